@@ -8,6 +8,10 @@
 - 导航与 JS 均走该 session，不把 Chrome 拉到前台
 - 绝不「还焦」或守护前台：用户切走别处后不会被抢回来
 
+多子系统共用：get_client(host) 按调试地址复用同一条浏览器级 WebSocket，
+各自用 background_target(host) 建独立后台标签（独立 session），可并发运行。
+调试地址始终显式传入，不再依赖全局配置。
+
 非静默：退回 Selenium 常规打开（会切前台，仅调试用）。
 """
 
@@ -20,7 +24,7 @@ import time
 import urllib.error
 import urllib.request
 from contextlib import contextmanager
-from typing import Any, Iterator, Optional
+from typing import Any, Dict, Iterator, Optional
 
 from allnews_mornitor import store
 
@@ -37,17 +41,23 @@ def silent_enabled() -> bool:
     return bool((store.load_config().get("cdp") or {}).get("silent", True))
 
 
-def _http_json(path: str) -> Any:
-    base = get_debugger_url().rstrip("/")
-    if not base.startswith("http"):
-        base = f"http://{base}"
-    url = f"{base}{path}"
+def normalize_host(host: Optional[str] = None) -> str:
+    """调试地址规范化为 host:port；未指定时用 allnews 配置。"""
+    raw = (host or get_debugger_url() or "127.0.0.1:9222").strip().rstrip("/")
+    for prefix in ("http://", "https://", "ws://", "wss://"):
+        if raw.startswith(prefix):
+            raw = raw[len(prefix):]
+    return raw.split("/", 1)[0] or "127.0.0.1:9222"
+
+
+def _http_json(path: str, host: Optional[str] = None) -> Any:
+    url = f"http://{normalize_host(host)}{path}"
     with urllib.request.urlopen(url, timeout=5) as resp:
         return json.loads(resp.read().decode("utf-8", errors="replace"))
 
 
-def _browser_ws_url() -> str:
-    ver = _http_json("/json/version")
+def _browser_ws_url(host: Optional[str] = None) -> str:
+    ver = _http_json("/json/version", host)
     ws = (ver or {}).get("webSocketDebuggerUrl") or ""
     if not ws:
         raise RuntimeError("Chrome CDP 未返回 webSocketDebuggerUrl，请确认已开 --remote-debugging-port")
@@ -121,6 +131,10 @@ class _CdpClient:
             raise RuntimeError(f"{method}: {err}")
         return resp.get("result") or {}
 
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
     def close(self) -> None:
         self._closed = True
         try:
@@ -129,6 +143,35 @@ class _CdpClient:
             pass
 
 
+# 按调试地址复用的浏览器连接
+_CLIENTS: Dict[str, _CdpClient] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_client(host: Optional[str] = None) -> _CdpClient:
+    """
+    取得该调试地址的共享 CDP 连接（线程安全；断开后自动重连）。
+    共享连接不要直接 close，各自只关闭自己的 BackgroundTarget。
+    """
+    key = normalize_host(host)
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is not None and not client.closed:
+            return client
+        client = _CdpClient(_browser_ws_url(key))
+        _CLIENTS[key] = client
+        return client
+
+
+def close_clients() -> None:
+    """关闭全部共享连接（进程退出或浏览器重启后调用）。"""
+    with _CLIENTS_LOCK:
+        clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+    for client in clients:
+        client.close()
+
+
 class BackgroundTarget:
     """后台标签：创建与操作均不 activate。"""
 
@@ -212,6 +255,44 @@ class BackgroundTarget:
         except Exception:
             pass
 
+    def close(self) -> None:
+        """分离并关闭该后台标签（共享连接保持打开）。"""
+        self.detach()
+        try:
+            self.client.call("Target.closeTarget", {"targetId": self.target_id}, timeout=10.0)
+        except Exception:
+            pass
+
+
+@contextmanager
+def background_target(host: Optional[str] = None, url: str = "about:blank") -> Iterator[BackgroundTarget]:
+    """
+    在指定调试地址的浏览器里开一个独立后台标签，退出时关闭。
+
+    Raises:
+        RuntimeError: 无法连接 Chrome CDP
+    """
+    key = normalize_host(host)
+    try:
+        _http_json("/json/version", key)
+    except (urllib.error.URLError, TimeoutError, OSError) as e:
+        raise RuntimeError(
+            f"无法连接 Chrome CDP ({key})，请先用 --remote-debugging-port 启动: {e}"
+        ) from e
+
+    client = get_client(key)
+    try:
+        page = BackgroundTarget.create(client, url)
+    except RuntimeError:
+        # 共享连接可能已被浏览器断开，重连一次
+        if not client.closed:
+            raise
+        page = BackgroundTarget.create(get_client(key), url)
+    try:
+        yield page
+    finally:
+        page.close()
+
 
 def get_driver(force_new: bool = False):
     """非静默模式用的 Selenium 连接。"""
@@ -234,8 +315,9 @@ def get_driver(force_new: bool = False):
 def reset_driver() -> None:
     global _driver, _bg
     if _bg is not None:
+        # 只关闭自己的后台标签，共享连接可能还在被其他子系统使用
         try:
-            _bg.client.close()
+            _bg.close()
         except Exception:
             pass
         _bg = None
@@ -323,42 +405,14 @@ def cdp_session() -> Iterator[Any]:
             raise
         return
 
-    client: Optional[_CdpClient] = None
-    page: Optional[BackgroundTarget] = None
-    try:
-        try:
-            _http_json("/json/version")
-        except (urllib.error.URLError, TimeoutError, OSError) as e:
-            raise RuntimeError(
-                f"无法连接 Chrome CDP ({get_debugger_url()})，请先用 --remote-debugging-port 启动: {e}"
-            ) from e
-
-        client = _CdpClient(_browser_ws_url())
-        page = BackgroundTarget.create(client, "about:blank")
+    with background_target(get_debugger_url()) as page:
         _bg = page
         print("[allnews] 静默 CDP：后台标签已建立（不激活、不还焦）")
-        yield page
-    except Exception:
-        if client is not None:
-            try:
-                client.close()
-            except Exception:
-                pass
-        _bg = None
-        raise
-    finally:
-        if page is not None:
-            try:
-                page.detach()
-            except Exception:
-                pass
-        if client is not None:
-            try:
-                client.close()
-            except Exception:
-                pass
-        if _bg is page:
-            _bg = None
+        try:
+            yield page
+        finally:
+            if _bg is page:
+                _bg = None
 
 
 @contextmanager
@@ -0,0 +1,9 @@
+# coding=utf-8
+"""
+性能基准测试
+
+用合成数据测量爬虫、MCP 服务器和控制台的热点路径，结果写入 JSON 便于跨提交对比。
+
+用法：
+    python -m benchmarks.run_benchmarks --platforms 10 --rounds 24 --titles 50 --output bench.json
+"""
@@ -0,0 +1,292 @@
+# coding=utf-8
+"""
+热点路径基准测试
+
+在临时目录生成合成数据后依次测量：
+- 爬虫：read_all_today_titles、detect_latest_new_titles、count_word_frequency、
+  split_content_into_batches、render_html_content
+- MCP 服务器：search_news（search_news_unified）、find_similar_news
+- 控制台：GET /api/posts
+
+每项记录首次调用耗时（冷缓存）与之后重复调用的 min/median/mean/max，结果写入 JSON。
+某组依赖缺失（如未安装 pytz/fastmcp）时该组记为 skipped，不影响其他组。
+
+用法：
+    python -m benchmarks.run_benchmarks --platforms 10 --rounds 24 --titles 50 --days 3 --output bench.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.synthetic_data import SUBJECTS, beijing_now, generate_dataset
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+Case = Tuple[str, Callable[[], object]]
+
+
+def measure(func: Callable[[], object], repeat: int) -> Dict:
+    """
+    测量一个可调用对象
+
+    Args:
+        func: 被测函数（无参数）
+        repeat: 首次调用之后的重复次数
+
+    Returns:
+        {"cold_ms", "runs", "min_ms", "median_ms", "mean_ms", "max_ms"}
+    """
+    # 被测函数内部的 print 输出不计入结果展示
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink):
+        start = time.perf_counter()
+        func()
+        cold = time.perf_counter() - start
+
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+
+    samples = samples or [cold]
+    return {
+        "cold_ms": round(cold * 1000, 3),
+        "runs": len(samples),
+        "min_ms": round(min(samples) * 1000, 3),
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3),
+    }
+
+
+def crawler_cases(root: Path, platform_ids: List[str]) -> List[Case]:
+    """爬虫热点路径（以合成数据目录为工作目录）"""
+    os.chdir(root)
+    os.environ["CONFIG_PATH"] = str(root / "config" / "config.yaml")
+    os.environ["FREQUENCY_WORDS_PATH"] = str(root / "config" / "frequency_words.txt")
+    with contextlib.redirect_stdout(io.StringIO()):
+        import crawler.index as crawler
+
+    word_groups, filter_words, global_filters = crawler.load_frequency_words()
+    results, id_to_name, title_info = crawler.read_all_today_titles(platform_ids)
+    new_titles = crawler.detect_latest_new_titles(platform_ids)
+    with contextlib.redirect_stdout(io.StringIO()):
+        stats, total_titles = crawler.count_word_frequency(
+            results, word_groups, filter_words, id_to_name, title_info,
+            crawler.CONFIG["RANK_THRESHOLD"], new_titles, "daily", global_filters,
+        )
+    report_data = crawler.prepare_report_data(stats, [], new_titles, id_to_name, "daily")
+
+    return [
+        ("crawler.read_all_today_titles", lambda: crawler.read_all_today_titles(platform_ids)),
+        ("crawler.detect_latest_new_titles", lambda: crawler.detect_latest_new_titles(platform_ids)),
+        ("crawler.count_word_frequency", lambda: crawler.count_word_frequency(
+            results, word_groups, filter_words, id_to_name, title_info,
+            crawler.CONFIG["RANK_THRESHOLD"], new_titles, "daily", global_filters,
+        )),
+        ("crawler.split_content_into_batches[feishu]",
+         lambda: crawler.split_content_into_batches(report_data, "feishu", mode="daily")),
+        ("crawler.split_content_into_batches[dingtalk]",
+         lambda: crawler.split_content_into_batches(report_data, "dingtalk", mode="daily")),
+        ("crawler.render_html_content",
+         lambda: crawler.render_html_content(report_data, total_titles, True, "daily")),
+    ]
+
+
+def mcp_cases(root: Path, dates: List[str], sample_titles: List[str]) -> List[Case]:
+    """MCP 工具热点路径"""
+    from mcp_server.tools.analytics import AnalyticsTools
+    from mcp_server.tools.search_tools import SearchTools
+
+    search = SearchTools(str(root))
+    analytics = AnalyticsTools(str(root))
+
+    def iso(folder: str) -> str:
+        return f"{folder[0:4]}-{folder[5:7]}-{folder[8:10]}"
+
+    date_range = {"start": iso(dates[0]), "end": iso(dates[-1])}
+    keyword = SUBJECTS[0]
+    reference = sample_titles[0]
+
+    return [
+        ("mcp.search_news[keyword]", lambda: search.search_news_unified(
+            query=keyword, search_mode="keyword", date_range=date_range, limit=50)),
+        ("mcp.search_news[fuzzy]", lambda: search.search_news_unified(
+            query=reference, search_mode="fuzzy", date_range=date_range, limit=50, threshold=0.5)),
+        ("mcp.find_similar_news", lambda: analytics.find_similar_news(reference, threshold=0.4, limit=50)),
+    ]
+
+
+def console_cases(root: Path) -> List[Case]:
+    """控制台 /api/posts（读取合成的帖子状态文件）"""
+    import console.app as console_app
+
+    console_app.STATE_PATH = root / "output" / "trendradar_posts_state.json"
+    keyword = SUBJECTS[2]
+
+    return [
+        ("console.api_posts", lambda: console_app.handle_api("GET", "/api/posts", {"limit": ["100"]}, {})),
+        ("console.api_posts[keyword]", lambda: console_app.handle_api(
+            "GET", "/api/posts", {"keyword": [keyword], "limit": ["100"]}, {})),
+    ]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        proc = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=str(PROJECT_ROOT), capture_output=True, text=True, timeout=10,
+        )
+        return proc.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_benchmarks(
+    platforms: int = 10,
+    rounds: int = 24,
+    titles: int = 50,
+    days: int = 3,
+    churn: float = 0.1,
+    repeat: int = 5,
+    seed: int = 42,
+    groups: Optional[List[str]] = None,
+    keep_data: Optional[str] = None,
+) -> Dict:
+    """
+    生成合成数据并运行基准测试
+
+    Args:
+        platforms: 平台数量
+        rounds: 每天轮次数
+        titles: 每个平台每轮的标题数
+        days: 天数
+        churn: 每轮标题替换比例
+        repeat: 每项重复次数（不含首次调用）
+        seed: 随机种子
+        groups: 运行哪些组（crawler/mcp/console），默认全部
+        keep_data: 合成数据目录；指定时保留数据，否则使用临时目录并在结束后删除
+
+    Returns:
+        基准测试报告字典
+    """
+    groups = groups or ["crawler", "mcp", "console"]
+    root = Path(keep_data).resolve() if keep_data else Path(tempfile.mkdtemp(prefix="trendradar-bench-"))
+    original_cwd = os.getcwd()
+    original_env = {key: os.environ.get(key) for key in ("CONFIG_PATH", "FREQUENCY_WORDS_PATH")}
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+
+    try:
+        started = time.perf_counter()
+        dataset = generate_dataset(
+            str(root), platforms=platforms, rounds=rounds, titles=titles,
+            days=days, churn=churn, seed=seed, end_date=beijing_now(),
+        )
+        dataset["generate_seconds"] = round(time.perf_counter() - started, 3)
+        # 使用仓库的主配置，频率词使用合成词汇
+        shutil.copyfile(PROJECT_ROOT / "config" / "config.yaml", root / "config" / "config.yaml")
+
+        factories = {
+            "crawler": lambda: crawler_cases(root, dataset["platforms"]),
+            "mcp": lambda: mcp_cases(root, dataset["dates"], dataset["sample_titles"]),
+            "console": lambda: console_cases(root),
+        }
+
+        results: Dict[str, Dict] = {}
+        for group in groups:
+            try:
+                cases = factories[group]()
+            except Exception as e:
+                results[group] = {"skipped": True, "error": f"{type(e).__name__}: {e}"}
+                continue
+            for name, func in cases:
+                try:
+                    results[name] = measure(func, repeat)
+                except Exception as e:
+                    results[name] = {"skipped": True, "error": f"{type(e).__name__}: {e}"}
+    finally:
+        os.chdir(original_cwd)
+        for key, value in original_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        if not keep_data:
+            shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "params": {
+            "platforms": platforms, "rounds": rounds, "titles": titles, "days": days,
+            "churn": churn, "repeat": repeat, "seed": seed,
+        },
+        "dataset": dataset,
+        "results": results,
+    }
+
+
+def format_results(report: Dict) -> str:
+    """把报告格式化为表格文本"""
+    params = report["params"]
+    lines = [
+        f"基准测试 @ {report['git_commit'] or 'unknown'}  "
+        f"({params['platforms']} 平台 × {params['rounds']} 轮 × {params['titles']} 条 × {params['days']} 天)",
+        f"  {'名称':<44}{'首次(ms)':>12}{'中位(ms)':>12}{'最小(ms)':>12}",
+    ]
+    for name, item in report["results"].items():
+        if item.get("skipped"):
+            lines.append(f"  {name:<44}  跳过: {item['error']}")
+            continue
+        lines.append(f"  {name:<44}{item['cold_ms']:>12.2f}{item['median_ms']:>12.2f}{item['min_ms']:>12.2f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="TrendRadar 热点路径基准测试")
+    parser.add_argument("--platforms", type=int, default=10, help="平台数量（默认 10）")
+    parser.add_argument("--rounds", type=int, default=24, help="每天轮次数（默认 24）")
+    parser.add_argument("--titles", type=int, default=50, help="每个平台每轮标题数（默认 50）")
+    parser.add_argument("--days", type=int, default=3, help="天数（默认 3）")
+    parser.add_argument("--churn", type=float, default=0.1, help="每轮标题替换比例（默认 0.1）")
+    parser.add_argument("--repeat", type=int, default=5, help="每项重复次数（默认 5）")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子（默认 42）")
+    parser.add_argument("--group", action="append", choices=["crawler", "mcp", "console"],
+                        help="只运行指定组，可重复")
+    parser.add_argument("--keep-data", help="把合成数据保留在该目录（默认使用临时目录）")
+    parser.add_argument("--output", default="bench.json", help="结果 JSON 文件（默认 bench.json）")
+    args = parser.parse_args(argv)
+
+    output_path = Path(args.output).resolve()
+    report = run_benchmarks(
+        platforms=args.platforms, rounds=args.rounds, titles=args.titles, days=args.days,
+        churn=args.churn, repeat=args.repeat, seed=args.seed, groups=args.group,
+        keep_data=args.keep_data,
+    )
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(format_results(report))
+    print(f"\n结果已写入 {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+# coding=utf-8
+"""
+合成热榜数据生成器
+
+在指定的项目根目录下生成与爬虫输出格式一致的数据：
+- output/<YYYY年MM月DD日>/txt/<HH时MM分>.txt：N 个平台 × M 轮 × K 条标题
+- output/trendradar_posts_state.json：控制台使用的帖子状态文件
+- config/frequency_words.txt：与合成标题词汇匹配的频率词
+
+标题由中文词汇随机组合而成，相邻轮次之间有排名变动与新旧标题替换（rank churn），
+同一随机种子生成的数据完全一致。
+"""
+
+import json
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import pytz
+
+    _BEIJING_TZ = pytz.timezone("Asia/Shanghai")
+except ImportError:
+    from datetime import timezone
+
+    _BEIJING_TZ = timezone(timedelta(hours=8))
+
+
+# 已知平台在前（x-cdp 为 config.yaml 中配置的平台），超出部分使用编号平台
+KNOWN_PLATFORMS = [
+    ("x-cdp", "X"),
+    ("zhihu", "知乎"),
+    ("weibo", "微博"),
+    ("baidu", "百度热搜"),
+    ("toutiao", "今日头条"),
+    ("douyin", "抖音"),
+    ("bilibili-hot-search", "bilibili 热搜"),
+    ("thepaper", "澎湃新闻"),
+    ("ifeng", "凤凰网"),
+    ("wallstreetcn-hot", "华尔街见闻"),
+    ("cls-hot", "财联社热门"),
+    ("tieba", "贴吧"),
+]
+
+SUBJECTS = [
+    "人工智能", "特斯拉", "比特币", "华为", "苹果", "OpenAI", "英伟达", "小米", "比亚迪", "美联储",
+    "央行", "A股", "港股", "纳斯达克", "世界杯", "奥运会", "国足", "台风", "地震", "高铁",
+    "新能源车", "芯片", "大模型", "机器人", "航天", "房地产", "楼市", "油价", "黄金", "人民币",
+]
+ACTIONS = [
+    "发布", "宣布", "回应", "下调", "上调", "暴跌", "大涨", "突破", "官宣", "曝光",
+    "否认", "启动", "暂停", "收购", "起诉", "夺冠", "刷新纪录", "登顶", "遭遇", "推出",
+]
+OBJECTS = [
+    "新品", "财报", "降价计划", "出口管制", "利率决议", "裁员传闻", "新一轮融资", "技术路线",
+    "安全事故", "年度报告", "合作协议", "新政策", "监管调查", "发布会", "开源模型", "价格战",
+    "季度销量", "海外市场", "用户协议", "供应链",
+]
+SUFFIXES = ["", "", "", "，网友热议", "，专家解读", "，最新进展", "，官方回应", "！", "？"]
+
+
+def beijing_now() -> datetime:
+    """北京时间（与爬虫 get_beijing_time 一致，去掉时区信息）"""
+    return datetime.now(_BEIJING_TZ).replace(tzinfo=None)
+
+
+def platform_list(count: int) -> List[Tuple[str, str]]:
+    """
+    生成平台列表
+
+    Args:
+        count: 平台数量
+
+    Returns:
+        [(平台ID, 平台名称), ...]
+    """
+    platforms = list(KNOWN_PLATFORMS[:count])
+    for index in range(len(platforms), count):
+        platforms.append((f"synthetic-{index}", f"合成平台{index}"))
+    return platforms
+
+
+def make_title(rng: random.Random) -> str:
+    """随机组合一条中文标题"""
+    title = f"{rng.choice(SUBJECTS)}{rng.choice(ACTIONS)}{rng.choice(OBJECTS)}{rng.choice(SUFFIXES)}"
+    if rng.random() < 0.3:
+        title = f"{rng.choice(SUBJECTS)}与{title}"
+    return title
+
+
+def round_times(rounds: int) -> List[str]:
+    """
+    把 M 轮均匀分布到一天内，返回文件名时间（HH时MM分）
+
+    Args:
+        rounds: 每天轮次数
+
+    Returns:
+        时间字符串列表（升序）
+    """
+    step = max(1, (24 * 60) // max(1, rounds))
+    return [f"{(i * step) // 60:02d}时{(i * step) % 60:02d}分" for i in range(rounds)]
+
+
+class _PlatformFeed:
+    """单个平台的榜单，逐轮演化"""
+
+    def __init__(self, platform_id: str, titles: int, churn: float, rng: random.Random):
+        self.platform_id = platform_id
+        self.size = titles
+        self.churn = churn
+        self.rng = rng
+        self._serial = 0
+        self.items: List[Tuple[str, str]] = [self._new_item() for _ in range(titles)]
+
+    def _new_item(self) -> Tuple[str, str]:
+        self._serial += 1
+        title = make_title(self.rng)
+        # 追加序号避免同一平台内标题重复（重复标题会被解析合并）
+        if self.rng.random() < 0.5:
+            title = f"{title}（{self._serial}）"
+        return title, f"https://example.com/{self.platform_id}/{self._serial}"
+
+    def advance(self) -> None:
+        """进入下一轮：按 churn 比例替换标题，其余标题排名随机扰动"""
+        replace = int(self.size * self.churn)
+        for _ in range(replace):
+            index = self.rng.randrange(len(self.items))
+            self.items[index] = self._new_item()
+        # 相邻位置交换模拟排名升降
+        for _ in range(self.size // 3):
+            i = self.rng.randrange(len(self.items))
+            j = min(len(self.items) - 1, max(0, i + self.rng.randint(-3, 3)))
+            self.items[i], self.items[j] = self.items[j], self.items[i]
+
+
+def _render_round(platforms: List[Tuple[str, str]], feeds: Dict[str, _PlatformFeed]) -> str:
+    sections = []
+    for platform_id, name in platforms:
+        lines = [f"{platform_id} | {name}"]
+        for rank, (title, url) in enumerate(feeds[platform_id].items, 1):
+            lines.append(f"{rank}. {title} [URL:{url}] [MOBILE:{url}?m=1]")
+        sections.append("\n".join(lines))
+    return "\n\n".join(sections) + "\n"
+
+
+def generate_dataset(
+    root: str,
+    platforms: int = 10,
+    rounds: int = 24,
+    titles: int = 50,
+    days: int = 3,
+    churn: float = 0.1,
+    seed: int = 42,
+    end_date: Optional[datetime] = None,
+) -> Dict:
+    """
+    生成合成数据集
+
+    Args:
+        root: 项目根目录（数据写入 root/output 与 root/config）
+        platforms: 平台数量
+        rounds: 每天轮次数
+        titles: 每个平台每轮的标题数
+        days: 天数（截止到 end_date，包含当天）
+        churn: 每轮被替换的标题比例
+        seed: 随机种子
+        end_date: 最后一天，默认北京时间今天
+
+    Returns:
+        {"dates", "platforms", "files", "titles_written", "posts", "sample_titles"}
+    """
+    rng = random.Random(seed)
+    root_path = Path(root)
+    platform_items = platform_list(platforms)
+    end_date = end_date or beijing_now()
+
+    feeds = {
+        platform_id: _PlatformFeed(platform_id, titles, churn, rng)
+        for platform_id, _ in platform_items
+    }
+
+    dates = []
+    files = 0
+    titles_written = 0
+    for offset in range(days - 1, -1, -1):
+        date = end_date - timedelta(days=offset)
+        date_folder = date.strftime("%Y年%m月%d日")
+        txt_dir = root_path / "output" / date_folder / "txt"
+        txt_dir.mkdir(parents=True, exist_ok=True)
+        for time_name in round_times(rounds):
+            for feed in feeds.values():
+                feed.advance()
+            (txt_dir / f"{time_name}.txt").write_text(_render_round(platform_items, feeds), encoding="utf-8")
+            files += 1
+            titles_written += platforms * titles
+        dates.append(date_folder)
+
+    posts = write_posts_state(root_path, platform_items, feeds, rng)
+    write_frequency_words(root_path)
+
+    return {
+        "dates": dates,
+        "platforms": [platform_id for platform_id, _ in platform_items],
+        "files": files,
+        "titles_written": titles_written,
+        "posts": posts,
+        # 最后一轮各平台的榜首标题，用作相似度查询的参考标题
+        "sample_titles": [feeds[platform_id].items[0][0] for platform_id, _ in platform_items],
+    }
+
+
+def write_posts_state(
+    root: Path,
+    platforms: List[Tuple[str, str]],
+    feeds: Dict[str, _PlatformFeed],
+    rng: random.Random,
+) -> int:
+    """
+    写入控制台帖子状态文件（结构与爬虫写出的 trendradar_posts_state.json 一致）
+
+    Returns:
+        写入的帖子数
+    """
+    now = beijing_now()
+    state = {
+        "version": 1,
+        "generated_at": now.strftime("%Y-%m-%d %H:%M:%S"),
+        "platform_labels": {platform_id: name for platform_id, name in platforms},
+        "posts": {},
+    }
+    count = 0
+    for platform_id, _ in platforms:
+        bucket = {}
+        for rank, (title, url) in enumerate(feeds[platform_id].items, 1):
+            fetched = now - timedelta(minutes=rng.randint(0, 24 * 60))
+            bucket[url] = {
+                "href": url,
+                "fetched_at": fetched.strftime("%Y-%m-%d %H:%M:%S"),
+                "title": title,
+                "raw": f"{title}。{make_title(rng)}，{make_title(rng)}。",
+                "summary": title[:60],
+                "rank": rank,
+                "tags": rng.sample(SUBJECTS, 2) if rng.random() < 0.3 else [],
+                "archived": rng.random() < 0.1,
+                "watch_later": rng.random() < 0.05,
+                "platform": platform_id,
+            }
+            count += 1
+        state["posts"][platform_id] = bucket
+
+    output_dir = root / "output"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / "trendradar_posts_state.json", "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    return count
+
+
+def write_frequency_words(root: Path) -> Path:
+    """
+    写入与合成词汇匹配的频率词文件（每个主体词一组，部分组带必须词与过滤词）
+
+    Returns:
+        频率词文件路径
+    """
+    groups = []
+    for index, subject in enumerate(SUBJECTS):
+        lines = [subject]
+        if index % 5 == 0:
+            lines.append(f"+{ACTIONS[index % len(ACTIONS)]}")
+        if index % 7 == 0:
+            lines.append(f"!{OBJECTS[index % len(OBJECTS)]}")
+        groups.append("\n".join(lines))
+
+    path = root / "config" / "frequency_words.txt"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n\n".join(groups) + "\n", encoding="utf-8")
+    return path
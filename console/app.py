@@ -23,7 +23,7 @@ from collections import defaultdict
 from datetime import datetime, timedelta
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from urllib.parse import parse_qs, urlparse
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -43,6 +43,10 @@ PLATFORM_DISPLAY = {
 # 后台任务状态
 _JOBS: Dict[str, Dict[str, Any]] = {}
 _JOBS_LOCK = threading.Lock()
+# 任务状态变化时唤醒 /api/jobs/<id>/stream 的等待者
+_JOBS_COND = threading.Condition(_JOBS_LOCK)
+# SSE 无新数据时的保活间隔（秒）
+JOB_STREAM_KEEPALIVE = 15.0
 
 # 周期性资讯任务
 _CRAWL_TASKS: Dict[str, Dict[str, Any]] = {}
@@ -631,10 +635,73 @@ def _flatten_posts(
 
 
 def _set_job(job_id: str, **kwargs) -> None:
-    with _JOBS_LOCK:
+    with _JOBS_COND:
         job = _JOBS.get(job_id, {"id": job_id})
         job.update(kwargs)
         _JOBS[job_id] = job
+        _JOBS_COND.notify_all()
+
+
+def _append_job_text(job_id: str, delta: str) -> None:
+    """流式任务：把模型新输出追加到 job["partial"]。"""
+    if not delta:
+        return
+    with _JOBS_COND:
+        job = _JOBS.setdefault(job_id, {"id": job_id})
+        job["partial"] = str(job.get("partial") or "") + delta
+        _JOBS_COND.notify_all()
+
+
+def _wait_job(job_id: str, offset: int, timeout: float) -> tuple[Optional[Dict[str, Any]], str]:
+    """
+    等到任务有 offset 之后的新输出或已结束（最多 timeout 秒）。
+    返回 (任务快照, 新增文本)；任务不存在时快照为 None。
+    """
+    deadline = time.monotonic() + timeout
+    with _JOBS_COND:
+        while True:
+            job = _JOBS.get(job_id)
+            if job is None:
+                return None, ""
+            partial = str(job.get("partial") or "")
+            finished = job.get("status") in ("done", "error")
+            left = deadline - time.monotonic()
+            if len(partial) > offset or finished or left <= 0:
+                return dict(job), partial[offset:]
+            _JOBS_COND.wait(left)
+
+
+def _start_stream_job(kind: str, fn: Callable[[Callable[[str], None]], Dict[str, Any]]) -> str:
+    """
+    后台执行 fn(on_chunk)，模型输出实时写入 job["partial"]，结束后写入 result。
+    前端用 /api/jobs/<id>/stream（SSE）或轮询 /api/jobs/<id> 取进度。
+    """
+    job_id = uuid.uuid4().hex[:12]
+
+    def _worker() -> None:
+        _set_job(job_id, status="running", message="生成中…", started_at=datetime.now().isoformat(timespec="seconds"))
+        try:
+            result = fn(lambda delta: _append_job_text(job_id, delta))
+            ok = bool(result.get("success"))
+            _set_job(
+                job_id,
+                status="done" if ok else "error",
+                message="完成" if ok else str(result.get("error") or "失败"),
+                result=result,
+                finished_at=datetime.now().isoformat(timespec="seconds"),
+            )
+        except Exception as e:
+            _set_job(
+                job_id,
+                status="error",
+                message=str(e),
+                error=str(e),
+                finished_at=datetime.now().isoformat(timespec="seconds"),
+            )
+
+    _set_job(job_id, status="queued", type=kind, message="排队中", partial="")
+    threading.Thread(target=_worker, name=f"{kind}-{job_id}", daemon=True).start()
+    return job_id
 
 
 def _get_job(job_id: str) -> Optional[Dict[str, Any]]:
@@ -647,8 +714,9 @@ def _prepare_search_plan(
     keyword: str,
     expand: bool = True,
     platforms: Optional[List[str]] = None,
+    on_chunk: Optional[Callable[[str], None]] = None,
 ) -> Dict[str, Any]:
-    """衍生关键词并整理各平台查询。"""
+    """衍生关键词并整理各平台查询（on_chunk 接收衍生时的模型流式输出）。"""
     plats = [str(p).strip() for p in (platforms or ["x-cdp", "reddit", "telegram"]) if str(p).strip()]
     plan: Dict[str, Any] = {
         "keyword": keyword,
@@ -666,7 +734,7 @@ def _prepare_search_plan(
     if expand:
         from console.keyword_expand import expand_keyword
 
-        expansion = expand_keyword(keyword)
+        expansion = expand_keyword(keyword, on_chunk=on_chunk)
         plan["expansion"] = expansion
         if expansion.get("success"):
             seeds = expansion.get("seeds") or [keyword]
@@ -717,7 +785,12 @@ def _run_crawl_job(
         else:
             safe_print(" 主题: (使用 config.yaml 默认)")
 
-        plan = _prepare_search_plan(keyword, expand=expand, platforms=platforms)
+        plan = _prepare_search_plan(
+            keyword,
+            expand=expand,
+            platforms=platforms,
+            on_chunk=lambda delta: _append_job_text(job_id, delta),
+        )
         _set_job(
             job_id,
             message="衍生词已就绪，开始抓取…",
@@ -1240,6 +1313,19 @@ def handle_api(method: str, path: str, query: Dict[str, List[str]], body: Dict[s
             }
         )
 
+    if path == "/api/ai/cache":
+        from utils.llm_cache import get_llm_cache
+
+        cache = get_llm_cache()
+        if method == "DELETE":
+            return _json_bytes({"success": True, "removed": cache.clear(), "stats": cache.stats()})
+        return _json_bytes({"success": True, "stats": cache.stats()})
+
+    if path == "/api/ai/router" and method == "GET":
+        from utils.ai_client import get_router
+
+        return _json_bytes({"success": True, "stats": get_router().stats()})
+
     if path == "/api/platforms/crawl":
         import sys
 
@@ -1343,6 +1429,19 @@ def handle_api(method: str, path: str, query: Dict[str, List[str]], body: Dict[s
             }
         )
 
+    if path == "/api/bursts" and method == "GET":
+        import sys
+
+        try:
+            limit = max(1, min(100, int((query.get("limit") or ["20"])[0])))
+        except Exception:
+            limit = 20
+        if str(PROJECT_ROOT) not in sys.path:
+            sys.path.insert(0, str(PROJECT_ROOT))
+        from mcp_server.services.burst_detector import read_bursts
+
+        return _json_bytes({"success": True, **read_bursts(str(PROJECT_ROOT), limit)})
+
     if path == "/api/posts/meta" and method == "POST":
         platform_id = str(body.get("platform_id") or "").strip()
         key = str(body.get("key") or body.get("href") or "").strip()
@@ -1514,6 +1613,9 @@ def handle_api(method: str, path: str, query: Dict[str, List[str]], body: Dict[s
             return _json_bytes({"success": False, "error": "请填写关键词"}, 400)
         from console.keyword_expand import expand_keyword
 
+        if body.get("stream"):
+            job_id = _start_stream_job("expand", lambda on_chunk: expand_keyword(keyword, on_chunk=on_chunk))
+            return _json_bytes({"success": True, "job_id": job_id})
         return _json_bytes(expand_keyword(keyword))
 
     if path == "/api/crawl/tasks" and method == "GET":
@@ -1870,7 +1972,7 @@ def handle_api(method: str, path: str, query: Dict[str, List[str]], body: Dict[s
                     tid_list = [int(body.get("template_id"))]
                 except Exception:
                     pass
-            result = lab_compose(
+            lab_kwargs = dict(
                 template_ids=tid_list,
                 topic=str(body.get("topic") or "").strip(),
                 formula_id=str(body.get("formula") or body.get("formula_id") or "contrarian"),
@@ -1879,6 +1981,10 @@ def handle_api(method: str, path: str, query: Dict[str, List[str]], body: Dict[s
                 variant_count=int(body.get("variant_count") or 3),
                 bump_weight=bool(body.get("bump_weight", True)),
             )
+            if body.get("stream"):
+                job_id = _start_stream_job("lab", lambda on_chunk: lab_compose(**lab_kwargs, on_chunk=on_chunk))
+                return _json_bytes({"success": True, "job_id": job_id})
+            result = lab_compose(**lab_kwargs)
             status = 200 if result.get("success") else 400
             return _json_bytes(result, status)
 
@@ -2177,23 +2283,27 @@ def handle_api(method: str, path: str, query: Dict[str, List[str]], body: Dict[s
             sys.path.insert(0, str(PROJECT_ROOT))
         from create.index import generate_article_by_topic
 
-        result = generate_article_by_topic(
-            topic=topic,
-            requirements=requirements,
-            platform=platform,
-            content_type=content_type,
-            word_count=words,
-            style=style,
-        )
-        saved = ""
-        if result.get("success") and result.get("content"):
-            saved = _save_article(
-                topic,
-                result["content"],
-                {"platform": platform, "style": style},
+        def _create(on_chunk: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+            result = generate_article_by_topic(
+                topic=topic,
+                requirements=requirements,
+                platform=platform,
+                content_type=content_type,
+                word_count=words,
+                style=style,
+                on_chunk=on_chunk,
             )
-            result["saved_path"] = saved
-        return _json_bytes(result)
+            if result.get("success") and result.get("content"):
+                result["saved_path"] = _save_article(
+                    topic,
+                    result["content"],
+                    {"platform": platform, "style": style},
+                )
+            return result
+
+        if body.get("stream"):
+            return _json_bytes({"success": True, "job_id": _start_stream_job("create", _create)})
+        return _json_bytes(_create())
 
     if path == "/api/publish" and method == "POST":
         title = str(body.get("title") or "").strip()
@@ -2426,17 +2536,17 @@ def handle_api(method: str, path: str, query: Dict[str, List[str]], body: Dict[s
     # ——— X List 交易信号 ———
     if path == "/api/signals/config" and method == "GET":
         from signals.push import channels_summary
-        from signals.store import get_config, load_state
+        from signals.store import counts, get_config, list_windows
 
-        st = load_state()
+        n = counts()
         return _json_bytes(
             {
                 "success": True,
                 "config": get_config(),
-                "windows": (st.get("windows") or [])[:12],
-                "card_count": len(st.get("cards") or []),
-                "seen_count": len(st.get("seen_tweet_ids") or []),
-                "pushed_count": len(st.get("pushed_tweet_ids") or []),
+                "windows": list_windows(12),
+                "card_count": n["cards"],
+                "seen_count": n["seen"],
+                "pushed_count": n["pushed"],
                 "channels": channels_summary(),
             }
         )
@@ -2479,7 +2589,7 @@ def handle_api(method: str, path: str, query: Dict[str, List[str]], body: Dict[s
         return _json_bytes({"success": True, **result})
 
     if path == "/api/signals/cards" and method == "GET":
-        from signals.store import list_cards, load_state
+        from signals.store import counts, get_config, list_cards, list_windows
 
         try:
             limit = int((query.get("limit") or ["80"])[0])
@@ -2488,14 +2598,13 @@ def handle_api(method: str, path: str, query: Dict[str, List[str]], body: Dict[s
         only_trade = str((query.get("trade") or [""])[0]).lower() in ("1", "true", "yes")
         lid = (query.get("list_id") or [""])[0]
         items = list_cards(list_id=lid, only_trade=only_trade, limit=limit)
-        st = load_state()
         return _json_bytes(
             {
                 "success": True,
                 "items": items,
-                "windows": (st.get("windows") or [])[:8],
-                "config": st.get("config") or {},
-                "pushed_count": len(st.get("pushed_tweet_ids") or []),
+                "windows": list_windows(8),
+                "config": get_config(),
+                "pushed_count": counts()["pushed"],
             }
         )
 
@@ -2572,9 +2681,16 @@ def handle_api(method: str, path: str, query: Dict[str, List[str]], body: Dict[s
         from signals.store import resolve_media
 
         rel = (query.get("rel") or [""])[0].strip()
+        url = (query.get("url") or [""])[0].strip()
         try:
-            fpath = resolve_media(rel)
-            if not fpath.is_file():
+            fpath = resolve_media(rel) if rel else None
+            if (fpath is None or not fpath.is_file()) and url.startswith(("http://", "https://")):
+                # 本地文件已被缓存按 LRU 淘汰：按卡片里的原始 URL 重新取回
+                from signals.media_cache import get_cache
+
+                fetched = get_cache().fetch(url)
+                fpath = resolve_media(fetched["rel"]) if fetched.get("rel") else None
+            if fpath is None or not fpath.is_file():
                 return _json_bytes({"success": False, "error": "文件不存在"}, 404)
             data = fpath.read_bytes()
             ctype = mimetypes.guess_type(str(fpath))[0] or "application/octet-stream"
@@ -2681,8 +2797,50 @@ class ConsoleHandler(SimpleHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Headers", "Content-Type")
         self.end_headers()
 
+    def _stream_job(self, job_id: str, query: Dict[str, List[str]]) -> None:
+        """
+        SSE 推送任务的流式输出：每段新文本一条 data: {"delta": ...}（id 为累计偏移，
+        断线重连时凭 Last-Event-ID 续传），结束时发 event: done 携带完整任务。
+        """
+        try:
+            offset = int(self.headers.get("Last-Event-ID") or (query.get("offset") or ["0"])[0] or 0)
+        except ValueError:
+            offset = 0
+        if _get_job(job_id) is None:
+            self._send(*_json_bytes({"success": False, "error": "任务不存在"}, 404))
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("X-Accel-Buffering", "no")
+        self.end_headers()
+        try:
+            while True:
+                job, delta = _wait_job(job_id, offset, JOB_STREAM_KEEPALIVE)
+                if job is None:
+                    break
+                if delta:
+                    offset += len(delta)
+                    data = json.dumps({"delta": delta}, ensure_ascii=False)
+                    self.wfile.write(f"id: {offset}\ndata: {data}\n\n".encode("utf-8"))
+                elif job.get("status") not in ("done", "error"):
+                    self.wfile.write(b": keepalive\n\n")
+                if job.get("status") in ("done", "error") and len(str(job.get("partial") or "")) <= offset:
+                    data = json.dumps({"success": True, "job": job}, ensure_ascii=False, default=str)
+                    self.wfile.write(f"event: done\ndata: {data}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    break
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
     def do_GET(self) -> None:
         parsed = urlparse(self.path)
+        m = re.fullmatch(r"/api/jobs/([^/]+)/stream", parsed.path)
+        if m:
+            self._stream_job(m.group(1), parse_qs(parsed.query))
+            return
         if parsed.path.startswith("/api/"):
             body, status, ctype = handle_api("GET", parsed.path, parse_qs(parsed.query), {})
             self._send(body, status, ctype)
@@ -2831,7 +2989,14 @@ def main() -> None:
     parser.add_argument("--host", default="127.0.0.1")
     parser.add_argument("--port", type=int, default=8787)
     parser.add_argument("--no-browser", action="store_true", help="不自动打开浏览器")
+    parser.add_argument("--profile-startup", action="store_true", help="分析各模块导入耗时后退出")
     args = parser.parse_args()
+    if args.profile_startup:
+        if str(PROJECT_ROOT) not in sys.path:
+            sys.path.insert(0, str(PROJECT_ROOT))
+        from mcp_server.utils.startup_profile import run_profile_cli
+
+        sys.exit(run_profile_cli("console.app", str(PROJECT_ROOT)))
     run_server(host=args.host, port=args.port, open_browser=not args.no_browser)
 
 
@@ -8,7 +8,7 @@ from __future__ import annotations
 import json
 import os
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 
 SYSTEM_PROMPT = """你是社交媒体搜索顾问。根据用户主题，输出便于在 X(Twitter)/Reddit/Telegram 检索的衍生词与查询。
@@ -114,6 +114,12 @@ def _heuristic_expand(keyword: str) -> Dict[str, Any]:
         if any("\u4e00" <= c <= "\u9fff" for c in kw):
             seeds.append(f"{kw} 招聘")
             seeds.append(f"{kw} 机会")
+            # 长主题拆成词典词/短语，便于分别检索
+            from mcp_server.utils.segmenter import get_segmenter
+
+            parts = get_segmenter().keywords(kw)
+            if len(parts) > 1:
+                seeds.extend(parts)
         else:
             seeds.extend([f"{kw} job", f"{kw} hiring", f'"{kw}"'])
 
@@ -171,9 +177,14 @@ def _normalize_list(val: Any, limit: int = 12) -> List[str]:
     return out
 
 
-def expand_keyword(keyword: str, max_twitter: int = 5) -> Dict[str, Any]:
+def expand_keyword(
+    keyword: str,
+    max_twitter: int = 5,
+    on_chunk: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
     """
     对主题做衍生，返回 seeds / twitter_queries / reddit_queries / telegram_queries。
+    on_chunk：流式回调首轮模型输出（重试那一轮不回调）。
     """
     kw = (keyword or "").strip()
     if not kw:
@@ -192,7 +203,7 @@ def expand_keyword(keyword: str, max_twitter: int = 5) -> Dict[str, Any]:
         f"主题：{kw}\n"
         f"请生成便于检索的衍生词与查询；twitter_queries 最多 {max_twitter} 条。"
     )
-    result = generate_text(prompt, system_prompt=SYSTEM_PROMPT, temperature=0.3, max_tokens=1800)
+    result = generate_text(prompt, system_prompt=SYSTEM_PROMPT, temperature=0.3, max_tokens=1800, on_chunk=on_chunk)
     parsed = _extract_json(result.get("content") or "") if result.get("success") else None
 
     # 再试一次更短、更硬的输出约束
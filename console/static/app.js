@@ -148,6 +148,57 @@ async function api(path, options = {}) {
   return data;
 }
 
+// 订阅后台任务的流式输出（SSE），结束时 resolve 最终 job；SSE 断开时退回轮询
+function streamJob(jobId, onDelta) {
+  let received = 0;
+  const emit = (text) => {
+    if (!text) return;
+    received += text.length;
+    if (onDelta) onDelta(text);
+  };
+  const poll = async () => {
+    for (;;) {
+      const data = await api(`/api/jobs/${jobId}`);
+      const job = data.job || {};
+      const partial = String(job.partial || "");
+      if (partial.length > received) emit(partial.slice(received));
+      if (!data.success || job.status === "done" || job.status === "error") {
+        return data.success ? job : { status: "error", message: data.error || "任务不存在" };
+      }
+      await new Promise((r) => setTimeout(r, 1000));
+    }
+  };
+  if (typeof EventSource === "undefined") return poll();
+  return new Promise((resolve) => {
+    const es = new EventSource(`/api/jobs/${jobId}/stream`);
+    es.onmessage = (ev) => {
+      try {
+        emit(JSON.parse(ev.data).delta || "");
+      } catch (e) {}
+    };
+    es.addEventListener("done", (ev) => {
+      es.close();
+      let job = {};
+      try {
+        job = JSON.parse(ev.data).job || {};
+      } catch (e) {}
+      resolve(job);
+    });
+    es.onerror = () => {
+      es.close();
+      poll().then(resolve, (e) => resolve({ status: "error", message: String(e) }));
+    };
+  });
+}
+
+// 以 stream:true 发起生成任务并订阅输出，返回与同步接口相同结构的结果
+async function apiStream(path, payload, onDelta) {
+  const start = await api(path, { method: "POST", body: JSON.stringify({ ...payload, stream: true }) });
+  if (!start.success || !start.job_id) return start;
+  const job = await streamJob(start.job_id, onDelta);
+  return job.result || { success: false, error: job.message || job.error || "生成失败" };
+}
+
 function escapeHtml(s) {
   return String(s)
     .replace(/&/g, "&amp;")
@@ -1318,9 +1369,10 @@ async function runCorpusRegen() {
   showLabSkeleton(true);
   renderLabCot(["读取灵感卡骨架…", "注入热点变量…", "分化 A刺眼 / B干货 / C故事…"]);
   try {
-    const data = await api("/api/corpus/generate", {
-      method: "POST",
-      body: JSON.stringify({
+    let streamed = 0;
+    const data = await apiStream(
+      "/api/corpus/generate",
+      {
         lab: true,
         template_ids: ids,
         topic,
@@ -1328,8 +1380,12 @@ async function runCorpusRegen() {
         platform_style: $("#regenStyle")?.value.trim() || "X/Twitter",
         prompt: $("#regenPrompt")?.value.trim() || "",
         variant_count: 3,
-      }),
-    });
+      },
+      (delta) => {
+        streamed += delta.length;
+        setStatus($("#corpusRegenStatus"), `生成中… 已输出 ${streamed} 字`);
+      }
+    );
     if (!data.success) {
       setStatus($("#corpusRegenStatus"), data.error || "生成失败", "error");
       return;
@@ -1520,6 +1576,15 @@ async function pollJob(jobId) {
     const data = await api(`/api/jobs/${jobId}`);
     const job = data.job || {};
     setStatus($("#crawlStatus"), job.message || job.status || "运行中…");
+    if (job.partial && !job.plan) {
+      // 衍生词还在生成：先显示模型原始输出
+      const box = $("#expandPreview");
+      const body = $("#expandPreviewBody");
+      if (box && body) {
+        box.hidden = false;
+        body.textContent = job.partial;
+      }
+    }
     if (job.plan && job.plan.twitter_queries) {
       const box = $("#expandPreview");
       const body = $("#expandPreviewBody");
@@ -2266,14 +2331,14 @@ function bind() {
     }
     if ($("#crawlExpand")) $("#crawlExpand").checked = true;
     setStatus($("#crawlStatus"), "正在用本地 AI 衍生搜索词…");
+    const box = $("#expandPreview");
+    const body = $("#expandPreviewBody");
     try {
-      const data = await api("/api/keywords/expand", {
-        method: "POST",
-        body: JSON.stringify({ keyword }),
-      });
-      const box = $("#expandPreview");
-      const body = $("#expandPreviewBody");
       box.hidden = false;
+      body.textContent = "";
+      const data = await apiStream("/api/keywords/expand", { keyword }, (delta) => {
+        body.textContent += delta;
+      });
       body.textContent = JSON.stringify(data, null, 2);
       setStatus(
         $("#crawlStatus"),
@@ -2383,16 +2448,25 @@ function bind() {
     }
     $("#btnCreate").disabled = true;
     setStatus($("#createStatus"), "正在生成，可能需要数十秒…");
+    const preview = $("#createContentPreview");
+    $("#createTitlePreview").textContent = topic;
+    preview.textContent = "";
     try {
-      const data = await api("/api/create", {
-        method: "POST",
-        body: JSON.stringify({
+      let streamed = 0;
+      const data = await apiStream(
+        "/api/create",
+        {
           topic,
           prompt: $("#createPrompt").value.trim(),
           style: $("#createStyle").value.trim() || "专业",
           words: Number($("#createWords").value || 2000),
-        }),
-      });
+        },
+        (delta) => {
+          preview.textContent += delta;
+          streamed += delta.length;
+          setStatus($("#createStatus"), `生成中… 已输出 ${streamed} 字`);
+        }
+      );
       if (!data.success) {
         setStatus($("#createStatus"), data.error || "生成失败", "error");
         return;
@@ -2876,7 +2950,7 @@ async function loadSignalCards() {
         const imgs = (c.images || [])
           .map((im) => {
             const src = im.rel
-              ? `/api/signals/media?rel=${encodeURIComponent(im.rel)}`
+              ? `/api/signals/media?rel=${encodeURIComponent(im.rel)}&url=${encodeURIComponent(im.url || "")}`
               : im.url || "";
             if (!src) return "";
             return `<a href="${escapeAttr(im.url || src)}" target="_blank" rel="noopener"><img src="${escapeAttr(src)}" alt="${escapeAttr(im.alt || "")}" loading="lazy" /></a>`;
@@ -2942,11 +3016,14 @@ async function loadTweetCards() {
         const points = (c.core_points || [])
           .map((p) => `<li>${escapeHtml(String(p))}</li>`)
           .join("");
+        const cached = (c.media && c.media.cache) || {};
         const imgs = (c.images || [])
-          .map(
-            (u) =>
-              `<a href="${escapeAttr(u)}" target="_blank" rel="noopener"><img src="${escapeAttr(u)}" alt="" loading="lazy" /></a>`
-          )
+          .map((u) => {
+            const src = cached[u]
+              ? `/api/signals/media?rel=${encodeURIComponent(cached[u])}&url=${encodeURIComponent(u)}`
+              : u;
+            return `<a href="${escapeAttr(u)}" target="_blank" rel="noopener"><img src="${escapeAttr(src)}" alt="" loading="lazy" /></a>`;
+          })
           .join("");
         return `<article class="tc-card" data-tid="${escapeAttr(String(c.tweet_id || ""))}">
           <div class="tc-head">
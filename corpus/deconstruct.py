@@ -9,6 +9,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from corpus.db import create_template, init_db
+from mcp_server.utils.segmenter import get_segmenter
 
 DECONSTRUCT_SYSTEM = """你是爆款内容拆解专家。目标：把具体帖子炼成可复用的「梗骨架」，去掉一时一事的细节。
 只输出一个 JSON 对象，不要 markdown 代码块，不要解释。字段如下：
@@ -47,7 +48,7 @@ def _extract_json(text: str) -> Dict[str, Any]:
 def _fallback_factors(title: str, raw: str) -> Dict[str, Any]:
     text = (raw or title or "").strip()
     cut = text[:80] + ("…" if len(text) > 80 else "")
-    words = re.findall(r"[\u4e00-\u9fff]{2,8}|[A-Za-z][A-Za-z0-9_-]{2,}", text)
+    words = get_segmenter().keywords(text)
     uniq: List[str] = []
     for w in words:
         if w not in uniq:
@@ -89,6 +89,7 @@ def compose_from_templates(
             system_prompt=system,
             temperature=0.75,
             max_tokens=1200,
+            cache=False,
         )
     except Exception as e:
         return {"success": False, "error": f"AI 调用失败: {e}"}
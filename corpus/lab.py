@@ -6,7 +6,7 @@ from __future__ import annotations
 import json
 import re
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
 from corpus.db import (
     create_generation,
@@ -145,8 +145,9 @@ def lab_compose(
     extra_prompt: str = "",
     variant_count: int = 3,
     bump_weight: bool = True,
+    on_chunk: Optional[Callable[[str], None]] = None,
 ) -> Dict[str, Any]:
-    """工作台一键融合：返回 CoT + 多版本。"""
+    """工作台一键融合：返回 CoT + 多版本；传 on_chunk 时流式回调模型原始输出。"""
     topic = (topic or "").strip()
     if not topic:
         return {"success": False, "error": "请填写热点主题"}
@@ -179,6 +180,8 @@ def lab_compose(
             system_prompt=LAB_SYSTEM,
             temperature=0.8,
             max_tokens=2200,
+            cache=False,
+            on_chunk=on_chunk,
         )
         provider = str(result.get("provider") or "")
         if not result.get("success"):
@@ -339,6 +342,7 @@ def tweak_content(
             system_prompt="你是短贴润色编辑。按要求改写，只输出改写后的完整正文，不要解释。",
             temperature=0.7,
             max_tokens=1200,
+            cache=False,
         )
     except Exception as e:
         return {"success": False, "error": f"AI 调用失败: {e}"}
@@ -192,21 +192,21 @@ def run_xgrowth_viral_pipeline(
     """
     CDP：热榜 →（可选）打开原帖 → AI 拆解入库。
     """
-    from allnews_mornitor.cdp_browser import BackgroundTarget, _CdpClient, _browser_ws_url, _http_json
+    from allnews_mornitor.cdp_browser import BackgroundTarget, _http_json, get_client, get_debugger_url
 
     limit = max(1, min(int(limit or 8), 30))
     min_velocity = max(0, int(min_velocity or 0))
     started = datetime.now().isoformat(timespec="seconds")
 
+    host = get_debugger_url()
     try:
-        _http_json("/json/version")
+        _http_json("/json/version", host)
     except Exception as e:
         return {
             "success": False,
             "error": f"无法连接 Chrome CDP，请先用 --remote-debugging-port=9222 启动: {e}",
         }
 
-    client = None
     page = None
     ok = 0
     fail = 0
@@ -216,8 +216,7 @@ def run_xgrowth_viral_pipeline(
 
     try:
         _log(progress, "连接 CDP，打开 xgrowth 热榜…")
-        client = _CdpClient(_browser_ws_url())
-        page = BackgroundTarget.create(client, "about:blank")
+        page = BackgroundTarget.create(get_client(host), "about:blank")
         ranked = fetch_viral_list(page, include_potential=include_potential)
         if min_velocity:
             ranked = [x for x in ranked if int(x.get("velocity_per_hour") or 0) >= min_velocity]
@@ -312,16 +311,9 @@ def run_xgrowth_viral_pipeline(
             "started_at": started,
         }
     finally:
+        # 只关闭自己的后台标签，共享连接留给其他子系统
         if page is not None:
-            try:
-                page.detach()
-            except Exception:
-                pass
-        if client is not None:
-            try:
-                client.close()
-            except Exception:
-                pass
+            page.close()
 
     _log(progress, f"完成：成功 {ok}，失败 {fail}")
     return {
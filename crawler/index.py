@@ -4,7 +4,9 @@ import json
 import os
 import random
 import re
+import sys
 import time
+import threading
 import webbrowser
 import smtplib
 from email.mime.text import MIMEText
@@ -19,9 +21,6 @@ from urllib.parse import quote
 import pytz
 import requests
 import yaml
-from selenium import webdriver
-from selenium.common.exceptions import WebDriverException, StaleElementReferenceException
-from selenium.webdriver.common.by import By
 
 try:
     from utils.stdio_encoding import ensure_utf8_stdio, safe_print
@@ -32,11 +31,61 @@ except Exception:  # 直接脚本运行时的兜底
     def safe_print(*args, **kwargs):
         print(*args, **kwargs)
 
+try:
+    from utils.tracing import finish_round, span, start_round, traced
+except Exception:  # 直接脚本运行时的兜底：不记录耗时
+    from contextlib import nullcontext
+
+    def span(name, **attrs):
+        return nullcontext()
+
+    def traced(name, **attrs):
+        return lambda func: func
+
+    def start_round(round_id, **attrs):
+        return None
+
+    def finish_round(jsonl_path=None, prometheus_path=None):
+        return None
+
 ensure_utf8_stdio()
 
 VERSION = "3.5.0"
 
 
+# === selenium 按需导入 ===
+# 只有 x-cdp 抓取需要 selenium，普通平台的定时抓取不为它付出导入开销。
+# 导入前用占位异常类占住名字，保证各处 except 子句可以正常求值。
+webdriver = None
+By = None
+
+
+class WebDriverException(Exception):
+    """selenium 导入前的占位类型"""
+
+
+class StaleElementReferenceException(WebDriverException):
+    """selenium 导入前的占位类型"""
+
+
+def _load_selenium() -> None:
+    """首次使用 x-cdp 时导入 selenium，并替换模块级占位名"""
+    global webdriver, By, WebDriverException, StaleElementReferenceException
+    if webdriver is not None:
+        return
+    from selenium import webdriver as _webdriver
+    from selenium.common.exceptions import (
+        WebDriverException as _WebDriverException,
+        StaleElementReferenceException as _StaleElementReferenceException,
+    )
+    from selenium.webdriver.common.by import By as _By
+
+    WebDriverException = _WebDriverException
+    StaleElementReferenceException = _StaleElementReferenceException
+    By = _By
+    webdriver = _webdriver
+
+
 # === SMTP邮件配置 ===
 SMTP_CONFIGS = {
     # Gmail（使用 STARTTLS）
@@ -273,6 +322,33 @@ def load_config():
             "FREQUENCY_WEIGHT": config_data["weight"]["frequency_weight"],
             "HOTNESS_WEIGHT": config_data["weight"]["hotness_weight"],
         },
+        "TRACING": {
+            "ENABLED": os.environ.get("TRACING_ENABLED", "").strip().lower()
+            in ("true", "1")
+            if os.environ.get("TRACING_ENABLED", "").strip()
+            else bool(config_data.get("tracing", {}).get("enabled", True)),
+            "JSONL_FILE": os.environ.get("TRACING_JSONL_FILE", "").strip()
+            or str(config_data.get("tracing", {}).get("jsonl_file", "") or ""),
+            "PROMETHEUS_FILE": os.environ.get("TRACING_PROMETHEUS_FILE", "").strip()
+            or str(config_data.get("tracing", {}).get("prometheus_file", "") or ""),
+        },
+        "BURST": {
+            "ENABLED": os.environ.get("BURST_DETECTION_ENABLED", "").strip().lower()
+            in ("true", "1")
+            if os.environ.get("BURST_DETECTION_ENABLED", "").strip()
+            else bool(config_data.get("burst_detection", {}).get("enabled", True)),
+            "HALF_LIFE_HOURS": float(
+                config_data.get("burst_detection", {}).get("half_life_hours", 6)
+            ),
+            "Z_THRESHOLD": float(
+                config_data.get("burst_detection", {}).get("z_threshold", 3.0)
+            ),
+            "MIN_COUNT": int(config_data.get("burst_detection", {}).get("min_count", 3)),
+            "PUSH_ON_BURST": os.environ.get("BURST_PUSH_ENABLED", "").strip().lower()
+            in ("true", "1")
+            if os.environ.get("BURST_PUSH_ENABLED", "").strip()
+            else bool(config_data.get("burst_detection", {}).get("push_on_burst", False)),
+        },
         "PLATFORMS": config_data["platforms"],
         "X_CDP": {
             "ENABLED": bool(x_cdp_config.get("enabled", False)),
@@ -439,7 +515,9 @@ def load_config():
 
 
 print("正在加载配置...")
+_config_load_started = time.perf_counter()
 CONFIG = load_config()
+CONFIG_LOAD_SECONDS = time.perf_counter() - _config_load_started
 print(f"TrendRadar v{VERSION} 配置加载完成")
 print(f"监控平台数量: {len(CONFIG['PLATFORMS'])}")
 
@@ -475,10 +553,10 @@ def ensure_directory_exists(directory: str):
     Path(directory).mkdir(parents=True, exist_ok=True)
 
 
-def get_output_path(subfolder: str, filename: str) -> str:
-    """获取输出路径"""
+def get_output_path(subfolder: str, filename: str, output_dir: Optional[str] = None) -> str:
+    """获取输出路径（output_dir 为输出根目录，默认相对当前目录的 output）"""
     date_folder = format_date_folder()
-    output_dir = Path("output") / date_folder / subfolder
+    output_dir = Path(output_dir or "output") / date_folder / subfolder
     ensure_directory_exists(str(output_dir))
     return str(output_dir / filename)
 
@@ -660,8 +738,11 @@ class PushRecordManager:
 class DataFetcher:
     """数据获取器"""
 
-    def __init__(self, proxy_url: Optional[str] = None):
+    def __init__(self, proxy_url: Optional[str] = None, pool_size: int = 8):
         self.proxy_url = proxy_url
+        self.pool_size = pool_size
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
         self._x_driver = None
         self._fetched_identity_cache: Dict[str, Set[str]] = {}
         # 静默抓取专用标签：全程复用，避免反复新建/切换导致置顶
@@ -671,11 +752,27 @@ class DataFetcher:
         self._x_user_hwnd: int = 0
         self._x_fg_guard = None
 
+    def _get_session(self) -> requests.Session:
+        """复用 keep-alive 连接池的会话（并发抓取时共享）"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = requests.adapters.HTTPAdapter(
+                        pool_connections=self.pool_size,
+                        pool_maxsize=self.pool_size,
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+
     def _get_x_driver(self):
         """连接已启动的 Chrome CDP 调试端口。"""
         if self._x_driver is not None:
             return self._x_driver
 
+        _load_selenium()
         x_cfg = CONFIG.get("X_CDP", {})
         debugger_url = x_cfg.get("DEBUGGER_URL", "127.0.0.1:9222")
         options = webdriver.ChromeOptions()
@@ -1508,7 +1605,7 @@ class DataFetcher:
         retries = 0
         while retries <= max_retries:
             try:
-                response = requests.get(
+                response = self._get_session().get(
                     url, proxies=proxies, headers=headers, timeout=10
                 )
                 response.raise_for_status()
@@ -1537,6 +1634,71 @@ class DataFetcher:
                     return None, id_value, alias
         return None, id_value, alias
 
+    def fetch_platform(
+        self, id_info: Union[str, Tuple[str, str]]
+    ) -> Tuple[Optional[Dict], str]:
+        """
+        抓取并解析单个平台
+
+        Returns:
+            (titles, name)：titles 为 {title: {ranks, url, mobileUrl, ...}}，失败时为 None
+        """
+        if isinstance(id_info, tuple):
+            id_value, name = id_info
+        else:
+            id_value = id_info
+            name = id_value
+
+        if id_value == "x-cdp":
+            try:
+                x_data, x_name = self.fetch_x_cdp_data()
+                return x_data, x_name
+            except (ValueError, WebDriverException, Exception) as e:
+                print(f"抓取 {id_value} 失败: {e}")
+                return None, name
+
+        response, _, _ = self.fetch_data(id_info)
+        if not response:
+            return None, name
+
+        try:
+            data = json.loads(response)
+            titles: Dict = {}
+            seen_cache = self._fetched_identity_cache.get(str(id_value), set())
+            skipped_cached = 0
+            for index, item in enumerate(data.get("items", []), 1):
+                title = item.get("title")
+                # 跳过无效标题（None、float、空字符串）
+                if title is None or isinstance(title, float) or not str(title).strip():
+                    continue
+                title = str(title).strip()
+                url = item.get("url", "")
+                mobile_url = item.get("mobileUrl", "")
+                identity_keys = _build_item_identity_keys(item)
+                if seen_cache and identity_keys and identity_keys.intersection(seen_cache):
+                    skipped_cached += 1
+                    continue
+
+                if title in titles:
+                    titles[title]["ranks"].append(index)
+                    _merge_item_metadata_into_entry(titles[title], item)
+                else:
+                    entry = {
+                        "ranks": [index],
+                        "url": url,
+                        "mobileUrl": mobile_url,
+                    }
+                    _merge_item_metadata_into_entry(entry, item)
+                    titles[title] = entry
+            if skipped_cached:
+                print(f"{id_value} 命中历史缓存，跳过 {skipped_cached} 条已抓取文章")
+            return titles, name
+        except json.JSONDecodeError:
+            print(f"解析 {id_value} 响应失败")
+        except Exception as e:
+            print(f"处理 {id_value} 数据出错: {e}")
+        return None, name
+
     def crawl_websites(
         self,
         ids_list: List[Union[str, Tuple[str, str]]],
@@ -1556,64 +1718,15 @@ class DataFetcher:
                 name = id_value
 
             id_to_name[id_value] = name
-            if id_value == "x-cdp":
-                try:
-                    x_data, x_name = self.fetch_x_cdp_data()
-                    id_to_name[id_value] = x_name
-                    results[id_value] = x_data
-                except (ValueError, WebDriverException, Exception) as e:
-                    print(f"抓取 {id_value} 失败: {e}")
-                    failed_ids.append(id_value)
-                if i < len(ids_list) - 1:
-                    actual_interval = request_interval + random.randint(-10, 20)
-                    actual_interval = max(50, actual_interval)
-                    time.sleep(actual_interval / 1000)
-                continue
-
-            response, _, _ = self.fetch_data(id_info)
-
-            if response:
-                try:
-                    data = json.loads(response)
-                    results[id_value] = {}
-                    seen_cache = self._fetched_identity_cache.get(str(id_value), set())
-                    skipped_cached = 0
-                    for index, item in enumerate(data.get("items", []), 1):
-                        title = item.get("title")
-                        # 跳过无效标题（None、float、空字符串）
-                        if title is None or isinstance(title, float) or not str(title).strip():
-                            continue
-                        title = str(title).strip()
-                        url = item.get("url", "")
-                        mobile_url = item.get("mobileUrl", "")
-                        identity_keys = _build_item_identity_keys(item)
-                        if seen_cache and identity_keys and identity_keys.intersection(seen_cache):
-                            skipped_cached += 1
-                            continue
-
-                        if title in results[id_value]:
-                            results[id_value][title]["ranks"].append(index)
-                            _merge_item_metadata_into_entry(
-                                results[id_value][title], item
-                            )
-                        else:
-                            entry = {
-                                "ranks": [index],
-                                "url": url,
-                                "mobileUrl": mobile_url,
-                            }
-                            _merge_item_metadata_into_entry(entry, item)
-                            results[id_value][title] = entry
-                    if skipped_cached:
-                        print(f"{id_value} 命中历史缓存，跳过 {skipped_cached} 条已抓取文章")
-                except json.JSONDecodeError:
-                    print(f"解析 {id_value} 响应失败")
-                    failed_ids.append(id_value)
-                except Exception as e:
-                    print(f"处理 {id_value} 数据出错: {e}")
-                    failed_ids.append(id_value)
-            else:
+            with span("fetch", platform=id_value) as trace_record:
+                titles, platform_name = self.fetch_platform(id_info)
+            id_to_name[id_value] = platform_name
+            if titles is None:
+                if trace_record is not None:
+                    trace_record["error"] = "fetch failed"
                 failed_ids.append(id_value)
+            else:
+                results[id_value] = titles
 
             if i < len(ids_list) - 1:
                 actual_interval = request_interval + random.randint(-10, 20)
@@ -2029,12 +2142,16 @@ def _build_post_state_entry(
 
 
 # === 数据处理 ===
-def save_titles_to_file(results: Dict, id_to_name: Dict, failed_ids: List) -> str:
+@traced("save")
+def save_titles_to_file(
+    results: Dict, id_to_name: Dict, failed_ids: List, output_dir: Optional[str] = None
+) -> str:
     """保存标题到文件，并同步写入 trendradar_posts_state.json 至 output 根目录与当日 output/日期/txt/。"""
-    file_path = get_output_path("txt", f"{format_time_filename()}.txt")
-    state_path = get_output_path("txt", "trendradar_posts_state.json")
-    ensure_directory_exists("output")
-    state_path_root = str(Path("output") / "trendradar_posts_state.json")
+    output_root = output_dir or "output"
+    file_path = get_output_path("txt", f"{format_time_filename()}.txt", output_root)
+    state_path = get_output_path("txt", "trendradar_posts_state.json", output_root)
+    ensure_directory_exists(output_root)
+    state_path_root = str(Path(output_root) / "trendradar_posts_state.json")
     posts_by_platform: Dict[str, Dict] = {}
     fetched_at = get_beijing_time().strftime("%Y-%m-%d %H:%M:%S 北京时间")
 
@@ -2400,6 +2517,7 @@ def process_source_data(
                     title_info[source_id][title]["mobileUrl"] = mobile_url
 
 
+@traced("detect_new")
 def detect_latest_new_titles(current_platform_ids: Optional[List[str]] = None) -> Dict:
     """检测当日最新批次的新增标题，支持按当前监控平台过滤"""
     date_folder = format_date_folder()
@@ -2600,6 +2718,7 @@ def format_rank_display(ranks: List[int], rank_threshold: int, format_type: str)
             return f"[{min_rank} - {max_rank}]"
 
 
+@traced("count")
 def count_word_frequency(
     results: Dict,
     word_groups: List[Dict],
@@ -3220,6 +3339,7 @@ def format_title_for_platform(
         return cleaned_title
 
 
+@traced("render_html")
 def generate_html_report(
     stats: List[Dict],
     total_titles: int,
@@ -3229,6 +3349,7 @@ def generate_html_report(
     mode: str = "daily",
     is_daily_summary: bool = False,
     update_info: Optional[Dict] = None,
+    output_dir: Optional[str] = None,
 ) -> str:
     """生成HTML报告"""
     if is_daily_summary:
@@ -3241,7 +3362,7 @@ def generate_html_report(
     else:
         filename = f"{format_time_filename()}.html"
 
-    file_path = get_output_path("html", filename)
+    file_path = get_output_path("html", filename, output_dir)
 
     report_data = prepare_report_data(stats, failed_ids, new_titles, id_to_name, mode)
 
@@ -3267,6 +3388,57 @@ def generate_html_report(
     return file_path
 
 
+def prepare_current_title_info(results: Dict, time_info: str) -> Dict:
+    """从当前抓取结果构建标题信息"""
+    title_info = {}
+    for source_id, titles_data in results.items():
+        title_info[source_id] = {}
+        for title, title_data in titles_data.items():
+            ranks = title_data.get("ranks", [])
+            url = title_data.get("url", "")
+            mobile_url = title_data.get("mobileUrl", "")
+
+            title_info[source_id][title] = {
+                "first_time": time_info,
+                "last_time": time_info,
+                "count": 1,
+                "ranks": ranks,
+                "url": url,
+                "mobileUrl": mobile_url,
+            }
+    return title_info
+
+
+def generate_round_report(
+    results: Dict,
+    id_to_name: Dict,
+    failed_ids: Optional[List] = None,
+    output_dir: Optional[str] = None,
+    frequency_file: Optional[str] = None,
+) -> str:
+    """按当前榜单模式为单轮抓取结果生成 HTML 报告（供 MCP 手动抓取复用）"""
+    word_groups, filter_words, global_filters = load_frequency_words(frequency_file)
+    title_info = prepare_current_title_info(results, format_time_filename())
+    stats, total_titles = count_word_frequency(
+        results,
+        word_groups,
+        filter_words,
+        id_to_name,
+        title_info,
+        CONFIG["RANK_THRESHOLD"],
+        mode="current",
+        global_filters=global_filters,
+    )
+    return generate_html_report(
+        stats,
+        total_titles,
+        failed_ids=failed_ids,
+        id_to_name=id_to_name,
+        mode="current",
+        output_dir=output_dir,
+    )
+
+
 def render_html_content(
     report_data: Dict,
     total_titles: int,
@@ -5313,6 +5485,7 @@ def send_to_notifications(
     return results
 
 
+@traced("notify", channel="feishu")
 def send_to_feishu(
     webhook_url: str,
     report_data: Dict,
@@ -5401,6 +5574,7 @@ def send_to_feishu(
     return True
 
 
+@traced("notify", channel="dingtalk")
 def send_to_dingtalk(
     webhook_url: str,
     report_data: Dict,
@@ -5524,6 +5698,7 @@ def strip_markdown(text: str) -> str:
     return text.strip()
 
 
+@traced("notify", channel="wework")
 def send_to_wework(
     webhook_url: str,
     report_data: Dict,
@@ -5612,6 +5787,7 @@ def send_to_wework(
     return True
 
 
+@traced("notify", channel="telegram")
 def send_to_telegram(
     bot_token: str,
     chat_id: str,
@@ -5688,6 +5864,7 @@ def send_to_telegram(
     return True
 
 
+@traced("notify", channel="email")
 def send_to_email(
     from_email: str,
     password: str,
@@ -5828,6 +6005,7 @@ TrendRadar 热点分析报告
         return False
 
 
+@traced("notify", channel="ntfy")
 def send_to_ntfy(
     server_url: str,
     topic: str,
@@ -5985,6 +6163,7 @@ def send_to_ntfy(
         return False
 
 
+@traced("notify", channel="bark")
 def send_to_bark(
     bark_url: str,
     report_data: Dict,
@@ -6130,6 +6309,7 @@ def convert_markdown_to_mrkdwn(content: str) -> str:
     return content
 
 
+@traced("notify", channel="slack")
 def send_to_slack(
     webhook_url: str,
     report_data: Dict,
@@ -6332,6 +6512,7 @@ class NewsAnalyzer:
             )
             return has_matched_news or has_new_news
 
+    @traced("load_history")
     def _load_analysis_data(
         self,
     ) -> Optional[Tuple[Dict, Dict, Dict, Dict, List, List]]:
@@ -6373,23 +6554,7 @@ class NewsAnalyzer:
 
     def _prepare_current_title_info(self, results: Dict, time_info: str) -> Dict:
         """从当前抓取结果构建标题信息"""
-        title_info = {}
-        for source_id, titles_data in results.items():
-            title_info[source_id] = {}
-            for title, title_data in titles_data.items():
-                ranks = title_data.get("ranks", [])
-                url = title_data.get("url", "")
-                mobile_url = title_data.get("mobileUrl", "")
-
-                title_info[source_id][title] = {
-                    "first_time": time_info,
-                    "last_time": time_info,
-                    "count": 1,
-                    "ranks": ranks,
-                    "url": url,
-                    "mobileUrl": mobile_url,
-                }
-        return title_info
+        return prepare_current_title_info(results, time_info)
 
     def _run_analysis_pipeline(
         self,
@@ -6603,6 +6768,91 @@ class NewsAnalyzer:
 
         return results, id_to_name, failed_ids
 
+    def _update_day_summary(self) -> None:
+        """物化当天摘要 output/<日期>/summary.json，供 MCP 汇总报告直接读取（失败不影响主流程）"""
+        try:
+            from mcp_server.services.summary_store import write_day_summary
+
+            write_day_summary(str(Path(__file__).parent.parent), get_beijing_time())
+        except Exception as e:
+            print(f"每日摘要更新失败: {e}")
+
+    def _update_burst_detector(self, results: Dict, id_to_name: Dict) -> None:
+        """把本轮结果喂给爆发检测器，新爆发按配置推送（失败不影响主流程）"""
+        burst_config = CONFIG["BURST"]
+        if not burst_config["ENABLED"] or not results:
+            return
+
+        try:
+            from mcp_server.services.burst_detector import feed_round
+
+            started = feed_round(
+                results,
+                project_root=str(Path(__file__).parent.parent),
+                half_life_hours=burst_config["HALF_LIFE_HOURS"],
+                z_threshold=burst_config["Z_THRESHOLD"],
+                min_count=burst_config["MIN_COUNT"],
+            )
+        except Exception as e:
+            print(f"爆发检测更新失败: {e}")
+            return
+
+        if not started:
+            return
+
+        print(f"检测到 {len(started)} 个爆发话题: {[item['keyword'] for item in started]}")
+
+        if not (
+            burst_config["PUSH_ON_BURST"]
+            and CONFIG["ENABLE_NOTIFICATION"]
+            and self._has_notification_configured()
+        ):
+            return
+
+        # 爆发话题转换为频率词统计格式，复用现有推送渠道
+        now_str = get_beijing_time().strftime("%H:%M")
+        stats = []
+        for item in started:
+            titles = []
+            for title in item["sample_titles"]:
+                for source_id, source_titles in results.items():
+                    info = source_titles.get(title)
+                    if info is None:
+                        continue
+                    titles.append({
+                        "title": title,
+                        "source_name": id_to_name.get(source_id, source_id),
+                        "time_display": now_str,
+                        "count": 1,
+                        "ranks": info.get("ranks", []),
+                        "rank_threshold": self.rank_threshold,
+                        "url": info.get("url", ""),
+                        "mobileUrl": info.get("mobileUrl", ""),
+                        "is_new": True,
+                    })
+                    break
+            stats.append({
+                "word": f"{item['keyword']} (z={item['z_score']})",
+                "count": item["current_count"],
+                "position": len(stats),
+                "titles": titles,
+                "percentage": 0,
+            })
+
+        try:
+            send_to_notifications(
+                stats,
+                [],
+                "爆发预警",
+                None,
+                id_to_name,
+                self.update_info,
+                self.proxy_url,
+                mode="incremental",
+            )
+        except Exception as e:
+            print(f"爆发预警推送失败: {e}")
+
     def _execute_mode_strategy(
         self, mode_strategy: Dict, results: Dict, id_to_name: Dict, failed_ids: List
     ) -> Optional[str]:
@@ -6720,22 +6970,62 @@ class NewsAnalyzer:
 
     def run(self) -> None:
         """执行分析流程"""
+        tracing = CONFIG["TRACING"]["ENABLED"]
+        if tracing:
+            start_round(
+                get_beijing_time().strftime("%Y-%m-%d %H:%M:%S"),
+                mode=self.report_mode,
+            )
+
         try:
-            self._initialize_and_check_config()
+            with span("initialize"):
+                self._initialize_and_check_config()
 
             mode_strategy = self._get_mode_strategy()
 
-            results, id_to_name, failed_ids = self._crawl_data()
+            with span("crawl"):
+                results, id_to_name, failed_ids = self._crawl_data()
+
+            with span("burst_detect"):
+                self._update_burst_detector(results, id_to_name)
+
+            with span("day_summary"):
+                self._update_day_summary()
 
-            self._execute_mode_strategy(mode_strategy, results, id_to_name, failed_ids)
+            with span("report"):
+                self._execute_mode_strategy(mode_strategy, results, id_to_name, failed_ids)
 
         except Exception as e:
             print(f"分析流程执行出错: {e}")
             raise
+        finally:
+            if tracing:
+                self._write_round_trace()
+
+    def _write_round_trace(self) -> None:
+        """写出本轮各阶段耗时（JSONL 追加 + 可选 Prometheus 文本文件）"""
+        trace_config = CONFIG["TRACING"]
+        jsonl_file = trace_config["JSONL_FILE"] or str(
+            Path("output") / format_date_folder() / "trace.jsonl"
+        )
+        record = finish_round(jsonl_file, trace_config["PROMETHEUS_FILE"] or None)
+        if not record:
+            return
+
+        fetch_spans = [item for item in record["spans"] if item["name"] == "fetch"]
+        slowest = max(fetch_spans, key=lambda item: item["ms"]) if fetch_spans else None
+        message = f"本轮耗时 {record['total_ms'] / 1000:.2f} 秒"
+        if slowest:
+            message += f"，最慢平台 {slowest['attrs']['platform']} {slowest['ms'] / 1000:.2f} 秒"
+        print(f"{message}（记录: {jsonl_file}）")
 
 
 def main():
     ensure_utf8_stdio()
+    if "--profile-startup" in sys.argv:
+        from mcp_server.utils.startup_profile import run_profile_cli
+
+        sys.exit(run_profile_cli("crawler.index", str(Path(__file__).parent.parent)))
     try:
         analyzer = NewsAnalyzer()
         analyzer.run()
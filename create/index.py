@@ -57,7 +57,8 @@ def generate_content(hot_data: dict, platform: str = "通用", content_type: str
         prompt=user_input,
         system_prompt=system_prompt,
         temperature=0.7,
-        max_tokens=2000
+        max_tokens=2000,
+        cache=False
     )
     
     return result
@@ -69,7 +70,8 @@ def generate_article_by_topic(
     platform: str = "通用",
     content_type: str = "技术文章",
     word_count: int = 2000,
-    style: str = "专业"
+    style: str = "专业",
+    on_chunk=None
 ) -> dict:
     """
     根据主题直接生成文章
@@ -81,6 +83,7 @@ def generate_article_by_topic(
         content_type: 内容类型（技术文章、博客文章、教程等）
         word_count: 目标字数
         style: 文章风格（专业、通俗、学术等）
+        on_chunk: 流式回调（可选），每收到一段生成文本调用一次
         
     Returns:
         包含生成内容的字典
@@ -230,7 +233,9 @@ def generate_article_by_topic(
         prompt=user_input,
         system_prompt=system_prompt,
         temperature=0.7,
-        max_tokens=max_tokens
+        max_tokens=max_tokens,
+        on_chunk=on_chunk,
+        cache=False
     )
     
     return result
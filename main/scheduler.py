@@ -16,10 +16,8 @@ from datetime import datetime
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from crawler.index import main as crawler_main
-from create.index import generate_article_by_topic
-from public.index import publish_content
-from comment.index import main as comment_main, generate_comment
+# 爬虫、创作、发布、评论模块依赖较重（selenium、配置加载等），在各步骤中按需导入，
+# 只运行其中一个模式时不必为其他模块付出启动开销
 
 
 class WorkflowScheduler:
@@ -45,6 +43,7 @@ class WorkflowScheduler:
         """
         self.log("开始执行爬虫模块...")
         try:
+            from crawler.index import main as crawler_main
             crawler_main()
             self.log("爬虫模块执行完成", "SUCCESS")
             return {'success': True, 'message': '爬虫执行成功'}
@@ -102,6 +101,7 @@ class WorkflowScheduler:
                 self.log("未提供发布内容，跳过发布模块", "WARNING")
                 return {'success': False, 'error': '未提供发布内容'}
             
+            from public.index import publish_content
             result = publish_content(
                 content=content,
                 platform=content.get('platform', '通用')
@@ -133,6 +133,7 @@ class WorkflowScheduler:
                 self.log("未提供文章信息，跳过评论模块", "WARNING")
                 return {'success': False, 'error': '未提供文章信息'}
             
+            from comment.index import generate_comment
             result = generate_comment(
                 article=article,
                 platform=article.get('platform', '通用'),
@@ -436,6 +437,7 @@ class WorkflowScheduler:
         else:
             # 2. 创建文章
             self.log(f"开始创建文章: {title}", "INFO")
+            from create.index import generate_article_by_topic
             create_result = generate_article_by_topic(
                 topic=title,
                 requirements=desc,
@@ -499,6 +501,7 @@ class WorkflowScheduler:
                 except Exception as e:
                     self.log(f"从文件读取内容失败，使用已有内容: {e}", "WARNING")
             
+            from public.index import publish_content
             publish_result = publish_content(
                 content={
                     'title': title,
@@ -600,9 +603,14 @@ def main():
     parser.add_argument('--platform', type=str, default='技术博客', help='目标平台')
     parser.add_argument('--keyword', type=str, help='评论关键词（用于crawler-comment模式）')
     parser.add_argument('--comment-limit', type=int, default=3, help='评论文章数量限制')
+    parser.add_argument('--profile-startup', action='store_true', help='分析各模块导入耗时后退出')
     
     args = parser.parse_args()
     
+    if args.profile_startup:
+        from mcp_server.utils.startup_profile import run_profile_cli
+        sys.exit(run_profile_cli('main.scheduler', str(project_root)))
+    
     scheduler = WorkflowScheduler()
     
     print("=" * 60)
@@ -5,16 +5,20 @@ TrendRadar MCP Server - FastMCP 2.0 实现
 支持 stdio 和 HTTP 两种传输模式。
 """
 
+import asyncio
 import json
 from typing import List, Optional, Dict
 
 from fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import JSONResponse
 
 from .tools.data_query import DataQueryTools
 from .tools.analytics import AnalyticsTools
 from .tools.search_tools import SearchTools
 from .tools.config_mgmt import ConfigManagementTools
 from .tools.system import SystemManagementTools
+from .services.warmup import get_warmup_state, preload_enabled, start_warmup
 from .utils.date_parser import DateParser
 from .utils.errors import MCPError
 
@@ -37,6 +41,13 @@ def _get_tools(project_root: Optional[str] = None):
     return _tools_instances
 
 
+@mcp.custom_route("/ready", methods=["GET"])
+async def readiness(request: Request) -> JSONResponse:
+    """就绪检查（HTTP 模式）：启动预热完成前返回 503"""
+    state = get_warmup_state().to_dict()
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
+
+
 # ==================== 日期解析工具（优先调用）====================
 
 @mcp.tool
@@ -178,7 +189,8 @@ async def get_news_by_date(
     date_query: Optional[str] = None,
     platforms: Optional[List[str]] = None,
     limit: int = 50,
-    include_url: bool = False
+    include_url: bool = False,
+    cursor: Optional[str] = None
 ) -> str:
     """
     获取指定日期的新闻数据，用于历史数据分析和对比
@@ -195,9 +207,10 @@ async def get_news_by_date(
         limit: 返回条数限制，默认50，最大1000
                注意：实际返回数量可能少于请求值，取决于指定日期的新闻总数
         include_url: 是否包含URL链接，默认False（节省token）
+        cursor: 分页游标（可选），传入上一页返回的 next_cursor 获取下一页，其他参数需保持不变
 
     Returns:
-        JSON格式的新闻列表，包含标题、平台、排名等信息
+        JSON格式的新闻列表，包含标题、平台、排名等信息；还有更多数据时包含 next_cursor
 
     **重要：数据展示建议**
     本工具会返回完整的新闻列表（通常50条）给你。但请注意：
@@ -216,7 +229,8 @@ async def get_news_by_date(
         date_query=date_query,
         platforms=platforms,
         limit=limit,
-        include_url=include_url
+        include_url=include_url,
+        cursor=cursor
     )
     return json.dumps(result, ensure_ascii=False, indent=2)
 
@@ -254,9 +268,9 @@ async def analyze_topic_trend(
                     - **格式**: {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}
                     - **获取方式**: 调用 resolve_date_range 工具解析自然语言日期
                     - **默认**: 不指定时默认分析最近7天
-        granularity: 时间粒度（trend模式），默认"day"（仅支持 day，因为底层数据按天聚合）
+        granularity: 时间粒度（trend模式），默认"day"，可选"hour"（按爬取轮次时间逐小时统计）
         threshold: 热度突增倍数阈值（viral模式），默认3.0
-        time_window: 检测时间窗口小时数（viral模式），默认24
+        time_window: 检测时间窗口小时数（viral模式），默认24，与之前同样长度的窗口对比
         lookahead_hours: 预测未来小时数（predict模式），默认6
         confidence_threshold: 置信度阈值（predict模式），默认0.7
 
@@ -338,7 +352,8 @@ async def analyze_sentiment(
     date_range: Optional[Dict[str, str]] = None,
     limit: int = 50,
     sort_by_weight: bool = True,
-    include_url: bool = False
+    include_url: bool = False,
+    max_prompt_tokens: int = 6000
 ) -> str:
     """
     分析新闻的情感倾向和热度趋势
@@ -363,6 +378,8 @@ async def analyze_sentiment(
                因此实际返回数量可能少于请求的 limit 值
         sort_by_weight: 是否按热度权重排序，默认True
         include_url: 是否包含URL链接，默认False（节省token）
+        max_prompt_tokens: 生成提示词的 token 预算，默认6000（最小1000）
+                           近似重复的标题只保留一条，超出预算的新闻不会放入提示词
 
     Returns:
         JSON格式的分析结果，包含情感分布、热度趋势和相关新闻
@@ -390,7 +407,8 @@ async def analyze_sentiment(
         date_range=date_range,
         limit=limit,
         sort_by_weight=sort_by_weight,
-        include_url=include_url
+        include_url=include_url,
+        max_prompt_tokens=max_prompt_tokens
     )
     return json.dumps(result, ensure_ascii=False, indent=2)
 
@@ -457,6 +475,28 @@ async def generate_summary_report(
     return json.dumps(result, ensure_ascii=False, indent=2)
 
 
+@mcp.tool
+async def get_burst_topics(
+    limit: int = 20
+) -> str:
+    """
+    当前爆发话题 - 读取爬虫每轮增量更新的流式爆发检测结果
+
+    基线按半衰期指数衰减，某关键词本轮在榜次数显著高于基线（z-score 超过阈值）时
+    进入爆发状态，回落后自动退出。查询不扫描历史文件，响应很快。
+
+    Args:
+        limit: 返回数量，默认20，最大100
+
+    Returns:
+        JSON格式的爆发列表，每项包含 keyword、z_score、peak_z_score、
+        current_count、baseline、burst_since、sample_titles
+    """
+    tools = _get_tools()
+    result = tools['analytics'].get_burst_topics(limit=limit)
+    return json.dumps(result, ensure_ascii=False, indent=2)
+
+
 # ==================== 智能检索工具 ====================
 
 @mcp.tool
@@ -468,7 +508,8 @@ async def search_news(
     limit: int = 50,
     sort_by: str = "relevance",
     threshold: float = 0.6,
-    include_url: bool = False
+    include_url: bool = False,
+    cursor: Optional[str] = None
 ) -> str:
     """
     统一搜索接口，支持多种搜索模式
@@ -501,9 +542,10 @@ async def search_news(
         threshold: 相似度阈值（仅fuzzy模式有效），0-1之间，默认0.6
                    注意：阈值越高匹配越严格，返回结果越少
         include_url: 是否包含URL链接，默认False（节省token）
+        cursor: 分页游标（可选），传入上一页返回的 next_cursor 获取下一页，其他参数需保持不变
 
     Returns:
-        JSON格式的搜索结果，包含标题、平台、排名等信息
+        JSON格式的搜索结果，包含标题、平台、排名等信息；还有更多结果时包含 next_cursor
 
     Examples:
         用户："搜索本周的AI新闻"
@@ -533,7 +575,8 @@ async def search_news(
         limit=limit,
         sort_by=sort_by,
         threshold=threshold,
-        include_url=include_url
+        include_url=include_url,
+        cursor=cursor
     )
     return json.dumps(result, ensure_ascii=False, indent=2)
 
@@ -629,23 +672,22 @@ async def trigger_crawl(
     include_url: bool = False
 ) -> str:
     """
-    手动触发一次爬取任务（可选持久化）
+    手动触发一次爬取任务（可选持久化），任务在后台运行并立即返回任务ID
 
     Args:
         platforms: 指定平台ID列表，如 ['zhihu', 'weibo', 'douyin']
                    - 不指定时：使用 config.yaml 中配置的所有平台
                    - 支持的平台来自 config/config.yaml 的 platforms 配置
                    - 每个平台都有对应的name字段（如"知乎"、"微博"），方便AI识别
-                   - 注意：失败的平台会在返回结果的 failed_platforms 字段中列出
+                   - 注意：失败的平台会在任务结果的 failed_platforms 字段中列出
         save_to_local: 是否保存到本地 output 目录，默认 False
         include_url: 是否包含URL链接，默认False（节省token）
 
     Returns:
-        JSON格式的任务状态信息，包含：
-        - platforms: 成功爬取的平台列表
-        - failed_platforms: 失败的平台列表（如有）
-        - total_news: 爬取的新闻总数
-        - data: 新闻数据
+        JSON格式的任务信息，包含：
+        - task_id: 任务ID，用于 get_crawl_job 查询进度和结果
+        - status: 任务状态（queued）
+        - platforms: 本次爬取的平台列表
 
     Examples:
         - 临时爬取: trigger_crawl(platforms=['zhihu'])
@@ -657,13 +699,54 @@ async def trigger_crawl(
     return json.dumps(result, ensure_ascii=False, indent=2)
 
 
+@mcp.tool
+async def get_crawl_job(
+    task_id: str,
+    since: int = 0,
+    wait_seconds: float = 0,
+    include_data: bool = False
+) -> str:
+    """
+    查询 trigger_crawl 任务的逐平台进度和结果
+
+    Args:
+        task_id: trigger_crawl 返回的任务ID
+        since: 只返回序号大于 since 的进度事件，传入上次返回的 next_since 即可增量读取
+        wait_seconds: 没有新进度时最多等待的秒数（长轮询，上限60秒），默认0立即返回
+        include_data: 任务完成后是否返回新闻数据，默认False
+
+    Returns:
+        JSON格式的任务状态，包含：
+        - status: queued / running / completed / failed
+        - progress: 每个平台的状态（pending/running/success/failed）与新闻数量
+        - events: 新的进度事件列表
+        - next_since: 下次查询时传入的 since
+        - 完成后包含 platforms、failed_platforms、total_news，include_data=True 时包含 data
+
+    Examples:
+        - 等待进度: get_crawl_job(task_id='crawl_...', since=0, wait_seconds=10)
+        - 获取结果: get_crawl_job(task_id='crawl_...', include_data=True)
+    """
+    tools = _get_tools()
+    # 长轮询在线程中等待，避免阻塞事件循环
+    result = await asyncio.to_thread(
+        tools['system'].get_crawl_job,
+        task_id=task_id,
+        since=since,
+        wait_seconds=wait_seconds,
+        include_data=include_data
+    )
+    return json.dumps(result, ensure_ascii=False, indent=2)
+
+
 # ==================== 启动入口 ====================
 
 def run_server(
     project_root: Optional[str] = None,
     transport: str = 'stdio',
     host: str = '0.0.0.0',
-    port: int = 3333
+    port: int = 3333,
+    preload: Optional[bool] = None
 ):
     """
     启动 MCP 服务器
@@ -673,9 +756,18 @@ def run_server(
         transport: 传输模式，'stdio' 或 'http'
         host: HTTP模式的监听地址，默认 0.0.0.0
         port: HTTP模式的监听端口，默认 3333
+        preload: 是否在后台预热当天数据缓存与索引，默认读取环境变量 MCP_PRELOAD（默认启用）
     """
     # 初始化工具实例
-    _get_tools(project_root)
+    tools = _get_tools(project_root)
+
+    # 后台预热，服务器无需等待即可接收请求
+    if preload is None:
+        preload = preload_enabled()
+    if preload:
+        start_warmup(tools)
+    else:
+        get_warmup_state().skip()
 
     # 打印启动信息
     print()
@@ -690,12 +782,15 @@ def run_server(
     elif transport == 'http':
         print(f"  协议: MCP over HTTP (生产环境)")
         print(f"  服务器监听: {host}:{port}")
+        print(f"  就绪检查: http://{host}:{port}/ready")
 
     if project_root:
         print(f"  项目目录: {project_root}")
     else:
         print("  项目目录: 当前目录")
 
+    print(f"  启动预热: {'后台进行中' if preload else '已关闭'}")
+
     print()
     print("  已注册的工具:")
     print("    === 日期解析工具（推荐优先调用）===")
@@ -716,11 +811,13 @@ def run_server(
     print("    8. analyze_sentiment        - 情感倾向分析")
     print("    9. find_similar_news        - 相似新闻查找")
     print("    10. generate_summary_report - 每日/每周摘要生成")
+    print("    11. get_burst_topics        - 当前爆发话题（流式检测）")
     print()
     print("    === 配置与系统管理 ===")
-    print("    11. get_current_config      - 获取当前系统配置")
-    print("    12. get_system_status       - 获取系统运行状态")
-    print("    13. trigger_crawl           - 手动触发爬取任务")
+    print("    12. get_current_config      - 获取当前系统配置")
+    print("    13. get_system_status       - 获取系统运行状态")
+    print("    14. trigger_crawl           - 手动触发爬取任务（后台运行）")
+    print("    15. get_crawl_job           - 查询爬取任务进度与结果")
     print("=" * 60)
     print()
 
@@ -770,12 +867,29 @@ if __name__ == '__main__':
         '--project-root',
         help='项目根目录路径'
     )
+    parser.add_argument(
+        '--no-preload',
+        action='store_true',
+        help='关闭启动预热（默认在后台预热当天数据缓存与索引）'
+    )
+    parser.add_argument(
+        '--profile-startup',
+        action='store_true',
+        help='分析各模块导入耗时后退出'
+    )
 
     args = parser.parse_args()
 
+    if args.profile_startup:
+        import sys
+        from .utils.startup_profile import run_profile_cli
+
+        sys.exit(run_profile_cli('mcp_server.server', args.project_root))
+
     run_server(
         project_root=args.project_root,
         transport=args.transport,
         host=args.host,
-        port=args.port
+        port=args.port,
+        preload=False if args.no_preload else None
     )
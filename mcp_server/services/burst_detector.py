@@ -0,0 +1,409 @@
+"""
+流式爆发检测服务
+
+每轮爬取结束后喂入一次该轮的在榜标题，对每个关键词维护按时间指数衰减的
+均值/方差与衰减计数，用 z-score 判断该轮计数是否显著高于历史基线。
+爆发状态带滞回（进入阈值 z_threshold，退出阈值 z_threshold * exit_ratio），
+状态保存在一个小 JSON 文件中，MCP 与控制台可以直接读取当前爆发列表。
+
+crawler、mcp_server 与 console 共用此模块。
+"""
+
+import json
+import math
+import os
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Dict, List, Optional
+
+from ..utils.segmenter import DEFAULT_LEARNED_FILE, get_segmenter
+
+
+STATE_VERSION = 1
+
+# 状态文件默认位置（相对项目根目录）
+DEFAULT_STATE_FILE = Path("output") / "burst_state.json"
+
+# 随状态一起保存的检测参数及默认值；构造时未显式传入的参数以状态文件中的为准
+DEFAULT_PARAMS = {
+    "half_life_hours": 6.0,
+    "z_threshold": 3.0,
+    "exit_ratio": 0.5,
+    "min_count": 3,
+    "min_variance": 1.0,
+    "warmup_rounds": 3,
+}
+
+_DATE_DIR_PATTERN = re.compile(r"^\d{4}年\d{2}月\d{2}日$")
+
+
+class BurstDetector:
+    """基于指数衰减 z-score 的关键词爆发检测器"""
+
+    def __init__(
+        self,
+        state_path: Optional[Path] = None,
+        half_life_hours: Optional[float] = None,
+        z_threshold: Optional[float] = None,
+        exit_ratio: Optional[float] = None,
+        min_count: Optional[int] = None,
+        min_variance: Optional[float] = None,
+        warmup_rounds: Optional[int] = None,
+        max_keywords: int = 5000,
+        extract_keywords: Optional[Callable[[str], List[str]]] = None
+    ):
+        """
+        初始化检测器
+
+        Args:
+            state_path: 状态文件路径，None 表示不持久化
+            （以下检测参数为 None 时沿用状态文件中保存的值，没有则取 DEFAULT_PARAMS）
+            half_life_hours: 基线与衰减计数的半衰期（小时）
+            z_threshold: 进入爆发的 z-score 阈值
+            exit_ratio: 退出爆发的阈值比例（z < z_threshold * exit_ratio 时结束）
+            min_count: 进入爆发所需的最小单轮计数
+            min_variance: 方差下限，避免新词或平稳词的 z-score 失真
+            warmup_rounds: 预热轮数，基线建立前不判定爆发
+            max_keywords: 最多跟踪的关键词数量（超出时丢弃衰减计数最低的）
+            extract_keywords: 关键词提取函数，默认使用全局分词器（每轮先加载状态文件旁的
+                learned_words.txt，再用该轮标题学习新词并写回，跨轮次保持同一关键词的切分一致）
+        """
+        self.state_path = Path(state_path) if state_path else None
+        params = {
+            "half_life_hours": half_life_hours,
+            "z_threshold": z_threshold,
+            "exit_ratio": exit_ratio,
+            "min_count": min_count,
+            "min_variance": min_variance,
+            "warmup_rounds": warmup_rounds,
+        }
+        self._explicit_params = {name for name, value in params.items() if value is not None}
+        for name, default in DEFAULT_PARAMS.items():
+            setattr(self, name, default if params[name] is None else params[name])
+        self.max_keywords = max_keywords
+        self.extract_keywords = extract_keywords or (lambda text: get_segmenter().keywords(text))
+        self._learn = extract_keywords is None
+        self.learned_path = self.state_path.with_name(DEFAULT_LEARNED_FILE.name) if self.state_path else None
+        self._learned_new = 0
+
+        # keyword -> {mean, var, score, count, z, rounds, burst_since, peak_z, titles}
+        self.keywords: Dict[str, Dict] = {}
+        self.last_update: Optional[float] = None
+        self.rounds = 0
+        self._lock = Lock()
+
+        if self.state_path:
+            self.load()
+
+    # ==================== 状态文件 ====================
+
+    def load(self) -> None:
+        """从状态文件恢复（文件不存在或损坏时从空状态开始）"""
+        if not self.state_path or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Warning: 读取爆发检测状态 {self.state_path} 失败: {e}")
+            return
+
+        if not isinstance(data, dict) or data.get("version") != STATE_VERSION:
+            return
+
+        with self._lock:
+            self.keywords = data.get("keywords") or {}
+            self.last_update = data.get("last_update")
+            self.rounds = int(data.get("rounds") or 0)
+            for name, default in DEFAULT_PARAMS.items():
+                if name not in self._explicit_params and data.get(name) is not None:
+                    setattr(self, name, type(default)(data[name]))
+
+    def save(self) -> None:
+        """原子写入状态文件"""
+        if not self.state_path:
+            return
+        with self._lock:
+            data = {
+                "version": STATE_VERSION,
+                "last_update": self.last_update,
+                "rounds": self.rounds,
+                **{name: getattr(self, name) for name in DEFAULT_PARAMS},
+                "keywords": self.keywords
+            }
+
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(self.state_path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.state_path)
+
+        if self._learned_new and self.learned_path:
+            get_segmenter().save_learned(self.learned_path)
+            self._learned_new = 0
+
+    # ==================== 更新 ====================
+
+    def update(self, results: Dict[str, Dict], timestamp: Optional[float] = None) -> List[Dict]:
+        """
+        喂入一轮爬取结果
+
+        Args:
+            results: {platform_id: {title: info}}，与 crawl_websites 返回格式一致
+            timestamp: 轮次时间戳（秒），默认当前时间
+
+        Returns:
+            本轮新进入爆发状态的关键词列表
+        """
+        now = timestamp if timestamp is not None else time.time()
+
+        if self._learn:
+            segmenter = get_segmenter()
+            if self.learned_path:
+                segmenter.refresh_learned(self.learned_path)
+            self._learned_new += segmenter.learn(
+                title for titles in results.values() for title in titles.keys()
+            )
+
+        # 本轮计数：同一平台的同一标题只计一次
+        round_counts: Dict[str, int] = {}
+        round_titles: Dict[str, List[str]] = {}
+        for titles in results.values():
+            for title in titles.keys():
+                for keyword in dict.fromkeys(self.extract_keywords(title)):
+                    round_counts[keyword] = round_counts.get(keyword, 0) + 1
+                    samples = round_titles.setdefault(keyword, [])
+                    if len(samples) < 3 and title not in samples:
+                        samples.append(title)
+
+        with self._lock:
+            if self.last_update is None:
+                decay = 0.0
+            else:
+                elapsed_hours = max(0.0, now - self.last_update) / 3600
+                decay = 0.5 ** (elapsed_hours / self.half_life_hours)
+
+            started = []
+            warmed_up = self.rounds >= self.warmup_rounds
+            for keyword in set(self.keywords) | set(round_counts):
+                count = round_counts.get(keyword, 0)
+                state = self.keywords.get(keyword)
+                if state is None:
+                    state = {"mean": 0.0, "var": 0.0, "score": 0.0, "rounds": 0,
+                             "burst_since": None, "peak_z": 0.0, "titles": []}
+                    self.keywords[keyword] = state
+
+                # 先用旧基线计算 z-score，再把本轮计数并入基线
+                z = (count - state["mean"]) / math.sqrt(max(state["var"], self.min_variance))
+                diff = count - state["mean"]
+                increment = (1 - decay) * diff
+                state["mean"] += increment
+                state["var"] = decay * (state["var"] + diff * increment)
+                state["score"] = state["score"] * decay + count
+                state["count"] = count
+                state["z"] = round(z, 3)
+                state["rounds"] += 1
+                if count:
+                    state["titles"] = round_titles[keyword]
+                    state["last_seen"] = now
+
+                bursting = state["burst_since"] is not None
+                if not bursting and warmed_up and z >= self.z_threshold and count >= self.min_count:
+                    state["burst_since"] = now
+                    state["peak_z"] = state["z"]
+                    started.append(self._describe(keyword, state))
+                elif bursting:
+                    if z < self.z_threshold * self.exit_ratio or count < self.min_count:
+                        state["burst_since"] = None
+                        state["peak_z"] = 0.0
+                    else:
+                        state["peak_z"] = max(state["peak_z"], state["z"])
+
+            self.last_update = now
+            self.rounds += 1
+            self._prune()
+
+        started.sort(key=lambda item: item["z_score"], reverse=True)
+        return started
+
+    def _prune(self) -> None:
+        """丢弃衰减殆尽的关键词，并限制跟踪数量（需持有锁）"""
+        stale = [
+            keyword for keyword, state in self.keywords.items()
+            if state["burst_since"] is None and state["score"] < 0.05
+        ]
+        for keyword in stale:
+            del self.keywords[keyword]
+
+        if len(self.keywords) > self.max_keywords:
+            ranked = sorted(
+                self.keywords.items(),
+                key=lambda item: (item[1]["burst_since"] is not None, item[1]["score"])
+            )
+            for keyword, _ in ranked[:len(self.keywords) - self.max_keywords]:
+                del self.keywords[keyword]
+
+    # ==================== 查询 ====================
+
+    @staticmethod
+    def _describe(keyword: str, state: Dict) -> Dict:
+        return {
+            "keyword": keyword,
+            "z_score": state["z"],
+            "peak_z_score": state["peak_z"],
+            "current_count": state.get("count", 0),
+            "baseline": round(state["mean"], 3),
+            "decayed_count": round(state["score"], 3),
+            "burst_since": datetime.fromtimestamp(state["burst_since"]).strftime("%Y-%m-%d %H:%M:%S")
+            if state["burst_since"] else None,
+            "sample_titles": list(state.get("titles") or [])
+        }
+
+    def current_bursts(self, limit: int = 20) -> List[Dict]:
+        """
+        当前处于爆发状态的关键词
+
+        Args:
+            limit: 返回数量
+
+        Returns:
+            按峰值 z-score 降序排列的爆发列表
+        """
+        with self._lock:
+            bursts = [
+                self._describe(keyword, state)
+                for keyword, state in self.keywords.items()
+                if state["burst_since"] is not None
+            ]
+        bursts.sort(key=lambda item: (item["peak_z_score"], item["decayed_count"]), reverse=True)
+        return bursts[:limit]
+
+    def hottest(self, limit: int = 20) -> List[Dict]:
+        """
+        衰减计数最高的关键词（不论是否爆发）
+
+        Args:
+            limit: 返回数量
+
+        Returns:
+            关键词列表
+        """
+        with self._lock:
+            ranked = sorted(self.keywords.items(), key=lambda item: item[1]["score"], reverse=True)[:limit]
+            return [self._describe(keyword, state) for keyword, state in ranked]
+
+    def summary(self, limit: int = 20) -> Dict:
+        """
+        检测器状态摘要
+
+        Args:
+            limit: 爆发列表数量
+
+        Returns:
+            包含 bursts、last_update、rounds 等字段的字典
+        """
+        return {
+            "bursts": self.current_bursts(limit),
+            "tracked_keywords": len(self.keywords),
+            "rounds": self.rounds,
+            "last_update": datetime.fromtimestamp(self.last_update).strftime("%Y-%m-%d %H:%M:%S")
+            if self.last_update else None,
+            **{name: getattr(self, name) for name in DEFAULT_PARAMS}
+        }
+
+
+def default_state_path(project_root: Optional[str] = None) -> Path:
+    """
+    状态文件路径（环境变量 BURST_STATE_PATH 可覆盖）
+
+    Args:
+        project_root: 项目根目录，默认为 mcp_server 的上级目录
+
+    Returns:
+        状态文件路径
+    """
+    root = Path(project_root) if project_root else Path(__file__).parent.parent.parent
+    override = os.environ.get("BURST_STATE_PATH")
+    path = Path(override) if override else DEFAULT_STATE_FILE
+    return path if path.is_absolute() else root / path
+
+
+def read_bursts(project_root: Optional[str] = None, limit: int = 20) -> Dict:
+    """
+    读取状态文件中的当前爆发列表（只读，不更新状态）
+
+    Args:
+        project_root: 项目根目录
+        limit: 返回数量
+
+    Returns:
+        检测器状态摘要（参数取自状态文件）；状态文件不存在时 rounds 为 0。
+        newest_round 为最新一轮抓取文件的时间，stale 表示状态文件早于该轮
+        （爬虫未启用爆发检测或更新失败），此时结果可能过时
+    """
+    state_path = default_state_path(project_root)
+    summary = BurstDetector(state_path).summary(limit)
+
+    root = Path(project_root) if project_root else Path(__file__).parent.parent.parent
+    newest = newest_round_time(root / "output")
+    summary["newest_round"] = (
+        datetime.fromtimestamp(newest).strftime("%Y-%m-%d %H:%M:%S") if newest else None
+    )
+    summary["stale"] = bool(
+        newest and (not state_path.exists() or state_path.stat().st_mtime < newest)
+    )
+    return summary
+
+
+def newest_round_time(output_dir: Path) -> Optional[float]:
+    """
+    最新一轮抓取文件（output/<日期>/txt/*.txt）的修改时间
+
+    Args:
+        output_dir: output 目录
+
+    Returns:
+        时间戳（秒），没有抓取文件时为 None
+    """
+    if not output_dir.is_dir():
+        return None
+    date_dirs = sorted(
+        (d for d in output_dir.iterdir() if d.is_dir() and _DATE_DIR_PATTERN.match(d.name)),
+        key=lambda d: d.name,
+        reverse=True,
+    )
+    for date_dir in date_dirs:
+        txt_dir = date_dir / "txt"
+        if not txt_dir.is_dir():
+            continue
+        mtimes = [f.stat().st_mtime for f in txt_dir.glob("*.txt")]
+        if mtimes:
+            return max(mtimes)
+    return None
+
+
+def feed_round(
+    results: Dict[str, Dict],
+    project_root: Optional[str] = None,
+    timestamp: Optional[float] = None,
+    **options
+) -> List[Dict]:
+    """
+    加载状态、喂入一轮结果并保存（供爬虫每轮调用）
+
+    Args:
+        results: {platform_id: {title: info}}
+        project_root: 项目根目录
+        timestamp: 轮次时间戳（秒）
+        **options: BurstDetector 参数（half_life_hours、z_threshold、min_count 等）
+
+    Returns:
+        本轮新进入爆发状态的关键词列表
+    """
+    detector = BurstDetector(default_state_path(project_root), **options)
+    started = detector.update(results, timestamp=timestamp)
+    detector.save()
+    return started
@@ -1,56 +1,200 @@
 """
 缓存服务
 
-实现TTL缓存机制，提升数据访问性能。
+实现有容量上限的 LRU + TTL 缓存，提升数据访问性能：
+- 按条目数和近似字节数双重限制，超限时淘汰最久未使用的条目
+- 每个条目在写入时确定 TTL
+- 后台清扫线程定期清理过期条目
+- 统计命中/未命中/淘汰次数
+- 同一个键的并发未命中只计算一次（single-flight）
 """
 
+import os
+import sys
 import time
-from typing import Any, Optional
-from threading import Lock
+from collections import OrderedDict
+from threading import Condition, Event, Lock, Thread
+from typing import Any, Callable, Dict, Optional
+
+
+# 默认 TTL（秒）
+DEFAULT_TTL = 900
+
+
+def estimate_size(obj: Any, _seen: Optional[set] = None) -> int:
+    """
+    估算对象占用的字节数（递归遍历常见容器）
+
+    Args:
+        obj: 任意对象
+
+    Returns:
+        近似字节数
+    """
+    if _seen is None:
+        _seen = set()
+
+    obj_id = id(obj)
+    if obj_id in _seen:
+        return 0
+    _seen.add(obj_id)
+
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += estimate_size(key, _seen) + estimate_size(value, _seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += estimate_size(item, _seen)
+
+    return size
+
+
+class _CacheEntry:
+    """缓存条目"""
+
+    __slots__ = ("value", "created_at", "expires_at", "size")
+
+    def __init__(self, value: Any, ttl: float, size: int):
+        now = time.time()
+        self.value = value
+        self.created_at = now
+        self.expires_at = now + ttl
+        self.size = size
 
 
 class CacheService:
-    """缓存服务类"""
+    """缓存服务类（有界 LRU，按条目 TTL 过期）"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 256 * 1024 * 1024,
+        default_ttl: int = DEFAULT_TTL,
+        sweep_interval: float = 60.0
+    ):
+        """
+        初始化缓存服务
+
+        Args:
+            max_entries: 最大条目数
+            max_bytes: 近似字节上限
+            default_ttl: 写入时未指定 TTL 的默认值（秒）
+            sweep_interval: 后台清扫间隔（秒），<=0 表示不启动清扫线程
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.sweep_interval = sweep_interval
 
-    def __init__(self):
-        """初始化缓存服务"""
-        self._cache = {}
-        self._timestamps = {}
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._total_bytes = 0
         self._lock = Lock()
 
-    def get(self, key: str, ttl: int = 900) -> Optional[Any]:
+        # single-flight：正在计算中的键
+        self._inflight: Dict[str, Condition] = {}
+
+        # 统计计数
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+        self._sweeper: Optional[Thread] = None
+        self._stop_event = Event()
+
+    def get(self, key: str, ttl: Optional[int] = None) -> Optional[Any]:
         """
         获取缓存数据
 
         Args:
             key: 缓存键
-            ttl: 存活时间（秒），默认15分钟
+            ttl: 调用方可接受的最大存活时间（秒），可选；
+                 条目自身的 TTL 在写入时确定，两者取更严格者
 
         Returns:
             缓存的值，如果不存在或已过期则返回None
         """
         with self._lock:
-            if key in self._cache:
-                # 检查是否过期
-                if time.time() - self._timestamps[key] < ttl:
-                    return self._cache[key]
-                else:
-                    # 已过期，删除缓存
-                    del self._cache[key]
-                    del self._timestamps[key]
-        return None
-
-    def set(self, key: str, value: Any) -> None:
+            entry = self._lookup(key, ttl)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            return entry.value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         """
         设置缓存数据
 
         Args:
             key: 缓存键
             value: 缓存值
+            ttl: 存活时间（秒），默认使用 default_ttl
         """
+        size = estimate_size(value)
+        entry = _CacheEntry(value, ttl if ttl is not None else self.default_ttl, size)
+
         with self._lock:
-            self._cache[key] = value
-            self._timestamps[key] = time.time()
+            old = self._cache.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old.size
+
+            # 单个条目超过总上限时不缓存
+            if size > self.max_bytes:
+                return
+
+            self._cache[key] = entry
+            self._total_bytes += size
+            self._evict_if_needed()
+
+        self._ensure_sweeper()
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[int] = None
+    ) -> Any:
+        """
+        获取缓存数据，未命中时计算并写入；同一个键的并发未命中只计算一次
+
+        Args:
+            key: 缓存键
+            compute: 计算函数
+            ttl: 存活时间（秒），同时作为读取时的最大存活时间
+
+        Returns:
+            缓存或新计算的值；compute 抛出的异常只传递给执行计算的调用方，
+            等待中的调用方会重新查找并在必要时自行计算
+        """
+        with self._lock:
+            while True:
+                entry = self._lookup(key, ttl)
+                if entry is not None:
+                    self._hits += 1
+                    return entry.value
+
+                waiter = self._inflight.get(key)
+                if waiter is None:
+                    self._misses += 1
+                    waiter = Condition(self._lock)
+                    self._inflight[key] = waiter
+                    break
+
+                # 其他线程正在计算，等待其完成后重新查找
+                waiter.wait()
+
+        try:
+            value = compute()
+            if value is not None:
+                self.set(key, value, ttl=ttl)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+                waiter.notify_all()
 
     def delete(self, key: str) -> bool:
         """
@@ -63,9 +207,9 @@ class CacheService:
             是否成功删除
         """
         with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                del self._timestamps[key]
+            entry = self._cache.pop(key, None)
+            if entry is not None:
+                self._total_bytes -= entry.size
                 return True
         return False
 
@@ -73,29 +217,30 @@ class CacheService:
         """清空所有缓存"""
         with self._lock:
             self._cache.clear()
-            self._timestamps.clear()
+            self._total_bytes = 0
 
-    def cleanup_expired(self, ttl: int = 900) -> int:
+    def cleanup_expired(self, ttl: Optional[int] = None) -> int:
         """
         清理过期缓存
 
         Args:
-            ttl: 存活时间（秒）
+            ttl: 额外的最大存活时间（秒），可选
 
         Returns:
             清理的条目数量
         """
         with self._lock:
-            current_time = time.time()
+            now = time.time()
             expired_keys = [
-                key for key, timestamp in self._timestamps.items()
-                if current_time - timestamp >= ttl
+                key for key, entry in self._cache.items()
+                if self._is_expired(entry, now, ttl)
             ]
 
             for key in expired_keys:
-                del self._cache[key]
-                del self._timestamps[key]
+                entry = self._cache.pop(key)
+                self._total_bytes -= entry.size
 
+            self._expirations += len(expired_keys)
             return len(expired_keys)
 
     def get_stats(self) -> dict:
@@ -106,31 +251,104 @@ class CacheService:
             统计信息字典
         """
         with self._lock:
+            now = time.time()
+            created = [entry.created_at for entry in self._cache.values()]
+            lookups = self._hits + self._misses
             return {
                 "total_entries": len(self._cache),
-                "oldest_entry_age": (
-                    time.time() - min(self._timestamps.values())
-                    if self._timestamps else 0
-                ),
-                "newest_entry_age": (
-                    time.time() - max(self._timestamps.values())
-                    if self._timestamps else 0
-                )
+                "max_entries": self.max_entries,
+                "approx_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "inflight": len(self._inflight),
+                "oldest_entry_age": now - min(created) if created else 0,
+                "newest_entry_age": now - max(created) if created else 0
             }
 
+    def stop_sweeper(self) -> None:
+        """停止后台清扫线程"""
+        self._stop_event.set()
+
+    # ==================== 内部方法 ====================
+
+    @staticmethod
+    def _is_expired(entry: _CacheEntry, now: float, ttl: Optional[int] = None) -> bool:
+        if now >= entry.expires_at:
+            return True
+        return ttl is not None and now - entry.created_at >= ttl
+
+    def _lookup(self, key: str, ttl: Optional[int]) -> Optional[_CacheEntry]:
+        """查找未过期条目并标记为最近使用（需持有锁）"""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+
+        if self._is_expired(entry, time.time(), ttl):
+            del self._cache[key]
+            self._total_bytes -= entry.size
+            self._expirations += 1
+            return None
+
+        self._cache.move_to_end(key)
+        return entry
+
+    def _evict_if_needed(self) -> None:
+        """淘汰最久未使用的条目直至满足容量限制（需持有锁）"""
+        while self._cache and (
+            len(self._cache) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            _, entry = self._cache.popitem(last=False)
+            self._total_bytes -= entry.size
+            self._evictions += 1
+
+    def _ensure_sweeper(self) -> None:
+        """首次写入时启动后台清扫线程"""
+        if self.sweep_interval <= 0 or self._sweeper is not None:
+            return
+        with self._lock:
+            if self._sweeper is not None:
+                return
+            self._sweeper = Thread(
+                target=self._sweep_loop,
+                name="mcp-cache-sweeper",
+                daemon=True
+            )
+            self._sweeper.start()
+
+    def _sweep_loop(self) -> None:
+        while not self._stop_event.wait(self.sweep_interval):
+            try:
+                self.cleanup_expired()
+            except Exception as e:
+                print(f"Warning: 缓存清扫失败: {e}")
+
 
 # 全局缓存实例
 _global_cache = None
+_global_cache_lock = Lock()
 
 
 def get_cache() -> CacheService:
     """
     获取全局缓存实例
 
+    容量可通过环境变量调整：
+    - MCP_CACHE_MAX_ENTRIES: 最大条目数（默认 1024）
+    - MCP_CACHE_MAX_MB: 近似内存上限 MB（默认 256）
+
     Returns:
         全局缓存服务实例
     """
     global _global_cache
     if _global_cache is None:
-        _global_cache = CacheService()
+        with _global_cache_lock:
+            if _global_cache is None:
+                _global_cache = CacheService(
+                    max_entries=int(os.environ.get("MCP_CACHE_MAX_ENTRIES", "1024")),
+                    max_bytes=int(float(os.environ.get("MCP_CACHE_MAX_MB", "256")) * 1024 * 1024)
+                )
     return _global_cache
@@ -0,0 +1,422 @@
+"""
+爬取任务执行服务
+
+MCP 触发的爬取以异步任务运行：trigger_crawl 立即返回任务ID，
+各平台在共享线程池中并发抓取（复用 crawler.index.DataFetcher 的抓取路径
+与 keep-alive 连接池），进度以事件流的形式记录，供 get_crawl_job 轮询。
+"""
+
+import os
+import sys
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from threading import Condition, Lock
+from typing import Dict, List, Optional, Tuple
+
+from ..utils.errors import CrawlTaskError
+
+
+# 任务状态
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+class CrawlJob:
+    """单个爬取任务（状态、逐平台进度与事件流）"""
+
+    def __init__(
+        self,
+        platforms: List[Tuple[str, str]],
+        save_to_local: bool = False,
+        include_url: bool = False
+    ):
+        """
+        初始化任务
+
+        Args:
+            platforms: [(platform_id, platform_name), ...]
+            save_to_local: 是否保存到 output 目录
+            include_url: 结果数据是否包含URL
+        """
+        self.job_id = f"crawl_{int(time.time())}_{uuid.uuid4().hex[:6]}"
+        self.platforms = platforms
+        self.save_to_local = save_to_local
+        self.include_url = include_url
+
+        self.status = JOB_QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.crawl_time: Optional[datetime] = None
+        self.error: Optional[str] = None
+
+        self.progress: Dict[str, Dict] = OrderedDict(
+            (pid, {"name": name, "status": "pending", "count": 0})
+            for pid, name in platforms
+        )
+        self.results: Dict[str, Dict] = {}
+        self.id_to_name: Dict[str, str] = dict(platforms)
+        self.failed_ids: List[str] = []
+        self.saved_files: Optional[Dict[str, str]] = None
+        self.save_error: Optional[str] = None
+
+        self._events: List[Dict] = []
+        self._cond = Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JOB_COMPLETED, JOB_FAILED)
+
+    def emit(self, event: str, platform: Optional[str] = None, **fields) -> None:
+        """记录一个进度事件并唤醒等待者"""
+        with self._cond:
+            record = {
+                "seq": len(self._events) + 1,
+                "time": round(time.time(), 3),
+                "event": event,
+            }
+            if platform is not None:
+                record["platform"] = platform
+            record.update(fields)
+            self._events.append(record)
+            self._cond.notify_all()
+
+    def update_platform(self, platform_id: str, status: str, **fields) -> None:
+        """更新单个平台的进度并记录事件"""
+        with self._cond:
+            entry = self.progress.setdefault(platform_id, {"name": platform_id, "count": 0})
+            entry["status"] = status
+            entry.update(fields)
+        self.emit(f"platform_{status}", platform=platform_id, **fields)
+
+    def wait_for_events(self, since: int, timeout: float) -> None:
+        """
+        等待 seq > since 的新事件或任务结束
+
+        Args:
+            since: 已读取的最后事件序号
+            timeout: 最长等待秒数
+        """
+        if timeout <= 0:
+            return
+        with self._cond:
+            self._cond.wait_for(
+                lambda: len(self._events) > since or self.done,
+                timeout=timeout
+            )
+
+    def news_data(self) -> List[Dict]:
+        """按 trigger_crawl 原有格式展开的新闻数据"""
+        news_data = []
+        for platform_id, titles_data in self.results.items():
+            platform_name = self.id_to_name.get(platform_id, platform_id)
+            for title, info in titles_data.items():
+                news_item = {
+                    "platform_id": platform_id,
+                    "platform_name": platform_name,
+                    "title": title,
+                    "ranks": info["ranks"]
+                }
+
+                # 条件性添加 URL 字段
+                if self.include_url:
+                    news_item["url"] = info.get("url", "")
+                    news_item["mobile_url"] = info.get("mobileUrl", "")
+
+                news_data.append(news_item)
+        return news_data
+
+    def to_dict(self, since: int = 0, include_data: bool = False) -> Dict:
+        """
+        导出任务状态
+
+        Args:
+            since: 只返回 seq > since 的事件
+            include_data: 任务完成后是否附带新闻数据
+
+        Returns:
+            任务状态字典
+        """
+        with self._cond:
+            progress = {pid: dict(entry) for pid, entry in self.progress.items()}
+            events = list(self._events[since:])
+            next_since = len(self._events)
+
+        finished = sum(1 for entry in progress.values() if entry["status"] in ("success", "failed"))
+        result = {
+            "task_id": self.job_id,
+            "status": self.status,
+            "created_at": datetime.fromtimestamp(self.created_at).strftime("%Y-%m-%d %H:%M:%S"),
+            "progress": progress,
+            "completed_platforms": finished,
+            "total_platforms": len(progress),
+            "events": events,
+            "next_since": next_since,
+            "saved_to_local": self.save_to_local
+        }
+
+        if self.started_at and self.finished_at:
+            result["elapsed_seconds"] = round(self.finished_at - self.started_at, 3)
+        if self.error:
+            result["error_message"] = self.error
+
+        if self.status == JOB_COMPLETED:
+            result["crawl_time"] = self.crawl_time.strftime("%Y-%m-%d %H:%M:%S")
+            result["platforms"] = list(self.results.keys())
+            result["failed_platforms"] = list(self.failed_ids)
+            result["total_news"] = sum(len(titles) for titles in self.results.values())
+            if include_data:
+                result["data"] = self.news_data()
+            if self.save_to_local:
+                if self.saved_files:
+                    result["saved_files"] = self.saved_files
+                    result["note"] = "数据已持久化到 output 文件夹"
+                else:
+                    result["save_error"] = self.save_error
+                    result["note"] = "爬取成功但保存失败，数据仅在内存中"
+            else:
+                result["note"] = "临时爬取结果，未持久化到output文件夹"
+
+        return result
+
+
+class CrawlExecutor:
+    """共享的爬取执行器（任务级线程池 + 平台级抓取线程池）"""
+
+    def __init__(
+        self,
+        project_root: Path,
+        max_workers: int = 4,
+        max_jobs: int = 50
+    ):
+        """
+        初始化执行器
+
+        Args:
+            project_root: 项目根目录
+            max_workers: 并发抓取的平台数（同时也是连接池大小）
+            max_jobs: 内存中保留的任务数量（超出后丢弃最早完成的任务）
+        """
+        self.project_root = Path(project_root)
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+
+        self._jobs: "OrderedDict[str, CrawlJob]" = OrderedDict()
+        self._lock = Lock()
+        self._job_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="crawl-job")
+        self._fetch_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crawl-fetch")
+
+        self._fetcher = None
+        self._crawler = None
+        self._fetcher_lock = Lock()
+        # x-cdp 通过同一个浏览器会话抓取，不能并发
+        self._x_cdp_lock = Lock()
+
+    def submit(
+        self,
+        platforms: List[Tuple[str, str]],
+        save_to_local: bool = False,
+        include_url: bool = False
+    ) -> CrawlJob:
+        """
+        提交爬取任务（立即返回）
+
+        Args:
+            platforms: [(platform_id, platform_name), ...]
+            save_to_local: 是否保存到 output 目录
+            include_url: 结果数据是否包含URL
+
+        Returns:
+            已入队的任务
+        """
+        job = CrawlJob(platforms, save_to_local=save_to_local, include_url=include_url)
+        job.emit("queued", platforms=[pid for pid, _ in platforms])
+
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._trim_jobs()
+
+        self._job_pool.submit(self._run_job, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[CrawlJob]:
+        """
+        获取任务
+
+        Args:
+            job_id: 任务ID
+
+        Returns:
+            任务对象，不存在时返回 None
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[CrawlJob]:
+        """按提交顺序返回内存中的任务"""
+        with self._lock:
+            return list(self._jobs.values())
+
+    # ==================== 内部方法 ====================
+
+    def _trim_jobs(self) -> None:
+        """丢弃最早完成的任务（需持有锁）"""
+        if len(self._jobs) <= self.max_jobs:
+            return
+        for job_id in [jid for jid, job in self._jobs.items() if job.done]:
+            if len(self._jobs) <= self.max_jobs:
+                break
+            del self._jobs[job_id]
+
+    def _get_fetcher(self):
+        """延迟加载 crawler 模块并创建共享的 DataFetcher"""
+        if self._fetcher is None:
+            with self._fetcher_lock:
+                if self._fetcher is None:
+                    root = str(self.project_root)
+                    if root not in sys.path:
+                        sys.path.insert(0, root)
+                    # crawler.index 在导入时按 CONFIG_PATH 读取配置
+                    os.environ.setdefault(
+                        "CONFIG_PATH", str(self.project_root / "config" / "config.yaml")
+                    )
+                    try:
+                        from crawler import index as crawler_index
+                    except Exception as e:
+                        raise CrawlTaskError(
+                            f"加载爬虫模块失败: {e}",
+                            suggestion="请确认在项目根目录运行且已安装 requirements.txt 中的依赖"
+                        )
+                    self._crawler = crawler_index
+                    self._fetcher = crawler_index.DataFetcher(pool_size=self.max_workers)
+        return self._fetcher
+
+    def _fetch_one(self, job: CrawlJob, platform_id: str, name: str) -> Tuple[Optional[Dict], str]:
+        """抓取单个平台并更新进度"""
+        fetcher = self._get_fetcher()
+        job.update_platform(platform_id, "running")
+        started = time.time()
+
+        if platform_id == "x-cdp":
+            with self._x_cdp_lock:
+                titles, platform_name = fetcher.fetch_platform((platform_id, name))
+        else:
+            titles, platform_name = fetcher.fetch_platform((platform_id, name))
+
+        elapsed = round(time.time() - started, 3)
+        if titles is None:
+            job.update_platform(platform_id, "failed", elapsed_seconds=elapsed)
+        else:
+            job.update_platform(platform_id, "success", count=len(titles), elapsed_seconds=elapsed)
+        return titles, platform_name
+
+    def _run_job(self, job: CrawlJob) -> None:
+        """执行任务：并发抓取各平台，全部完成后按需持久化"""
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        job.emit("started")
+
+        try:
+            self._get_fetcher()
+
+            futures = {
+                self._fetch_pool.submit(self._fetch_one, job, platform_id, name): platform_id
+                for platform_id, name in job.platforms
+            }
+            for future in as_completed(futures):
+                platform_id = futures[future]
+                try:
+                    titles, platform_name = future.result()
+                except Exception as e:
+                    job.update_platform(platform_id, "failed", error=str(e))
+                    titles, platform_name = None, job.id_to_name.get(platform_id, platform_id)
+
+                job.id_to_name[platform_id] = platform_name
+                if titles is None:
+                    job.failed_ids.append(platform_id)
+                else:
+                    job.results[platform_id] = titles
+
+            # 保持配置中的平台顺序
+            order = [pid for pid, _ in job.platforms]
+            job.results = {pid: job.results[pid] for pid in order if pid in job.results}
+            job.failed_ids = [pid for pid in order if pid in job.failed_ids]
+
+            job.crawl_time = self._crawler.get_beijing_time()
+            print(f"成功: {list(job.results.keys())}, 失败: {job.failed_ids}")
+
+            if job.save_to_local:
+                try:
+                    job.saved_files = self._save(job)
+                    job.emit("saved", files=job.saved_files)
+                except Exception as e:
+                    print(f"保存文件失败: {e}")
+                    job.save_error = str(e)
+                    job.emit("save_failed", error=str(e))
+
+            job.status = JOB_COMPLETED
+        except Exception as e:
+            job.error = str(e)
+            job.status = JOB_FAILED
+        finally:
+            job.finished_at = time.time()
+            job.emit(job.status)
+
+    def _save(self, job: CrawlJob) -> Dict[str, str]:
+        """复用 crawler 的写入路径：txt + 帖子状态文件，以及当前榜单模式的 HTML 报告"""
+        output_dir = str(self.project_root / "output")
+        frequency_file = Path(os.environ.get("FREQUENCY_WORDS_PATH") or "config/frequency_words.txt")
+        if not frequency_file.is_absolute():
+            frequency_file = self.project_root / frequency_file
+        txt_file_path = self._crawler.save_titles_to_file(
+            job.results, job.id_to_name, job.failed_ids, output_dir=output_dir
+        )
+        html_file_path = self._crawler.generate_round_report(
+            job.results,
+            job.id_to_name,
+            job.failed_ids,
+            output_dir=output_dir,
+            frequency_file=str(frequency_file),
+        )
+
+        print(f"数据已保存到:")
+        print(f"  TXT: {txt_file_path}")
+        print(f"  HTML: {html_file_path}")
+
+        return {"txt": str(txt_file_path), "html": str(html_file_path)}
+
+
+# 全局执行器实例
+_global_executor = None
+_global_executor_lock = Lock()
+
+
+def get_crawl_executor(project_root: Optional[str] = None) -> CrawlExecutor:
+    """
+    获取全局爬取执行器
+
+    并发数可通过环境变量 MCP_CRAWL_WORKERS 调整（默认 4）
+
+    Args:
+        project_root: 项目根目录（仅首次创建时生效）
+
+    Returns:
+        全局执行器实例
+    """
+    global _global_executor
+    if _global_executor is None:
+        with _global_executor_lock:
+            if _global_executor is None:
+                if project_root is None:
+                    project_root = Path(__file__).parent.parent.parent
+                _global_executor = CrawlExecutor(
+                    Path(project_root),
+                    max_workers=int(os.environ.get("MCP_CRAWL_WORKERS", "4"))
+                )
+    return _global_executor
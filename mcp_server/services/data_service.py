@@ -12,6 +12,7 @@ from typing import Dict, List, Optional, Tuple
 from .cache_service import get_cache
 from .parser_service import ParserService
 from ..utils.errors import DataNotFoundError
+from ..utils.pagination import top_k
 
 
 class DataService:
@@ -97,7 +98,7 @@ class DataService:
         result = news_list[:limit]
 
         # 缓存结果
-        self.cache.set(cache_key, result)
+        self.cache.set(cache_key, result, ttl=900)
 
         return result
 
@@ -106,7 +107,8 @@ class DataService:
         target_date: datetime,
         platforms: Optional[List[str]] = None,
         limit: int = 50,
-        include_url: bool = False
+        include_url: bool = False,
+        offset: int = 0
     ) -> List[Dict]:
         """
         按指定日期获取新闻
@@ -116,6 +118,7 @@ class DataService:
             platforms: 平台ID列表,None表示所有平台
             limit: 返回条数限制
             include_url: 是否包含URL链接,默认False(节省token)
+            offset: 按排名排序后的起始偏移量(分页)
 
         Returns:
             新闻列表
@@ -133,7 +136,7 @@ class DataService:
         """
         # 尝试从缓存获取
         date_str = target_date.strftime("%Y-%m-%d")
-        cache_key = f"news_by_date:{date_str}:{','.join(platforms or [])}:{limit}:{include_url}"
+        cache_key = f"news_by_date:{date_str}:{','.join(platforms or [])}:{offset}:{limit}:{include_url}"
         cached = self.cache.get(cache_key, ttl=1800)  # 30分钟缓存
         if cached:
             return cached
@@ -144,40 +147,36 @@ class DataService:
             platform_ids=platforms
         )
 
-        # 转换为新闻列表
-        news_list = []
-        for platform_id, titles in all_titles.items():
-            platform_name = id_to_name.get(platform_id, platform_id)
-
-            for title, info in titles.items():
-                # 计算平均排名
-                avg_rank = sum(info["ranks"]) / len(info["ranks"]) if info["ranks"] else 0
+        def iter_news():
+            for platform_id, titles in all_titles.items():
+                platform_name = id_to_name.get(platform_id, platform_id)
 
-                news_item = {
-                    "title": title,
-                    "platform": platform_id,
-                    "platform_name": platform_name,
-                    "rank": info["ranks"][0] if info["ranks"] else 0,
-                    "avg_rank": round(avg_rank, 2),
-                    "count": len(info["ranks"]),
-                    "date": date_str
-                }
+                for title, info in titles.items():
+                    # 计算平均排名
+                    avg_rank = sum(info["ranks"]) / len(info["ranks"]) if info["ranks"] else 0
 
-                # 条件性添加 URL 字段
-                if include_url:
-                    news_item["url"] = info.get("url", "")
-                    news_item["mobileUrl"] = info.get("mobileUrl", "")
+                    news_item = {
+                        "title": title,
+                        "platform": platform_id,
+                        "platform_name": platform_name,
+                        "rank": info["ranks"][0] if info["ranks"] else 0,
+                        "avg_rank": round(avg_rank, 2),
+                        "count": len(info["ranks"]),
+                        "date": date_str
+                    }
 
-                news_list.append(news_item)
+                    # 条件性添加 URL 字段
+                    if include_url:
+                        news_item["url"] = info.get("url", "")
+                        news_item["mobileUrl"] = info.get("mobileUrl", "")
 
-        # 按排名排序
-        news_list.sort(key=lambda x: x["rank"])
+                    yield news_item
 
-        # 限制返回数量
-        result = news_list[:limit]
+        # 按排名取当前页(堆选取,不对全部新闻排序)
+        result = top_k(iter_news(), offset + limit, key=lambda x: x["rank"], reverse=False)[offset:]
 
         # 缓存结果(历史数据缓存更久)
-        self.cache.set(cache_key, result)
+        self.cache.set(cache_key, result, ttl=1800)
 
         return result
 
@@ -214,44 +213,32 @@ class DataService:
         results = []
         platform_distribution = Counter()
 
-        # 遍历日期范围
-        current_date = start_date
-        while current_date <= end_date:
-            try:
-                all_titles, id_to_name, _ = self.parser.read_all_titles_for_date(
-                    date=current_date,
-                    platform_ids=platforms
-                )
-
-                # 搜索包含关键词的标题
-                for platform_id, titles in all_titles.items():
-                    platform_name = id_to_name.get(platform_id, platform_id)
-
-                    for title, info in titles.items():
-                        if keyword.lower() in title.lower():
-                            # 计算平均排名
-                            avg_rank = sum(info["ranks"]) / len(info["ranks"]) if info["ranks"] else 0
-
-                            results.append({
-                                "title": title,
-                                "platform": platform_id,
-                                "platform_name": platform_name,
-                                "ranks": info["ranks"],
-                                "count": len(info["ranks"]),
-                                "avg_rank": round(avg_rank, 2),
-                                "url": info.get("url", ""),
-                                "mobileUrl": info.get("mobileUrl", ""),
-                                "date": current_date.strftime("%Y-%m-%d")
-                            })
-
-                            platform_distribution[platform_id] += 1
-
-            except DataNotFoundError:
-                # 该日期没有数据,继续下一天
-                pass
-
-            # 下一天
-            current_date += timedelta(days=1)
+        # 并行读取日期范围（没有数据的日期自动跳过）
+        for current_date, (all_titles, id_to_name, _) in self.parser.read_range(
+            start_date, end_date, platform_ids=platforms
+        ):
+            # 搜索包含关键词的标题
+            for platform_id, titles in all_titles.items():
+                platform_name = id_to_name.get(platform_id, platform_id)
+
+                for title, info in titles.items():
+                    if keyword.lower() in title.lower():
+                        # 计算平均排名
+                        avg_rank = sum(info["ranks"]) / len(info["ranks"]) if info["ranks"] else 0
+
+                        results.append({
+                            "title": title,
+                            "platform": platform_id,
+                            "platform_name": platform_name,
+                            "ranks": info["ranks"],
+                            "count": len(info["ranks"]),
+                            "avg_rank": round(avg_rank, 2),
+                            "url": info.get("url", ""),
+                            "mobileUrl": info.get("mobileUrl", ""),
+                            "date": current_date.strftime("%Y-%m-%d")
+                        })
+
+                        platform_distribution[platform_id] += 1
 
         if not results:
             raise DataNotFoundError(
@@ -396,7 +383,7 @@ class DataService:
         }
 
         # 缓存结果
-        self.cache.set(cache_key, result)
+        self.cache.set(cache_key, result, ttl=1800)
 
         return result
 
@@ -491,7 +478,7 @@ class DataService:
             result = {}
 
         # 缓存结果
-        self.cache.set(cache_key, result)
+        self.cache.set(cache_key, result, ttl=3600)
 
         return result
 
@@ -0,0 +1,387 @@
+"""
+关键词统计立方体服务
+
+按 (日期, 平台, 轮次) 物化关键词计数，并维护当天的关键词共现稀疏矩阵。
+每个 txt 文件对应一轮爬取，新一轮数据到达时只增量解析新文件，
+分析工具在此基础上做廉价聚合，而不必每次重新读取和分词。
+"""
+
+import re
+from collections import Counter, OrderedDict, defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..utils.errors import DataNotFoundError
+
+
+# 轮次文件名格式：HH时MM分.txt（兼容旧的 HHMM.txt）
+_ROUND_NAME_PATTERNS = (
+    re.compile(r'^(\d{2})时(\d{2})分'),
+    re.compile(r'^(\d{2})(\d{2})$'),
+)
+
+
+def parse_round_time(round_name: str) -> Optional[Tuple[int, int]]:
+    """
+    从轮次文件名中解析时间
+
+    Args:
+        round_name: 轮次文件名（可带 .txt 后缀）
+
+    Returns:
+        (小时, 分钟)，无法解析时返回 None
+    """
+    stem = round_name[:-4] if round_name.endswith(".txt") else round_name
+    for pattern in _ROUND_NAME_PATTERNS:
+        match = pattern.match(stem)
+        if match:
+            hour, minute = int(match.group(1)), int(match.group(2))
+            if 0 <= hour <= 23 and 0 <= minute <= 59:
+                return hour, minute
+    return None
+
+
+def parse_round_hour(round_name: str) -> Optional[int]:
+    """
+    从轮次文件名中解析小时
+
+    Args:
+        round_name: 轮次文件名（可带 .txt 后缀）
+
+    Returns:
+        小时（0-23），无法解析时返回 None
+    """
+    parsed = parse_round_time(round_name)
+    return parsed[0] if parsed else None
+
+
+def list_round_files(parser, date: datetime = None) -> Tuple[str, List[Tuple[Path, float]]]:
+    """
+    列出指定日期的轮次文件
+
+    Args:
+        parser: ParserService 实例
+        date: 日期对象，默认为今天
+
+    Returns:
+        (日期文件夹名, [(文件路径, 修改时间), ...])，按文件名排序
+
+    Raises:
+        DataNotFoundError: 数据不存在
+    """
+    date_folder = parser.get_date_folder_name(date)
+    txt_dir = parser.project_root / "output" / date_folder / "txt"
+
+    if not txt_dir.exists():
+        raise DataNotFoundError(
+            f"未找到 {date_folder} 的数据目录",
+            suggestion="请先运行爬虫或检查日期是否正确"
+        )
+
+    round_files = [(f, f.stat().st_mtime) for f in sorted(txt_dir.glob("*.txt"))]
+    if not round_files:
+        raise DataNotFoundError(
+            f"{date_folder} 没有数据文件",
+            suggestion="请等待爬虫任务完成"
+        )
+
+    return date_folder, round_files
+
+
+class DayKeywordCube:
+    """
+    单日关键词立方体
+
+    - round_counts: {(platform_id, round_name): Counter}，该轮在榜标题的关键词计数
+    - platform_counts: {platform_id: Counter}，平台当日去重标题的关键词计数
+    - cooccurrence: Counter{(kw1, kw2): count}，上三角稀疏共现矩阵（kw1 < kw2）
+    - postings: {keyword: [title, ...]}，关键词到去重标题的倒排表（按首次出现顺序）
+    """
+
+    def __init__(self, date_str: str):
+        self.date_str = date_str
+        self.rounds: "OrderedDict[str, float]" = OrderedDict()
+        self.id_to_name: Dict[str, str] = {}
+        self.round_counts: Dict[Tuple[str, str], Counter] = {}
+        self.platform_counts: Dict[str, Counter] = defaultdict(Counter)
+        self.platform_titles: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self.platform_rounds: Dict[str, List[str]] = defaultdict(list)
+        self.title_keywords: Dict[str, Tuple[str, ...]] = {}
+        self.postings: Dict[str, List[str]] = defaultdict(list)
+        self.cooccurrence: Counter = Counter()
+        # 构建时的分词词典版本（词典变化后整体重建，保证同一天各轮的分词口径一致）
+        self.dictionary_version: Optional[int] = None
+
+    def ingest_round(
+        self,
+        round_name: str,
+        mtime: float,
+        titles_by_id: Dict,
+        id_to_name: Dict,
+        extract_keywords: Callable[[str], List[str]]
+    ) -> None:
+        """
+        合并一轮爬取数据
+
+        Args:
+            round_name: 轮次文件名
+            mtime: 文件修改时间
+            titles_by_id: parse_txt_file 返回的 {platform_id: {title: info}}
+            id_to_name: 平台ID到名称映射
+            extract_keywords: 关键词提取函数
+        """
+        self.rounds[round_name] = mtime
+        self.id_to_name.update(id_to_name)
+
+        for platform_id, titles in titles_by_id.items():
+            round_counter = Counter()
+            seen_titles = self.platform_titles[platform_id]
+            platform_counter = self.platform_counts[platform_id]
+
+            for title in titles.keys():
+                keywords = self._keywords_for(title, extract_keywords)
+                round_counter.update(keywords)
+
+                if title in seen_titles:
+                    continue
+                seen_titles[title] = None
+
+                # 平台当日去重计数与共现矩阵只在标题首次出现时更新
+                platform_counter.update(keywords)
+                unique_keywords = sorted(set(keywords))
+                for i, kw1 in enumerate(unique_keywords):
+                    for kw2 in unique_keywords[i + 1:]:
+                        self.cooccurrence[(kw1, kw2)] += 1
+
+            self.round_counts[(platform_id, round_name)] = round_counter
+            self.platform_rounds[platform_id].append(round_name)
+
+    def _keywords_for(
+        self,
+        title: str,
+        extract_keywords: Callable[[str], List[str]]
+    ) -> Tuple[str, ...]:
+        """获取标题关键词（同一标题只分词一次，并登记倒排表）"""
+        keywords = self.title_keywords.get(title)
+        if keywords is None:
+            keywords = tuple(extract_keywords(title))
+            self.title_keywords[title] = keywords
+            for kw in dict.fromkeys(keywords):
+                self.postings[kw].append(title)
+        return keywords
+
+    def keyword_counts(self, platform_ids: Optional[Iterable[str]] = None) -> Counter:
+        """
+        汇总当日关键词计数（按平台去重标题）
+
+        Args:
+            platform_ids: 平台过滤列表，None 表示所有平台
+
+        Returns:
+            关键词计数
+        """
+        total = Counter()
+        for platform_id, counter in self.platform_counts.items():
+            if platform_ids and platform_id not in platform_ids:
+                continue
+            total.update(counter)
+        return total
+
+    def titles_with(self, keyword: str, other: Optional[str] = None, limit: int = 3) -> List[str]:
+        """
+        查找包含关键词（可选同时包含另一个关键词）的标题样本
+
+        Args:
+            keyword: 关键词
+            other: 需要同时包含的关键词
+            limit: 返回数量
+
+        Returns:
+            标题列表
+        """
+        samples = []
+        for title in self.postings.get(keyword, ()):
+            if other is not None and other not in self.title_keywords.get(title, ()):
+                continue
+            samples.append(title)
+            if len(samples) >= limit:
+                break
+        return samples
+
+    def round_hours(self, platform_id: str) -> Counter:
+        """
+        统计平台各小时的更新轮次
+
+        Args:
+            platform_id: 平台ID
+
+        Returns:
+            {hour: 轮次数}
+        """
+        hours = Counter()
+        for round_name in self.platform_rounds.get(platform_id, ()):
+            hour = parse_round_hour(round_name)
+            if hour is not None:
+                hours[hour] += 1
+        return hours
+
+
+class KeywordCubeService:
+    """关键词立方体服务（按天缓存，按轮次增量构建）"""
+
+    def __init__(
+        self,
+        parser,
+        extract_keywords: Callable[[str], List[str]],
+        max_days: int = 32,
+        learn_titles: Optional[Callable[[Iterable[str]], int]] = None,
+        dictionary_version: Optional[Callable[[], int]] = None
+    ):
+        """
+        初始化立方体服务
+
+        Args:
+            parser: ParserService 实例
+            extract_keywords: 关键词提取函数
+            max_days: 内存中最多保留的天数
+            learn_titles: 新词学习函数（如 Segmenter.learn），每天首次构建时先用当天已有的全部标题学习一次
+            dictionary_version: 返回当前分词词典版本的函数（如 Segmenter.refresh_learned），
+                版本变化时已缓存的立方体整体重建
+        """
+        self.parser = parser
+        self.extract_keywords = extract_keywords
+        self.learn_titles = learn_titles
+        self.dictionary_version = dictionary_version
+        self._learned_days: Set[str] = set()
+        self.max_days = max_days
+        self._days: "OrderedDict[str, DayKeywordCube]" = OrderedDict()
+        self._lock = Lock()
+
+    def get_day(self, date: datetime = None) -> DayKeywordCube:
+        """
+        获取指定日期的关键词立方体，只解析尚未合并的新轮次文件
+
+        Args:
+            date: 日期对象，默认为今天
+
+        Returns:
+            单日关键词立方体
+
+        Raises:
+            DataNotFoundError: 数据不存在
+        """
+        date_folder, round_files = list_round_files(self.parser, date)
+
+        with self._lock:
+            cube = self._days.get(date_folder)
+
+            # 已合并的轮次文件被改写，或分词词典已变化时整体重建
+            if cube is not None:
+                current = dict((f.name, mtime) for f, mtime in round_files)
+                if any(current.get(name) != mtime for name, mtime in cube.rounds.items()):
+                    cube = None
+            if cube is not None and self.dictionary_version is not None:
+                if cube.dictionary_version != self.dictionary_version():
+                    cube = None
+
+            pending = [
+                (txt_file, mtime, self._parse_file(txt_file))
+                for txt_file, mtime in round_files
+                if cube is None or txt_file.name not in cube.rounds
+            ]
+
+            # 每天只学习一次（首次构建前用当天已有的全部标题），之后该天的词典不再因学习而变化
+            if self.learn_titles is not None and date_folder not in self._learned_days:
+                self._learned_days.add(date_folder)
+                self.learn_titles(
+                    title
+                    for _, _, parsed in pending if parsed
+                    for titles in parsed[0].values()
+                    for title in titles.keys()
+                )
+
+            if cube is None:
+                cube = DayKeywordCube(date_folder)
+                if self.dictionary_version is not None:
+                    cube.dictionary_version = self.dictionary_version()
+
+            for txt_file, mtime, parsed in pending:
+                if parsed is None:
+                    cube.rounds[txt_file.name] = mtime
+                    continue
+                cube.ingest_round(txt_file.name, mtime, parsed[0], parsed[1], self.extract_keywords)
+
+            if not cube.platform_titles:
+                raise DataNotFoundError(
+                    f"{date_folder} 没有有效的数据",
+                    suggestion="请检查数据文件格式或重新运行爬虫"
+                )
+
+            self._days[date_folder] = cube
+            self._days.move_to_end(date_folder)
+            while len(self._days) > self.max_days:
+                self._days.popitem(last=False)
+
+            return cube
+
+    def iter_days(self, start: datetime, end: datetime) -> Iterable[DayKeywordCube]:
+        """
+        按日期顺序产出范围内有数据的单日立方体
+
+        Args:
+            start: 开始日期
+            end: 结束日期（包含）
+        """
+        for offset in range((end.date() - start.date()).days + 1):
+            try:
+                yield self.get_day(start + timedelta(days=offset))
+            except DataNotFoundError:
+                continue
+
+    def window_counts(self, start: datetime, end: datetime) -> Tuple[Counter, int]:
+        """
+        时间窗口内各轮在榜标题的关键词计数之和（直接累加已物化的 round_counts，不再分词）
+
+        Args:
+            start: 起始时间（包含）
+            end: 结束时间（不包含）
+
+        Returns:
+            (关键词计数, 窗口内的轮次数)；无法从文件名解析时间的轮次不计入
+        """
+        total = Counter()
+        rounds = set()
+        for cube in self.iter_days(start, end):
+            day = datetime.strptime(cube.date_str, "%Y年%m月%d日")
+            for (platform_id, round_name), counter in cube.round_counts.items():
+                parsed = parse_round_time(round_name)
+                if parsed is None:
+                    continue
+                round_time = day.replace(hour=parsed[0], minute=parsed[1])
+                if start <= round_time < end:
+                    total.update(counter)
+                    rounds.add((cube.date_str, round_name))
+        return total, len(rounds)
+
+    def _parse_file(self, txt_file: Path) -> Optional[Tuple[Dict, Dict]]:
+        """解析单个轮次文件，失败时返回 None"""
+        try:
+            return self.parser.parse_txt_file(txt_file)
+        except Exception as e:
+            print(f"Warning: 解析文件 {txt_file} 失败: {e}")
+            return None
+
+    def invalidate(self, date: datetime = None) -> None:
+        """
+        丢弃指定日期的立方体
+
+        Args:
+            date: 日期对象，None 表示清空全部
+        """
+        with self._lock:
+            if date is None:
+                self._days.clear()
+            else:
+                self._days.pop(self.parser.get_date_folder_name(date), None)
@@ -5,9 +5,11 @@
 """
 
 import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
-from datetime import datetime
+from typing import Dict, Iterator, List, Tuple, Optional
+from datetime import datetime, timedelta
 
 import yaml
 
@@ -189,11 +191,105 @@ class ParserService:
         is_today = (date is None) or (date.date() == datetime.now().date())
         ttl = 900 if is_today else 3600  # 15分钟 vs 1小时
 
-        cached = self.cache.get(cache_key, ttl=ttl)
-        if cached:
-            return cached
+        # 并发的相同查询只读取一次文件
+        return self.cache.get_or_compute(
+            cache_key,
+            lambda: self._load_titles_for_date(date, platform_ids),
+            ttl=ttl
+        )
 
-        # 缓存未命中，读取文件
+    def read_range(
+        self,
+        start: datetime,
+        end: datetime,
+        platform_ids: Optional[List[str]] = None,
+        include_missing: bool = False,
+        newest_first: bool = False,
+        max_workers: int = 4
+    ) -> Iterator[Tuple[datetime, Optional[Tuple[Dict, Dict, Dict]]]]:
+        """
+        并行读取日期范围内每天的标题数据，按日期顺序流式产出
+
+        每天的数据经由 read_all_titles_for_date 读取，复用按天缓存；
+        线程池最多预读 max_workers 天，调用方可以在最后一天加载完成前开始聚合，
+        提前结束迭代时未开始的读取会被取消。
+
+        Args:
+            start: 开始日期
+            end: 结束日期（包含）
+            platform_ids: 平台ID列表，None表示所有平台
+            include_missing: 是否为没有数据的日期产出 (date, None)
+            newest_first: 是否从结束日期往前产出
+            max_workers: 并行读取的天数
+
+        Yields:
+            (date, (all_titles, id_to_name, all_timestamps))；
+            include_missing=True 时缺失日期产出 (date, None)
+        """
+        total_days = (end - start).days + 1
+        if total_days <= 0:
+            return
+
+        if newest_first:
+            dates = [end - timedelta(days=i) for i in range(total_days)]
+        else:
+            dates = [start + timedelta(days=i) for i in range(total_days)]
+
+        def load(date: datetime) -> Optional[Tuple[Dict, Dict, Dict]]:
+            try:
+                return self.read_all_titles_for_date(date=date, platform_ids=platform_ids)
+            except DataNotFoundError:
+                return None
+
+        workers = max(1, min(max_workers, total_days))
+        if workers == 1:
+            for date in dates:
+                data = load(date)
+                if data is not None or include_missing:
+                    yield date, data
+            return
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="read-range")
+        try:
+            pending = deque()
+            remaining = iter(dates)
+
+            # 预读窗口：保持最多 workers 天在加载中
+            for date in remaining:
+                pending.append((date, executor.submit(load, date)))
+                if len(pending) >= workers:
+                    break
+
+            while pending:
+                date, future = pending.popleft()
+                next_date = next(remaining, None)
+                if next_date is not None:
+                    pending.append((next_date, executor.submit(load, next_date)))
+
+                data = future.result()
+                if data is not None or include_missing:
+                    yield date, data
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _load_titles_for_date(
+        self,
+        date: Optional[datetime],
+        platform_ids: Optional[List[str]]
+    ) -> Tuple[Dict, Dict, Dict]:
+        """
+        读取指定日期的所有标题文件（不经过缓存）
+
+        Args:
+            date: 日期对象，None 表示今天
+            platform_ids: 平台ID列表，None表示所有平台
+
+        Returns:
+            (all_titles, id_to_name, all_timestamps) 元组
+
+        Raises:
+            DataNotFoundError: 数据不存在
+        """
         date_folder = self.get_date_folder_name(date)
         txt_dir = self.project_root / "output" / date_folder / "txt"
 
@@ -253,11 +349,7 @@ class ParserService:
                 suggestion="请检查数据文件格式或重新运行爬虫"
             )
 
-        # 缓存结果
-        result = (all_titles, id_to_name, all_timestamps)
-        self.cache.set(cache_key, result)
-
-        return result
+        return (all_titles, id_to_name, all_timestamps)
 
     def parse_yaml_config(self, config_path: str = None) -> dict:
         """
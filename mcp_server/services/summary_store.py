@@ -0,0 +1,415 @@
+"""
+每日摘要物化服务
+
+把单日的摘要统计（平台新闻数、关键词计数、样本候选标题）写成
+output/<日期>/summary.json。已结束的日期只计算一次；当天的摘要在
+新一轮数据到达时，借助关键词立方体只解析新轮次文件后刷新。
+周报和自定义范围报告直接合并最多 7-31 个小文件，不再重新扫描原始 txt。
+
+output/ 归爬虫所有：爬虫每轮结束后调用 write_day_summary 物化当天摘要。爬虫每轮是独立进程，
+它在上一份 summary.json 与 summary_state.json（各平台已计入的标题）的基础上只合并新轮次。
+MCP 服务（docker 中 output 以只读挂载）按 内存 → output → SUMMARY_CACHE_DIR 的顺序读取，
+自己重建的摘要写到 SUMMARY_CACHE_DIR（未配置时尝试 output），写入失败只保留内存副本。
+"""
+
+import json
+import os
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..utils.errors import DataNotFoundError
+from .keyword_cube import DayKeywordCube, KeywordCubeService, list_round_files
+
+
+SUMMARY_VERSION = 1
+
+# 摘要文件名（位于 output/<日期>/ 下）
+SUMMARY_FILE = "summary.json"
+# 增量合并所需的状态（各平台已计入的标题、分词词典大小），只由爬虫读写
+SUMMARY_STATE_FILE = "summary_state.json"
+
+# 样本候选：当日前 N 个关键词命中的标题，最多保留多少条
+SAMPLE_KEYWORDS = 50
+MAX_SAMPLE_TITLES = 200
+
+# 内存中保留的单日摘要数量
+MEMORY_DAYS = 64
+
+
+def build_day_summary(cube: DayKeywordCube, complete: bool) -> Dict:
+    """
+    由单日关键词立方体生成摘要
+
+    Args:
+        cube: 单日关键词立方体
+        complete: 该日期是否已结束（不会再有新轮次）
+
+    Returns:
+        可直接写入 JSON 的摘要字典
+    """
+    keywords = cube.keyword_counts()
+
+    platforms = Counter()
+    for platform_id, titles in cube.platform_titles.items():
+        platforms[cube.id_to_name.get(platform_id, platform_id)] += len(titles)
+
+    # 样本候选：包含当日热门关键词的标题，按当日得分排序后截断
+    top_keywords = keywords.most_common(SAMPLE_KEYWORDS)
+    title_platforms: Dict[str, str] = {}
+    for platform_id, titles in cube.platform_titles.items():
+        platform_name = cube.id_to_name.get(platform_id, platform_id)
+        for title in titles:
+            title_platforms.setdefault(title, platform_name)
+
+    candidates = {}
+    for keyword, _ in top_keywords:
+        for title in cube.postings.get(keyword, ()):
+            if title not in candidates and title in title_platforms:
+                candidates[title] = _sample_score(title, top_keywords[:10])
+
+    ranked = sorted(candidates.items(), key=lambda item: (-item[1], item[0]))[:MAX_SAMPLE_TITLES]
+
+    return {
+        "version": SUMMARY_VERSION,
+        "date": cube.date_str,
+        "complete": complete,
+        "rounds": dict(cube.rounds),
+        "total_news": sum(platforms.values()),
+        "platforms": dict(platforms),
+        "keywords": dict(keywords),
+        "sample_titles": [[title_platforms[title], title] for title, _ in ranked],
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+
+def extend_day_summary(
+    summary: Dict,
+    state: Dict,
+    rounds: List[Tuple[str, float, Dict, Dict]],
+    extract_keywords: Callable[[str], List[str]],
+    complete: bool
+) -> Dict:
+    """
+    把新轮次合并进已有的单日摘要（只对各平台首次出现的标题分词）
+
+    样本候选在原有样本与新标题中重新按热门关键词排序，与整体重建的结果可能略有出入。
+
+    Args:
+        summary: 上一份单日摘要
+        state: 增量状态 {"titles": {platform_id: [title, ...]}}，原地更新
+        rounds: [(轮次文件名, 修改时间, titles_by_id, id_to_name), ...]
+        extract_keywords: 关键词提取函数
+        complete: 该日期是否已结束
+
+    Returns:
+        新的单日摘要
+    """
+    keywords = Counter(summary["keywords"])
+    platforms = Counter(summary["platforms"])
+    round_times = dict(summary["rounds"])
+    platform_titles = state.setdefault("titles", {})
+    new_titles: Dict[str, Tuple[str, List[str]]] = {}
+
+    for round_name, mtime, titles_by_id, id_to_name in rounds:
+        round_times[round_name] = mtime
+        for platform_id, titles in titles_by_id.items():
+            platform_name = id_to_name.get(platform_id, platform_id)
+            known = platform_titles.setdefault(platform_id, [])
+            seen = set(known)
+            for title in titles.keys():
+                if title in seen:
+                    continue
+                seen.add(title)
+                known.append(title)
+                title_keywords = list(extract_keywords(title))
+                keywords.update(title_keywords)
+                platforms[platform_name] += 1
+                new_titles.setdefault(title, (platform_name, title_keywords))
+
+    top_keywords = keywords.most_common(SAMPLE_KEYWORDS)
+    top_set = {keyword for keyword, _ in top_keywords}
+    candidates: Dict[str, str] = {}
+    for platform_name, title in summary["sample_titles"]:
+        candidates.setdefault(title, platform_name)
+    for title, (platform_name, title_keywords) in new_titles.items():
+        if top_set.intersection(title_keywords):
+            candidates.setdefault(title, platform_name)
+
+    ranked = sorted(
+        candidates.items(),
+        key=lambda item: (-_sample_score(item[0], top_keywords[:10]), item[0])
+    )[:MAX_SAMPLE_TITLES]
+
+    return {
+        "version": SUMMARY_VERSION,
+        "date": summary["date"],
+        "complete": complete,
+        "rounds": round_times,
+        "total_news": sum(platforms.values()),
+        "platforms": dict(platforms),
+        "keywords": dict(keywords),
+        "sample_titles": [[platform_name, title] for title, platform_name in ranked],
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+
+def _sample_score(title: str, top_keywords: List[Tuple[str, int]]) -> int:
+    """样本得分：标题包含的热门关键词出现次数之和"""
+    title_lower = title.lower()
+    return sum(count for keyword, count in top_keywords if keyword.lower() in title_lower)
+
+
+def merge_summaries(summaries: List[Dict], top_n: int = 10, sample_size: int = 5) -> Dict:
+    """
+    合并多日摘要
+
+    Args:
+        summaries: 单日摘要列表
+        top_n: 热门关键词数量
+        sample_size: 精选样本数量
+
+    Returns:
+        {"total_news", "platforms", "keywords", "keywords_count", "top_keywords", "sample_news"}
+    """
+    keywords = Counter()
+    platforms = Counter()
+    total_news = 0
+    candidates: Dict[Tuple[str, str], None] = {}
+
+    for summary in summaries:
+        keywords.update(summary["keywords"])
+        platforms.update(summary["platforms"])
+        total_news += summary["total_news"]
+        for platform_name, title in summary["sample_titles"]:
+            candidates.setdefault((platform_name, title), None)
+
+    top_keywords = keywords.most_common(top_n)
+    scored = [
+        (_sample_score(title, top_keywords), title, platform_name)
+        for platform_name, title in candidates
+    ]
+    scored.sort(key=lambda item: (-item[0], item[1]))
+
+    return {
+        "total_news": total_news,
+        "platforms": dict(platforms),
+        "keywords": keywords,
+        "keywords_count": len(keywords),
+        "top_keywords": top_keywords,
+        "sample_news": [
+            {"platform": platform_name, "title": title}
+            for _, title, platform_name in scored[:sample_size]
+        ]
+    }
+
+
+class SummaryStore:
+    """每日摘要存储（磁盘物化 + 当天增量刷新）"""
+
+    def __init__(self, parser, keyword_cube: KeywordCubeService, cache_dir: Optional[str] = None):
+        """
+        初始化摘要存储
+
+        Args:
+            parser: ParserService 实例
+            keyword_cube: 关键词立方体服务（负责按轮次增量解析）
+            cache_dir: 可写的摘要缓存目录（相对路径基于项目根目录），
+                None 时直接写 output/<日期>/
+        """
+        self.parser = parser
+        self.keyword_cube = keyword_cube
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir is not None and not self.cache_dir.is_absolute():
+            self.cache_dir = self.parser.project_root / self.cache_dir
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._unwritable = set()
+        self._lock = Lock()
+
+    def _paths(self, date_folder: str) -> Tuple[Path, Optional[Path]]:
+        """(output 下的摘要路径, 缓存目录下的摘要路径)"""
+        output_path = self.parser.project_root / "output" / date_folder / SUMMARY_FILE
+        cache_path = self.cache_dir / date_folder / SUMMARY_FILE if self.cache_dir else None
+        return output_path, cache_path
+
+    def _remember(self, date_folder: str, summary: Dict) -> None:
+        with self._lock:
+            self._memory[date_folder] = summary
+            self._memory.move_to_end(date_folder)
+            while len(self._memory) > MEMORY_DAYS:
+                self._memory.popitem(last=False)
+
+    def get_day(self, date: datetime) -> Dict:
+        """
+        获取单日摘要，磁盘上的摘要与轮次文件一致时直接返回
+
+        Args:
+            date: 日期对象
+
+        Returns:
+            单日摘要
+
+        Raises:
+            DataNotFoundError: 数据不存在
+        """
+        date_folder, round_files = list_round_files(self.parser, date)
+        output_path, cache_path = self._paths(date_folder)
+        current_rounds = {f.name: mtime for f, mtime in round_files}
+
+        with self._lock:
+            summary = self._memory.get(date_folder)
+        if summary is not None and summary.get("rounds") == current_rounds:
+            return summary
+
+        for path in (output_path, cache_path):
+            if path is None:
+                continue
+            summary = self._load(path)
+            if summary is not None and summary.get("rounds") == current_rounds:
+                self._remember(date_folder, summary)
+                return summary
+
+        cube = self.keyword_cube.get_day(date)
+        complete = date.date() < datetime.now().date()
+        summary = build_day_summary(cube, complete)
+        self._remember(date_folder, summary)
+        self._save(cache_path or output_path, summary)
+        return summary
+
+    def iter_range(self, start_date: datetime, end_date: datetime) -> Iterator[Tuple[datetime, Dict]]:
+        """
+        按日期顺序遍历范围内有数据的单日摘要
+
+        Args:
+            start_date: 开始日期
+            end_date: 结束日期
+
+        Yields:
+            (日期, 单日摘要)
+        """
+        current_date = start_date
+        while current_date.date() <= end_date.date():
+            try:
+                yield current_date, self.get_day(current_date)
+            except DataNotFoundError:
+                pass
+            current_date += timedelta(days=1)
+
+    @staticmethod
+    def _load(summary_path) -> Optional[Dict]:
+        return _load_json(summary_path)
+
+    def _save(self, summary_path: Path, summary: Dict) -> None:
+        """原子写入；目录不可写（如只读挂载）时只提示一次，之后只保留内存副本"""
+        root = summary_path.parent.parent
+        if root in self._unwritable:
+            return
+        try:
+            _write_json(summary_path, summary)
+        except OSError as e:
+            self._unwritable.add(root)
+            print(f"Warning: 写入摘要文件 {summary_path} 失败，改为只在内存中保留摘要: {e}")
+
+
+def _load_json(path: Path) -> Optional[Dict]:
+    """读取摘要或状态文件（不存在、损坏或版本不符时返回 None）"""
+    if not path.exists():
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception as e:
+        print(f"Warning: 读取摘要文件 {path} 失败: {e}")
+        return None
+    if not isinstance(data, dict) or data.get("version") != SUMMARY_VERSION:
+        return None
+    return data
+
+
+def _write_json(path: Path, data: Dict) -> None:
+    """原子写入 JSON（失败时清理临时文件并抛出 OSError）"""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def write_day_summary(project_root: Optional[str] = None, date: Optional[datetime] = None) -> Dict:
+    """
+    物化单日摘要到 output/<日期>/summary.json（供爬虫每轮结束后调用）
+
+    爬虫每轮是独立进程，不依赖进程内缓存：上一份 summary.json 与 summary_state.json
+    和现有轮次文件一致、且分词词典未变化时，只解析并合并新增的轮次文件；
+    否则用关键词立方体整体重建一次。
+
+    Args:
+        project_root: 项目根目录
+        date: 日期对象，默认为今天
+
+    Returns:
+        单日摘要
+
+    Raises:
+        DataNotFoundError: 数据不存在
+    """
+    from ..utils.segmenter import get_segmenter
+    from .parser_service import ParserService
+
+    parser = ParserService(project_root)
+    segmenter = get_segmenter(project_root)
+    date = date or datetime.now()
+    date_folder, round_files = list_round_files(parser, date)
+    day_dir = parser.project_root / "output" / date_folder
+    summary_path = day_dir / SUMMARY_FILE
+    state_path = day_dir / SUMMARY_STATE_FILE
+    current_rounds = {f.name: mtime for f, mtime in round_files}
+    complete = date.date() < datetime.now().date()
+    # 学习词条只增不减，词典大小变化即说明分词口径变了
+    dictionary_size = len(segmenter.words)
+
+    summary = _load_json(summary_path)
+    state = _load_json(state_path)
+    incremental = (
+        summary is not None and state is not None
+        and state.get("dictionary_size") == dictionary_size
+        and state.get("rounds") == summary.get("rounds")
+        and all(current_rounds.get(name) == mtime for name, mtime in summary["rounds"].items())
+    )
+
+    if incremental:
+        pending = [(f, mtime) for f, mtime in round_files if f.name not in summary["rounds"]]
+        if not pending and summary.get("complete") == complete:
+            return summary
+        rounds = []
+        for txt_file, mtime in pending:
+            try:
+                titles_by_id, id_to_name = parser.parse_txt_file(txt_file)
+            except Exception as e:
+                print(f"Warning: 解析文件 {txt_file} 失败: {e}")
+                titles_by_id, id_to_name = {}, {}
+            rounds.append((txt_file.name, mtime, titles_by_id, id_to_name))
+        summary = extend_day_summary(summary, state, rounds, segmenter.keywords, complete)
+    else:
+        cube = KeywordCubeService(parser, segmenter.keywords).get_day(date)
+        summary = build_day_summary(cube, complete)
+        state = {
+            "version": SUMMARY_VERSION,
+            "titles": {platform_id: list(titles) for platform_id, titles in cube.platform_titles.items()}
+        }
+
+    state["rounds"] = summary["rounds"]
+    state["dictionary_size"] = dictionary_size
+    # 先写状态再写摘要：中途失败时两者的 rounds 不一致，下一轮整体重建
+    _write_json(state_path, state)
+    _write_json(summary_path, summary)
+    return summary
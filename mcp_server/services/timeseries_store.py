@@ -0,0 +1,432 @@
+"""
+日内时序存储服务
+
+txt 数据按轮次记录排名，但读入后被合并成 ranks 列表，丢失了时间信息。
+此服务把每一轮的 (标题ID, 平台, 轮次时间, 排名) 写入紧凑的列式数组，
+并维护按小时降采样的汇总，使话题热度、排名速度和爆发检测可以按小时回答，
+而不必反复读取日期目录。
+"""
+
+from array import array
+from bisect import insort
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..utils.errors import DataNotFoundError
+from .keyword_cube import list_round_files, parse_round_time
+
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class DayTimeSeries:
+    """
+    单日排名时序
+
+    - title_col / platform_col / minute_col / rank_col: 每次观测一行的列式数组
+    - round_index: [(轮次分钟, 起始行, 结束行)]，按时间排序
+    - title_rows: {title_id: 行号数组}，按标题取轨迹
+    - hourly: 24 个小时桶，{(title_id, platform_idx): [轮次数, 最佳排名, 排名和]}
+    """
+
+    def __init__(self, date_str: str, day: datetime):
+        self.date_str = date_str
+        self.day = day.replace(hour=0, minute=0, second=0, microsecond=0)
+        self.rounds: "OrderedDict[str, float]" = OrderedDict()
+        self.id_to_name: Dict[str, str] = {}
+
+        self.titles: List[str] = []
+        self._titles_lower: List[str] = []
+        self._title_ids: Dict[str, int] = {}
+        self.platforms: List[str] = []
+        self._platform_ids: Dict[str, int] = {}
+
+        self.title_col = array("I")
+        self.platform_col = array("H")
+        self.minute_col = array("H")
+        self.rank_col = array("H")
+
+        self.round_index: List[Tuple[int, int, int]] = []
+        self.title_rows: Dict[int, array] = {}
+        self.hourly: List[Dict[Tuple[int, int], List[int]]] = [dict() for _ in range(24)]
+
+    def ingest_round(
+        self,
+        round_name: str,
+        mtime: float,
+        titles_by_id: Dict,
+        id_to_name: Dict
+    ) -> None:
+        """
+        合并一轮爬取数据（无法从文件名解析时间的轮次只登记不入库）
+
+        Args:
+            round_name: 轮次文件名
+            mtime: 文件修改时间
+            titles_by_id: parse_txt_file 返回的 {platform_id: {title: info}}
+            id_to_name: 平台ID到名称映射
+        """
+        self.rounds[round_name] = mtime
+        self.id_to_name.update(id_to_name)
+
+        parsed = parse_round_time(round_name)
+        if parsed is None:
+            return
+        hour, minute = parsed
+        minute_of_day = hour * 60 + minute
+        bucket = self.hourly[hour]
+
+        start_row = len(self.title_col)
+        for platform_id, titles in titles_by_id.items():
+            pid = self._platform_id(platform_id)
+            for title, info in titles.items():
+                tid = self._title_id(title)
+                ranks = info.get("ranks") or [0]
+                rank = min(max(int(ranks[0]), 0), 0xFFFF)
+
+                row = len(self.title_col)
+                self.title_col.append(tid)
+                self.platform_col.append(pid)
+                self.minute_col.append(minute_of_day)
+                self.rank_col.append(rank)
+                self.title_rows.setdefault(tid, array("I")).append(row)
+
+                stats = bucket.get((tid, pid))
+                if stats is None:
+                    bucket[(tid, pid)] = [1, rank, rank]
+                else:
+                    stats[0] += 1
+                    stats[1] = min(stats[1], rank)
+                    stats[2] += rank
+
+        insort(self.round_index, (minute_of_day, start_row, len(self.title_col)))
+
+    def _title_id(self, title: str) -> int:
+        tid = self._title_ids.get(title)
+        if tid is None:
+            tid = len(self.titles)
+            self._title_ids[title] = tid
+            self.titles.append(title)
+            self._titles_lower.append(title.lower())
+        return tid
+
+    def _platform_id(self, platform_id: str) -> int:
+        pid = self._platform_ids.get(platform_id)
+        if pid is None:
+            pid = len(self.platforms)
+            self._platform_ids[platform_id] = pid
+            self.platforms.append(platform_id)
+        return pid
+
+    # ==================== 查询 ====================
+
+    def hours(self) -> List[int]:
+        """有数据的小时（升序）"""
+        return sorted({minute // 60 for minute, _, _ in self.round_index})
+
+    def latest_minute(self) -> Optional[int]:
+        """最近一轮的分钟数（当天 0 点起算）"""
+        return self.round_index[-1][0] if self.round_index else None
+
+    def match_titles(self, topic: str) -> Set[int]:
+        """
+        查找包含话题（不区分大小写）的标题ID
+
+        Args:
+            topic: 话题关键词
+
+        Returns:
+            标题ID集合
+        """
+        topic = topic.lower()
+        return {tid for tid, title in enumerate(self._titles_lower) if topic in title}
+
+    def hourly_counts(self, title_ids: Optional[Set[int]] = None) -> Dict[int, int]:
+        """
+        每小时在榜的 (标题, 平台) 数量
+
+        Args:
+            title_ids: 标题ID过滤，None 表示全部
+
+        Returns:
+            {hour: count}，只包含有数据的小时
+        """
+        counts = {}
+        for hour in self.hours():
+            bucket = self.hourly[hour]
+            if title_ids is None:
+                counts[hour] = len(bucket)
+            else:
+                counts[hour] = sum(1 for tid, _ in bucket if tid in title_ids)
+        return counts
+
+    def entries_between(self, start_minute: int, end_minute: int) -> Set[Tuple[int, int]]:
+        """
+        时间窗口内出现过的 (title_id, platform_idx)
+
+        Args:
+            start_minute: 起始分钟（包含）
+            end_minute: 结束分钟（不包含）
+
+        Returns:
+            去重后的观测键集合
+        """
+        entries: Set[Tuple[int, int]] = set()
+        for minute, start_row, end_row in self.round_index:
+            if start_minute <= minute < end_minute:
+                entries.update(zip(self.title_col[start_row:end_row], self.platform_col[start_row:end_row]))
+        return entries
+
+    def trajectory(self, title_id: int, platform_id: Optional[str] = None) -> List[Tuple[int, str, int]]:
+        """
+        标题的排名轨迹
+
+        Args:
+            title_id: 标题ID
+            platform_id: 平台过滤（可选）
+
+        Returns:
+            [(分钟, 平台ID, 排名)]，按时间排序
+        """
+        points = []
+        for row in self.title_rows.get(title_id, ()):
+            platform = self.platforms[self.platform_col[row]]
+            if platform_id and platform != platform_id:
+                continue
+            points.append((self.minute_col[row], platform, self.rank_col[row]))
+        points.sort()
+        return points
+
+    def hourly_rollup(self, title_id: int) -> Dict[int, Dict]:
+        """
+        标题按小时汇总的排名
+
+        Args:
+            title_id: 标题ID
+
+        Returns:
+            {hour: {"rounds", "best_rank", "avg_rank"}}（跨平台合并）
+        """
+        rollup = {}
+        for hour, bucket in enumerate(self.hourly):
+            rounds = best = total = 0
+            for (tid, _), (count, best_rank, rank_sum) in bucket.items():
+                if tid != title_id:
+                    continue
+                best = best_rank if not rounds else min(best, best_rank)
+                rounds += count
+                total += rank_sum
+            if rounds:
+                rollup[hour] = {
+                    "rounds": rounds,
+                    "best_rank": best,
+                    "avg_rank": round(total / rounds, 2)
+                }
+        return rollup
+
+    def velocity(self, title_id: int) -> Dict[str, float]:
+        """
+        排名速度（最小二乘斜率，名次/小时；负数表示排名上升）
+
+        Args:
+            title_id: 标题ID
+
+        Returns:
+            {platform_id: slope}，观测少于两轮的平台不返回
+        """
+        by_platform: Dict[str, List[Tuple[int, int]]] = {}
+        for minute, platform, rank in self.trajectory(title_id):
+            by_platform.setdefault(platform, []).append((minute, rank))
+
+        slopes = {}
+        for platform, points in by_platform.items():
+            slope = _slope(points)
+            if slope is not None:
+                slopes[platform] = round(slope * 60, 3)
+        return slopes
+
+
+def _slope(points: List[Tuple[int, int]]) -> Optional[float]:
+    """最小二乘斜率（y/x），x 只有一个取值时返回 None"""
+    n = len(points)
+    if n < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0:
+        return None
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    return cov / var_x
+
+
+class TimeSeriesService:
+    """排名时序服务（按天缓存，按轮次增量构建）"""
+
+    def __init__(self, parser, max_days: int = 32):
+        """
+        初始化时序服务
+
+        Args:
+            parser: ParserService 实例
+            max_days: 内存中最多保留的天数
+        """
+        self.parser = parser
+        self.max_days = max_days
+        self._days: "OrderedDict[str, DayTimeSeries]" = OrderedDict()
+        self._lock = Lock()
+
+    def get_day(self, date: datetime = None) -> DayTimeSeries:
+        """
+        获取指定日期的时序，只解析尚未合并的新轮次文件
+
+        Args:
+            date: 日期对象，默认为今天
+
+        Returns:
+            单日时序
+
+        Raises:
+            DataNotFoundError: 数据不存在
+        """
+        date = date or datetime.now()
+        date_folder, round_files = list_round_files(self.parser, date)
+
+        with self._lock:
+            series = self._days.get(date_folder)
+
+            # 已合并的轮次文件被改写时整体重建
+            if series is not None:
+                current = dict((f.name, mtime) for f, mtime in round_files)
+                if any(current.get(name) != mtime for name, mtime in series.rounds.items()):
+                    series = None
+
+            if series is None:
+                series = DayTimeSeries(date_folder, date)
+
+            for txt_file, mtime in round_files:
+                if txt_file.name in series.rounds:
+                    continue
+                self._ingest_file(series, txt_file, mtime)
+
+            if not series.round_index:
+                raise DataNotFoundError(
+                    f"{date_folder} 没有可用的轮次时序数据",
+                    suggestion="请检查数据文件名是否为 HH时MM分.txt 格式"
+                )
+
+            self._days[date_folder] = series
+            self._days.move_to_end(date_folder)
+            while len(self._days) > self.max_days:
+                self._days.popitem(last=False)
+
+            return series
+
+    def _ingest_file(self, series: DayTimeSeries, txt_file: Path, mtime: float) -> None:
+        """解析并合并单个轮次文件"""
+        try:
+            titles_by_id, id_to_name = self.parser.parse_txt_file(txt_file)
+        except Exception as e:
+            print(f"Warning: 解析文件 {txt_file} 失败: {e}")
+            series.rounds[txt_file.name] = mtime
+            return
+
+        series.ingest_round(txt_file.name, mtime, titles_by_id, id_to_name)
+
+    def iter_days(self, start: datetime, end: datetime) -> Iterable[DayTimeSeries]:
+        """
+        按日期顺序产出范围内有数据的单日时序
+
+        Args:
+            start: 开始日期
+            end: 结束日期（包含）
+        """
+        for offset in range((end.date() - start.date()).days + 1):
+            try:
+                yield self.get_day(start + timedelta(days=offset))
+            except DataNotFoundError:
+                continue
+
+    def hourly_topic_series(self, topic: str, start: datetime, end: datetime) -> List[Dict]:
+        """
+        话题按小时的在榜数量
+
+        Args:
+            topic: 话题关键词
+            start: 开始日期
+            end: 结束日期（包含）
+
+        Returns:
+            [{"date", "hour", "count", "sample_titles"}]，只包含有数据的小时
+        """
+        series_data = []
+        for series in self.iter_days(start, end):
+            title_ids = series.match_titles(topic)
+            date_str = series.day.strftime("%Y-%m-%d")
+            for hour, count in series.hourly_counts(title_ids).items():
+                samples = []
+                for tid, _ in series.hourly[hour]:
+                    if tid in title_ids and series.titles[tid] not in samples:
+                        samples.append(series.titles[tid])
+                        if len(samples) >= 3:
+                            break
+                series_data.append({
+                    "date": date_str,
+                    "hour": f"{hour:02d}:00",
+                    "count": count,
+                    "sample_titles": samples
+                })
+        return series_data
+
+    def latest_time(self, date: datetime = None) -> datetime:
+        """
+        指定日期最近一轮的时间
+
+        Args:
+            date: 日期对象，默认为今天
+
+        Returns:
+            轮次时间
+
+        Raises:
+            DataNotFoundError: 数据不存在
+        """
+        series = self.get_day(date)
+        return series.day + timedelta(minutes=series.latest_minute())
+
+    def titles_between(self, start: datetime, end: datetime) -> Set[Tuple[str, str]]:
+        """
+        时间窗口内在榜的 (platform_id, title)
+
+        Args:
+            start: 起始时间（包含）
+            end: 结束时间（不包含）
+
+        Returns:
+            去重后的 (平台ID, 标题) 集合
+        """
+        entries: Set[Tuple[str, str]] = set()
+        for series in self.iter_days(start, end):
+            start_minute = max(0, int((start - series.day).total_seconds() // 60))
+            end_minute = min(MINUTES_PER_DAY, int((end - series.day).total_seconds() // 60))
+            if end_minute <= start_minute:
+                continue
+            for tid, pid in series.entries_between(start_minute, end_minute):
+                entries.add((series.platforms[pid], series.titles[tid]))
+        return entries
+
+    def invalidate(self, date: datetime = None) -> None:
+        """
+        丢弃指定日期的时序
+
+        Args:
+            date: 日期对象，None 表示清空全部
+        """
+        with self._lock:
+            if date is None:
+                self._days.clear()
+            else:
+                self._days.pop(self.parser.get_date_folder_name(date), None)
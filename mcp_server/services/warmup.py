@@ -0,0 +1,173 @@
+"""
+启动预热服务
+
+MCP 服务器启动后在后台线程中预先加载当天数据缓存、关键词立方体、
+时间序列索引、每日摘要和关注词匹配结果，服务器同时已经可以接收请求。
+预热进度通过 WarmupState 暴露，用于就绪检查（/ready）和 get_system_status。
+
+环境变量：
+- MCP_PRELOAD: 是否启用预热（默认 true）
+- MCP_PRELOAD_DAYS: 预热最近几天的原始数据缓存（默认 1，即只预热今天）
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from threading import Lock, Thread
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class WarmupState:
+    """预热状态（线程安全）"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.status = "idle"
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.steps: List[Dict] = []
+
+    def start(self) -> None:
+        with self._lock:
+            self.status = "warming"
+            self.started_at = time.time()
+            self.finished_at = None
+            self.steps = []
+
+    def record(self, name: str, elapsed: float, error: Optional[str] = None) -> None:
+        with self._lock:
+            step = {"name": name, "elapsed_ms": round(elapsed * 1000, 1), "success": error is None}
+            if error:
+                step["error"] = error
+            self.steps.append(step)
+
+    def finish(self) -> None:
+        with self._lock:
+            self.status = "ready"
+            self.finished_at = time.time()
+
+    def skip(self) -> None:
+        """未启用预热时直接视为就绪"""
+        with self._lock:
+            self.status = "ready"
+            self.started_at = self.finished_at = time.time()
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def to_dict(self) -> Dict:
+        """
+        导出状态
+
+        Returns:
+            {"status", "ready", "elapsed_ms", "steps"}
+        """
+        with self._lock:
+            end = self.finished_at or time.time()
+            return {
+                "status": self.status,
+                "ready": self.status == "ready",
+                "elapsed_ms": round((end - self.started_at) * 1000, 1) if self.started_at else 0,
+                "steps": list(self.steps)
+            }
+
+
+_warmup_state = WarmupState()
+
+
+def get_warmup_state() -> WarmupState:
+    """
+    获取全局预热状态
+
+    Returns:
+        全局 WarmupState 实例
+    """
+    return _warmup_state
+
+
+def preload_enabled(default: bool = True) -> bool:
+    """
+    读取环境变量 MCP_PRELOAD
+
+    Args:
+        default: 未设置时的默认值
+
+    Returns:
+        是否启用预热
+    """
+    value = os.environ.get("MCP_PRELOAD", "").strip().lower()
+    if not value:
+        return default
+    return value in ("true", "1", "yes")
+
+
+def build_warmup_steps(tools: Dict, days: int = 1) -> List[Tuple[str, Callable[[], object]]]:
+    """
+    构建预热步骤（按首个请求最常用的顺序排列）
+
+    Args:
+        tools: _get_tools() 返回的工具实例字典
+        days: 预热最近几天的原始数据缓存
+
+    Returns:
+        [(步骤名, 可调用对象), ...]
+    """
+    data_service = tools["data"].data_service
+    analytics = tools["analytics"]
+    parser = data_service.parser
+    today = datetime.now()
+
+    steps = [
+        ("today_titles", lambda: parser.read_all_titles_for_date()),
+        ("latest_news", lambda: tools["data"].get_latest_news()),
+        ("frequency_words", lambda: tools["data"].get_trending_topics()),
+        ("keyword_cube", lambda: analytics.keyword_cube.get_day(today)),
+        ("timeseries", lambda: analytics.timeseries.get_day(today)),
+        ("daily_summary", lambda: analytics.summary_store.get_day(today)),
+    ]
+
+    if days > 1:
+        start = today - timedelta(days=days - 1)
+        steps.append((
+            f"recent_{days}_days",
+            lambda: sum(1 for _ in parser.read_range(start, today - timedelta(days=1)))
+        ))
+
+    return steps
+
+
+def start_warmup(tools: Dict, days: Optional[int] = None) -> Thread:
+    """
+    在后台线程中执行预热，单个步骤失败不影响后续步骤
+
+    Args:
+        tools: _get_tools() 返回的工具实例字典
+        days: 预热最近几天，默认读取 MCP_PRELOAD_DAYS（默认 1）
+
+    Returns:
+        预热线程（守护线程）
+    """
+    if days is None:
+        days = max(1, int(os.environ.get("MCP_PRELOAD_DAYS", "1") or "1"))
+
+    state = get_warmup_state()
+    state.start()
+
+    def run():
+        for name, step in build_warmup_steps(tools, days):
+            started = time.time()
+            try:
+                step()
+                state.record(name, time.time() - started)
+            except Exception as e:
+                # 今天尚无数据等情况只记录，不阻塞就绪
+                state.record(name, time.time() - started, str(e))
+        state.finish()
+        # stdio 模式下 stdout 是协议通道，日志写到 stderr
+        print(f"[MCP] 预热完成，耗时 {state.to_dict()['elapsed_ms']} ms", file=sys.stderr)
+
+    thread = Thread(target=run, name="mcp-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -4,13 +4,20 @@
 提供热度趋势分析、平台对比、关键词共现、情感分析等高级分析功能。
 """
 
-import re
+import heapq
+import os
 from collections import Counter, defaultdict
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from difflib import SequenceMatcher
 
 from ..services.data_service import DataService
+from ..services.keyword_cube import KeywordCubeService
+from ..services.summary_store import SummaryStore, merge_summaries
+from ..services.timeseries_store import TimeSeriesService
+from ..utils.pagination import top_k
+from ..utils.prompt_budget import DEFAULT_PROMPT_TOKENS, estimate_tokens, pack_by_budget
+from ..utils.segmenter import get_segmenter
 from ..utils.validators import (
     validate_platforms,
     validate_limit,
@@ -21,6 +28,10 @@ from ..utils.validators import (
 from ..utils.errors import MCPError, InvalidParameterError, DataNotFoundError
 
 
+# 提示词中数据概览、平台分组标题等可变部分预留的 token 数
+PROMPT_GROUP_OVERHEAD_TOKENS = 200
+
+
 def calculate_news_weight(news_data: Dict, rank_threshold: int = 5) -> float:
     """
     计算新闻权重（用于排序）
@@ -85,6 +96,20 @@ class AnalyticsTools:
             project_root: 项目根目录
         """
         self.data_service = DataService(project_root)
+        self.segmenter = get_segmenter(project_root)
+        self.keyword_cube = KeywordCubeService(
+            self.data_service.parser,
+            self._extract_keywords,
+            learn_titles=self.segmenter.learn,
+            dictionary_version=self.segmenter.refresh_learned
+        )
+        self.timeseries = TimeSeriesService(self.data_service.parser)
+        # docker 中 output 只读挂载：可用 SUMMARY_CACHE_DIR 指定可写的摘要缓存目录
+        self.summary_store = SummaryStore(
+            self.data_service.parser,
+            self.keyword_cube,
+            cache_dir=os.environ.get("SUMMARY_CACHE_DIR")
+        )
 
     def analyze_data_insights_unified(
         self,
@@ -255,7 +280,7 @@ class AnalyticsTools:
             date_range: 日期范围（可选）
                        - **格式**: {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}
                        - **默认**: 不指定时默认分析最近7天
-            granularity: 时间粒度，仅支持 day（天）
+            granularity: 时间粒度，day（天）或 hour（小时，按爬取轮次时间汇总）
 
         Returns:
             趋势分析结果字典
@@ -288,12 +313,11 @@ class AnalyticsTools:
             # 验证参数
             topic = validate_keyword(topic)
 
-            # 验证粒度参数（只支持day）
-            if granularity != "day":
-                from ..utils.errors import InvalidParameterError
+            # 验证粒度参数
+            if granularity not in ("day", "hour"):
                 raise InvalidParameterError(
                     f"不支持的粒度参数: {granularity}",
-                    suggestion="当前仅支持 'day' 粒度，因为底层数据按天聚合"
+                    suggestion="支持的粒度: 'day'（天）、'hour'（小时）"
                 )
 
             # 处理日期范围（不指定时默认最近7天）
@@ -308,23 +332,27 @@ class AnalyticsTools:
 
             # 收集趋势数据
             trend_data = []
-            current_date = start_date
-
-            while current_date <= end_date:
-                try:
-                    all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
-                    )
 
+            if granularity == "hour":
+                # 按小时：来自轮次时序存储，只包含有爬取数据的小时
+                trend_data = self.timeseries.hourly_topic_series(topic, start_date, end_date)
+                for item in trend_data:
+                    item["time"] = f"{item['date']} {item['hour']}"
+            else:
+                for current_date, day_data in self.data_service.parser.read_range(
+                    start_date, end_date, include_missing=True
+                ):
                     # 统计该时间点的话题出现次数
                     count = 0
                     matched_titles = []
 
-                    for _, titles in all_titles.items():
-                        for title in titles.keys():
-                            if topic.lower() in title.lower():
-                                count += 1
-                                matched_titles.append(title)
+                    if day_data is not None:
+                        all_titles = day_data[0]
+                        for _, titles in all_titles.items():
+                            for title in titles.keys():
+                                if topic.lower() in title.lower():
+                                    count += 1
+                                    matched_titles.append(title)
 
                     trend_data.append({
                         "date": current_date.strftime("%Y-%m-%d"),
@@ -332,16 +360,6 @@ class AnalyticsTools:
                         "sample_titles": matched_titles[:3]  # 只保留前3个样本
                     })
 
-                except DataNotFoundError:
-                    trend_data.append({
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "count": 0,
-                        "sample_titles": []
-                    })
-
-                # 按天增加时间
-                current_date += timedelta(days=1)
-
             # 计算趋势指标
             counts = [item["count"] for item in trend_data]
             total_days = (end_date - start_date).days + 1
@@ -359,7 +377,7 @@ class AnalyticsTools:
                 # 找到峰值时间
                 max_count = max(counts)
                 peak_index = counts.index(max_count)
-                peak_time = trend_data[peak_index]["date"]
+                peak_time = trend_data[peak_index].get("time", trend_data[peak_index]["date"])
             else:
                 change_rate = 0
                 peak_time = None
@@ -452,24 +470,24 @@ class AnalyticsTools:
             current_date = start_date
             while current_date <= end_date:
                 try:
-                    all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
-                    )
+                    cube = self.keyword_cube.get_day(current_date)
 
-                    for platform_id, titles in all_titles.items():
-                        platform_name = id_to_name.get(platform_id, platform_id)
+                    for platform_id, titles in cube.platform_titles.items():
+                        platform_name = cube.id_to_name.get(platform_id, platform_id)
+                        stats = platform_stats[platform_name]
 
-                        for title in titles.keys():
-                            platform_stats[platform_name]["total_news"] += 1
-                            platform_stats[platform_name]["unique_titles"].add(title)
+                        stats["total_news"] += len(titles)
+                        stats["unique_titles"].update(titles)
 
-                            # 如果指定了话题，统计包含话题的新闻
-                            if topic and topic.lower() in title.lower():
-                                platform_stats[platform_name]["topic_mentions"] += 1
+                        # 如果指定了话题，统计包含话题的新闻
+                        if topic:
+                            topic_lower = topic.lower()
+                            stats["topic_mentions"] += sum(
+                                1 for title in titles if topic_lower in title.lower()
+                            )
 
-                            # 提取关键词（简单分词）
-                            keywords = self._extract_keywords(title)
-                            platform_stats[platform_name]["top_keywords"].update(keywords)
+                        # 关键词计数直接取自立方体
+                        stats["top_keywords"].update(cube.platform_counts[platform_id])
 
                 except DataNotFoundError:
                     pass
@@ -557,53 +575,27 @@ class AnalyticsTools:
             min_frequency = validate_limit(min_frequency, default=3, max_limit=100)
             top_n = validate_top_n(top_n, default=20)
 
-            # 读取今天的数据
-            all_titles, _, _ = self.data_service.parser.read_all_titles_for_date()
-
-            # 关键词共现统计
-            cooccurrence = Counter()
-            keyword_titles = defaultdict(list)
-
-            for platform_id, titles in all_titles.items():
-                for title in titles.keys():
-                    # 提取关键词
-                    keywords = self._extract_keywords(title)
-
-                    # 记录每个关键词出现的标题
-                    for kw in keywords:
-                        keyword_titles[kw].append(title)
-
-                    # 计算两两共现
-                    if len(keywords) >= 2:
-                        for i, kw1 in enumerate(keywords):
-                            for kw2 in keywords[i+1:]:
-                                # 统一排序，避免重复
-                                pair = tuple(sorted([kw1, kw2]))
-                                cooccurrence[pair] += 1
-
-            # 过滤低频共现
-            filtered_pairs = [
-                (pair, count) for pair, count in cooccurrence.items()
-                if count >= min_frequency
-            ]
-
-            # 排序并取TOP N
-            top_pairs = sorted(filtered_pairs, key=lambda x: x[1], reverse=True)[:top_n]
+            # 读取今天的关键词立方体
+            cube = self.keyword_cube.get_day()
+
+            # 过滤低频共现并取TOP N
+            top_pairs = heapq.nlargest(
+                top_n,
+                (
+                    (pair, count) for pair, count in cube.cooccurrence.items()
+                    if count >= min_frequency
+                ),
+                key=lambda x: x[1]
+            )
 
             # 构建结果
             result_pairs = []
             for (kw1, kw2), count in top_pairs:
-                # 找出同时包含两个关键词的标题样本
-                titles_with_both = [
-                    title for title in keyword_titles[kw1]
-                    if kw2 in self._extract_keywords(title)
-                ]
-
                 result_pairs.append({
                     "keyword1": kw1,
                     "keyword2": kw2,
                     "cooccurrence_count": count,
-                    "sample_titles": titles_with_both[:3]
+                    "sample_titles": cube.titles_with(kw1, kw2, limit=3)
                 })
 
             return {
@@ -635,7 +627,8 @@ class AnalyticsTools:
         date_range: Optional[Dict[str, str]] = None,
         limit: int = 50,
         sort_by_weight: bool = True,
-        include_url: bool = False
+        include_url: bool = False,
+        max_prompt_tokens: int = DEFAULT_PROMPT_TOKENS
     ) -> Dict:
         """
         情感倾向分析 - 生成用于 AI 情感分析的结构化提示词
@@ -650,6 +643,8 @@ class AnalyticsTools:
             limit: 返回新闻数量限制，默认50，最大100
             sort_by_weight: 是否按权重排序，默认True（推荐）
             include_url: 是否包含URL链接，默认False（节省token）
+            max_prompt_tokens: 提示词的 token 预算（粗略估算），默认6000，
+                               超出预算的新闻不会放入提示词
 
         Returns:
             包含 AI 提示词和新闻数据的结构化结果
@@ -682,6 +677,11 @@ class AnalyticsTools:
                 topic = validate_keyword(topic)
             platforms = validate_platforms(platforms)
             limit = validate_limit(limit, default=50)
+            if max_prompt_tokens < 1000:
+                raise InvalidParameterError(
+                    "max_prompt_tokens 不能小于 1000",
+                    suggestion="推荐值：4000-16000，取决于所用模型的上下文长度"
+                )
 
             # 处理日期范围
             if date_range:
@@ -691,77 +691,62 @@ class AnalyticsTools:
                 # 默认今天
                 start_date = end_date = datetime.now()
 
-            # 收集新闻数据（支持多天）
-            all_news_items = []
-            current_date = start_date
+            # 流式聚合：同一平台的同一标题跨天合并 ranks，不保留逐条明细列表
+            unique_news = {}
+            total_matches = 0
+
+            for current_date, (all_titles, id_to_name, _) in self.data_service.parser.read_range(
+                start_date, end_date, platform_ids=platforms
+            ):
+                date_str = current_date.strftime("%Y-%m-%d")
+                for platform_id, titles in all_titles.items():
+                    platform_name = id_to_name.get(platform_id, platform_id)
+                    for title, info in titles.items():
+                        # 如果指定了话题，只收集包含话题的标题
+                        if topic and topic.lower() not in title.lower():
+                            continue
+
+                        total_matches += 1
+                        key = (platform_name, title)
+                        existing = unique_news.get(key)
+                        if existing is not None:
+                            # 合并 ranks（如果同一新闻在多天出现）
+                            existing["ranks"].extend(info.get("ranks", []))
+                            existing["count"] = len(existing["ranks"])
+                            continue
 
-            while current_date <= end_date:
-                try:
-                    all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date,
-                        platform_ids=platforms
-                    )
-
-                    # 收集该日期的新闻
-                    for platform_id, titles in all_titles.items():
-                        platform_name = id_to_name.get(platform_id, platform_id)
-                        for title, info in titles.items():
-                            # 如果指定了话题，只收集包含话题的标题
-                            if topic and topic.lower() not in title.lower():
-                                continue
-
-                            news_item = {
-                                "platform": platform_name,
-                                "title": title,
-                                "ranks": info.get("ranks", []),
-                                "count": len(info.get("ranks", [])),
-                                "date": current_date.strftime("%Y-%m-%d")
-                            }
-
-                            # 条件性添加 URL 字段
-                            if include_url:
-                                news_item["url"] = info.get("url", "")
-                                news_item["mobileUrl"] = info.get("mobileUrl", "")
-
-                            all_news_items.append(news_item)
+                        news_item = {
+                            "platform": platform_name,
+                            "title": title,
+                            "ranks": list(info.get("ranks", [])),
+                            "count": len(info.get("ranks", [])),
+                            "date": date_str
+                        }
 
-                except DataNotFoundError:
-                    # 该日期没有数据，继续下一天
-                    pass
+                        # 条件性添加 URL 字段
+                        if include_url:
+                            news_item["url"] = info.get("url", "")
+                            news_item["mobileUrl"] = info.get("mobileUrl", "")
 
-                # 下一天
-                current_date += timedelta(days=1)
+                        unique_news[key] = news_item
 
-            if not all_news_items:
+            if not unique_news:
                 time_desc = "今天" if start_date == end_date else f"{start_date.strftime('%Y-%m-%d')} 至 {end_date.strftime('%Y-%m-%d')}"
                 raise DataNotFoundError(
                     f"未找到相关新闻（{time_desc}）",
                     suggestion="请尝试其他话题、日期范围或平台"
                 )
 
-            # 去重（同一标题只保留一次）
-            unique_news = {}
-            for item in all_news_items:
-                key = f"{item['platform']}::{item['title']}"
-                if key not in unique_news:
-                    unique_news[key] = item
-                else:
-                    # 合并 ranks（如果同一新闻在多天出现）
-                    existing = unique_news[key]
-                    existing["ranks"].extend(item["ranks"])
-                    existing["count"] = len(existing["ranks"])
-
-            deduplicated_news = list(unique_news.values())
-
-            # 按权重排序（如果启用）
+            # 候选：按权重堆选取（O(n log k)），多取一些以便近似去重和预算裁剪后仍能凑满 limit
             if sort_by_weight:
-                deduplicated_news.sort(
-                    key=lambda x: calculate_news_weight(x),
-                    reverse=True
-                )
+                candidates = top_k(unique_news.values(), limit * 4, key=calculate_news_weight)
+            else:
+                candidates = unique_news.values()
 
-            # 限制返回数量
-            selected_news = deduplicated_news[:limit]
+            # 按 token 预算装入提示词，同时去掉近似重复的标题
+            selected_news, pack_stats = self._select_news_for_prompt(
+                candidates, limit, topic, max_prompt_tokens
+            )
 
             # 生成 AI 提示词
             ai_prompt = self._create_sentiment_analysis_prompt(
@@ -779,10 +764,14 @@ class AnalyticsTools:
                 "success": True,
                 "method": "ai_prompt_generation",
                 "summary": {
-                    "total_found": len(deduplicated_news),
+                    "total_found": len(unique_news),
                     "returned_count": len(selected_news),
                     "requested_limit": limit,
-                    "duplicates_removed": len(all_news_items) - len(deduplicated_news),
+                    "duplicates_removed": total_matches - len(unique_news),
+                    "near_duplicates_removed": pack_stats["near_duplicates"],
+                    "skipped_over_budget": pack_stats["over_budget"],
+                    "prompt_tokens_estimate": estimate_tokens(ai_prompt),
+                    "max_prompt_tokens": max_prompt_tokens,
                     "topic": topic,
                     "time_range": time_range_desc,
                     "platforms": list(set(item["platform"] for item in selected_news)),
@@ -794,10 +783,13 @@ class AnalyticsTools:
             }
 
             # 如果返回数量少于请求数量，增加提示
-            if len(selected_news) < limit and len(deduplicated_news) >= limit:
-                result["note"] = "返回数量少于请求数量是因为去重逻辑（同一标题在不同平台只保留一次）"
-            elif len(deduplicated_news) < limit:
-                result["note"] = f"在指定时间范围内仅找到 {len(deduplicated_news)} 条匹配的新闻"
+            if len(selected_news) < limit and len(unique_news) >= limit:
+                if pack_stats["over_budget"]:
+                    result["note"] = f"返回数量少于请求数量是因为提示词预算（约 {max_prompt_tokens} tokens）已用完"
+                else:
+                    result["note"] = "返回数量少于请求数量是因为去重逻辑（近似重复的标题只保留一次）"
+            elif len(unique_news) < limit:
+                result["note"] = f"在指定时间范围内仅找到 {len(unique_news)} 条匹配的新闻"
 
             return result
 
@@ -815,6 +807,37 @@ class AnalyticsTools:
                 }
             }
 
+    def _select_news_for_prompt(
+        self,
+        candidates,
+        limit: int,
+        topic: Optional[str],
+        max_prompt_tokens: int
+    ):
+        """
+        按优先级顺序挑选放入提示词的新闻（近似去重 + token 预算）
+
+        Args:
+            candidates: 已按优先级排序的候选新闻
+            limit: 最多选取条数
+            topic: 话题关键词
+            max_prompt_tokens: 提示词总预算
+
+        Returns:
+            (选中的新闻列表, pack_by_budget 的统计信息)
+        """
+        # 扣除固定模板和平台分组标题的开销
+        template_tokens = estimate_tokens(self._create_sentiment_analysis_prompt([], topic))
+        budget = max_prompt_tokens - template_tokens - PROMPT_GROUP_OVERHEAD_TOKENS
+
+        return pack_by_budget(
+            candidates,
+            render=lambda item: f"100. {item['title']} [{item.get('date', '')}]",
+            token_budget=budget,
+            max_items=limit,
+            title_of=lambda item: item["title"]
+        )
+
     def _create_sentiment_analysis_prompt(
         self,
         news_data: List[Dict],
@@ -1202,37 +1225,11 @@ class AnalyticsTools:
                     end_date = datetime.now()
                     start_date = end_date - timedelta(days=6)
 
-            # 收集数据
-            all_keywords = Counter()
-            all_platforms_news = defaultdict(int)
-            all_titles_list = []
-
-            current_date = start_date
-            while current_date <= end_date:
-                try:
-                    all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
-                    )
-
-                    for platform_id, titles in all_titles.items():
-                        platform_name = id_to_name.get(platform_id, platform_id)
-                        all_platforms_news[platform_name] += len(titles)
-
-                        for title in titles.keys():
-                            all_titles_list.append({
-                                "title": title,
-                                "platform": platform_name,
-                                "date": current_date.strftime("%Y-%m-%d")
-                            })
-
-                            # 提取关键词
-                            keywords = self._extract_keywords(title)
-                            all_keywords.update(keywords)
-
-                except DataNotFoundError:
-                    pass
-
-                current_date += timedelta(days=1)
+            # 合并每日摘要（已结束的日期直接读取磁盘上的摘要文件）
+            day_summaries = [summary for _, summary in self.summary_store.iter_range(start_date, end_date)]
+            merged = merge_summaries(day_summaries)
+            all_keywords = merged["keywords"]
+            all_platforms_news = merged["platforms"]
 
             # 生成报告
             report_title = f"{'每日' if report_type == 'daily' else '每周'}新闻热点摘要"
@@ -1248,7 +1245,7 @@ class AnalyticsTools:
 
 ## 📊 数据概览
 
-- **总新闻数**: {len(all_titles_list)}
+- **总新闻数**: {merged["total_news"]}
 - **覆盖平台**: {len(all_platforms_news)}
 - **热门关键词数**: {len(all_keywords)}
 
@@ -1280,28 +1277,10 @@ class AnalyticsTools:
             # 添加样本新闻（按权重选择，确保确定性）
             markdown += "\n## 📰 精选新闻样本\n\n"
 
-            # 确定性选取：按标题的权重排序，取前5条
+            # 确定性选取：候选标题按包含的 TOP 关键词出现次数排序，取前5条
             # 这样相同输入总是返回相同结果
-            if all_titles_list:
-                # 计算每条新闻的权重分数（基于关键词出现次数）
-                news_with_scores = []
-                for news in all_titles_list:
-                    # 简单权重：统计包含TOP关键词的次数
-                    score = 0
-                    title_lower = news['title'].lower()
-                    for keyword, count in all_keywords.most_common(10):
-                        if keyword.lower() in title_lower:
-                            score += count
-                    news_with_scores.append((news, score))
-
-                # 按权重降序排序，权重相同则按标题字母顺序（确保确定性）
-                news_with_scores.sort(key=lambda x: (-x[1], x[0]['title']))
-
-                # 取前5条
-                sample_news = [item[0] for item in news_with_scores[:5]]
-
-                for news in sample_news:
-                    markdown += f"- [{news['platform']}] {news['title']}\n"
+            for news in merged["sample_news"]:
+                markdown += f"- [{news['platform']}] {news['title']}\n"
 
             markdown += "\n---\n\n*本报告由 TrendRadar MCP 自动生成*\n"
 
@@ -1314,10 +1293,11 @@ class AnalyticsTools:
                 },
                 "markdown_report": markdown,
                 "statistics": {
-                    "total_news": len(all_titles_list),
+                    "total_news": merged["total_news"],
                     "platforms_count": len(all_platforms_news),
                     "keywords_count": len(all_keywords),
-                    "top_keyword": all_keywords.most_common(1)[0] if all_keywords else None
+                    "top_keyword": all_keywords.most_common(1)[0] if all_keywords else None,
+                    "days_merged": len(day_summaries)
                 }
             }
 
@@ -1383,26 +1363,20 @@ class AnalyticsTools:
             current_date = start_date
             while current_date <= end_date:
                 try:
-                    all_titles, id_to_name, timestamps = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
-                    )
+                    cube = self.keyword_cube.get_day(current_date)
 
-                    for platform_id, titles in all_titles.items():
-                        platform_name = id_to_name.get(platform_id, platform_id)
+                    for platform_id, titles in cube.platform_titles.items():
+                        platform_name = cube.id_to_name.get(platform_id, platform_id)
+                        activity = platform_activity[platform_name]
 
-                        platform_activity[platform_name]["news_count"] += len(titles)
-                        platform_activity[platform_name]["days_active"].add(current_date.strftime("%Y-%m-%d"))
+                        activity["news_count"] += len(titles)
+                        activity["days_active"].add(current_date.strftime("%Y-%m-%d"))
 
-                        # 统计更新次数（基于文件数量）
-                        platform_activity[platform_name]["total_updates"] += len(timestamps)
+                        # 统计更新次数（该平台出现的轮次数）
+                        activity["total_updates"] += len(cube.platform_rounds[platform_id])
 
-                        # 统计时间分布（基于文件名中的时间）
-                        for filename in timestamps.keys():
-                            # 解析文件名中的小时（格式：HHMM.txt）
-                            match = re.match(r'(\d{2})(\d{2})\.txt', filename)
-                            if match:
-                                hour = int(match.group(1))
-                                platform_activity[platform_name]["hourly_distribution"][hour] += 1
+                        # 统计时间分布（基于轮次文件名中的时间）
+                        activity["hourly_distribution"].update(cube.round_hours(platform_id))
 
                 except DataNotFoundError:
                     pass
@@ -1509,32 +1483,21 @@ class AnalyticsTools:
 
             # 收集话题历史数据
             lifecycle_data = []
-            current_date = start_date
-            while current_date <= end_date:
-                try:
-                    all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
-                    )
-
-                    # 统计该日的话题出现次数
-                    count = 0
-                    for _, titles in all_titles.items():
+            for current_date, day_data in self.data_service.parser.read_range(
+                start_date, end_date, include_missing=True
+            ):
+                # 统计该日的话题出现次数（无数据的日期计为 0）
+                count = 0
+                if day_data is not None:
+                    for _, titles in day_data[0].items():
                         for title in titles.keys():
                             if topic.lower() in title.lower():
                                 count += 1
 
-                    lifecycle_data.append({
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "count": count
-                    })
-
-                except DataNotFoundError:
-                    lifecycle_data.append({
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "count": 0
-                    })
-
-                current_date += timedelta(days=1)
+                lifecycle_data.append({
+                    "date": current_date.strftime("%Y-%m-%d"),
+                    "count": count
+                })
 
             # 计算分析天数
             total_days = (end_date - start_date).days + 1
@@ -1575,6 +1538,36 @@ class AnalyticsTools:
             else:
                 lifecycle_stage = "稳定期"
 
+            # 峰值日按小时的分布与主要标题的排名走势（来自轮次时序存储）
+            peak_day_hourly = []
+            peak_day_titles = []
+            peak_hour = None
+            try:
+                peak_series = self.timeseries.get_day(start_date + timedelta(days=peak_index))
+                title_ids = peak_series.match_titles(topic)
+                hourly_counts = peak_series.hourly_counts(title_ids)
+                peak_day_hourly = [
+                    {"hour": f"{hour:02d}:00", "count": count}
+                    for hour, count in hourly_counts.items()
+                ]
+                if any(hourly_counts.values()):
+                    peak_hour = f"{max(hourly_counts, key=hourly_counts.get):02d}:00"
+
+                # 在榜轮次最多的几条标题：逐小时排名与排名速度（名次/小时，负数表示上升）
+                top_ids = sorted(title_ids, key=lambda tid: len(peak_series.title_rows.get(tid, ())), reverse=True)[:5]
+                for tid in top_ids:
+                    peak_day_titles.append({
+                        "title": peak_series.titles[tid],
+                        "rounds": len(peak_series.title_rows.get(tid, ())),
+                        "velocity": peak_series.velocity(tid),
+                        "hourly": [
+                            {"hour": f"{hour:02d}:00", **stats}
+                            for hour, stats in peak_series.hourly_rollup(tid).items()
+                        ]
+                    })
+            except DataNotFoundError:
+                pass
+
             # 分类：昙花一现 vs 持续热点
             active_days = sum(1 for c in counts if c > 0)
 
@@ -1594,10 +1587,13 @@ class AnalyticsTools:
                     "total_days": total_days
                 },
                 "lifecycle_data": lifecycle_data,
+                "peak_day_hourly": peak_day_hourly,
+                "peak_day_titles": peak_day_titles,
                 "analysis": {
                     "first_appearance": first_appearance,
                     "last_appearance": last_appearance,
                     "peak_date": peak_date,
+                    "peak_hour": peak_hour,
                     "peak_count": max_count,
                     "active_days": active_days,
                     "avg_daily_mentions": round(avg_count, 2),
@@ -1628,6 +1624,11 @@ class AnalyticsTools:
         """
         异常热度检测 - 自动识别突然爆火的话题
 
+        以最近一轮爬取时间为终点，比较最近 time_window 小时与之前
+        同样长度窗口内各关键词的平均每轮在榜标题数（取关键词立方体中
+        物化的逐轮计数，除以窗口内轮次数，避免两个窗口轮次不同造成假增长）。
+        基准窗口未出现的关键词需在当前窗口有至少 5 条不同标题才算新话题。
+
         Args:
             threshold: 热度突增倍数阈值
             time_window: 检测时间窗口（小时）
@@ -1659,63 +1660,64 @@ class AnalyticsTools:
 
             time_window = validate_limit(time_window, default=24, max_limit=72)
 
-            # 读取当前和之前的数据
-            current_all_titles, _, _ = self.data_service.parser.read_all_titles_for_date()
-
-            # 读取昨天的数据作为基准
-            yesterday = datetime.now() - timedelta(days=1)
-            try:
-                previous_all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
-                    date=yesterday
-                )
-            except DataNotFoundError:
-                previous_all_titles = {}
-
-            # 统计当前的关键词频率
-            current_keywords = Counter()
-            current_keyword_titles = defaultdict(list)
-
-            for _, titles in current_all_titles.items():
-                for title in titles.keys():
-                    keywords = self._extract_keywords(title)
-                    current_keywords.update(keywords)
-
-                    for kw in keywords:
-                        current_keyword_titles[kw].append(title)
+            # 以今天最近一轮为终点划分当前窗口与基准窗口
+            window_end = self.timeseries.latest_time() + timedelta(minutes=1)
+            window = timedelta(hours=time_window)
+            current_keywords, current_rounds = self.keyword_cube.window_counts(window_end - window, window_end)
+            previous_keywords, previous_rounds = self.keyword_cube.window_counts(
+                window_end - 2 * window, window_end - window
+            )
+            window_info = {
+                "current_start": (window_end - window).strftime("%Y-%m-%d %H:%M"),
+                "baseline_start": (window_end - 2 * window).strftime("%Y-%m-%d %H:%M"),
+                "end": window_end.strftime("%Y-%m-%d %H:%M"),
+                "current_rounds": current_rounds,
+                "baseline_rounds": previous_rounds
+            }
 
-            # 统计之前的关键词频率
-            previous_keywords = Counter()
+            if not previous_rounds:
+                return {
+                    "success": True,
+                    "viral_topics": [],
+                    "total_detected": 0,
+                    "window": window_info,
+                    "message": "基准窗口内没有爬取数据，无法比较热度变化（爬虫运行时间不足两个检测窗口）",
+                    "suggestion": f"缩短 time_window（当前 {time_window} 小时）或等待积累更多数据"
+                }
 
-            for _, titles in previous_all_titles.items():
-                for title in titles.keys():
-                    keywords = self._extract_keywords(title)
-                    previous_keywords.update(keywords)
+            current_cubes = list(self.keyword_cube.iter_days(window_end - window, window_end))[::-1]
+            previous_cubes = list(self.keyword_cube.iter_days(window_end - 2 * window, window_end - window))[::-1]
+            current_titles = self._window_title_counts(window_end - window, window_end, current_cubes)
+            previous_titles = self._window_title_counts(window_end - 2 * window, window_end - window, previous_cubes)
 
             # 检测异常热度
             viral_topics = []
 
-            for keyword, current_count in current_keywords.items():
-                previous_count = previous_keywords.get(keyword, 0)
+            for keyword, current_total in current_keywords.items():
+                current_rate = current_total / current_rounds
+                previous_rate = previous_keywords.get(keyword, 0) / previous_rounds
 
-                # 计算增长倍数
-                if previous_count == 0:
-                    # 新出现的话题
-                    if current_count >= 5:  # 至少出现5次才认为是爆火
+                # 计算增长倍数（平均每轮在榜标题数之比）
+                if previous_rate == 0:
+                    # 新出现的话题：至少 5 条不同标题才认为是爆火（同一标题多轮在榜只算一次）
+                    if current_titles[keyword] >= 5:
                         growth_rate = float('inf')
                         is_viral = True
                     else:
                         continue
                 else:
-                    growth_rate = current_count / previous_count
+                    growth_rate = current_rate / previous_rate
                     is_viral = growth_rate >= threshold
 
                 if is_viral:
                     viral_topics.append({
                         "keyword": keyword,
-                        "current_count": current_count,
-                        "previous_count": previous_count,
+                        "current_count": current_titles[keyword],
+                        "previous_count": previous_titles[keyword],
+                        "current_per_round": round(current_rate, 2),
+                        "previous_per_round": round(previous_rate, 2),
                         "growth_rate": round(growth_rate, 2) if growth_rate != float('inf') else "新话题",
-                        "sample_titles": current_keyword_titles[keyword][:3],
+                        "sample_titles": self._cube_samples(current_cubes, keyword),
                         "alert_level": "高" if growth_rate > threshold * 2 else "中"
                     })
 
@@ -1739,6 +1741,7 @@ class AnalyticsTools:
                 "total_detected": len(viral_topics),
                 "threshold": threshold,
                 "time_window": time_window,
+                "window": window_info,
                 "detection_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             }
 
@@ -1756,6 +1759,60 @@ class AnalyticsTools:
                 }
             }
 
+    def get_burst_topics(self, limit: int = 20) -> Dict:
+        """
+        当前爆发话题 - 读取爬虫每轮更新的流式爆发检测状态
+
+        与 detect_viral_topics 的固定窗口对比不同，这里的基线按半衰期指数衰减，
+        结果在每轮爬取时增量更新，查询时不再扫描历史数据。
+
+        Args:
+            limit: 返回数量，默认20
+
+        Returns:
+            当前处于爆发状态的关键词及检测器状态
+
+        Examples:
+            >>> tools = AnalyticsTools()
+            >>> result = tools.get_burst_topics(limit=10)
+            >>> print(result['bursts'])
+        """
+        try:
+            limit = validate_limit(limit, default=20, max_limit=100)
+
+            from ..services.burst_detector import read_bursts
+
+            summary = read_bursts(str(self.data_service.parser.project_root), limit)
+            if not summary["rounds"]:
+                raise DataNotFoundError(
+                    "爆发检测状态尚未建立",
+                    suggestion="爬虫每轮运行后会自动更新爆发检测状态，请确认 burst_detection.enabled 为 true 并至少运行一轮"
+                )
+
+            result = {
+                "success": True,
+                **summary,
+                "total_detected": len(summary["bursts"])
+            }
+            if summary.get("stale"):
+                result["note"] = f"爆发检测状态早于最新一轮抓取（{summary['newest_round']}），结果可能已过时，请确认爬虫的 burst_detection 正常运行"
+
+            return result
+
+        except MCPError as e:
+            return {
+                "success": False,
+                "error": e.to_dict()
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": {
+                    "code": "INTERNAL_ERROR",
+                    "message": str(e)
+                }
+            }
+
     def predict_trending_topics(
         self,
         lookahead_hours: int = 6,
@@ -1802,16 +1859,7 @@ class AnalyticsTools:
                 date = datetime.now() - timedelta(days=days_ago)
 
                 try:
-                    all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=date
-                    )
-
-                    # 统计关键词
-                    keywords_count = Counter()
-                    for _, titles in all_titles.items():
-                        for title in titles.keys():
-                            keywords = self._extract_keywords(title)
-                            keywords_count.update(keywords)
+                    keywords_count = self.keyword_cube.get_day(date).keyword_counts()
 
                     # 记录每个关键词的历史数据
                     for keyword, count in keywords_count.items():
@@ -1822,18 +1870,8 @@ class AnalyticsTools:
 
             # 添加今天的数据
             try:
-                all_titles, _, _ = self.data_service.parser.read_all_titles_for_date()
-
-                keywords_count = Counter()
-                keyword_titles = defaultdict(list)
-
-                for _, titles in all_titles.items():
-                    for title in titles.keys():
-                        keywords = self._extract_keywords(title)
-                        keywords_count.update(keywords)
-
-                        for kw in keywords:
-                            keyword_titles[kw].append(title)
+                today_cube = self.keyword_cube.get_day()
+                keywords_count = today_cube.keyword_counts()
 
                 for keyword, count in keywords_count.items():
                     keyword_trends[keyword].append(count)
@@ -1885,7 +1923,7 @@ class AnalyticsTools:
                             "confidence": round(confidence, 2),
                             "trend_data": trend_data,
                             "prediction": "上升趋势，可能成为热点",
-                            "sample_titles": keyword_titles.get(keyword, [])[:3]
+                            "sample_titles": today_cube.titles_with(keyword, limit=3)
                         })
 
             # 按置信度和增长率排序
@@ -1922,7 +1960,7 @@ class AnalyticsTools:
 
     def _extract_keywords(self, title: str, min_length: int = 2) -> List[str]:
         """
-        从标题中提取关键词（简单实现）
+        从标题中提取关键词（共享分词器，结果按标题缓存）
 
         Args:
             title: 标题文本
@@ -1931,22 +1969,48 @@ class AnalyticsTools:
         Returns:
             关键词列表
         """
-        # 移除URL和特殊字符
-        title = re.sub(r'http[s]?://\S+', '', title)
-        title = re.sub(r'[^\w\s]', ' ', title)
+        return self.segmenter.keywords(title, min_length=min_length)
 
-        # 简单分词（按空格和常见分隔符）
-        words = re.split(r'[\s，。！？、]+', title)
+    def _window_title_counts(self, start: datetime, end: datetime, cubes: List) -> Counter:
+        """
+        时间窗口内各关键词的去重标题数（关键词取自立方体中已缓存的标题分词结果）
 
-        # 过滤停用词和短词
-        stopwords = {'的', '了', '在', '是', '我', '有', '和', '就', '不', '人', '都', '一', '一个', '上', '也', '很', '到', '说', '要', '去', '你', '会', '着', '没有', '看', '好', '自己', '这'}
+        Args:
+            start: 起始时间（包含）
+            end: 结束时间（不包含）
+            cubes: 覆盖该窗口的单日关键词立方体
 
-        keywords = [
-            word.strip() for word in words
-            if word.strip() and len(word.strip()) >= min_length and word.strip() not in stopwords
-        ]
+        Returns:
+            {keyword: 包含该关键词的不同 (平台, 标题) 数}
+        """
+        counts = Counter()
+        for _, title in self.timeseries.titles_between(start, end):
+            for cube in cubes:
+                keywords = cube.title_keywords.get(title)
+                if keywords is not None:
+                    counts.update(set(keywords))
+                    break
+        return counts
+
+    @staticmethod
+    def _cube_samples(cubes: List, keyword: str, limit: int = 3) -> List[str]:
+        """
+        从关键词立方体（按日期倒序）中取包含关键词的标题样本
 
-        return keywords
+        Args:
+            cubes: 单日关键词立方体列表
+            keyword: 关键词
+            limit: 返回数量
+
+        Returns:
+            标题列表
+        """
+        samples = []
+        for cube in cubes:
+            samples.extend(cube.titles_with(keyword, limit=limit - len(samples)))
+            if len(samples) >= limit:
+                break
+        return samples
 
     def _calculate_similarity(self, text1: str, text2: str) -> float:
         """
@@ -17,6 +17,7 @@ from ..utils.validators import (
     validate_date_query
 )
 from ..utils.errors import MCPError
+from ..utils.pagination import decode_cursor, encode_cursor, query_fingerprint
 
 
 class DataQueryTools:
@@ -213,7 +214,8 @@ class DataQueryTools:
         date_query: Optional[str] = None,
         platforms: Optional[List[str]] = None,
         limit: Optional[int] = None,
-        include_url: bool = False
+        include_url: bool = False,
+        cursor: Optional[str] = None
     ) -> Dict:
         """
         按日期查询新闻，支持自然语言日期
@@ -226,9 +228,10 @@ class DataQueryTools:
             platforms: 平台ID列表，如 ['zhihu', 'weibo']
             limit: 返回条数限制，默认50
             include_url: 是否包含URL链接，默认False（节省token）
+            cursor: 分页游标（可选），传入上一页返回的 next_cursor 获取下一页
 
         Returns:
-            新闻列表字典
+            新闻列表字典，还有更多数据时包含 next_cursor
 
         Example:
             >>> tools = DataQueryTools()
@@ -242,6 +245,13 @@ class DataQueryTools:
             ... )
             >>> print(result['total'])
             20
+            >>> # 下一页
+            >>> result = tools.get_news_by_date(
+            ...     date_query="昨天",
+            ...     platforms=['zhihu'],
+            ...     limit=20,
+            ...     cursor=result['next_cursor']
+            ... )
         """
         try:
             # 参数验证 - 默认今天
@@ -251,23 +261,46 @@ class DataQueryTools:
             platforms = validate_platforms(platforms)
             limit = validate_limit(limit, default=50)
 
-            # 获取数据
+            date_str = target_date.strftime("%Y-%m-%d")
+            fingerprint = query_fingerprint(
+                tool="get_news_by_date",
+                date=date_str,
+                platforms=platforms,
+                include_url=include_url
+            )
+            offset = decode_cursor(cursor, fingerprint)["offset"]
+
+            # 获取数据（多取一条用于判断是否还有下一页）
             news_list = self.data_service.get_news_by_date(
                 target_date=target_date,
                 platforms=platforms,
-                limit=limit,
-                include_url=include_url
+                limit=limit + 1,
+                include_url=include_url,
+                offset=offset
             )
+            has_more = len(news_list) > limit
+            news_list = news_list[:limit]
 
-            return {
+            result = {
                 "news": news_list,
                 "total": len(news_list),
-                "date": target_date.strftime("%Y-%m-%d"),
+                "date": date_str,
                 "date_query": date_query,
                 "platforms": platforms,
+                "offset": offset,
+                "has_more": has_more,
                 "success": True
             }
 
+            if has_more:
+                result["next_cursor"] = encode_cursor(
+                    date=date_str,
+                    offset=offset + limit,
+                    fingerprint=fingerprint
+                )
+
+            return result
+
         except MCPError as e:
             return {
                 "success": False,
@@ -281,4 +314,3 @@ class DataQueryTools:
                     "message": str(e)
                 }
             }
-
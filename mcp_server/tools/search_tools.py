@@ -8,9 +8,11 @@ import re
 from collections import Counter
 from datetime import datetime, timedelta
 from difflib import SequenceMatcher
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from ..services.data_service import DataService
+from ..utils.pagination import decode_cursor, encode_cursor, paginate_top_k, query_fingerprint
+from ..utils.segmenter import get_segmenter
 from ..utils.validators import validate_keyword, validate_limit
 from ..utils.errors import MCPError, InvalidParameterError, DataNotFoundError
 
@@ -26,14 +28,9 @@ class SearchTools:
             project_root: 项目根目录
         """
         self.data_service = DataService(project_root)
+        self.segmenter = get_segmenter(project_root)
         # 中文停用词列表
-        self.stopwords = {
-            '的', '了', '在', '是', '我', '有', '和', '就', '不', '人', '都', '一',
-            '一个', '上', '也', '很', '到', '说', '要', '去', '你', '会', '着', '没有',
-            '看', '好', '自己', '这', '那', '来', '被', '与', '为', '对', '将', '从',
-            '以', '及', '等', '但', '或', '而', '于', '中', '由', '可', '可以', '已',
-            '已经', '还', '更', '最', '再', '因为', '所以', '如果', '虽然', '然而'
-        }
+        self.stopwords = self.segmenter.stopwords
 
     def search_news_unified(
         self,
@@ -44,7 +41,8 @@ class SearchTools:
         limit: int = 50,
         sort_by: str = "relevance",
         threshold: float = 0.6,
-        include_url: bool = False
+        include_url: bool = False,
+        cursor: Optional[str] = None
     ) -> Dict:
         """
         统一新闻搜索工具 - 整合多种搜索模式
@@ -68,9 +66,15 @@ class SearchTools:
                 - "date": 按日期排序
             threshold: 相似度阈值（仅fuzzy模式有效），0-1之间，默认0.6
             include_url: 是否包含URL链接，默认False（节省token）
+            cursor: 分页游标（可选），传入上一页返回的 next_cursor 获取下一页
 
         Returns:
-            搜索结果字典，包含匹配的新闻列表
+            搜索结果字典，包含匹配的新闻列表；还有更多结果时包含 next_cursor
+
+        Note:
+            sort_by="date" 时从最近的日期开始逐日扫描，凑满一页即返回，
+            此时 total_found 为本页数量，是否还有更多以 has_more 为准；
+            其余排序方式使用堆选取 Top-K。
 
         Examples:
             - search_news_unified(query="人工智能", search_mode="keyword")
@@ -120,40 +124,54 @@ class SearchTools:
                 # 使用最新可用日期
                 start_date = end_date = latest
 
-            # 收集所有匹配的新闻
-            all_matches = []
-            current_date = start_date
-
-            while current_date <= end_date:
-                try:
-                    all_titles, id_to_name, timestamps = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date,
-                        platform_ids=platforms
-                    )
+            fingerprint = query_fingerprint(
+                tool="search_news",
+                query=query,
+                search_mode=search_mode,
+                start=start_date.strftime("%Y-%m-%d"),
+                end=end_date.strftime("%Y-%m-%d"),
+                platforms=platforms,
+                sort_by=sort_by,
+                threshold=threshold,
+                include_url=include_url
+            )
+            position = decode_cursor(cursor, fingerprint)
+
+            if sort_by == "date":
+                # 按日期倒序流式扫描，凑满一页即停止
+                results, total_found, next_position = self._collect_page_by_date(
+                    query, search_mode, start_date, end_date, platforms,
+                    threshold, include_url, position, limit
+                )
+                next_cursor = encode_cursor(fingerprint=fingerprint, **next_position) if next_position else None
+            else:
+                if sort_by == "relevance":
+                    sort_key = lambda x: x.get("similarity_score", 1.0)
+                else:  # weight
+                    from .analytics import calculate_news_weight
+                    sort_key = calculate_news_weight
+
+                # 流式收集匹配项，堆选取当前页（不对全部结果排序）
+                counter = {"total": 0}
+
+                def iter_all_matches():
+                    for _, _, _, item in self._iter_matches(
+                        query, search_mode, start_date, end_date, platforms,
+                        threshold, include_url, newest_first=False
+                    ):
+                        counter["total"] += 1
+                        yield item
+
+                offset = position["offset"]
+                page = paginate_top_k(iter_all_matches(), offset, limit, key=sort_key)
+                results = page[:limit]
+                total_found = counter["total"]
+                next_cursor = (
+                    encode_cursor(offset=offset + limit, fingerprint=fingerprint)
+                    if len(page) > limit else None
+                )
 
-                    # 根据搜索模式执行不同的搜索逻辑
-                    if search_mode == "keyword":
-                        matches = self._search_by_keyword_mode(
-                            query, all_titles, id_to_name, current_date, include_url
-                        )
-                    elif search_mode == "fuzzy":
-                        matches = self._search_by_fuzzy_mode(
-                            query, all_titles, id_to_name, current_date, threshold, include_url
-                        )
-                    else:  # entity
-                        matches = self._search_by_entity_mode(
-                            query, all_titles, id_to_name, current_date, include_url
-                        )
-
-                    all_matches.extend(matches)
-
-                except DataNotFoundError:
-                    # 该日期没有数据，继续下一天
-                    pass
-
-                current_date += timedelta(days=1)
-
-            if not all_matches:
+            if not results and not cursor:
                 # 获取可用日期范围用于错误提示
                 earliest, latest = self.data_service.get_available_date_range()
 
@@ -183,18 +201,6 @@ class SearchTools:
                 }
                 return result
 
-            # 统一排序逻辑
-            if sort_by == "relevance":
-                all_matches.sort(key=lambda x: x.get("similarity_score", 1.0), reverse=True)
-            elif sort_by == "weight":
-                from .analytics import calculate_news_weight
-                all_matches.sort(key=lambda x: calculate_news_weight(x), reverse=True)
-            elif sort_by == "date":
-                all_matches.sort(key=lambda x: x.get("date", ""), reverse=True)
-
-            # 限制返回数量
-            results = all_matches[:limit]
-
             # 构建时间范围描述（正确判断是否为今天）
             if start_date.date() == datetime.now().date() and start_date == end_date:
                 time_range_desc = "今天"
@@ -206,22 +212,26 @@ class SearchTools:
             result = {
                 "success": True,
                 "summary": {
-                    "total_found": len(all_matches),
+                    "total_found": total_found,
                     "returned_count": len(results),
                     "requested_limit": limit,
                     "search_mode": search_mode,
                     "query": query,
                     "platforms": platforms or "所有平台",
                     "time_range": time_range_desc,
-                    "sort_by": sort_by
+                    "sort_by": sort_by,
+                    "has_more": next_cursor is not None
                 },
                 "results": results
             }
 
+            if next_cursor:
+                result["next_cursor"] = next_cursor
+
             if search_mode == "fuzzy":
                 result["summary"]["threshold"] = threshold
-                if len(all_matches) < limit:
-                    result["note"] = f"模糊搜索模式下，相似度阈值 {threshold} 仅匹配到 {len(all_matches)} 条结果"
+                if total_found < limit and next_cursor is None:
+                    result["note"] = f"模糊搜索模式下，相似度阈值 {threshold} 仅匹配到 {total_found} 条结果"
 
             return result
 
@@ -239,6 +249,113 @@ class SearchTools:
                 }
             }
 
+    def _iter_matches(
+        self,
+        query: str,
+        search_mode: str,
+        start_date: datetime,
+        end_date: datetime,
+        platforms: Optional[List[str]],
+        threshold: float,
+        include_url: bool,
+        newest_first: bool,
+        resume: Optional[Dict] = None
+    ) -> Iterator[Tuple[str, str, int, Dict]]:
+        """
+        逐日、逐平台流式产出匹配的新闻
+
+        Args:
+            query: 查询内容
+            search_mode: 搜索模式
+            start_date: 开始日期
+            end_date: 结束日期
+            platforms: 平台过滤列表
+            threshold: 相似度阈值（fuzzy模式）
+            include_url: 是否包含URL链接
+            newest_first: 是否从最近的日期开始扫描
+            resume: 游标位置 {"date", "platform", "offset"}，从该位置继续扫描
+
+        Yields:
+            (日期, 平台ID, 平台内序号, 新闻字典)
+        """
+        resume_date = (resume or {}).get("date", "")
+        resume_platform = (resume or {}).get("platform", "")
+        resume_offset = (resume or {}).get("offset", 0)
+
+        # 游标之前的日期不再读取
+        if resume_date:
+            resume_day = datetime.strptime(resume_date, "%Y-%m-%d").date()
+            if newest_first:
+                end_date -= timedelta(days=max(0, (end_date.date() - resume_day).days))
+            else:
+                start_date += timedelta(days=max(0, (resume_day - start_date.date()).days))
+
+        # 并行预读各天数据，没有数据的日期自动跳过
+        for current_date, (all_titles, id_to_name, _) in self.data_service.parser.read_range(
+            start_date, end_date, platform_ids=platforms, newest_first=newest_first
+        ):
+            date_str = current_date.strftime("%Y-%m-%d")
+
+            for platform_id in sorted(all_titles.keys()):
+                at_resume_date = resume_date and date_str == resume_date
+                if at_resume_date and resume_platform and platform_id < resume_platform:
+                    continue
+
+                platform_titles = {platform_id: all_titles[platform_id]}
+
+                # 根据搜索模式执行不同的搜索逻辑
+                if search_mode == "keyword":
+                    matches = self._search_by_keyword_mode(
+                        query, platform_titles, id_to_name, current_date, include_url
+                    )
+                elif search_mode == "fuzzy":
+                    matches = self._search_by_fuzzy_mode(
+                        query, platform_titles, id_to_name, current_date, threshold, include_url
+                    )
+                else:  # entity
+                    matches = self._search_by_entity_mode(
+                        query, platform_titles, id_to_name, current_date, include_url
+                    )
+
+                skip = resume_offset if at_resume_date and platform_id == resume_platform else 0
+                for index, item in enumerate(matches):
+                    if index >= skip:
+                        yield date_str, platform_id, index, item
+
+    def _collect_page_by_date(
+        self,
+        query: str,
+        search_mode: str,
+        start_date: datetime,
+        end_date: datetime,
+        platforms: Optional[List[str]],
+        threshold: float,
+        include_url: bool,
+        position: Dict,
+        limit: int
+    ) -> Tuple[List[Dict], int, Optional[Dict]]:
+        """
+        按日期倒序收集一页结果，凑满即停止扫描
+
+        Returns:
+            (当前页结果, 当前页数量, 下一页游标位置或None)
+        """
+        results = []
+        for date_str, platform_id, index, item in self._iter_matches(
+            query, search_mode, start_date, end_date, platforms,
+            threshold, include_url, newest_first=True, resume=position
+        ):
+            if len(results) >= limit:
+                # 第 limit+1 条即下一页的起点
+                return results, len(results), {
+                    "date": date_str,
+                    "platform": platform_id,
+                    "offset": index
+                }
+            results.append(item)
+
+        return results, len(results), None
+
     def _search_by_keyword_mode(
         self,
         query: str,
@@ -450,20 +567,11 @@ class SearchTools:
         Returns:
             关键词列表
         """
-        # 移除URL和特殊字符
-        text = re.sub(r'http[s]?://\S+', '', text)
-        text = re.sub(r'\[.*?\]', '', text)  # 移除方括号内容
-
-        # 使用正则表达式分词（中文和英文）
-        words = re.findall(r'[\w]+', text)
-
-        # 过滤停用词和短词
-        keywords = [
-            word for word in words
-            if word and len(word) >= min_length and word not in self.stopwords
-        ]
+        # 移除方括号内容
+        text = re.sub(r'\[.*?\]', '', text)
 
-        return keywords
+        # 共享分词器（按文本缓存分词结果）
+        return self.segmenter.keywords(text, min_length=min_length)
 
     def _calculate_keyword_overlap(self, keywords1: List[str], keywords2: List[str]) -> float:
         """
@@ -574,13 +682,12 @@ class SearchTools:
 
             # 收集所有相关新闻
             all_related_news = []
-            current_date = search_start
 
-            while current_date <= search_end:
+            # 并行读取各天数据（没有数据的日期自动跳过）
+            for current_date, (all_titles, id_to_name, _) in self.data_service.parser.read_range(
+                search_start, search_end
+            ):
                 try:
-                    # 读取该日期的数据
-                    all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date(current_date)
-
                     # 搜索相关新闻
                     for platform_id, titles in all_titles.items():
                         platform_name = id_to_name.get(platform_id, platform_id)
@@ -621,16 +728,10 @@ class SearchTools:
 
                                 all_related_news.append(news_item)
 
-                except DataNotFoundError:
-                    # 该日期没有数据，继续下一天
-                    pass
                 except Exception as e:
                     # 记录错误但继续处理其他日期
                     print(f"Warning: 处理日期 {current_date.strftime('%Y-%m-%d')} 时出错: {e}")
 
-                # 移动到下一天
-                current_date += timedelta(days=1)
-
             if not all_related_news:
                 return {
                     "success": True,
@@ -0,0 +1,144 @@
+"""
+分页工具
+
+提供不透明游标的编码/解码，以及基于堆的 Top-K 选取。
+游标记录 日期、平台 和 偏移量，并携带查询参数指纹，
+防止把一个查询的游标用在另一个查询上。
+"""
+
+import base64
+import hashlib
+import heapq
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .errors import InvalidParameterError
+
+
+CURSOR_VERSION = 1
+
+
+def query_fingerprint(**params: Any) -> str:
+    """
+    计算查询参数指纹
+
+    Args:
+        **params: 影响结果集的查询参数
+
+    Returns:
+        短指纹字符串
+    """
+    raw = json.dumps(params, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def encode_cursor(date: str = "", platform: str = "", offset: int = 0, fingerprint: str = "") -> str:
+    """
+    编码分页游标
+
+    Args:
+        date: 日期（YYYY-MM-DD），按日期扫描时为下一页起始日期
+        platform: 平台ID，按日期扫描时为下一页起始平台
+        offset: 偏移量（全局排序时为全局偏移，按日期扫描时为平台内偏移）
+        fingerprint: 查询参数指纹
+
+    Returns:
+        不透明游标字符串
+    """
+    payload = {"v": CURSOR_VERSION, "d": date, "p": platform, "o": offset, "f": fingerprint}
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], fingerprint: str = "") -> Dict[str, Any]:
+    """
+    解码分页游标
+
+    Args:
+        cursor: 游标字符串，None 或空表示第一页
+        fingerprint: 当前查询参数指纹
+
+    Returns:
+        {"date": str, "platform": str, "offset": int}
+
+    Raises:
+        InvalidParameterError: 游标无效或与当前查询不匹配
+    """
+    if not cursor:
+        return {"date": "", "platform": "", "offset": 0}
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        offset = int(payload.get("o", 0))
+    except Exception:
+        raise InvalidParameterError(
+            "无效的分页游标",
+            suggestion="请使用上一页结果中返回的 next_cursor，或不传 cursor 从第一页开始"
+        )
+
+    if payload.get("v") != CURSOR_VERSION or offset < 0:
+        raise InvalidParameterError(
+            "分页游标版本不匹配",
+            suggestion="请不传 cursor 重新从第一页开始"
+        )
+
+    if fingerprint and payload.get("f") != fingerprint:
+        raise InvalidParameterError(
+            "分页游标与当前查询参数不匹配",
+            suggestion="翻页时请保持除 cursor 以外的参数不变"
+        )
+
+    return {
+        "date": payload.get("d", ""),
+        "platform": payload.get("p", ""),
+        "offset": offset
+    }
+
+
+def top_k(
+    items: Iterable[Any],
+    k: int,
+    key: Callable[[Any], Any],
+    reverse: bool = True
+) -> List[Any]:
+    """
+    使用堆选取前 K 个元素（O(n log k)，不构建完整排序列表）
+
+    Args:
+        items: 可迭代对象（可以是生成器）
+        k: 选取数量
+        key: 排序键函数
+        reverse: True 取最大的 K 个（降序），False 取最小的 K 个（升序）
+
+    Returns:
+        已排序的前 K 个元素；相同键保持输入顺序
+    """
+    if k <= 0:
+        return []
+    if reverse:
+        return heapq.nlargest(k, items, key=key)
+    return heapq.nsmallest(k, items, key=key)
+
+
+def paginate_top_k(
+    items: Iterable[Any],
+    offset: int,
+    limit: int,
+    key: Callable[[Any], Any],
+    reverse: bool = True
+) -> List[Any]:
+    """
+    从全局排序中取出 [offset, offset + limit] 区间（多取一条用于判断是否还有下一页）
+
+    Args:
+        items: 可迭代对象
+        offset: 全局偏移量
+        limit: 每页数量
+        key: 排序键函数
+        reverse: 是否降序
+
+    Returns:
+        最多 limit + 1 个元素
+    """
+    return top_k(items, offset + limit + 1, key=key, reverse=reverse)[offset:]
@@ -0,0 +1,161 @@
+"""
+提示词预算工具
+
+为生成给 AI 的提示词提供：
+- 粗略的 token 估算（中文按字计，其余按约 4 个字符一个 token）
+- 近似重复标题过滤（字符 bigram 的 Jaccard 相似度）
+- 按 token 预算逐条装入候选内容
+"""
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+# 默认提示词预算（token）
+DEFAULT_PROMPT_TOKENS = 6000
+
+_CJK_PATTERN = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uff00-\uffef]")
+_NORMALIZE_PATTERN = re.compile(r"[\s\W_]+", re.UNICODE)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    粗略估算文本的 token 数
+
+    Args:
+        text: 文本
+
+    Returns:
+        估算的 token 数（中日韩字符按 1 个字 1 个 token，其余按 4 个字符 1 个 token）
+    """
+    if not text:
+        return 0
+    cjk = len(_CJK_PATTERN.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def _shingles(title: str) -> Set[str]:
+    normalized = _NORMALIZE_PATTERN.sub("", title.lower())
+    if len(normalized) < 2:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + 2] for i in range(len(normalized) - 1)}
+
+
+class NearDuplicateFilter:
+    """近似重复标题过滤器（基于字符 bigram 的 Jaccard 相似度）"""
+
+    def __init__(self, threshold: float = 0.8):
+        """
+        初始化过滤器
+
+        Args:
+            threshold: 相似度阈值，达到该值视为重复
+        """
+        self.threshold = threshold
+        self._kept: List[Set[str]] = []
+        # bigram -> 已保留标题下标，只和共享 bigram 的标题比较
+        self._index: Dict[str, List[int]] = {}
+
+    def is_duplicate(self, title: str) -> bool:
+        """
+        判断标题是否与已保留标题近似重复（不记录）
+
+        Args:
+            title: 标题
+
+        Returns:
+            True 表示近似重复
+        """
+        shingles = _shingles(title)
+        overlaps: Dict[int, int] = {}
+        for shingle in shingles:
+            for idx in self._index.get(shingle, ()):
+                overlaps[idx] = overlaps.get(idx, 0) + 1
+
+        for idx, common in overlaps.items():
+            union = len(shingles) + len(self._kept[idx]) - common
+            if union and common / union >= self.threshold:
+                return True
+        return False
+
+    def keep(self, title: str) -> None:
+        """
+        记录一个已保留的标题
+
+        Args:
+            title: 标题
+        """
+        shingles = _shingles(title)
+        if not shingles:
+            return
+        idx = len(self._kept)
+        self._kept.append(shingles)
+        for shingle in shingles:
+            self._index.setdefault(shingle, []).append(idx)
+
+    def add(self, title: str) -> bool:
+        """
+        尝试加入一个标题
+
+        Args:
+            title: 标题
+
+        Returns:
+            True 表示不重复并已加入，False 表示与已保留标题近似重复
+        """
+        if self.is_duplicate(title):
+            return False
+        self.keep(title)
+        return True
+
+
+def pack_by_budget(
+    candidates: Iterable[Any],
+    render: Callable[[Any], str],
+    token_budget: int,
+    max_items: int,
+    title_of: Optional[Callable[[Any], str]] = None,
+    dedup_threshold: float = 0.8
+) -> Tuple[List[Any], Dict[str, int]]:
+    """
+    按顺序装入候选内容，直到达到数量上限或 token 预算
+
+    Args:
+        candidates: 已按优先级排序的候选（可以是生成器）
+        render: 候选渲染为提示词中一行文本的函数
+        token_budget: 可用于候选内容的 token 数
+        max_items: 最多装入的条数
+        title_of: 提取标题用于近似去重的函数，None 表示不去重
+        dedup_threshold: 近似重复阈值
+
+    Returns:
+        (已装入的候选列表, 统计信息 {"tokens", "near_duplicates", "over_budget"})
+    """
+    dedup = NearDuplicateFilter(dedup_threshold) if title_of else None
+    packed = []
+    used = 0
+    near_duplicates = 0
+    over_budget = 0
+
+    for item in candidates:
+        if len(packed) >= max_items:
+            break
+        title = title_of(item) if dedup is not None else None
+        if dedup is not None and dedup.is_duplicate(title):
+            near_duplicates += 1
+            continue
+        cost = estimate_tokens(render(item)) + 1
+        if used + cost > token_budget:
+            # 预算不足时继续尝试更短的候选（未装入的标题不参与之后的去重）
+            over_budget += 1
+            continue
+        if dedup is not None:
+            dedup.keep(title)
+        packed.append(item)
+        used += cost
+
+    return packed, {
+        "tokens": used,
+        "near_duplicates": near_duplicates,
+        "over_budget": over_budget
+    }
@@ -0,0 +1,526 @@
+"""
+中文标题分词工具
+
+提供可插拔的离线分词器：默认使用基于词典的正向最大匹配。词典种子来自
+config/frequency_words.txt，并从抓取到的标题中学习在多个标题里重复出现、
+左右邻字多样的 2~4 字片段（learn），学到的词条持久化在 output/learned_words.txt，
+各进程启动时加载，保证跨进程、跨天的分词口径一致。词典未覆盖的中文片段先在虚词处断开，
+再按不重叠的二元组切分。分词结果按标题做 LRU 缓存，同一标题只付出一次分词成本。
+
+mcp_server、corpus 与 console/keyword_expand 共用此模块。
+"""
+
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+# 中文停用词列表
+STOPWORDS = {
+    '的', '了', '在', '是', '我', '有', '和', '就', '不', '人', '都', '一',
+    '一个', '上', '也', '很', '到', '说', '要', '去', '你', '会', '着', '没有',
+    '看', '好', '自己', '这', '那', '来', '被', '与', '为', '对', '将', '从',
+    '以', '及', '等', '但', '或', '而', '于', '中', '由', '可', '可以', '已',
+    '已经', '还', '更', '最', '再', '因为', '所以', '如果', '虽然', '然而'
+}
+
+# 未登录片段在这些虚词处断开，切出的片段也不会以它们开头或结尾
+PARTICLES = frozenset('的了吗呢吧啊呀么和与及或被把')
+
+_URL_PATTERN = re.compile(r'http[s]?://\S+')
+# 中文连续片段 / 英文数字片段
+_RUN_PATTERN = re.compile(r'[\u4e00-\u9fff]+|[A-Za-z0-9][A-Za-z0-9_.+#-]*')
+_CJK_PATTERN = re.compile(r'[\u4e00-\u9fff]')
+_CJK_RUN_PATTERN = re.compile(r'[\u4e00-\u9fff]+')
+
+# 学习到的词条文件默认位置（相对项目根目录）
+DEFAULT_LEARNED_FILE = Path("output") / "learned_words.txt"
+
+
+def learned_words_path(project_root: Optional[str] = None) -> Path:
+    """
+    学习词条文件路径（环境变量 LEARNED_WORDS_PATH 可覆盖）
+
+    Args:
+        project_root: 项目根目录，默认为 mcp_server 的上级目录
+
+    Returns:
+        词条文件路径
+    """
+    root = Path(project_root) if project_root else Path(__file__).parent.parent.parent
+    override = os.environ.get("LEARNED_WORDS_PATH")
+    path = Path(override) if override else DEFAULT_LEARNED_FILE
+    return path if path.is_absolute() else root / path
+
+
+def load_frequency_dictionary(words_file: Path) -> Set[str]:
+    """
+    从关键词配置文件中提取词典词条
+
+    Args:
+        words_file: frequency_words.txt 路径
+
+    Returns:
+        词条集合（忽略过滤词、@数量限制与区域标记）
+    """
+    words = set()
+    if not words_file.exists():
+        return words
+
+    try:
+        with open(words_file, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith(("#", "!", "@", "[")):
+                    continue
+                for part in re.split(r'[|,，]', line):
+                    word = part.strip().lstrip("+").rstrip("+!")
+                    if word and not part.strip().endswith("!"):
+                        words.add(word)
+    except Exception as e:
+        print(f"Warning: 读取分词词典 {words_file} 失败: {e}")
+
+    return words
+
+
+class Segmenter:
+    """
+    词典最大匹配分词器
+
+    中文片段使用正向最大匹配；未命中词典的连续片段在虚词处断开，
+    不超过 3 字的整体保留，更长的按不重叠二元组切分（末尾余字并入最后一组）。
+    英文与数字片段整体保留。
+    """
+
+    name = "maxmatch"
+
+    def __init__(
+        self,
+        words: Optional[Iterable[str]] = None,
+        stopwords: Optional[Iterable[str]] = None,
+        max_word_length: int = 8,
+        cache_size: int = 65536
+    ):
+        """
+        初始化分词器
+
+        Args:
+            words: 词典词条
+            stopwords: 停用词
+            max_word_length: 最大匹配词长
+            cache_size: 标题 → 分词结果的 LRU 缓存容量
+        """
+        self.words: Set[str] = set()
+        self.max_word_length = max_word_length
+        self.stopwords = set(STOPWORDS if stopwords is None else stopwords)
+        self._longest = 1
+        # 从标题学习到的词条，及候选片段的统计：ngram -> [标题数, 左邻字, 右邻字]
+        self.learned: Set[str] = set()
+        self._candidates: Dict[str, list] = {}
+        self._learn_lock = Lock()
+        # 词典版本：每次实际新增词条时加一，使用方据此判断已有分词结果是否过期
+        self.version = 0
+        self.learned_path: Optional[Path] = None
+        self._learned_mtime: Optional[float] = None
+        self.add_words(words or ())
+        self.segment = lru_cache(maxsize=cache_size)(self._segment)
+
+    def add_words(self, words: Iterable[str]) -> None:
+        """
+        添加词典词条（中文词条参与最大匹配）
+
+        Args:
+            words: 词条
+        """
+        added = False
+        for word in words:
+            word = word.strip()
+            if len(word) >= 2 and _CJK_PATTERN.search(word) and word not in self.words:
+                self.words.add(word)
+                self._longest = max(self._longest, min(len(word), self.max_word_length))
+                added = True
+        # 词典变化后旧的分词结果失效
+        if added:
+            self.version += 1
+            if hasattr(self, "segment"):
+                self.segment.cache_clear()
+
+    def _segment(self, text: str) -> Tuple[str, ...]:
+        """对文本分词（未过滤停用词）"""
+        text = _URL_PATTERN.sub(' ', text)
+        tokens: List[str] = []
+        for match in _RUN_PATTERN.finditer(text):
+            run = match.group(0)
+            if _CJK_PATTERN.match(run):
+                tokens.extend(self._segment_cjk(run))
+            else:
+                tokens.append(run.strip("._-"))
+        return tuple(token for token in tokens if token)
+
+    def _segment_cjk(self, run: str) -> List[str]:
+        """对中文片段做正向最大匹配，未登录片段退化为二元组"""
+        tokens: List[str] = []
+        residual_start = None
+        i = 0
+        n = len(run)
+
+        while i < n:
+            matched = 0
+            for length in range(min(self._longest, n - i), 1, -1):
+                if run[i:i + length] in self.words:
+                    matched = length
+                    break
+
+            if matched:
+                if residual_start is not None:
+                    tokens.extend(self._ngrams(run[residual_start:i]))
+                    residual_start = None
+                tokens.append(run[i:i + matched])
+                i += matched
+            else:
+                if residual_start is None:
+                    residual_start = i
+                i += 1
+
+        if residual_start is not None:
+            tokens.extend(self._ngrams(run[residual_start:]))
+        return tokens
+
+    @staticmethod
+    def _pieces(span: str) -> List[str]:
+        """未登录片段在虚词处断开"""
+        pieces: List[str] = []
+        start = 0
+        for i, ch in enumerate(span):
+            if ch in PARTICLES:
+                if i > start:
+                    pieces.append(span[start:i])
+                start = i + 1
+        if start < len(span):
+            pieces.append(span[start:])
+        return pieces
+
+    @classmethod
+    def _ngrams(cls, span: str) -> List[str]:
+        """未登录片段的切分：虚词处断开，短片段整体保留，长片段按不重叠二元组切分"""
+        tokens: List[str] = []
+        for piece in cls._pieces(span):
+            if len(piece) <= 3:
+                tokens.append(piece)
+                continue
+            grams = [piece[i:i + 2] for i in range(0, len(piece) - 1, 2)]
+            if len(piece) % 2:
+                grams[-1] += piece[-1]
+            tokens.extend(grams)
+        return tokens
+
+    def _oov_spans(self, text: str) -> List[str]:
+        """标题中未被词典覆盖的中文片段（已在虚词处断开）"""
+        spans: List[str] = []
+        for run in _CJK_RUN_PATTERN.findall(_URL_PATTERN.sub(' ', text)):
+            i, start, n = 0, 0, len(run)
+            while i < n:
+                matched = 0
+                for length in range(min(self._longest, n - i), 1, -1):
+                    if run[i:i + length] in self.words:
+                        matched = length
+                        break
+                if matched:
+                    spans.extend(self._pieces(run[start:i]))
+                    i += matched
+                    start = i
+                else:
+                    i += 1
+            spans.extend(self._pieces(run[start:]))
+        return [span for span in spans if len(span) >= 2]
+
+    def learn(self, titles: Iterable[str], min_titles: int = 3, max_candidates: int = 200000) -> int:
+        """
+        从标题中学习新词条
+
+        统计未登录片段中 2~4 字子串出现的标题数与左右邻字（片段边界也算一种邻字），
+        出现在至少 min_titles 个标题中、且左右邻字都至少有两种的子串加入词典。
+        只在同一短语里出现的片段（如“发布新款”里的“布新”）邻字单一，不会被收录。
+
+        Args:
+            titles: 标题（同一批内重复的标题只计一次）
+            min_titles: 收录所需的最少标题数
+            max_candidates: 候选统计上限，超出时丢弃只出现过一次的候选
+
+        Returns:
+            本次新收录的词条数
+        """
+        with self._learn_lock:
+            candidates = self._candidates
+            for title in dict.fromkeys(titles):
+                seen: Set[str] = set()
+                for span in self._oov_spans(title):
+                    n = len(span)
+                    for length in range(2, min(4, n) + 1):
+                        for i in range(n - length + 1):
+                            gram = span[i:i + length]
+                            left = span[i - 1] if i > 0 else ''
+                            right = span[i + length] if i + length < n else ''
+                            stat = candidates.get(gram)
+                            if stat is None:
+                                stat = candidates[gram] = [0, set(), set()]
+                            if gram not in seen:
+                                seen.add(gram)
+                                stat[0] += 1
+                            # 只需判断邻字是否多于一种，各保留两种即可
+                            if len(stat[1]) < 2:
+                                stat[1].add(left)
+                            if len(stat[2]) < 2:
+                                stat[2].add(right)
+
+            new_words = [
+                gram for gram, (count, lefts, rights) in candidates.items()
+                if count >= min_titles and len(lefts) >= 2 and len(rights) >= 2
+                and gram not in self.words and gram not in self.stopwords
+                and gram[0] not in PARTICLES and gram[-1] not in PARTICLES
+            ]
+            for gram in new_words:
+                candidates.pop(gram, None)
+
+            if len(candidates) > max_candidates:
+                self._candidates = {
+                    gram: stat for gram, stat in candidates.items() if stat[0] > 1
+                }
+
+        if new_words:
+            self.learned.update(new_words)
+            self.add_words(new_words)
+        return len(new_words)
+
+    def load_learned(self, path: Path) -> int:
+        """
+        加载学习词条文件（每行一个词条），并记住路径供 refresh_learned / save_learned 使用
+
+        Args:
+            path: 词条文件路径
+
+        Returns:
+            新增的词条数
+        """
+        path = Path(path)
+        self.learned_path = path
+        try:
+            mtime = path.stat().st_mtime
+            with open(path, "r", encoding="utf-8") as f:
+                words = [line.strip() for line in f if line.strip()]
+        except FileNotFoundError:
+            self._learned_mtime = None
+            return 0
+        except Exception as e:
+            print(f"Warning: 读取学习词条 {path} 失败: {e}")
+            return 0
+
+        self._learned_mtime = mtime
+        new_words = [word for word in words if word not in self.words]
+        self.learned.update(words)
+        self.add_words(new_words)
+        return len(new_words)
+
+    def refresh_learned(self, path: Optional[Path] = None) -> int:
+        """
+        词条文件变化（或换了路径）时重新加载
+
+        Args:
+            path: 词条文件路径，默认为上次加载的路径
+
+        Returns:
+            当前词典版本
+        """
+        path = Path(path) if path else self.learned_path
+        if path is None:
+            return self.version
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            mtime = None
+        if path != self.learned_path or mtime != self._learned_mtime:
+            self.load_learned(path)
+        return self.version
+
+    def save_learned(self, path: Optional[Path] = None) -> None:
+        """
+        原子写入学习词条文件（先合并文件中其他进程已写入的词条）
+
+        Args:
+            path: 词条文件路径，默认为上次加载的路径
+        """
+        path = Path(path) if path else self.learned_path
+        if path is None:
+            return
+        self.refresh_learned(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+            f.writelines(f"{word}\n" for word in sorted(self.learned))
+        os.replace(tmp_path, path)
+        self._learned_mtime = path.stat().st_mtime
+
+    def keywords(self, text: str, min_length: int = 2) -> List[str]:
+        """
+        提取关键词（分词后过滤停用词和短词）
+
+        Args:
+            text: 输入文本
+            min_length: 最小词长
+
+        Returns:
+            关键词列表
+        """
+        return [
+            token for token in self.segment(text)
+            if len(token) >= min_length and token not in self.stopwords
+        ]
+
+    def cache_info(self) -> Dict:
+        """
+        获取分词缓存统计
+
+        Returns:
+            统计信息字典
+        """
+        info = self.segment.cache_info()
+        return {
+            "segmenter": self.name,
+            "dictionary_size": len(self.words),
+            "dictionary_version": self.version,
+            "learned_words": len(self.learned),
+            "hits": info.hits,
+            "misses": info.misses,
+            "cached_titles": info.currsize,
+            "max_size": info.maxsize
+        }
+
+
+class JiebaSegmenter(Segmenter):
+    """基于 jieba 的分词器（可选依赖，未安装时不可用）"""
+
+    name = "jieba"
+
+    def __init__(self, words: Optional[Iterable[str]] = None, **kwargs):
+        import jieba
+
+        self._jieba = jieba
+        super().__init__(words, **kwargs)
+
+    def add_words(self, words: Iterable[str]) -> None:
+        words = list(words)
+        super().add_words(words)
+        for word in words:
+            if word.strip():
+                self._jieba.add_word(word.strip())
+
+    def _segment(self, text: str) -> Tuple[str, ...]:
+        text = _URL_PATTERN.sub(' ', text)
+        return tuple(
+            token.strip() for token in self._jieba.cut(text)
+            if token.strip() and _RUN_PATTERN.fullmatch(token.strip())
+        )
+
+
+# 分词器工厂注册表
+_SEGMENTER_FACTORIES: Dict[str, Callable[..., Segmenter]] = {
+    "maxmatch": Segmenter,
+    "jieba": JiebaSegmenter,
+}
+
+_default_segmenter: Optional[Segmenter] = None
+_default_lock = Lock()
+
+
+def register_segmenter(name: str, factory: Callable[..., Segmenter]) -> None:
+    """
+    注册自定义分词器工厂
+
+    Args:
+        name: 分词器名称
+        factory: 接受 words 参数并返回 Segmenter 的可调用对象
+    """
+    _SEGMENTER_FACTORIES[name] = factory
+
+
+def create_segmenter(name: str = "maxmatch", project_root: Optional[str] = None) -> Segmenter:
+    """
+    创建分词器，词典种子来自 config/frequency_words.txt（可用 FREQUENCY_WORDS_PATH 覆盖）
+    与学习词条文件 output/learned_words.txt（可用 LEARNED_WORDS_PATH 覆盖）
+
+    Args:
+        name: 分词器名称（maxmatch / jieba / 已注册的自定义名称）
+        project_root: 项目根目录
+
+    Returns:
+        分词器实例（不可用时回退到 maxmatch）
+    """
+    if project_root is None:
+        root = Path(__file__).parent.parent.parent
+    else:
+        root = Path(project_root)
+
+    words_file = os.environ.get("FREQUENCY_WORDS_PATH")
+    words_path = Path(words_file) if words_file else root / "config" / "frequency_words.txt"
+    if not words_path.is_absolute():
+        words_path = root / words_path
+
+    words = load_frequency_dictionary(words_path)
+    factory = _SEGMENTER_FACTORIES.get(name, Segmenter)
+    try:
+        segmenter = factory(words)
+    except ImportError:
+        print(f"Warning: 分词器 {name} 不可用，回退到 maxmatch")
+        segmenter = Segmenter(words)
+    segmenter.load_learned(learned_words_path(str(root)))
+    return segmenter
+
+
+def get_segmenter(project_root: Optional[str] = None) -> Segmenter:
+    """
+    获取全局分词器实例（后端由环境变量 SEGMENTER 选择，默认 maxmatch）
+
+    Args:
+        project_root: 项目根目录（仅首次创建时生效）
+
+    Returns:
+        全局分词器实例
+    """
+    global _default_segmenter
+    if _default_segmenter is None:
+        with _default_lock:
+            if _default_segmenter is None:
+                _default_segmenter = create_segmenter(
+                    name=os.environ.get("SEGMENTER", "maxmatch"),
+                    project_root=project_root
+                )
+    return _default_segmenter
+
+
+def set_segmenter(segmenter: Segmenter) -> None:
+    """
+    替换全局分词器
+
+    Args:
+        segmenter: 分词器实例
+    """
+    global _default_segmenter
+    with _default_lock:
+        _default_segmenter = segmenter
+
+
+def extract_keywords(text: str, min_length: int = 2) -> List[str]:
+    """
+    使用全局分词器提取关键词
+
+    Args:
+        text: 输入文本
+        min_length: 最小词长
+
+    Returns:
+        关键词列表
+    """
+    return get_segmenter().keywords(text, min_length=min_length)
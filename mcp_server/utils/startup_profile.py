@@ -0,0 +1,169 @@
+"""
+启动耗时分析
+
+各入口（crawler、console、mcp_server、main/scheduler）的 --profile-startup 模式共用：
+在子进程中以 `python -X importtime` 重新导入入口模块，解析每个模块的导入耗时，
+并读取入口模块记录的配置加载耗时（模块级变量 CONFIG_LOAD_SECONDS）。
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+# 导入后需要特别关注的重型依赖
+HEAVY_MODULES = ("selenium", "fastmcp", "requests", "pytz", "yaml", "crawler.index")
+
+_IMPORTTIME_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)")
+_RESULT_MARKER = "__STARTUP_PROFILE__"
+
+_CHILD_CODE = """
+import json, sys, time
+t0 = time.perf_counter()
+import {module} as _entry
+wall = time.perf_counter() - t0
+print({marker!r} + json.dumps({{
+    "wall_seconds": wall,
+    "config_load_seconds": getattr(_entry, "CONFIG_LOAD_SECONDS", None)
+}}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """
+    解析 -X importtime 输出
+
+    Args:
+        stderr: 子进程 stderr 文本
+
+    Returns:
+        [{"module", "self_ms", "cumulative_ms", "depth"}, ...]，按导入完成顺序
+    """
+    rows = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_PATTERN.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        rows.append({
+            "module": module,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+            "depth": max(0, (len(indent) - 1) // 2)
+        })
+    return rows
+
+
+def profile_startup(module: str, project_root: Optional[str] = None, top: int = 20) -> Dict:
+    """
+    在子进程中分析入口模块的导入耗时
+
+    Args:
+        module: 入口模块名，如 "crawler.index"
+        project_root: 项目根目录（子进程工作目录），默认为 mcp_server 的上级目录
+        top: 报告中列出的模块数量
+
+    Returns:
+        {"module", "wall_seconds", "config_load_seconds", "total_import_ms",
+         "top_self", "top_cumulative", "heavy_modules", "error"}
+    """
+    root = Path(project_root) if project_root else Path(__file__).parent.parent.parent
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(root), env.get("PYTHONPATH", "")]))
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD_CODE.format(module=module, marker=_RESULT_MARKER)],
+        cwd=str(root),
+        env=env,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace"
+    )
+
+    rows = parse_importtime(proc.stderr)
+    summary = {}
+    for line in proc.stdout.splitlines():
+        if line.startswith(_RESULT_MARKER):
+            summary = json.loads(line[len(_RESULT_MARKER):])
+
+    # 同一模块只会导入一次，按名称索引即可
+    by_name = {row["module"]: row for row in rows}
+    heavy = {
+        name: round(by_name[name]["cumulative_ms"], 1)
+        for name in HEAVY_MODULES if name in by_name
+    }
+
+    error = None
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit code {proc.returncode}"
+
+    return {
+        "module": module,
+        "wall_seconds": summary.get("wall_seconds"),
+        "config_load_seconds": summary.get("config_load_seconds"),
+        "total_import_ms": round(sum(row["self_ms"] for row in rows), 1),
+        "modules_imported": len(rows),
+        "top_self": sorted(rows, key=lambda row: row["self_ms"], reverse=True)[:top],
+        "top_cumulative": sorted(
+            (row for row in rows if row["module"] != module),
+            key=lambda row: row["cumulative_ms"],
+            reverse=True
+        )[:top],
+        "heavy_modules": heavy,
+        "error": error
+    }
+
+
+def format_report(report: Dict) -> str:
+    """
+    把分析结果格式化为可读文本
+
+    Args:
+        report: profile_startup 的返回值
+
+    Returns:
+        多行文本
+    """
+    lines = [f"启动耗时分析: {report['module']}"]
+    if report["error"]:
+        lines.append(f"  [错误] 导入失败: {report['error']}")
+    if report["wall_seconds"] is not None:
+        lines.append(f"  导入总耗时: {report['wall_seconds'] * 1000:.1f} ms")
+    if report["config_load_seconds"] is not None:
+        lines.append(f"  配置加载耗时: {report['config_load_seconds'] * 1000:.1f} ms")
+    lines.append(f"  导入模块数: {report['modules_imported']}（自身耗时合计 {report['total_import_ms']} ms）")
+
+    if report["heavy_modules"]:
+        lines.append("  重型依赖（累计 ms）: " + ", ".join(
+            f"{name}={ms}" for name, ms in report["heavy_modules"].items()
+        ))
+    else:
+        lines.append("  重型依赖: 未导入")
+
+    lines.append("")
+    lines.append(f"  {'累计(ms)':>10}  {'自身(ms)':>10}  模块")
+    for row in report["top_cumulative"]:
+        lines.append(f"  {row['cumulative_ms']:>10.1f}  {row['self_ms']:>10.1f}  {'  ' * row['depth']}{row['module']}")
+    return "\n".join(lines)
+
+
+def run_profile_cli(module: str, project_root: Optional[str] = None, top: int = 20) -> int:
+    """
+    入口 --profile-startup 的统一实现：打印报告并返回退出码
+
+    Args:
+        module: 入口模块名
+        project_root: 项目根目录
+        top: 列出的模块数量
+
+    Returns:
+        退出码（导入失败时为 1）
+    """
+    report = profile_startup(module, project_root, top)
+    print(format_report(report))
+    return 1 if report["error"] else 0
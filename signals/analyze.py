@@ -4,7 +4,9 @@
 from __future__ import annotations
 
 import json
+import os
 import re
+import threading
 from typing import Any, Dict, List, Optional
 
 SYSTEM = """你是加密货币/合约交易信号解析器。根据推文正文与配图说明，提取结构化交易信息。
@@ -30,6 +32,10 @@ SYSTEM = """你是加密货币/合约交易信号解析器。根据推文正文
 - 价位原样保留，不要臆造没有的数字。
 """
 
+# 同时进行中的 AI 请求上限（进程内共享，多个流水线任务同时运行也不会超过）
+AI_CONCURRENCY = max(1, int(os.environ.get("SIGNALS_AI_CONCURRENCY", "6") or 6))
+_AI_SLOTS = threading.BoundedSemaphore(AI_CONCURRENCY)
+
 
 def _extract_json(text: str) -> Dict[str, Any]:
     raw = (text or "").strip()
@@ -123,12 +129,13 @@ def analyze_tweet_signal(
     try:
         from utils.ai_client import generate_text
 
-        result = generate_text(
-            prompt,
-            system_prompt=SYSTEM,
-            temperature=0.2,
-            max_tokens=900,
-        )
+        with _AI_SLOTS:
+            result = generate_text(
+                prompt,
+                system_prompt=SYSTEM,
+                temperature=0.2,
+                max_tokens=900,
+            )
         provider = str(result.get("provider") or "")
         if result.get("success"):
             data = _extract_json(str(result.get("content") or ""))
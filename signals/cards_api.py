@@ -0,0 +1,230 @@
+# coding=utf-8
+"""
+Cards API HTTP 传输：按目标地址复用 keep-alive 连接池，并探测批量接口。
+
+与 urllib 一样遵循 HTTP(S)_PROXY / NO_PROXY：https 目标经代理 CONNECT 隧道，
+http 目标向代理发送绝对 URL。
+"""
+
+from __future__ import annotations
+
+import http.client
+import base64
+import json
+import queue
+import threading
+import time
+import urllib.request
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+# 每个目标地址最多保持的空闲连接数
+POOL_SIZE = 8
+# 批量接口探测结果缓存时长（秒），过期后重新尝试
+BATCH_PROBE_TTL = 600.0
+# 服务端不支持批量接口时的状态码
+_BATCH_UNSUPPORTED = (404, 405, 501)
+
+
+class _ConnectionPool:
+    """单个 scheme://host:port 的 HTTP/1.1 keep-alive 连接池（线程安全）。"""
+
+    def __init__(self, scheme: str, netloc: str, size: int = POOL_SIZE):
+        self.scheme = scheme
+        self.netloc = netloc
+        self.proxy, self._proxy_headers = _proxy_for(scheme, netloc)
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize=size)
+
+    def _new(self, timeout: float) -> http.client.HTTPConnection:
+        if self.proxy is None:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            return cls(self.netloc, timeout=timeout)
+        if self.scheme == "https":
+            conn = http.client.HTTPSConnection(self.proxy, timeout=timeout)
+            conn.set_tunnel(self.netloc, headers=self._proxy_headers or None)
+            return conn
+        return http.client.HTTPConnection(self.proxy, timeout=timeout)
+
+    def _acquire(self, timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        try:
+            conn = self._idle.get_nowait()
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn, True
+        except queue.Empty:
+            return self._new(timeout), False
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes],
+        headers: Dict[str, str],
+        timeout: float,
+    ) -> Tuple[int, bytes]:
+        """
+        发送请求并读完响应。复用的空闲连接若已被服务端关闭（发送前/读状态行时断开），
+        换新连接重试一次；其他错误直接抛出。
+        """
+        if self.proxy is not None and self.scheme == "http":
+            # 经 HTTP 代理转发时请求行使用绝对 URL
+            path = f"http://{self.netloc}{path}"
+            headers = {**headers, **self._proxy_headers}
+        for attempt in range(2):
+            conn, reused = self._acquire(timeout)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                conn.close()
+                if reused and attempt == 0:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            return resp.status, data
+        raise RuntimeError("unreachable")
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def _proxy_for(scheme: str, netloc: str) -> Tuple[Optional[str], Dict[str, str]]:
+    """按环境变量解析代理：返回 (代理 host:port, 代理认证头)，不走代理时为 (None, {})。"""
+    proxy_url = urllib.request.getproxies().get(scheme)
+    host = urlsplit(f"{scheme}://{netloc}").hostname or ""
+    if not proxy_url or urllib.request.proxy_bypass(host):
+        return None, {}
+    if "://" not in proxy_url:
+        proxy_url = "http://" + proxy_url
+    parts = urlsplit(proxy_url)
+    headers = {}
+    if parts.username is not None:
+        token = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+        headers["Proxy-Authorization"] = "Basic " + base64.b64encode(token.encode("utf-8")).decode("ascii")
+    proxy = parts.hostname or ""
+    if parts.port:
+        proxy += f":{parts.port}"
+    return proxy, headers
+
+
+_POOLS: Dict[Tuple[str, str], _ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+# (base_url, batch_path) → (是否支持, 探测时间)
+_BATCH_SUPPORT: Dict[Tuple[str, str], Tuple[bool, float]] = {}
+
+
+def _pool_for(url: str) -> Tuple[_ConnectionPool, str]:
+    parts = urlsplit(url)
+    scheme = (parts.scheme or "http").lower()
+    key = (scheme, parts.netloc)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = _POOLS[key] = _ConnectionPool(scheme, parts.netloc)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    return pool, path
+
+
+def close_pools() -> None:
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
+def post_json(url: str, payload: Any, headers: Dict[str, str], timeout: float) -> Dict[str, Any]:
+    """
+    POST JSON，返回 {"status", "response"}；连接失败抛异常。
+    响应体不是 JSON 时 response 为 {"raw": 文本}。
+    """
+    pool, path = _pool_for(url)
+    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    all_headers = {
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+        "Connection": "keep-alive",
+        **headers,
+    }
+    status, raw = pool.request("POST", path, data, all_headers, timeout)
+    text = raw.decode("utf-8", errors="replace")
+    try:
+        body = json.loads(text) if text else {}
+    except Exception:
+        body = {"raw": text}
+    if not isinstance(body, dict):
+        body = {"data": body}
+    return {"status": status, "response": body}
+
+
+def batch_supported(base_url: str, batch_path: str) -> Optional[bool]:
+    """批量接口探测结果：True/False，未探测或已过期返回 None。"""
+    hit = _BATCH_SUPPORT.get((base_url, batch_path))
+    if hit is None or time.time() - hit[1] > BATCH_PROBE_TTL:
+        return None
+    return hit[0]
+
+
+def remember_batch_support(base_url: str, batch_path: str, supported: bool) -> None:
+    _BATCH_SUPPORT[(base_url, batch_path)] = (supported, time.time())
+
+
+def is_batch_unsupported_status(status: int) -> bool:
+    return int(status or 0) in _BATCH_UNSUPPORTED
+
+
+def batch_item_results(body: Dict[str, Any], count: int, status: int) -> List[Dict[str, Any]]:
+    """
+    把批量响应拆成逐卡结果。
+
+    支持 {"results": [...]} 或 {"items": [...]}，每项含 ok/success（可带 index 指定位置）；
+    整体 2xx 且没有逐项结果时视为全部成功。
+    """
+    rows = body.get("results")
+    if not isinstance(rows, list):
+        rows = body.get("items") if isinstance(body.get("items"), list) else None
+    ok_status = status in (200, 201, 207)
+    if rows is None:
+        overall = ok_status and body.get("ok") is not False and body.get("success") is not False
+        return [{"success": overall, "status": status, "response": body} for _ in range(count)]
+
+    out: List[Dict[str, Any]] = [
+        {"success": False, "status": status, "error": "批量响应缺少该卡结果"} for _ in range(count)
+    ]
+    for pos, row in enumerate(rows):
+        if not isinstance(row, dict):
+            continue
+        idx = row.get("index", pos)
+        try:
+            idx = int(idx)
+        except Exception:
+            continue
+        if not 0 <= idx < count:
+            continue
+        ok = bool(row.get("ok") is True or row.get("success") is True)
+        item: Dict[str, Any] = {"success": ok_status and ok, "status": int(row.get("status") or status), "response": row}
+        if not item["success"]:
+            item["error"] = str(row.get("error") or row.get("message") or f"HTTP {status}")
+        out[idx] = item
+    return out
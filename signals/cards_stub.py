@@ -0,0 +1,176 @@
+# coding=utf-8
+"""
+本地 Cards API 桩服务：用于联调/压测推送，不落库，只记录收到的卡片。
+
+    python -m signals.cards_stub --port 3851 [--api-key KEY] [--no-batch] [--delay-ms 50]
+
+- POST /api/v1/cards：单卡，返回 201 {"ok": true, "id": N}
+- POST /api/v1/cards:batch：{"cards": [...]}，返回 {"ok": true, "results": [{"index", "ok", "id"}]}
+  （--no-batch 时 404，模拟旧版服务端）
+- GET /api/v1/cards：查看已收到的卡片与请求/连接计数
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def _check_card(card: Any) -> str:
+    if not isinstance(card, dict):
+        return "card must be an object"
+    if not str(card.get("channelId") or "").strip():
+        return "channelId required"
+    return ""
+
+
+class CardsStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        addr: Tuple[str, int],
+        *,
+        api_key: str = "",
+        batch: bool = True,
+        delay_ms: int = 0,
+        path: str = "/api/v1/cards",
+    ):
+        super().__init__(addr, _Handler)
+        self.api_key = api_key
+        self.batch = batch
+        self.delay = max(0, delay_ms) / 1000.0
+        self.path = path
+        self.cards: List[Dict[str, Any]] = []
+        self.requests = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    def accept_card(self, card: Dict[str, Any]) -> int:
+        with self.lock:
+            self.cards.append(card)
+            return len(self.cards)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "cards": len(self.cards),
+                "requests": self.requests,
+                "connections": self.connections,
+            }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: CardsStubServer
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, fmt: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self) -> Optional[Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            return json.loads(raw.decode("utf-8")) if raw else None
+        except Exception:
+            return None
+
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != self.server.path:
+            self._send(404, {"ok": False, "error": "not found"})
+            return
+        with self.server.lock:
+            cards = list(self.server.cards)
+        self._send(200, {"ok": True, "stats": self.server.stats(), "cards": cards})
+
+    def do_POST(self) -> None:
+        srv = self.server
+        with srv.lock:
+            srv.requests += 1
+        body = self._read_json()
+        path = self.path.split("?")[0]
+        if srv.api_key and self.headers.get("X-Cards-Api-Key") != srv.api_key:
+            self._send(401, {"ok": False, "error": "invalid api key"})
+            return
+        if srv.delay:
+            time.sleep(srv.delay)
+
+        if path == srv.path:
+            err = _check_card(body)
+            if err:
+                self._send(400, {"ok": False, "error": err})
+                return
+            self._send(201, {"ok": True, "id": srv.accept_card(body)})
+            return
+
+        if path == f"{srv.path}:batch" and srv.batch:
+            cards = body.get("cards") if isinstance(body, dict) else None
+            if not isinstance(cards, list):
+                self._send(400, {"ok": False, "error": "cards must be a list"})
+                return
+            results = []
+            for i, card in enumerate(cards):
+                err = _check_card(card)
+                if err:
+                    results.append({"index": i, "ok": False, "error": err})
+                else:
+                    results.append({"index": i, "ok": True, "id": srv.accept_card(card)})
+            self._send(200, {"ok": all(r["ok"] for r in results), "results": results})
+            return
+
+        self._send(404, {"ok": False, "error": "not found"})
+
+
+def start_stub(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    **kwargs: Any,
+) -> CardsStubServer:
+    """后台线程启动桩服务（port=0 时自动分配端口，见 server.server_address）。"""
+    srv = CardsStubServer((host, port), **kwargs)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="本地 Cards API 桩服务")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=3851)
+    ap.add_argument("--api-key", default="")
+    ap.add_argument("--no-batch", action="store_true", help="不提供 :batch 批量接口")
+    ap.add_argument("--delay-ms", type=int, default=0, help="每个请求的模拟延迟")
+    args = ap.parse_args()
+    srv = CardsStubServer(
+        (args.host, args.port),
+        api_key=args.api_key,
+        batch=not args.no_batch,
+        delay_ms=args.delay_ms,
+    )
+    print(f"Cards API stub: http://{args.host}:{srv.server_address[1]}{srv.path}")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
+
+
+if __name__ == "__main__":
+    main()
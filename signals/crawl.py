@@ -3,24 +3,38 @@
 
 from __future__ import annotations
 
-import re
+import os
+import threading
 import time
-import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
 
-from signals.store import media_root, parse_dt, parse_list_id
+from signals.store import parse_dt, parse_list_id
 
 ProgressCb = Optional[Callable[[str], None]]
 
-LIST_FEED_JS = r"""
+# 抓取模式：observer（MutationObserver 增量推送）或 poll（每次滚动后全量抽取）
+CAPTURE_MODE = (os.environ.get("SIGNALS_CAPTURE_MODE") or "observer").strip().lower()
+# observer 模式：首屏最长等待 / 每次滚动后最长等待 / 同一批渲染的合并等待（毫秒）
+OBSERVER_FIRST_WAIT_MS = 8000
+OBSERVER_WAIT_MS = 2500
+OBSERVER_SETTLE_MS = 300
+# 连续多少次滚动没有新推文视为到底
+OBSERVER_MAX_IDLE = 2
+
+# 配图下载共享线程池（进程内所有流水线共用，避免每轮新建线程）
+IMAGE_DOWNLOAD_WORKERS = 8
+_IMAGE_POOL: Optional[ThreadPoolExecutor] = None
+_IMAGE_POOL_LOCK = threading.Lock()
+
+# 单条推文抽取（轮询抽取与 MutationObserver 共用）
+EXTRACT_TWEET_JS = r"""
 function abs(u){
   try { return new URL(u, location.origin).href.split('?')[0]; } catch(e){ return (u||''); }
 }
-const out = [];
-const arts = [...document.querySelectorAll("article[data-testid='tweet']")];
-for (const a of arts) {
+function extractTweet(a) {
   const links = [...a.querySelectorAll("a[href*='/status/']")];
   let status = '';
   for (const l of links) {
@@ -30,7 +44,7 @@ for (const a of arts) {
       break;
     }
   }
-  if (!status) continue;
+  if (!status) return null;
   const idm = status.match(/\/status\/(\d+)/);
   const tweet_id = idm ? idm[1] : '';
   const timeEl = a.querySelector('time');
@@ -61,7 +75,7 @@ for (const a of arts) {
       alt: (img.getAttribute('alt') || '').slice(0, 300),
     });
   }
-  out.push({
+  return {
     tweet_id,
     url: status,
     author,
@@ -69,11 +83,64 @@ for (const a of arts) {
     created_at,
     time_label,
     images,
-  });
+  };
+}
+"""
+
+LIST_FEED_JS = EXTRACT_TWEET_JS + r"""
+const out = [];
+for (const a of document.querySelectorAll("article[data-testid='tweet']")) {
+  const it = extractTweet(a);
+  if (it) out.push(it);
 }
 return out;
 """
 
+# 事件驱动抓取：MutationObserver 在推文渲染时抽取并入队，Python 侧长轮询取走增量
+OBSERVER_INSTALL_JS = EXTRACT_TWEET_JS + r"""
+if (window.__trSignals) return true;
+const SEL = "article[data-testid='tweet']";
+const st = window.__trSignals = { queue: [], seen: new Set(), waiters: [] };
+const take = (a) => {
+  const it = extractTweet(a);
+  // 正文/时间未渲染完时不记 seen，等后续变更再抽
+  if (!it || !it.tweet_id || (!it.created_at && !it.text && !it.images.length)) return;
+  if (st.seen.has(it.tweet_id)) return;
+  st.seen.add(it.tweet_id);
+  st.queue.push(it);
+  for (const w of st.waiters.splice(0)) w();
+};
+document.querySelectorAll(SEL).forEach(take);
+new MutationObserver((mutations) => {
+  for (const m of mutations) {
+    for (const n of m.addedNodes) {
+      if (n.nodeType !== 1) continue;
+      const host = n.closest ? n.closest(SEL) : null;
+      if (host) { take(host); continue; }
+      if (n.querySelectorAll) n.querySelectorAll(SEL).forEach(take);
+    }
+  }
+}).observe(document.body, { childList: true, subtree: true });
+return true;
+"""
+
+# 有新推文立即返回，否则最多等待 %d 毫秒（由 Python 侧填入）
+OBSERVER_DRAIN_JS = r"""
+const st = window.__trSignals;
+if (!st) return null;
+return new Promise((resolve) => {
+  let fired = false;
+  const done = () => {
+    if (fired) return;
+    fired = true;
+    resolve(st.queue.splice(0));
+  };
+  if (st.queue.length) return done();
+  st.waiters.push(done);
+  setTimeout(done, %d);
+});
+"""
+
 
 def _log(cb: ProgressCb, msg: str) -> None:
     print(f"[signals] {msg}")
@@ -106,37 +173,156 @@ def _debugger_host() -> str:
 
 
 def download_image(url: str, tweet_id: str, index: int) -> Dict[str, Any]:
-    """下载配图到 output/signals/media/，失败则仅保留远端 URL。"""
+    """
+    配图经共享缓存落到 output/signals/media/objects/，同一 URL / 同一内容不重复下载；
+    失败则仅保留远端 URL。
+    """
     info: Dict[str, Any] = {"url": url, "local": "", "rel": "", "alt": ""}
     if not url:
         return info
-    root = media_root()
-    ext = ".jpg"
-    m = re.search(r"format=(\w+)", url)
-    if m:
-        fmt = m.group(1).lower()
-        ext = ".png" if fmt == "png" else ".webp" if fmt == "webp" else ".jpg"
-    elif ".png" in url:
-        ext = ".png"
-    name = f"{tweet_id}_{index}{ext}"
-    dest = root / name
-    try:
-        req = urllib.request.Request(
-            url,
-            headers={
-                "User-Agent": "Mozilla/5.0 TrendRadarSignals/1.0",
-                "Referer": "https://x.com/",
-            },
+    from signals.media_cache import get_cache
+
+    got = get_cache().fetch(url)
+    if got.get("rel"):
+        info["local"] = got["local"]
+        info["rel"] = got["rel"]
+        info["sha256"] = got.get("sha256") or ""
+    if got.get("error"):
+        info["error"] = got["error"]
+    return info
+
+
+def _image_pool() -> ThreadPoolExecutor:
+    global _IMAGE_POOL
+    with _IMAGE_POOL_LOCK:
+        if _IMAGE_POOL is None:
+            _IMAGE_POOL = ThreadPoolExecutor(
+                max_workers=IMAGE_DOWNLOAD_WORKERS,
+                thread_name_prefix="signals-img",
+            )
+        return _IMAGE_POOL
+
+
+def submit_image_download(url: str, tweet_id: str, index: int) -> "Future[Dict[str, Any]]":
+    """在共享线程池中下载配图，返回 Future（结果同 download_image）。"""
+    return _image_pool().submit(download_image, url, tweet_id, index)
+
+
+class _TimelineCollector:
+    """按到达顺序收集推文，并判断 since / max_tweets 停止条件。"""
+
+    def __init__(self, since: datetime, max_tweets: int):
+        self.since = since
+        self.max_tweets = max_tweets
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        self.reached_old = False
+
+    def feed(self, raw: Any) -> Optional[datetime]:
+        """收下一批抽取结果，返回这批里最旧的时间。"""
+        oldest_in_batch = None
+        for it in raw if isinstance(raw, list) else []:
+            if not isinstance(it, dict):
+                continue
+            tid = str(it.get("tweet_id") or "").strip()
+            if not tid:
+                continue
+            created = parse_dt(str(it.get("created_at") or ""))
+            if created:
+                if oldest_in_batch is None or created < oldest_in_batch:
+                    oldest_in_batch = created
+                if created < self.since:
+                    self.reached_old = True
+                    continue
+            if tid not in self.by_id:
+                self.by_id[tid] = it
+        return oldest_in_batch
+
+    @property
+    def done(self) -> bool:
+        if len(self.by_id) >= self.max_tweets:
+            return True
+        return self.reached_old and len(self.by_id) >= 3
+
+
+def _capture_by_polling(page, col: _TimelineCollector, max_scroll: int, progress: ProgressCb) -> None:
+    """每次滚动后固定等待，再全量抽取 DOM。"""
+    time.sleep(3.2)
+    for round_i in range(max_scroll):
+        try:
+            raw = page.eval_js(LIST_FEED_JS) or []
+        except Exception as e:
+            _log(progress, f"抽取失败 round={round_i}: {e}")
+            raw = []
+        oldest_in_batch = col.feed(raw)
+        _log(
+            progress,
+            f"滚动 {round_i + 1}/{max_scroll} · 累计 {len(col.by_id)} 条"
+            + (f" · 最旧 {oldest_in_batch.isoformat()}" if oldest_in_batch else ""),
         )
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            data = resp.read()
-        if data:
-            dest.write_bytes(data)
-            info["local"] = str(dest)
-            info["rel"] = name
+        if col.done:
+            break
+        try:
+            page.eval_js("window.scrollBy(0, 1400); return true;")
+        except Exception:
+            break
+        time.sleep(1.15)
+
+
+def _capture_by_observer(page, col: _TimelineCollector, max_scroll: int, progress: ProgressCb) -> bool:
+    """
+    MutationObserver 在推文渲染时入队，Python 长轮询取增量，到达即判断停止条件。
+    安装失败返回 False（调用方退回轮询模式）。
+    """
+    try:
+        page.eval_js(OBSERVER_INSTALL_JS)
     except Exception as e:
-        info["error"] = str(e)[:120]
-    return info
+        _log(progress, f"MutationObserver 安装失败，改用轮询抽取: {e}")
+        return False
+
+    idle = 0
+    for round_i in range(max_scroll):
+        got = 0
+        oldest_in_batch = None
+        wait_ms = OBSERVER_FIRST_WAIT_MS if round_i == 0 else OBSERVER_WAIT_MS
+        while True:
+            try:
+                raw = page.eval_js(OBSERVER_DRAIN_JS % wait_ms)
+            except Exception as e:
+                _log(progress, f"取增量失败 round={round_i}: {e}")
+                raw = []
+            if raw is None:
+                # 页面被整页刷新，observer 丢失，重新安装
+                try:
+                    page.eval_js(OBSERVER_INSTALL_JS)
+                except Exception:
+                    pass
+                break
+            if not isinstance(raw, list) or not raw:
+                break
+            got += len(raw)
+            batch_oldest = col.feed(raw)
+            if batch_oldest and (oldest_in_batch is None or batch_oldest < oldest_in_batch):
+                oldest_in_batch = batch_oldest
+            if col.done:
+                break
+            # 同一批渲染通常连续到达，短暂合并后再滚动
+            wait_ms = OBSERVER_SETTLE_MS
+
+        _log(
+            progress,
+            f"滚动 {round_i + 1}/{max_scroll} · 新到 {got} · 累计 {len(col.by_id)} 条"
+            + (f" · 最旧 {oldest_in_batch.isoformat()}" if oldest_in_batch else ""),
+        )
+        if col.done:
+            break
+        idle = idle + 1 if got == 0 else 0
+        if idle >= OBSERVER_MAX_IDLE:
+            break
+        try:
+            page.eval_js("window.scrollBy(0, 1400); return true;")
+        except Exception:
+            break
+    return True
 
 
 def crawl_list_timeline(
@@ -146,11 +332,15 @@ def crawl_list_timeline(
     max_tweets: int = 40,
     max_scroll: int = 18,
     progress: ProgressCb = None,
+    capture: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     静默 CDP 打开列表页，滚动直到推文时间早于 since 或达到上限。
+
+    capture: "observer"（默认，MutationObserver 增量推送）或 "poll"（滚动后全量抽取），
+    未指定时读 SIGNALS_CAPTURE_MODE。
     """
-    from allnews_mornitor.cdp_browser import BackgroundTarget, _CdpClient, _browser_ws_url, _http_json
+    from allnews_mornitor.cdp_browser import _http_json, background_target
 
     lid = parse_list_id(list_id) or str(list_id or "").strip()
     if not lid:
@@ -158,82 +348,30 @@ def crawl_list_timeline(
     url = f"https://x.com/i/lists/{lid}"
     max_tweets = max(1, min(int(max_tweets or 40), 120))
     max_scroll = max(3, min(int(max_scroll or 18), 40))
+    mode = (capture or CAPTURE_MODE or "observer").strip().lower()
 
-    # 临时覆盖 allnews debugger（BackgroundTarget 用其 get_debugger_url）
+    # 调试地址显式传给共享连接池，不改动 allnews 的全局配置
     host = _debugger_host()
-    _orig = None
     try:
-        import allnews_mornitor.cdp_browser as cdp_mod
-
-        _orig = cdp_mod.get_debugger_url
-
-        def _patched() -> str:
-            return host
-
-        cdp_mod.get_debugger_url = _patched  # type: ignore
-    except Exception:
-        pass
+        _http_json("/json/version", host)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"无法连接 Chrome CDP（{host}），请先 --remote-debugging-port=9222: {e}",
+            "items": [],
+        }
 
-    client = None
-    page = None
     try:
-        try:
-            _http_json("/json/version")
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"无法连接 Chrome CDP（{host}），请先 --remote-debugging-port=9222: {e}",
-                "items": [],
-            }
-
         _log(progress, f"CDP 打开列表 {url}")
-        client = _CdpClient(_browser_ws_url())
-        page = BackgroundTarget.create(client, "about:blank")
-        page.silent_navigate(url)
-        time.sleep(3.2)
-
-        by_id: Dict[str, Dict[str, Any]] = {}
-        reached_old = False
-        for round_i in range(max_scroll):
-            try:
-                raw = page.eval_js(LIST_FEED_JS) or []
-            except Exception as e:
-                _log(progress, f"抽取失败 round={round_i}: {e}")
-                raw = []
-            if not isinstance(raw, list):
-                raw = []
-            oldest_in_batch = None
-            for it in raw:
-                if not isinstance(it, dict):
-                    continue
-                tid = str(it.get("tweet_id") or "").strip()
-                if not tid:
-                    continue
-                created = parse_dt(str(it.get("created_at") or ""))
-                if created:
-                    if oldest_in_batch is None or created < oldest_in_batch:
-                        oldest_in_batch = created
-                    if created < since:
-                        reached_old = True
-                        continue
-                if tid not in by_id:
-                    by_id[tid] = it
-            _log(
-                progress,
-                f"滚动 {round_i + 1}/{max_scroll} · 累计 {len(by_id)} 条"
-                + (f" · 最旧 {oldest_in_batch.isoformat()}" if oldest_in_batch else ""),
-            )
-            if len(by_id) >= max_tweets:
-                break
-            if reached_old and len(by_id) >= 3:
-                break
-            try:
-                page.eval_js("window.scrollBy(0, 1400); return true;")
-            except Exception:
-                break
-            time.sleep(1.15)
+        with background_target(host) as page:
+            page.silent_navigate(url)
+
+            col = _TimelineCollector(since, max_tweets)
+            if mode != "observer" or not _capture_by_observer(page, col, max_scroll, progress):
+                mode = "poll"
+                _capture_by_polling(page, col, max_scroll, progress)
 
-        items = list(by_id.values())
+        items = list(col.by_id.values())
 
         def _key(x: Dict[str, Any]):
             dt = parse_dt(str(x.get("created_at") or ""))
@@ -247,24 +385,7 @@ def crawl_list_timeline(
             "url": url,
             "items": items,
             "count": len(items),
+            "capture": mode,
         }
     except Exception as e:
         return {"success": False, "error": str(e), "items": []}
-    finally:
-        try:
-            if page is not None:
-                page.detach()
-        except Exception:
-            pass
-        try:
-            if client is not None:
-                client.close()
-        except Exception:
-            pass
-        if _orig is not None:
-            try:
-                import allnews_mornitor.cdp_browser as cdp_mod
-
-                cdp_mod.get_debugger_url = _orig  # type: ignore
-            except Exception:
-                pass
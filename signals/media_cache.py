@@ -0,0 +1,309 @@
+# coding=utf-8
+"""
+配图缓存：URL 哈希索引 + 内容寻址存储，signals 与 tweet_cards 共用。
+
+- 文件按内容 sha256 存为 media/objects/ab/<sha256>.<ext>，不同 URL 的同一张图只存一份；
+- 索引（media/cache.db）记录 URL → sha256 与 ETag/Last-Modified，新鲜期内直接命中不联网，
+  过期后带 If-None-Match / If-Modified-Since 条件请求，304 时只更新检查时间；
+- 总大小超过上限时按最近使用时间（LRU）淘汰；
+- 同一 URL 并发请求只下载一次（single-flight）。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from signals.store import media_root
+
+# 缓存总大小上限（MB）
+MAX_BYTES = int(float(os.environ.get("SIGNALS_MEDIA_CACHE_MB") or 1024) * 1024 * 1024)
+# 新鲜期（秒）：期内命中不发请求，过期后条件请求重新验证
+FRESH_SECONDS = int(float(os.environ.get("SIGNALS_MEDIA_FRESH_HOURS") or 24) * 3600)
+FETCH_WORKERS = 8
+FETCH_TIMEOUT = 20
+
+_HEADERS = {
+    "User-Agent": "Mozilla/5.0 TrendRadarSignals/1.0",
+    "Referer": "https://x.com/",
+}
+_EXT_BY_TYPE = {
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/gif": ".gif",
+    "image/jpeg": ".jpg",
+    "video/mp4": ".mp4",
+}
+
+
+def url_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def _guess_ext(url: str, content_type: str = "") -> str:
+    ctype = (content_type or "").split(";")[0].strip().lower()
+    if ctype in _EXT_BY_TYPE:
+        return _EXT_BY_TYPE[ctype]
+    m = re.search(r"format=(\w+)", url)
+    fmt = m.group(1).lower() if m else ""
+    if fmt == "png" or ".png" in url:
+        return ".png"
+    if fmt == "webp":
+        return ".webp"
+    return ".jpg"
+
+
+class MediaCache:
+    """线程安全；一个进程内通常只用 get_cache() 返回的共享实例。"""
+
+    def __init__(self, root: Path, max_bytes: int = MAX_BYTES, fresh_seconds: int = FRESH_SECONDS):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.fresh_seconds = fresh_seconds
+        self.db_path = self.root / "cache.db"
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS urls (
+                    url_hash TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    etag TEXT NOT NULL DEFAULT '',
+                    last_modified TEXT NOT NULL DEFAULT '',
+                    checked_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_urls_sha ON urls(sha256);
+                CREATE TABLE IF NOT EXISTS blobs (
+                    sha256 TEXT PRIMARY KEY,
+                    rel TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    content_type TEXT NOT NULL DEFAULT '',
+                    last_used REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_blobs_used ON blobs(last_used);
+                """
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    # ——— 查询 ———
+
+    def _lookup(self, key: str) -> Optional[sqlite3.Row]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT u.sha256, u.etag, u.last_modified, u.checked_at, b.rel, b.size, b.content_type "
+                "FROM urls u JOIN blobs b ON b.sha256 = u.sha256 WHERE u.url_hash=?",
+                (key,),
+            ).fetchone()
+        if row is not None and not (self.root / row["rel"]).is_file():
+            # 文件被手动删掉：当作未缓存
+            return None
+        return row
+
+    def _result(self, url: str, row: Any, status: str) -> Dict[str, Any]:
+        return {
+            "url": url,
+            "local": str(self.root / row["rel"]),
+            "rel": row["rel"],
+            "sha256": row["sha256"],
+            "size": row["size"],
+            "status": status,
+        }
+
+    def _touch(self, key: str, sha: str, *, checked: bool = False, etag: str = "", last_modified: str = "") -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("UPDATE blobs SET last_used=? WHERE sha256=?", (now, sha))
+            if checked:
+                conn.execute(
+                    "UPDATE urls SET checked_at=?, etag=COALESCE(NULLIF(?, ''), etag), "
+                    "last_modified=COALESCE(NULLIF(?, ''), last_modified) WHERE url_hash=?",
+                    (now, etag, last_modified, key),
+                )
+
+    # ——— 下载 ———
+
+    def _store(self, key: str, url: str, data: bytes, headers: Any) -> Dict[str, Any]:
+        sha = hashlib.sha256(data).hexdigest()
+        ctype = str(headers.get("Content-Type") or "")
+        rel = f"objects/{sha[:2]}/{sha}{_guess_ext(url, ctype)}"
+        now = time.time()
+        with self._connect() as conn:
+            existing = conn.execute("SELECT rel FROM blobs WHERE sha256=?", (sha,)).fetchone()
+            if existing is not None and (self.root / existing["rel"]).is_file():
+                rel = existing["rel"]
+            else:
+                dest = self.root / rel
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                tmp = dest.with_name(dest.name + f".{threading.get_ident()}.tmp")
+                tmp.write_bytes(data)
+                os.replace(tmp, dest)
+            conn.execute(
+                "INSERT INTO blobs(sha256, rel, size, content_type, last_used) VALUES (?,?,?,?,?) "
+                "ON CONFLICT(sha256) DO UPDATE SET rel=excluded.rel, last_used=excluded.last_used",
+                (sha, rel, len(data), ctype, now),
+            )
+            conn.execute(
+                "INSERT INTO urls(url_hash, url, sha256, etag, last_modified, checked_at) VALUES (?,?,?,?,?,?) "
+                "ON CONFLICT(url_hash) DO UPDATE SET sha256=excluded.sha256, etag=excluded.etag, "
+                "last_modified=excluded.last_modified, checked_at=excluded.checked_at",
+                (key, url, sha, str(headers.get("ETag") or ""), str(headers.get("Last-Modified") or ""), now),
+            )
+        self._evict()
+        return {
+            "url": url,
+            "local": str(self.root / rel),
+            "rel": rel,
+            "sha256": sha,
+            "size": len(data),
+            "status": "fetched",
+        }
+
+    def _fetch(self, url: str, key: str) -> Dict[str, Any]:
+        row = self._lookup(key)
+        if row is not None and time.time() - row["checked_at"] < self.fresh_seconds:
+            self._touch(key, row["sha256"])
+            return self._result(url, row, "hit")
+
+        headers = dict(_HEADERS)
+        if row is not None:
+            if row["etag"]:
+                headers["If-None-Match"] = row["etag"]
+            if row["last_modified"]:
+                headers["If-Modified-Since"] = row["last_modified"]
+        req = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(req, timeout=FETCH_TIMEOUT) as resp:
+                data = resp.read()
+                resp_headers = resp.headers
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and row is not None:
+                self._touch(key, row["sha256"], checked=True,
+                            etag=str(e.headers.get("ETag") or ""),
+                            last_modified=str(e.headers.get("Last-Modified") or ""))
+                return self._result(url, row, "revalidated")
+            raise
+        if not data:
+            raise ValueError("空响应")
+        return self._store(key, url, data, resp_headers)
+
+    def fetch(self, url: str) -> Dict[str, Any]:
+        """
+        取一张图：返回 {url, local, rel, sha256, size, status}，status 为 hit/revalidated/fetched；
+        失败时 local/rel 为空并带 error（有旧缓存时退回旧文件，status=stale）。
+        """
+        url = (url or "").strip()
+        if not url:
+            return {"url": url, "local": "", "rel": "", "status": "empty"}
+        key = url_key(url)
+        with self._lock:
+            fut = self._inflight.get(key)
+            owner = fut is None
+            if owner:
+                fut = self._inflight[key] = Future()
+        if not owner:
+            return dict(fut.result())
+
+        try:
+            result = self._fetch(url, key)
+        except Exception as e:
+            row = self._lookup(key)
+            if row is not None:
+                result = self._result(url, row, "stale")
+            else:
+                result = {"url": url, "local": "", "rel": "", "status": "error"}
+            result["error"] = str(e)[:120]
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        fut.set_result(result)
+        return dict(result)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="media-cache")
+            return self._pool
+
+    def submit(self, url: str) -> "Future[Dict[str, Any]]":
+        return self._executor().submit(self.fetch, url)
+
+    def fetch_many(self, urls: Iterable[str]) -> List[Dict[str, Any]]:
+        """并发取多张图，结果与输入顺序一致。"""
+        futures = [self.submit(u) for u in urls]
+        return [f.result() for f in futures]
+
+    # ——— 淘汰 ———
+
+    def total_bytes(self) -> int:
+        with self._connect() as conn:
+            return int(conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0])
+
+    def _evict(self) -> None:
+        if self.max_bytes <= 0:
+            return
+        with self._connect() as conn:
+            total = int(conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0])
+            if total <= self.max_bytes:
+                return
+            # 一次淘汰到上限的 90%，避免每次写入都触发
+            target = int(self.max_bytes * 0.9)
+            victims = []
+            for row in conn.execute("SELECT sha256, rel, size FROM blobs ORDER BY last_used ASC"):
+                if total <= target:
+                    break
+                victims.append((row["sha256"], row["rel"]))
+                total -= int(row["size"])
+            for sha, _ in victims:
+                conn.execute("DELETE FROM urls WHERE sha256=?", (sha,))
+                conn.execute("DELETE FROM blobs WHERE sha256=?", (sha,))
+        for _, rel in victims:
+            try:
+                (self.root / rel).unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._connect() as conn:
+            blobs = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+            urls = conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+        return {"urls": int(urls), "blobs": int(blobs[0]), "bytes": int(blobs[1]), "max_bytes": self.max_bytes}
+
+
+_CACHE: Optional[MediaCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_cache() -> MediaCache:
+    global _CACHE
+    with _CACHE_LOCK:
+        root = media_root()
+        if _CACHE is None or _CACHE.root != root:
+            _CACHE = MediaCache(root)
+        return _CACHE
@@ -1,25 +1,29 @@
 # coding=utf-8
-"""列表交易信号流水线：时间窗去重 → CDP 抓取 → 下图 → AI 解析 → 卡片。"""
+"""列表交易信号流水线：时间窗去重 → CDP 抓取 → 并发下图 / 并发 AI 解析 → 按序组装卡片。"""
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from itertools import count
 from typing import Any, Callable, Dict, List, Optional
 from uuid import uuid4
 
-from signals.analyze import analyze_tweet_signal
-from signals.crawl import crawl_list_timeline, download_image
+from signals.analyze import AI_CONCURRENCY, analyze_tweet_signal
+from signals.crawl import crawl_list_timeline, submit_image_download
 from signals.push import push_cards_batch
 from signals.store import (
     add_window,
+    flush_pending,
     get_config,
     is_seen,
     latest_window_end,
     list_url,
+    mark_seen,
     parse_dt,
     parse_list_id,
     save_config,
-    upsert_card,
+    upsert_cards,
 )
 
 ProgressCb = Optional[Callable[[str], None]]
@@ -125,10 +129,11 @@ def run_list_signal_pipeline(
     newest: Optional[datetime] = None
     oldest: Optional[datetime] = None
 
+    # 阶段一：整理每条推文，提交配图下载（共享线程池）
+    jobs: List[Dict[str, Any]] = []
     for i, it in enumerate(fresh, 1):
         tid = str(it.get("tweet_id") or "")
         text = str(it.get("text") or "").strip()
-        author = str(it.get("author") or "")
         created_raw = str(it.get("created_at") or "")
         created = parse_dt(created_raw)
         if created:
@@ -138,58 +143,97 @@ def run_list_signal_pipeline(
             if oldest is None or created < oldest:
                 oldest = created
 
-        _log(progress, f"[{i}/{len(fresh)}] 解析 {author or tid}…")
-        images_meta = []
+        images = [im for im in (it.get("images") or []) if isinstance(im, dict)]
+        if not text and not images:
+            skipped += 1
+            continue
+
         alts: List[str] = []
         urls: List[str] = []
-        for j, im in enumerate(it.get("images") or []):
-            if not isinstance(im, dict):
-                continue
+        downloads = []
+        for j, im in enumerate(images):
             u = str(im.get("url") or "")
             alt = str(im.get("alt") or "")
             if alt:
                 alts.append(alt)
             if u:
                 urls.append(u)
-            saved = download_image(u, tid or f"x{i}", j)
-            saved["alt"] = alt
-            images_meta.append(saved)
+            downloads.append((alt, submit_image_download(u, tid or f"x{i}", j)))
 
-        if not text and not images_meta:
-            skipped += 1
-            continue
+        jobs.append(
+            {
+                "item": it,
+                "tweet_id": tid,
+                "text": text,
+                "author": str(it.get("author") or ""),
+                "created_raw": created_raw,
+                "alts": alts,
+                "urls": urls,
+                "downloads": downloads,
+            }
+        )
+
+    # 阶段二：AI 解析并发执行（解析只用正文与远端图片 URL，不等下载完成）
+    total = len(jobs)
+    done = count(1)
 
+    def _analyze(job: Dict[str, Any]) -> Dict[str, Any]:
         signal = analyze_tweet_signal(
-            text=text or "（无文字，见配图）",
-            author=author,
-            image_alts=alts,
-            image_urls=urls,
+            text=job["text"] or "（无文字，见配图）",
+            author=job["author"],
+            image_alts=job["alts"],
+            image_urls=job["urls"],
         )
-        if skip_nt and not signal.get("has_trade_signal"):
-            skipped += 1
-            # 仍标记 seen，避免反复解析闲聊
-            from signals.store import mark_seen
+        _log(progress, f"[{next(done)}/{total}] 已解析 {job['author'] or job['tweet_id']}")
+        return signal
 
-            if tid:
-                mark_seen([tid])
-            continue
+    if jobs:
+        _log(progress, f"并发解析 {total} 条（AI 并发上限 {AI_CONCURRENCY}）…")
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(AI_CONCURRENCY, total or 1)),
+        thread_name_prefix="signals-ai",
+    ) as pool:
+        futures = [pool.submit(_analyze, job) for job in jobs]
 
-        card = {
-            "id": f"sig_{uuid4().hex[:10]}",
-            "list_id": lid,
-            "tweet_id": tid,
-            "url": str(it.get("url") or ""),
-            "author": author,
-            "text": text,
-            "created_at": created_raw,
-            "time_label": str(it.get("time_label") or ""),
-            "images": images_meta,
-            "signal": signal,
-            "parsed_at": now.isoformat(timespec="seconds"),
-        }
-        upsert_card(card)
-        cards.append(card)
-        parsed += 1
+        # 阶段三：按原顺序组装卡片
+        unseen_non_trade: List[str] = []
+        for job, fut in zip(jobs, futures):
+            signal = fut.result()
+            tid = job["tweet_id"]
+            if skip_nt and not signal.get("has_trade_signal"):
+                skipped += 1
+                # 仍标记 seen，避免反复解析闲聊
+                if tid:
+                    unseen_non_trade.append(tid)
+                continue
+
+            images_meta = []
+            for alt, dl in job["downloads"]:
+                saved = dl.result()
+                saved["alt"] = alt
+                images_meta.append(saved)
+
+            it = job["item"]
+            card = {
+                "id": f"sig_{uuid4().hex[:10]}",
+                "list_id": lid,
+                "tweet_id": tid,
+                "url": str(it.get("url") or ""),
+                "author": job["author"],
+                "text": job["text"],
+                "created_at": job["created_raw"],
+                "time_label": str(it.get("time_label") or ""),
+                "images": images_meta,
+                "signal": signal,
+                "parsed_at": now.isoformat(timespec="seconds"),
+            }
+            cards.append(card)
+            parsed += 1
+
+    # 卡片一个事务写入；seen 标记进内存集合，下面统一写回
+    upsert_cards(cards)
+    if unseen_non_trade:
+        mark_seen(unseen_non_trade)
 
     push_result: Dict[str, Any] = {
         "pushed": 0,
@@ -215,6 +259,7 @@ def run_list_signal_pipeline(
         if oldest:
             win_from = oldest.isoformat(timespec="seconds")
 
+    flush_pending()
     win = add_window(
         list_id=lid,
         window_from=win_from,
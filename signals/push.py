@@ -3,16 +3,16 @@
 
 from __future__ import annotations
 
-import json
-import urllib.error
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
+from signals import cards_api
 from signals.store import (
+    flush_pending,
     is_pushed,
     mark_pushed,
     parse_dt,
@@ -33,6 +33,9 @@ def load_channels_config() -> Dict[str, Any]:
                 "only_trade_signals": True,
                 "inject_channel_message": True,
                 "timeout_sec": 15,
+                "batch": "auto",
+                "batch_size": 50,
+                "max_in_flight": 4,
             },
             "default_channel": {
                 "channelId": "api",
@@ -165,6 +168,36 @@ def build_cards_payload(
     return payload
 
 
+def _api_target(api: Dict[str, Any]) -> Tuple[str, str, Dict[str, str], float]:
+    """(base_url, path, 请求头, 超时)。"""
+    base = str(api.get("base_url") or "http://127.0.0.1:3851").rstrip("/")
+    path = str(api.get("path") or "/api/v1/cards")
+    if not path.startswith("/"):
+        path = "/" + path
+    key = str(api.get("api_key") or "").strip()
+    headers = {"X-Cards-Api-Key": key} if key else {}
+    timeout = float(api.get("timeout_sec") or 15)
+    return base, path, headers, timeout
+
+
+def _batch_path(api: Dict[str, Any], path: str) -> str:
+    bp = str(api.get("batch_path") or f"{path}:batch")
+    return bp if bp.startswith("/") else "/" + bp
+
+
+def _batch_mode(api: Dict[str, Any]) -> str:
+    """batch: auto（默认，探测 :batch 接口）/ true（总是批量）/ false（逐卡）。"""
+    v = api.get("batch", "auto")
+    if isinstance(v, bool):
+        return "on" if v else "off"
+    v = str(v or "auto").strip().lower()
+    if v in ("0", "false", "no", "off"):
+        return "off"
+    if v in ("1", "true", "yes", "on"):
+        return "on"
+    return "auto"
+
+
 def post_card(
     payload: Dict[str, Any],
     *,
@@ -172,55 +205,54 @@ def post_card(
 ) -> Dict[str, Any]:
     cfg = cfg or load_channels_config()
     api = cfg.get("cards_api") if isinstance(cfg.get("cards_api"), dict) else {}
-    base = str(api.get("base_url") or "http://127.0.0.1:3851").rstrip("/")
-    path = str(api.get("path") or "/api/v1/cards")
-    if not path.startswith("/"):
-        path = "/" + path
+    base, path, headers, timeout = _api_target(api)
     url = f"{base}{path}"
-    key = str(api.get("api_key") or "").strip()
-    timeout = float(api.get("timeout_sec") or 15)
+    try:
+        r = cards_api.post_json(url, payload, headers, timeout)
+    except Exception as e:
+        return {"success": False, "status": 0, "error": str(e), "url": url}
+    status, body = r["status"], r["response"]
+    ok = status in (200, 201) and (
+        body.get("ok") is True or body.get("success") is True or status == 201
+    )
+    out = {"success": ok, "status": status, "response": body, "url": url}
+    if status >= 400:
+        out["error"] = f"HTTP Error {status}"
+    return out
 
-    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
-    headers = {
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-    }
-    if key:
-        headers["X-Cards-Api-Key"] = key
 
-    req = urllib.request.Request(url, data=data, headers=headers, method="POST")
+def post_cards_bulk(
+    payloads: List[Dict[str, Any]],
+    *,
+    cfg: Optional[Dict[str, Any]] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    一次 POST 到批量接口（默认 path + ":batch"，body 为 {"cards": [...]}），返回逐卡结果。
+    服务端没有批量接口（404/405/501）时记住并返回 None，调用方改为逐卡推送。
+    """
+    cfg = cfg or load_channels_config()
+    api = cfg.get("cards_api") if isinstance(cfg.get("cards_api"), dict) else {}
+    base, path, headers, timeout = _api_target(api)
+    bpath = _batch_path(api, path)
+    url = f"{base}{bpath}"
+    # 批量请求按卡数放宽超时
+    bulk_timeout = timeout * max(1.0, len(payloads) / 10)
     try:
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            raw = resp.read().decode("utf-8", errors="replace")
-            status = getattr(resp, "status", 200) or 200
-            try:
-                body = json.loads(raw) if raw else {}
-            except Exception:
-                body = {"raw": raw}
-            ok = status in (200, 201) and (
-                body.get("ok") is True or body.get("success") is True or status == 201
-            )
-            return {
-                "success": ok,
-                "status": status,
-                "response": body,
-                "url": url,
-            }
-    except urllib.error.HTTPError as e:
-        err_body = e.read().decode("utf-8", errors="replace") if e.fp else ""
-        try:
-            parsed = json.loads(err_body) if err_body else {}
-        except Exception:
-            parsed = {"raw": err_body}
-        return {
-            "success": False,
-            "status": e.code,
-            "error": str(e),
-            "response": parsed,
-            "url": url,
-        }
+        r = cards_api.post_json(url, {"cards": payloads}, headers, bulk_timeout)
     except Exception as e:
-        return {"success": False, "status": 0, "error": str(e), "url": url}
+        return [{"success": False, "status": 0, "error": str(e), "url": url} for _ in payloads]
+    status, body = r["status"], r["response"]
+    if cards_api.is_batch_unsupported_status(status):
+        cards_api.remember_batch_support(base, bpath, False)
+        return None
+    cards_api.remember_batch_support(base, bpath, True)
+    if status >= 400 and not isinstance(body.get("results"), list):
+        err = str(body.get("error") or body.get("message") or f"HTTP Error {status}")
+        return [{"success": False, "status": status, "error": err, "url": url} for _ in payloads]
+    items = cards_api.batch_item_results(body, len(payloads), status)
+    for it in items:
+        it["url"] = url
+    return items
 
 
 def push_card_if_needed(
@@ -237,16 +269,13 @@ def push_card_if_needed(
     if not api.get("enabled", True):
         return {"success": True, "skipped": True, "reason": "push_disabled"}
 
+    skip = _skip_reason(card, api, force)
     tid = str(card.get("tweet_id") or "").strip()
-    if tid and is_pushed(tid) and not force:
-        return {"success": True, "skipped": True, "reason": "already_pushed", "tweet_id": tid}
-
-    sig = card.get("signal") if isinstance(card.get("signal"), dict) else {}
-    if api.get("only_trade_signals", True) and not sig.get("has_trade_signal"):
-        if tid:
+    if skip:
+        if skip == "non_trade" and tid:
             # 非交易也记已处理推送队列，避免反复尝试
             mark_pushed([tid], status="skipped_non_trade")
-        return {"success": True, "skipped": True, "reason": "non_trade", "tweet_id": tid}
+        return {"success": True, "skipped": True, "reason": skip, "tweet_id": tid}
 
     payload = build_cards_payload(card, cfg=cfg)
     result = post_card(payload, cfg=cfg)
@@ -257,6 +286,57 @@ def push_card_if_needed(
     return result
 
 
+def _skip_reason(card: Dict[str, Any], api: Dict[str, Any], force: bool) -> str:
+    tid = str(card.get("tweet_id") or "").strip()
+    if tid and is_pushed(tid) and not force:
+        return "already_pushed"
+    sig = card.get("signal") if isinstance(card.get("signal"), dict) else {}
+    if api.get("only_trade_signals", True) and not sig.get("has_trade_signal"):
+        return "non_trade"
+    return ""
+
+
+def _send_payloads(
+    payloads: List[Dict[str, Any]],
+    cfg: Dict[str, Any],
+) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    发送一组卡片，返回 (与 payloads 等长的结果, 实际使用的方式 batch/single)。
+
+    批量接口可用时按 batch_size 分块，否则逐卡 POST；两种方式的并发请求数都不超过 max_in_flight。
+    """
+    api = cfg.get("cards_api") if isinstance(cfg.get("cards_api"), dict) else {}
+    max_in_flight = max(1, int(api.get("max_in_flight") or 4))
+    batch_size = max(1, int(api.get("batch_size") or 50))
+    mode = _batch_mode(api)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(payloads)
+
+    use_batch = mode != "off" and len(payloads) > 1
+    if use_batch and mode == "auto":
+        base, path, _, _ = _api_target(api)
+        use_batch = cards_api.batch_supported(base, _batch_path(api, path)) is not False
+
+    if use_batch:
+        chunks = [(i, payloads[i:i + batch_size]) for i in range(0, len(payloads), batch_size)]
+        # 第一块串行发送，顺便探测批量接口是否存在
+        first = post_cards_bulk(chunks[0][1], cfg=cfg)
+        if first is not None:
+            results[0:len(first)] = first
+            rest = chunks[1:]
+            with ThreadPoolExecutor(max_workers=min(max_in_flight, len(rest) or 1)) as pool:
+                for (start, chunk), items in zip(rest, pool.map(lambda c: post_cards_bulk(c[1], cfg=cfg), rest)):
+                    if items is None:
+                        # 服务端中途下线了批量接口：这一块改逐卡
+                        items = [post_card(p, cfg=cfg) for p in chunk]
+                    results[start:start + len(items)] = items
+            return [r or {"success": False, "status": 0, "error": "no result"} for r in results], "batch"
+
+    with ThreadPoolExecutor(max_workers=min(max_in_flight, len(payloads))) as pool:
+        for i, r in enumerate(pool.map(lambda p: post_card(p, cfg=cfg), payloads)):
+            results[i] = r
+    return [r or {"success": False, "status": 0, "error": "no result"} for r in results], "single"
+
+
 def push_cards_batch(
     cards: List[Dict[str, Any]],
     *,
@@ -275,44 +355,63 @@ def push_cards_batch(
             "items": [],
         }
 
-    pushed = 0
-    skipped = 0
-    failed = 0
+    def _log(msg: str) -> None:
+        if progress:
+            try:
+                progress(msg)
+            except Exception:
+                pass
+
+    # 先串行过滤（读已推送集合），只有真正要发的卡进入网络阶段
     items: List[Dict[str, Any]] = []
+    to_send: List[int] = []
+    payloads: List[Dict[str, Any]] = []
+    non_trade: List[str] = []
+    queued = set()
     for card in cards:
-        r = push_card_if_needed(card, force=force, cfg=cfg)
-        items.append(
-            {
-                "tweet_id": r.get("tweet_id"),
-                "success": r.get("success"),
-                "skipped": r.get("skipped"),
-                "reason": r.get("reason"),
-                "status": r.get("status"),
-                "error": r.get("error"),
-            }
-        )
-        if r.get("skipped"):
-            skipped += 1
-        elif r.get("success"):
-            pushed += 1
-            if progress:
-                try:
-                    progress(f"已推送卡片 {r.get('tweet_id')} → Cards API")
-                except Exception:
-                    pass
-        else:
-            failed += 1
-            if progress:
-                try:
-                    progress(f"推送失败 {r.get('tweet_id')}: {r.get('error') or r.get('status')}")
-                except Exception:
-                    pass
-
+        tid = str(card.get("tweet_id") or "").strip()
+        skip = "already_pushed" if tid and tid in queued else _skip_reason(card, api, force)
+        items.append({"tweet_id": tid, "success": True if skip else None, "skipped": bool(skip) or None,
+                      "reason": skip or None, "status": None, "error": None})
+        if skip:
+            if skip == "non_trade" and tid:
+                non_trade.append(tid)
+            continue
+        if tid:
+            queued.add(tid)
+        to_send.append(len(items) - 1)
+        payloads.append(build_cards_payload(card, cfg=cfg))
+    if non_trade:
+        # 非交易也记已处理推送队列，避免反复尝试
+        mark_pushed(non_trade, status="skipped_non_trade")
+
+    mode = ""
+    if payloads:
+        results, mode = _send_payloads(payloads, cfg)
+        ok_ids: List[str] = []
+        for idx, r in zip(to_send, results):
+            item = items[idx]
+            item.update(success=bool(r.get("success")), status=r.get("status"), error=r.get("error"))
+            if item["success"]:
+                if item["tweet_id"]:
+                    ok_ids.append(item["tweet_id"])
+                _log(f"已推送卡片 {item['tweet_id']} → Cards API")
+            else:
+                _log(f"推送失败 {item['tweet_id']}: {item['error'] or item['status']}")
+        if ok_ids:
+            mark_pushed(ok_ids, status="ok")
+
+    pushed = sum(1 for it in items if not it["skipped"] and it["success"])
+    skipped = sum(1 for it in items if it["skipped"])
+    failed = len(items) - pushed - skipped
+
+    flush_pending()
     return {
         "success": failed == 0,
         "pushed": pushed,
         "skipped": skipped,
         "failed": failed,
+        "mode": mode or None,
         "items": items,
     }
 
@@ -1,24 +1,57 @@
 # coding=utf-8
-"""交易信号状态：配置、爬取时间窗、已见 tweet、卡片。"""
+"""交易信号状态：配置、爬取时间窗、已见 tweet、卡片（SQLite，WAL）。
+
+表：
+- config：配置（单行 JSON）
+- cards：解析后的卡片，按 seq 倒序即最近优先，最多保留 CARD_LIMIT 条
+- seen / pushed：已解析 / 已推送的 tweet_id，按写入顺序淘汰最旧的
+- windows：每次爬取覆盖的时间窗
+- push_log：推送记录
+
+首次打开数据库时会导入旧版 state.json（保留原文件）。
+
+seen / pushed 的成员判断走进程内 SeenSet：首次使用时整表加载一次，之后 O(1) 判断；
+新增 id 先记在内存，由定时器或 flush_pending() 批量写回（write-behind）。
+"""
 
 from __future__ import annotations
 
+import atexit
 import json
+import os
 import re
+import sqlite3
 import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 STORE_DIR = PROJECT_ROOT / "output" / "signals"
+DB_PATH = STORE_DIR / "signals.db"
+# 旧版 JSON 状态文件，仅用于首次迁移
 STATE_PATH = STORE_DIR / "state.json"
 MEDIA_DIR = STORE_DIR / "media"
 
 _LOCK = threading.Lock()
+_INITIALIZED: Optional[str] = None
 
 DEFAULT_LIST_ID = "2088443239435215337"
 
+SCHEMA_VERSION = 1
+
+# 各表保留上限（与旧版 JSON 的切片长度一致）
+CARD_LIMIT = 500
+SEEN_LIMIT = 5000
+PUSHED_LIMIT = 8000
+PUSH_LOG_LIMIT = 200
+WINDOW_LIMIT = 100
+
+# seen / pushed 写回间隔（秒）
+FLUSH_INTERVAL = float(os.environ.get("SIGNALS_SEEN_FLUSH_SECONDS", "5") or 5)
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).astimezone().isoformat(timespec="seconds")
@@ -45,16 +78,20 @@ def list_url(list_id: str) -> str:
     return f"https://x.com/i/lists/{lid}" if lid else ""
 
 
+def _default_config() -> Dict[str, Any]:
+    return {
+        "list_id": DEFAULT_LIST_ID,
+        "list_url": list_url(DEFAULT_LIST_ID),
+        "cutoff_hours": 24,
+        "max_tweets": 40,
+        "skip_non_trade": False,
+        "push_enabled": True,
+    }
+
+
 def _empty_state() -> Dict[str, Any]:
     return {
-        "config": {
-            "list_id": DEFAULT_LIST_ID,
-            "list_url": list_url(DEFAULT_LIST_ID),
-            "cutoff_hours": 24,
-            "max_tweets": 40,
-            "skip_non_trade": False,
-            "push_enabled": True,
-        },
+        "config": _default_config(),
         "windows": [],
         "seen_tweet_ids": [],
         "pushed_tweet_ids": [],
@@ -64,78 +101,434 @@ def _empty_state() -> Dict[str, Any]:
     }
 
 
-def load_state() -> Dict[str, Any]:
-    ensure_dirs()
+# ——— SQLite ———
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS config (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS cards (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    card_id TEXT NOT NULL DEFAULT '',
+    tweet_id TEXT NOT NULL DEFAULT '',
+    list_id TEXT NOT NULL DEFAULT '',
+    has_trade INTEGER NOT NULL DEFAULT 0,
+    card_json TEXT NOT NULL DEFAULT '{}',
+    updated_at TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_signal_cards_tweet ON cards(tweet_id);
+CREATE INDEX IF NOT EXISTS idx_signal_cards_list ON cards(list_id, seq);
+CREATE TABLE IF NOT EXISTS seen (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    tweet_id TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS pushed (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    tweet_id TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS windows (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    list_id TEXT NOT NULL DEFAULT '',
+    window_from TEXT NOT NULL DEFAULT '',
+    window_to TEXT NOT NULL DEFAULT '',
+    fetched INTEGER NOT NULL DEFAULT 0,
+    parsed INTEGER NOT NULL DEFAULT 0,
+    skipped INTEGER NOT NULL DEFAULT 0,
+    fetched_at TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_signal_windows_list ON windows(list_id, seq);
+CREATE TABLE IF NOT EXISTS push_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    tweet_id TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT '',
+    at TEXT NOT NULL DEFAULT ''
+);
+"""
+
+
+@contextmanager
+def connect():
+    """一次调用一个事务：正常退出提交，异常回滚。"""
+    _init_db()
+    conn = sqlite3.connect(str(DB_PATH), timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA synchronous=NORMAL")
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def _init_db() -> None:
+    global _INITIALIZED
+    key = str(DB_PATH)
+    if _INITIALIZED == key:
+        return
     with _LOCK:
-        if not STATE_PATH.exists():
-            return _empty_state()
+        if _INITIALIZED == key:
+            return
+        ensure_dirs()
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(key, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION:
+                legacy = _read_legacy_state()
+                if legacy is not None:
+                    _write_state(conn, legacy)
+                conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            conn.commit()
+        finally:
+            conn.close()
+        _INITIALIZED = key
+
+
+def _read_legacy_state() -> Optional[Dict[str, Any]]:
+    if not STATE_PATH.exists():
+        return None
+    try:
+        data = json.loads(STATE_PATH.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _trim(conn: sqlite3.Connection, table: str, keep: int) -> None:
+    conn.execute(
+        f"DELETE FROM {table} WHERE seq IN "
+        f"(SELECT seq FROM {table} ORDER BY seq DESC LIMIT -1 OFFSET ?)",
+        (int(keep),),
+    )
+
+
+def _add_ids(conn: sqlite3.Connection, table: str, tweet_ids: Iterable[str], keep: int) -> None:
+    rows = [(t,) for t in (str(x or "").strip() for x in tweet_ids) if t]
+    if not rows:
+        return
+    conn.executemany(f"INSERT OR IGNORE INTO {table} (tweet_id) VALUES (?)", rows)
+    _trim(conn, table, keep)
+
+
+def _merge_config(cfg: Any) -> Dict[str, Any]:
+    merged = _default_config()
+    if isinstance(cfg, dict):
+        merged.update(cfg)
+    if not merged.get("list_id"):
+        merged["list_id"] = DEFAULT_LIST_ID
+    merged["list_url"] = list_url(str(merged.get("list_id") or ""))
+    return merged
+
+
+def _read_config(conn: sqlite3.Connection) -> Dict[str, Any]:
+    row = conn.execute("SELECT value FROM config WHERE key='config'").fetchone()
+    cfg: Any = {}
+    if row:
+        try:
+            cfg = json.loads(row["value"])
+        except Exception:
+            cfg = {}
+    return _merge_config(cfg)
+
+
+def _write_config(conn: sqlite3.Connection, cfg: Dict[str, Any]) -> None:
+    conn.execute(
+        "INSERT INTO config (key, value) VALUES ('config', ?) "
+        "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+        (json.dumps(cfg, ensure_ascii=False),),
+    )
+
+
+def _card_row(card: Dict[str, Any]) -> tuple:
+    sig = card.get("signal") if isinstance(card.get("signal"), dict) else {}
+    return (
+        str(card.get("id") or ""),
+        str(card.get("tweet_id") or ""),
+        str(card.get("list_id") or ""),
+        1 if sig.get("has_trade_signal") else 0,
+        json.dumps(card, ensure_ascii=False),
+        _now_iso(),
+    )
+
+
+def _window_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        "list_id": row["list_id"],
+        "from": row["window_from"],
+        "to": row["window_to"],
+        "fetched": row["fetched"],
+        "parsed": row["parsed"],
+        "skipped": row["skipped"],
+        "fetched_at": row["fetched_at"],
+    }
+
+
+def _write_state(conn: sqlite3.Connection, state: Dict[str, Any]) -> None:
+    """整体覆盖写入（旧版 save_state 语义，以及 JSON 迁移）。"""
+    base = _empty_state()
+    base.update({k: state.get(k, base[k]) for k in base if k in state})
+    _write_config(conn, _merge_config(base.get("config")))
+
+    for table in ("cards", "seen", "pushed", "windows", "push_log"):
+        conn.execute(f"DELETE FROM {table}")
+
+    # JSON 中列表头部为最新，倒序插入使 seq 越大越新
+    cards = [c for c in (base.get("cards") or []) if isinstance(c, dict)][:CARD_LIMIT]
+    conn.executemany(
+        "INSERT INTO cards (card_id, tweet_id, list_id, has_trade, card_json, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [_card_row(c) for c in reversed(cards)],
+    )
+    # seen / pushed 列表尾部为最新
+    _add_ids(conn, "seen", base.get("seen_tweet_ids") or [], SEEN_LIMIT)
+    _add_ids(conn, "pushed", base.get("pushed_tweet_ids") or [], PUSHED_LIMIT)
+    windows = [w for w in (base.get("windows") or []) if isinstance(w, dict)][:WINDOW_LIMIT]
+    conn.executemany(
+        "INSERT INTO windows (list_id, window_from, window_to, fetched, parsed, skipped, fetched_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                str(w.get("list_id") or ""),
+                str(w.get("from") or ""),
+                str(w.get("to") or ""),
+                int(w.get("fetched") or 0),
+                int(w.get("parsed") or 0),
+                int(w.get("skipped") or 0),
+                str(w.get("fetched_at") or ""),
+            )
+            for w in reversed(windows)
+        ],
+    )
+    log = [x for x in (base.get("push_log") or []) if isinstance(x, dict)][:PUSH_LOG_LIMIT]
+    conn.executemany(
+        "INSERT INTO push_log (tweet_id, status, at) VALUES (?, ?, ?)",
+        [
+            (str(x.get("tweet_id") or ""), str(x.get("status") or ""), str(x.get("at") or ""))
+            for x in reversed(log)
+        ],
+    )
+
+
+class SeenSet:
+    """进程内 tweet_id 集合（按插入顺序淘汰最旧，写回 SQLite 为批量延迟写）。
+
+    同一进程内的判断总是最新的；其他进程写入的 id 要到 reload() 后才可见，
+    漏判只会导致重复解析/推送检查，不会丢数据。
+    """
+
+    def __init__(self, table: str, capacity: int, flush_interval: float = FLUSH_INTERVAL):
+        self.table = table
+        self.capacity = max(1, int(capacity))
+        self.flush_interval = flush_interval
+        self._ids: "OrderedDict[str, None]" = OrderedDict()
+        self._pending: List[str] = []
+        self._loaded_from: Optional[str] = None
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+
+    def _ensure_loaded(self) -> None:
+        key = str(DB_PATH)
+        if self._loaded_from == key:
+            return
+        with self._lock:
+            if self._loaded_from == key:
+                return
+            with connect() as conn:
+                rows = conn.execute(f"SELECT tweet_id FROM {self.table} ORDER BY seq").fetchall()
+            self._ids = OrderedDict((r["tweet_id"], None) for r in rows)
+            self._pending = []
+            self._evict()
+            self._loaded_from = key
+
+    def _evict(self) -> None:
+        while len(self._ids) > self.capacity:
+            self._ids.popitem(last=False)
+
+    def __contains__(self, tweet_id: object) -> bool:
+        tid = str(tweet_id or "").strip()
+        if not tid:
+            return False
+        self._ensure_loaded()
+        return tid in self._ids
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._ids)
+
+    def add(self, tweet_ids: Iterable[str]) -> List[str]:
+        """加入集合并排队写回；返回此前不在集合中的 id。"""
+        self._ensure_loaded()
+        added: List[str] = []
+        with self._lock:
+            for x in tweet_ids:
+                tid = str(x or "").strip()
+                if not tid or tid in self._ids:
+                    continue
+                self._ids[tid] = None
+                added.append(tid)
+            if not added:
+                return added
+            self._pending.extend(added)
+            self._evict()
+            if self.flush_interval <= 0:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self._flush_quietly)
+                self._timer.daemon = True
+                self._timer.start()
+        return added
+
+    def flush(self) -> int:
+        """把排队的 id 一次写回数据库；返回写入条数。"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending, self._pending = self._pending, []
+        if not pending:
+            return 0
         try:
-            data = json.loads(STATE_PATH.read_text(encoding="utf-8"))
+            with connect() as conn:
+                _add_ids(conn, self.table, pending, self.capacity)
         except Exception:
-            return _empty_state()
-        if not isinstance(data, dict):
-            return _empty_state()
-        base = _empty_state()
-        base.update({k: data.get(k, base[k]) for k in base})
-        cfg = base.get("config") if isinstance(base.get("config"), dict) else {}
-        merged = _empty_state()["config"]
-        merged.update(cfg or {})
-        if not merged.get("list_id"):
-            merged["list_id"] = DEFAULT_LIST_ID
-        merged["list_url"] = list_url(str(merged.get("list_id") or ""))
-        base["config"] = merged
-        if not isinstance(base.get("windows"), list):
-            base["windows"] = []
-        if not isinstance(base.get("seen_tweet_ids"), list):
-            base["seen_tweet_ids"] = []
-        if not isinstance(base.get("pushed_tweet_ids"), list):
-            base["pushed_tweet_ids"] = []
-        if not isinstance(base.get("push_log"), list):
-            base["push_log"] = []
-        if not isinstance(base.get("cards"), list):
-            base["cards"] = []
-        return base
+            # 写回失败放回队列，下次再试
+            with self._lock:
+                self._pending = pending + self._pending
+            raise
+        return len(pending)
+
+    def _flush_quietly(self) -> None:
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"[signals] 写回 {self.table} 失败: {e}")
+
+    def reload(self) -> None:
+        """丢弃内存副本，下次访问时重新加载（会先写回未落盘的 id）。"""
+        self.flush()
+        with self._lock:
+            self._loaded_from = None
+
+
+_SEEN = SeenSet("seen", SEEN_LIMIT)
+_PUSHED = SeenSet("pushed", PUSHED_LIMIT)
+
+
+def seen_set() -> SeenSet:
+    return _SEEN
+
+
+def pushed_set() -> SeenSet:
+    return _PUSHED
+
+
+def flush_pending() -> None:
+    """立即写回 seen / pushed 的待写 id（流水线结束、导出状态前调用）。"""
+    _SEEN._flush_quietly()
+    _PUSHED._flush_quietly()
+
+
+atexit.register(flush_pending)
+
+
+# ——— 公共接口 ———
+
+
+def load_state() -> Dict[str, Any]:
+    """导出完整状态（与旧版 state.json 结构一致）。"""
+    flush_pending()
+    with connect() as conn:
+        state = _empty_state()
+        state["config"] = _read_config(conn)
+        state["windows"] = [
+            _window_from_row(r)
+            for r in conn.execute("SELECT * FROM windows ORDER BY seq DESC")
+        ]
+        state["seen_tweet_ids"] = [
+            r["tweet_id"] for r in conn.execute("SELECT tweet_id FROM seen ORDER BY seq")
+        ]
+        state["pushed_tweet_ids"] = [
+            r["tweet_id"] for r in conn.execute("SELECT tweet_id FROM pushed ORDER BY seq")
+        ]
+        state["push_log"] = [
+            {"tweet_id": r["tweet_id"], "status": r["status"], "at": r["at"]}
+            for r in conn.execute("SELECT * FROM push_log ORDER BY seq DESC")
+        ]
+        cards = []
+        for r in conn.execute("SELECT card_json FROM cards ORDER BY seq DESC"):
+            try:
+                cards.append(json.loads(r["card_json"]))
+            except Exception:
+                continue
+        state["cards"] = cards
+        row = conn.execute(
+            "SELECT MAX(updated_at) AS t FROM cards"
+        ).fetchone()
+        state["updated_at"] = (row["t"] if row else "") or ""
+    return state
 
 
 def save_state(state: Dict[str, Any]) -> None:
-    ensure_dirs()
-    payload = dict(state or {})
-    payload["updated_at"] = _now_iso()
-    with _LOCK:
-        STATE_PATH.write_text(
-            json.dumps(payload, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+    flush_pending()
+    with connect() as conn:
+        _write_state(conn, dict(state or {}))
+    _SEEN.reload()
+    _PUSHED.reload()
 
 
 def get_config() -> Dict[str, Any]:
-    return dict(load_state().get("config") or {})
+    with connect() as conn:
+        return _read_config(conn)
 
 
 def save_config(patch: Dict[str, Any]) -> Dict[str, Any]:
-    state = load_state()
-    cfg = dict(state.get("config") or {})
-    if "list_url" in patch or "list_id" in patch:
-        raw = str(patch.get("list_url") or patch.get("list_id") or "")
-        lid = parse_list_id(raw) or parse_list_id(str(cfg.get("list_id") or ""))
-        if lid:
-            cfg["list_id"] = lid
-            cfg["list_url"] = list_url(lid)
-    for key in ("cutoff_hours", "max_tweets"):
-        if key in patch and patch[key] is not None:
-            try:
-                cfg[key] = int(patch[key])
-            except Exception:
-                pass
-    if "skip_non_trade" in patch:
-        cfg["skip_non_trade"] = bool(patch["skip_non_trade"])
-    if "push_enabled" in patch:
-        cfg["push_enabled"] = bool(patch["push_enabled"])
-    state["config"] = cfg
-    save_state(state)
+    with connect() as conn:
+        cfg = _read_config(conn)
+        if "list_url" in patch or "list_id" in patch:
+            raw = str(patch.get("list_url") or patch.get("list_id") or "")
+            lid = parse_list_id(raw) or parse_list_id(str(cfg.get("list_id") or ""))
+            if lid:
+                cfg["list_id"] = lid
+                cfg["list_url"] = list_url(lid)
+        for key in ("cutoff_hours", "max_tweets"):
+            if key in patch and patch[key] is not None:
+                try:
+                    cfg[key] = int(patch[key])
+                except Exception:
+                    pass
+        if "skip_non_trade" in patch:
+            cfg["skip_non_trade"] = bool(patch["skip_non_trade"])
+        if "push_enabled" in patch:
+            cfg["push_enabled"] = bool(patch["push_enabled"])
+        _write_config(conn, cfg)
     return cfg
 
 
+def counts() -> Dict[str, int]:
+    """各表条数（控制台概览用，不加载全部状态）。"""
+    flush_pending()
+    with connect() as conn:
+        return {
+            table: conn.execute(f"SELECT COUNT(*) AS c FROM {table}").fetchone()["c"]
+            for table in ("cards", "seen", "pushed", "windows", "push_log")
+        }
+
+
+def list_windows(limit: int = 12) -> List[Dict[str, Any]]:
+    with connect() as conn:
+        rows = conn.execute(
+            "SELECT * FROM windows ORDER BY seq DESC LIMIT ?", (max(1, int(limit)),)
+        ).fetchall()
+    return [_window_from_row(r) for r in rows]
+
+
 def media_root() -> Path:
     ensure_dirs()
     return MEDIA_DIR
@@ -153,40 +546,48 @@ def resolve_media(rel: str) -> Path:
     return path
 
 
+def _upsert_cards(conn: sqlite3.Connection, cards: List[Dict[str, Any]]) -> List[str]:
+    seen_ids = []
+    for card in cards:
+        tid = str(card.get("tweet_id") or "")
+        row = _card_row(card)
+        updated = 0
+        if tid:
+            # 同一 tweet 覆盖原卡片，保持原有位置
+            updated = conn.execute(
+                "UPDATE cards SET card_id=?, tweet_id=?, list_id=?, has_trade=?, card_json=?, updated_at=? "
+                "WHERE seq=(SELECT seq FROM cards WHERE tweet_id=? ORDER BY seq DESC LIMIT 1)",
+                row + (tid,),
+            ).rowcount
+            seen_ids.append(tid)
+        if not updated:
+            conn.execute(
+                "INSERT INTO cards (card_id, tweet_id, list_id, has_trade, card_json, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                row,
+            )
+    _trim(conn, "cards", CARD_LIMIT)
+    return seen_ids
+
+
 def upsert_card(card: Dict[str, Any]) -> Dict[str, Any]:
-    state = load_state()
-    cards: List[Dict[str, Any]] = list(state.get("cards") or [])
-    tid = str(card.get("tweet_id") or "")
-    replaced = False
-    if tid:
-        for i, old in enumerate(cards):
-            if str(old.get("tweet_id") or "") == tid:
-                cards[i] = card
-                replaced = True
-                break
-    if not replaced:
-        cards.insert(0, card)
-    # 保留最近 500
-    state["cards"] = cards[:500]
-    seen = list(state.get("seen_tweet_ids") or [])
-    if tid and tid not in seen:
-        seen.append(tid)
-    state["seen_tweet_ids"] = seen[-5000:]
-    save_state(state)
+    with connect() as conn:
+        seen_ids = _upsert_cards(conn, [card])
+    _SEEN.add(seen_ids)
     return card
 
 
+def upsert_cards(cards: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """批量写入卡片（单个事务，按列表顺序依次插入，后者更新）。"""
+    if cards:
+        with connect() as conn:
+            seen_ids = _upsert_cards(conn, list(cards))
+        _SEEN.add(seen_ids)
+    return cards
+
+
 def mark_seen(tweet_ids: List[str]) -> None:
-    state = load_state()
-    seen = list(state.get("seen_tweet_ids") or [])
-    sset = set(seen)
-    for tid in tweet_ids:
-        t = str(tid or "").strip()
-        if t and t not in sset:
-            seen.append(t)
-            sset.add(t)
-    state["seen_tweet_ids"] = seen[-5000:]
-    save_state(state)
+    _SEEN.add(tweet_ids)
 
 
 def add_window(
@@ -198,7 +599,6 @@ def add_window(
     parsed: int = 0,
     skipped: int = 0,
 ) -> Dict[str, Any]:
-    state = load_state()
     win = {
         "list_id": list_id,
         "from": window_from,
@@ -208,24 +608,34 @@ def add_window(
         "skipped": int(skipped),
         "fetched_at": _now_iso(),
     }
-    windows = list(state.get("windows") or [])
-    windows.insert(0, win)
-    state["windows"] = windows[:100]
-    save_state(state)
+    with connect() as conn:
+        conn.execute(
+            "INSERT INTO windows (list_id, window_from, window_to, fetched, parsed, skipped, fetched_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                win["list_id"],
+                win["from"],
+                win["to"],
+                win["fetched"],
+                win["parsed"],
+                win["skipped"],
+                win["fetched_at"],
+            ),
+        )
+        _trim(conn, "windows", WINDOW_LIMIT)
     return win
 
 
 def latest_window_end(list_id: str) -> Optional[datetime]:
     """该列表最近一次成功爬取覆盖到的结束时间（本地/带时区）。"""
-    state = load_state()
     lid = parse_list_id(list_id) or list_id
-    for w in state.get("windows") or []:
-        if str(w.get("list_id") or "") != str(lid):
-            continue
-        raw = str(w.get("to") or "").strip()
-        if not raw:
-            continue
-        dt = parse_dt(raw)
+    with connect() as conn:
+        rows = conn.execute(
+            "SELECT window_to FROM windows WHERE list_id=? AND window_to != '' ORDER BY seq DESC",
+            (str(lid),),
+        ).fetchall()
+    for r in rows:
+        dt = parse_dt(str(r["window_to"] or ""))
         if dt:
             return dt
     return None
@@ -252,18 +662,27 @@ def list_cards(
     only_trade: bool = False,
     limit: int = 100,
 ) -> List[Dict[str, Any]]:
-    state = load_state()
     lid = parse_list_id(list_id) if list_id else ""
+    sql = "SELECT card_json FROM cards"
+    where = []
+    params: List[Any] = []
+    if lid:
+        where.append("list_id IN ('', ?)")
+        params.append(lid)
+    if only_trade:
+        where.append("has_trade=1")
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY seq DESC LIMIT ?"
+    params.append(max(1, int(limit)))
+    with connect() as conn:
+        rows = conn.execute(sql, params).fetchall()
     out: List[Dict[str, Any]] = []
-    for c in state.get("cards") or []:
-        if lid and str(c.get("list_id") or "") not in ("", lid):
-            continue
-        sig = c.get("signal") if isinstance(c.get("signal"), dict) else {}
-        if only_trade and not sig.get("has_trade_signal"):
+    for r in rows:
+        try:
+            out.append(json.loads(r["card_json"]))
+        except Exception:
             continue
-        out.append(c)
-        if len(out) >= max(1, int(limit)):
-            break
     return out
 
 
@@ -271,32 +690,25 @@ def is_seen(tweet_id: str) -> bool:
     tid = str(tweet_id or "").strip()
     if not tid:
         return False
-    state = load_state()
-    return tid in set(state.get("seen_tweet_ids") or [])
+    return tid in _SEEN
 
 
 def is_pushed(tweet_id: str) -> bool:
     tid = str(tweet_id or "").strip()
     if not tid:
         return False
-    state = load_state()
-    return tid in set(state.get("pushed_tweet_ids") or [])
+    return tid in _PUSHED
 
 
 def mark_pushed(tweet_ids: List[str], *, status: str = "ok") -> None:
-    state = load_state()
-    pushed = list(state.get("pushed_tweet_ids") or [])
-    pset = set(pushed)
-    log = list(state.get("push_log") or [])
     now = _now_iso()
-    for tid in tweet_ids:
-        t = str(tid or "").strip()
-        if not t:
-            continue
-        if t not in pset:
-            pushed.append(t)
-            pset.add(t)
-        log.insert(0, {"tweet_id": t, "status": status, "at": now})
-    state["pushed_tweet_ids"] = pushed[-8000:]
-    state["push_log"] = log[:200]
-    save_state(state)
+    ids = [t for t in (str(x or "").strip() for x in tweet_ids) if t]
+    if not ids:
+        return
+    _PUSHED.add(ids)
+    with connect() as conn:
+        conn.executemany(
+            "INSERT INTO push_log (tweet_id, status, at) VALUES (?, ?, ?)",
+            [(t, status, now) for t in ids],
+        )
+        _trim(conn, "push_log", PUSH_LOG_LIMIT)
@@ -0,0 +1,136 @@
+# coding=utf-8
+"""
+测试 LLM 通道熔断（utils.llm_router）与响应缓存的配合
+
+用本地假 LLM 服务（utils.fake_llm_server）代替真实接口，不消耗额度：
+    python test_llm_router.py
+也可以用 pytest 运行。
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import yaml
+
+import utils.ai_client as ai_client
+import utils.llm_cache as llm_cache
+from utils.fake_llm_server import start_fake_llm
+from utils.llm_router import ProviderRouter
+
+
+def _control(server, body):
+    host, port = server.server_address[:2]
+    req = urllib.request.Request(
+        f"http://{host}:{port}/__control",
+        data=json.dumps(body).encode("utf-8"),
+        method="POST",
+    )
+    urllib.request.urlopen(req).read()
+
+
+def _setup(threshold=2, cooldown=0.2):
+    """假 DeepSeek + 临时配置（只走 DeepSeek）+ 临时缓存库，返回假服务。"""
+    server = start_fake_llm(model="fake-deepseek")
+    host, port = server.server_address[:2]
+    tmp = Path(tempfile.mkdtemp())
+    with open(project_root / "config" / "config.yaml", "r", encoding="utf-8") as f:
+        cfg = yaml.safe_load(f) or {}
+    ai = cfg.setdefault("ai", {})
+    ai["prefer"] = "deepseek"
+    ai.setdefault("deepseek", {}).update(
+        enable=True,
+        api_key="test",
+        api_endpoint=f"http://{host}:{port}/chat/completions",
+    )
+    ai["router"] = {"breaker_threshold": threshold, "breaker_cooldown": cooldown, "hedge": False}
+    path = tmp / "config.yaml"
+    path.write_text(yaml.safe_dump(cfg, allow_unicode=True), encoding="utf-8")
+    ai_client._ai_config = ai_client._AIConfig(path)
+    llm_cache._cache = llm_cache.LLMCache(tmp / "llm_cache.db")
+    return server
+
+
+def test_cached_trial_does_not_wedge_breaker():
+    """熔断冷却后第一个请求命中缓存，之后的实时请求仍应放行并恢复通道。"""
+    server = _setup(threshold=2, cooldown=0.2)
+    try:
+        warm = ai_client.generate_text("缓存的提示词", temperature=0.1, cache=True)
+        assert warm["success"], warm
+
+        _control(server, {"down": True})
+        for i in range(2):
+            r = ai_client.generate_text(f"失败 {i}", cache=False)
+            assert not r["success"]
+        state = ai_client.get_router().state("deepseek")
+        assert state.snapshot()["circuit_open"]
+
+        time.sleep(0.25)
+        hit = ai_client.generate_text("缓存的提示词", temperature=0.1, cache=True)
+        assert hit.get("cached"), hit
+        assert not state.trial_inflight
+
+        _control(server, {"down": False})
+        live = ai_client.generate_text("实时请求", cache=False)
+        assert live["success"], live
+        assert live["provider"] == "deepseek"
+        assert not state.snapshot()["circuit_open"]
+    finally:
+        server.shutdown()
+
+
+def test_router_call_cached_releases_trial():
+    """直接经 ProviderRouter.call 返回缓存结果时也要交还试探名额。"""
+    router = ProviderRouter({"router": {"breaker_threshold": 1, "breaker_cooldown": 0.05}})
+    router.call("deepseek", lambda: {"success": False, "error": "boom"})
+    state = router.state("deepseek")
+    assert not state.allow()
+    time.sleep(0.06)
+    assert state.allow()
+    router.call("deepseek", lambda: {"success": True, "content": "x", "cached": True})
+    assert state.allow()
+
+
+def test_ollama_half_open_allows_single_probe():
+    """Ollama 健康熔断冷却结束后只有一个线程探测；试探失败重新熔断且计数清零。"""
+    probes = []
+
+    class SlowOllama(ai_client.OllamaClient):
+        BREAKER_COOLDOWN = 0.1
+        HEALTH_TTL_FAIL = 0.05
+
+        def _probe_reachable(self, timeout):
+            probes.append(threading.get_ident())
+            time.sleep(0.1)
+            return False
+
+    client = SlowOllama()
+    client.enable = True
+    for _ in range(client.BREAKER_THRESHOLD):
+        client.record_failure()
+    assert client.circuit_open()
+    assert client.health()["failures"] == 0
+
+    time.sleep(0.15)
+    threads = [threading.Thread(target=client.reachable) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(probes) == 1
+    assert client.circuit_open()
+    assert not client.health()["trial_inflight"]
+
+
+if __name__ == "__main__":
+    test_router_call_cached_releases_trial()
+    test_ollama_half_open_allows_single_probe()
+    test_cached_trial_does_not_wedge_breaker()
+    print("OK")
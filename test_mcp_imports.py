@@ -0,0 +1,55 @@
+# coding=utf-8
+"""
+MCP 服务模块导入冒烟测试
+
+逐个导入 mcp_server 下的模块，防止服务层改动时删掉了工具层仍在引用的名字
+（例如 get_crawl_executor），导致整个 MCP 服务无法启动：
+    python test_mcp_imports.py
+也可以用 pytest 运行。
+"""
+
+import importlib
+import importlib.util
+import os
+import pkgutil
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import mcp_server
+
+# 依赖 fastmcp 的入口模块：未安装 fastmcp 时跳过
+OPTIONAL = {"mcp_server.server": "fastmcp"}
+
+
+def _modules():
+    for info in pkgutil.walk_packages(mcp_server.__path__, prefix="mcp_server."):
+        yield info.name
+
+
+def test_import_all_mcp_modules():
+    """所有 mcp_server 模块都能导入"""
+    for name in _modules():
+        dependency = OPTIONAL.get(name)
+        if dependency and importlib.util.find_spec(dependency) is None:
+            continue
+        importlib.import_module(name)
+
+
+def test_crawl_executor_factory():
+    """system 工具依赖的全局执行器工厂存在，且按 MCP_CRAWL_WORKERS 设置并发数"""
+    from mcp_server.services import crawl_executor
+    from mcp_server.tools.system import SystemManagementTools
+
+    crawl_executor._global_executor = None
+    tools = SystemManagementTools(str(project_root))
+    assert tools.crawl_executor is crawl_executor.get_crawl_executor()
+    assert tools.crawl_executor.max_workers == int(os.environ.get("MCP_CRAWL_WORKERS", "4"))
+
+
+if __name__ == "__main__":
+    test_import_all_mcp_modules()
+    test_crawl_executor_factory()
+    print("OK")
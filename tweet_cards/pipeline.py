@@ -21,16 +21,37 @@ def _log(cb: ProgressCb, msg: str) -> None:
             pass
 
 
+def _submit_images(urls: List[str]) -> List[Any]:
+    """配图提交到 signals 共享缓存（同一 URL/内容不重复下载），返回 [(url, Future)]。"""
+    try:
+        from signals.media_cache import get_cache
+
+        cache = get_cache()
+        return [(u, cache.submit(u)) for u in urls]
+    except Exception:
+        return []
+
+
 def ingest_one(url_or_id: str, *, progress: ProgressCb = None) -> Dict[str, Any]:
     _log(progress, f"拉取 {url_or_id[:80]}…")
     fetched = fetch_tweet(url_or_id)
     if not fetched.get("success"):
         return fetched
 
+    images = [str(u) for u in (fetched.get("images") or []) if u]
+    media = dict(fetched.get("media") or {})
+    # 配图下载与 LLM 并行
+    downloads = _submit_images(images)
+
     text = str(fetched.get("text") or "")
     author = str(fetched.get("author_handle") or fetched.get("author_name") or "")
     _log(progress, f"LLM 结构化 @{author or fetched.get('tweet_id')}…")
     llm = analyze_tweet_text(text, author=author)
+    # {url: rel}，前端优先经 /api/signals/media 读本地缓存
+    cached = {u: fut.result().get("rel") for u, fut in downloads}
+    cached = {u: rel for u, rel in cached.items() if rel}
+    if cached:
+        media["cache"] = cached
 
     payload = {
         "tweet_id": fetched.get("tweet_id"),
@@ -45,8 +66,8 @@ def ingest_one(url_or_id: str, *, progress: ProgressCb = None) -> Dict[str, Any]
         "retweets": fetched.get("retweets") or 0,
         "bookmarks": fetched.get("bookmarks") or 0,
         "views": fetched.get("views") or 0,
-        "images": fetched.get("images") or [],
-        "media": fetched.get("media") or {},
+        "images": images,
+        "media": media,
         "summary": llm.get("summary") or "",
         "core_points": llm.get("core_points") or [],
         "emotion": llm.get("emotion") or "",
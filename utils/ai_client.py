@@ -5,16 +5,121 @@ AI模型客户端
 """
 
 import json
+import os
+import threading
+import time
 import requests
 import yaml
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Iterator
 import logging
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+CONFIG_PATH = Path(__file__).parent.parent / "config" / "config.yaml"
+# 两次检查配置文件 mtime 的最短间隔（秒），间隔内直接用内存中的配置
+CONFIG_STAT_INTERVAL = 1.0
+
+
+class _AIConfig:
+    """config.yaml 中 ai 段的进程内缓存：按 mtime 热重载，version 递增通知客户端重建。"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.version = 0
+        self._data: Dict[str, Any] = {}
+        self._mtime: Optional[int] = None
+        self._checked = float("-inf")
+        self._lock = threading.Lock()
+
+    def get(self) -> Dict[str, Any]:
+        if time.monotonic() - self._checked < CONFIG_STAT_INTERVAL:
+            return self._data
+        with self._lock:
+            now = time.monotonic()
+            if now - self._checked < CONFIG_STAT_INTERVAL:
+                return self._data
+            try:
+                mtime: Optional[int] = os.stat(self.path).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime != self._mtime or self.version == 0:
+                data: Dict[str, Any] = {}
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        cfg = yaml.safe_load(f) or {}
+                    ai = cfg.get("ai") if isinstance(cfg, dict) else None
+                    data = ai if isinstance(ai, dict) else {}
+                except Exception as e:
+                    if mtime is not None:
+                        logger.error(f"加载 AI 配置失败: {e}")
+                self._data = data
+                self._mtime = mtime
+                self.version += 1
+            self._checked = now
+        return self._data
+
+    def current_version(self) -> int:
+        self.get()
+        return self.version
+
+
+_ai_config = _AIConfig(CONFIG_PATH)
+
+
+def ai_config() -> Dict[str, Any]:
+    """config.ai（缓存，文件修改后自动重载）。"""
+    return _ai_config.get()
+
+
+def _read_config(path: Path) -> Dict[str, Any]:
+    """默认配置文件走缓存，其他路径直接读取。"""
+    if Path(path) == _ai_config.path:
+        if not _ai_config.path.exists():
+            raise FileNotFoundError(str(_ai_config.path))
+        return {"ai": ai_config()}
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def ai_prefer() -> str:
+    return str(ai_config().get("prefer") or "deepseek_first").strip().lower()
+
+
+def _make_session(provider: str, trust_env: bool = False) -> "requests.Session":
+    """每个客户端一个连接池会话，池大小与该通道的并发上限一致。"""
+    from utils.llm_router import DEFAULT_CONCURRENCY
+
+    p = ai_config().get(provider)
+    limit = int((p if isinstance(p, dict) else {}).get("max_concurrency") or DEFAULT_CONCURRENCY.get(provider, 4))
+    session = requests.Session()
+    session.trust_env = trust_env
+    adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=max(4, limit))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _iter_sse(resp: "requests.Response") -> Iterator[Dict[str, Any]]:
+    """逐条解析 text/event-stream 的 data 行（JSON），遇到 [DONE] 结束。"""
+    for raw in resp.iter_lines(decode_unicode=False):
+        if not raw:
+            continue
+        line = raw.decode("utf-8", errors="replace").strip()
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        try:
+            obj = json.loads(data)
+        except Exception:
+            continue
+        if isinstance(obj, dict):
+            yield obj
+
 
 class QwenClient:
     """通义千问API客户端"""
@@ -27,17 +132,16 @@ class QwenClient:
             config_path: 配置文件路径，默认使用项目根目录下的config/config.yaml
         """
         if config_path is None:
-            project_root = Path(__file__).parent.parent
-            config_path = project_root / "config" / "config.yaml"
+            config_path = _ai_config.path
         
         self.config_path = Path(config_path)
         self._load_config()
+        self.session = _make_session("qwen", trust_env=True)
     
     def _load_config(self):
         """加载配置文件"""
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+            config = _read_config(self.config_path)
             
             ai_config = config.get('ai', {}).get('qwen', {})
             
@@ -124,7 +228,7 @@ class QwenClient:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.post(
+            response = self.session.post(
                 self.api_endpoint,
                 headers=headers,
                 json=data,
@@ -194,6 +298,62 @@ class QwenClient:
                 'usage': {}
             }
     
+    def stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        流式生成（DashScope SSE，incremental_output），逐块产出文本
+        
+        Raises:
+            RuntimeError: 未启用或响应中没有任何文本
+            requests.exceptions.RequestException: 请求失败
+        """
+        if not self.enable:
+            raise RuntimeError('千问模型未启用或API Key未配置')
+        messages = []
+        if system_prompt:
+            messages.append({'role': 'system', 'content': system_prompt})
+        messages.append({'role': 'user', 'content': prompt})
+        data = {
+            'model': self.model,
+            'input': {'messages': messages},
+            'parameters': {
+                'temperature': temperature if temperature is not None else self.temperature,
+                'max_tokens': max_tokens if max_tokens is not None else self.max_tokens,
+                'result_format': 'message',
+                'incremental_output': True,
+                **kwargs
+            }
+        }
+        headers = {
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json',
+            'Accept': 'text/event-stream',
+            'X-DashScope-SSE': 'enable'
+        }
+        with self.session.post(self.api_endpoint, headers=headers, json=data,
+                               timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            got = False
+            for event in _iter_sse(response):
+                output = event.get('output') or {}
+                piece = ''
+                choices = output.get('choices') or []
+                if choices and isinstance(choices[0], dict):
+                    piece = (choices[0].get('message') or {}).get('content') or ''
+                if not piece:
+                    piece = output.get('text') or ''
+                if piece:
+                    got = True
+                    yield piece
+            if not got:
+                raise RuntimeError('千问流式响应为空')
+    
     def generate_with_prompt_file(
         self,
         prompt_file: str,
@@ -254,8 +414,11 @@ _deepseek_client: Optional["DeepSeekClient"] = None
 def get_qwen_client() -> QwenClient:
     """获取全局千问客户端实例（单例模式）"""
     global _qwen_client
-    if _qwen_client is None:
+    version = _ai_config.current_version()
+    # 配置文件改动后重建客户端
+    if _qwen_client is None or _qwen_client.config_version != version:
         _qwen_client = QwenClient()
+        _qwen_client.config_version = version
     return _qwen_client
 
 
@@ -264,15 +427,14 @@ class DeepSeekClient:
 
     def __init__(self, config_path: Optional[str] = None):
         if config_path is None:
-            project_root = Path(__file__).parent.parent
-            config_path = project_root / "config" / "config.yaml"
+            config_path = _ai_config.path
         self.config_path = Path(config_path)
         self._load_config()
+        self.session = _make_session("deepseek")
 
     def _load_config(self):
         try:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                config = yaml.safe_load(f) or {}
+            config = _read_config(self.config_path)
             ds = (config.get("ai") or {}).get("deepseek") or {}
             self.api_key = str(ds.get("api_key") or "").strip()
             self.api_endpoint = str(
@@ -332,9 +494,7 @@ class DeepSeekClient:
             "Content-Type": "application/json",
         }
         try:
-            session = requests.Session()
-            session.trust_env = False
-            resp = session.post(
+            resp = self.session.post(
                 self.api_endpoint,
                 headers=headers,
                 json=data,
@@ -394,10 +554,61 @@ class DeepSeekClient:
             }
 
 
+    def stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> Iterator[str]:
+        """流式生成（OpenAI 兼容 SSE），逐块产出 delta.content；失败抛异常。"""
+        if not self.enable:
+            raise RuntimeError("DeepSeek 未启用或 API Key 未配置")
+        messages: List[Dict[str, str]] = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        data = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature if temperature is not None else self.temperature,
+            "max_tokens": max_tokens if max_tokens is not None else self.max_tokens,
+            "stream": True,
+        }
+        for k, v in kwargs.items():
+            if k not in data:
+                data[k] = v
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream",
+        }
+        with self.session.post(
+            self.api_endpoint, headers=headers, json=data, timeout=self.timeout, stream=True
+        ) as resp:
+            resp.raise_for_status()
+            got = False
+            for event in _iter_sse(resp):
+                choices = event.get("choices")
+                if not isinstance(choices, list) or not choices or not isinstance(choices[0], dict):
+                    continue
+                delta = choices[0].get("delta") or {}
+                piece = delta.get("content") if isinstance(delta, dict) else ""
+                if piece:
+                    got = True
+                    yield str(piece)
+            if not got:
+                raise RuntimeError("DeepSeek 流式响应为空")
+
+
 def get_deepseek_client() -> DeepSeekClient:
     global _deepseek_client
-    if _deepseek_client is None:
+    version = _ai_config.current_version()
+    # 配置文件改动后重建客户端
+    if _deepseek_client is None or _deepseek_client.config_version != version:
         _deepseek_client = DeepSeekClient()
+        _deepseek_client.config_version = version
     return _deepseek_client
 
 
@@ -406,15 +617,15 @@ class OllamaClient:
 
     def __init__(self, config_path: Optional[str] = None):
         if config_path is None:
-            project_root = Path(__file__).parent.parent
-            config_path = project_root / "config" / "config.yaml"
+            config_path = _ai_config.path
         self.config_path = Path(config_path)
         self._load_config()
+        self._health_init()
+        self.session = _make_session("ollama")
 
     def _load_config(self) -> None:
         try:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                config = yaml.safe_load(f) or {}
+            config = _read_config(self.config_path)
             ai = config.get("ai") or {}
             o = ai.get("ollama") or {}
             self.base_url = str(o.get("base_url") or "http://127.0.0.1:11434").rstrip("/")
@@ -430,9 +641,56 @@ class OllamaClient:
             self.model = ""
             self.timeout = 120
 
-    def reachable(self, timeout: float = 1.5) -> bool:
-        if not self.enable or not self.base_url:
-            return False
+    # 健康探测缓存：成功结果保留 HEALTH_TTL_OK 秒，失败结果保留 HEALTH_TTL_FAIL 秒
+    HEALTH_TTL_OK = 30.0
+    HEALTH_TTL_FAIL = 5.0
+    # 熔断：连续失败 BREAKER_THRESHOLD 次后 BREAKER_COOLDOWN 秒内直接判定不可用，
+    # 冷却结束后只放行一个线程探测（半开），成功即恢复，失败则重新熔断
+    BREAKER_THRESHOLD = 3
+    BREAKER_COOLDOWN = 30.0
+
+    def _health_init(self) -> None:
+        self._health_lock = threading.Lock()
+        self._reachable_cache: Optional[tuple] = None  # (bool, expires_at)
+        self._models_cache: Optional[tuple] = None  # (bool, expires_at)
+        self._failures = 0
+        self._open_until = 0.0
+        self._trial_inflight = False
+
+    def record_success(self) -> None:
+        with self._health_lock:
+            self._failures = 0
+            self._open_until = 0.0
+            self._trial_inflight = False
+            self._reachable_cache = (True, time.monotonic() + self.HEALTH_TTL_OK)
+
+    def record_failure(self) -> None:
+        with self._health_lock:
+            trial = self._trial_inflight
+            self._trial_inflight = False
+            self._failures += 1
+            now = time.monotonic()
+            self._reachable_cache = (False, now + self.HEALTH_TTL_FAIL)
+            # 半开试探失败直接重新熔断；熔断时清零计数，恢复后重新累计
+            if trial or self._failures >= self.BREAKER_THRESHOLD:
+                self._open_until = now + self.BREAKER_COOLDOWN
+                self._failures = 0
+                self._models_cache = None
+
+    def circuit_open(self) -> bool:
+        return time.monotonic() < self._open_until
+
+    def health(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "failures": self._failures,
+            "circuit_open": now < self._open_until,
+            "trial_inflight": self._trial_inflight,
+            "open_seconds_left": round(max(0.0, self._open_until - now), 1),
+            "reachable_cached": self._reachable_cache[0] if self._reachable_cache else None,
+        }
+
+    def _probe_reachable(self, timeout: float) -> bool:
         try:
             from urllib.parse import urlparse
             import socket
@@ -443,22 +701,39 @@ class OllamaClient:
             if host in {"127.0.0.1", "localhost"}:
                 with socket.create_connection((host, int(port)), timeout=timeout):
                     return True
-            r = requests.get(f"{self.base_url}/api/tags", timeout=timeout)
+            r = self.session.get(f"{self.base_url}/api/tags", timeout=timeout)
             return r.status_code < 500
         except Exception:
             return False
 
-    def has_model(self, timeout: float = 3.0) -> bool:
-        """本机是否已拉取配置中的 model（名称或 name:tag 前缀匹配）。"""
-        if not self.reachable(timeout=min(1.5, timeout)):
+    def reachable(self, timeout: float = 1.5) -> bool:
+        if not self.enable or not self.base_url:
             return False
+        with self._health_lock:
+            now = time.monotonic()
+            if now < self._open_until:
+                return False
+            cached = self._reachable_cache
+            if cached is not None and now < cached[1]:
+                return cached[0]
+            if self._open_until:
+                # 冷却结束：只放行一个试探，其余线程在试探结束前仍判定不可用
+                if self._trial_inflight:
+                    return False
+                self._trial_inflight = True
+        ok = self._probe_reachable(timeout)
+        if ok:
+            self.record_success()
+        else:
+            self.record_failure()
+        return ok
+
+    def _probe_has_model(self, timeout: float) -> bool:
         want = (self.model or "").strip().lower()
         if not want:
             return False
         try:
-            session = requests.Session()
-            session.trust_env = False
-            r = session.get(f"{self.base_url}/api/tags", timeout=timeout)
+            r = self.session.get(f"{self.base_url}/api/tags", timeout=timeout)
             r.raise_for_status()
             data = r.json() if r.content else {}
             models = data.get("models") if isinstance(data, dict) else None
@@ -480,6 +755,18 @@ class OllamaClient:
         except Exception:
             return True
 
+    def has_model(self, timeout: float = 3.0) -> bool:
+        """本机是否已拉取配置中的 model（名称或 name:tag 前缀匹配），结果缓存 HEALTH_TTL_OK 秒。"""
+        if not self.reachable(timeout=min(1.5, timeout)):
+            return False
+        cached = self._models_cache
+        now = time.monotonic()
+        if cached is not None and now < cached[1]:
+            return cached[0]
+        ok = self._probe_has_model(timeout)
+        self._models_cache = (ok, now + (self.HEALTH_TTL_OK if ok else self.HEALTH_TTL_FAIL))
+        return ok
+
     def generate(
         self,
         prompt: str,
@@ -500,7 +787,8 @@ class OllamaClient:
             return {
                 "success": False,
                 "content": "",
-                "error": f"Ollama 不可达: {self.base_url}",
+                "error": f"Ollama 不可达: {self.base_url}"
+                + ("（熔断中）" if self.circuit_open() else ""),
                 "usage": {},
                 "provider": "ollama",
             }
@@ -534,9 +822,7 @@ class OllamaClient:
 
         url = f"{self.base_url}/api/generate"
         try:
-            session = requests.Session()
-            session.trust_env = False
-            r = session.post(
+            r = self.session.post(
                 url,
                 json=payload,
                 headers={"Content-Type": "application/json"},
@@ -554,6 +840,7 @@ class OllamaClient:
                     "provider": "ollama",
                     "model": self.model,
                 }
+            self.record_success()
             return {
                 "success": True,
                 "content": text.strip(),
@@ -563,6 +850,7 @@ class OllamaClient:
                 "model": self.model,
             }
         except Exception as e:
+            self.record_failure()
             logger.error(f"Ollama 请求失败: {e}")
             return {
                 "success": False,
@@ -573,10 +861,78 @@ class OllamaClient:
             }
 
 
+    def stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> Iterator[str]:
+        """流式生成（/api/generate NDJSON），逐块产出 response 字段；失败抛异常。"""
+        if not self.enable:
+            raise RuntimeError("Ollama 未启用或配置不完整")
+        if not self.reachable():
+            raise RuntimeError(f"Ollama 不可达: {self.base_url}")
+        if not self.has_model():
+            raise RuntimeError(f"Ollama 未找到模型: {self.model}")
+
+        full_prompt = prompt or ""
+        if system_prompt:
+            full_prompt = f"{system_prompt.strip()}\n\n{full_prompt}"
+        payload: Dict[str, Any] = {"model": self.model, "prompt": full_prompt, "stream": True}
+        options: Dict[str, Any] = {}
+        if temperature is not None:
+            options["temperature"] = temperature
+        if max_tokens is not None:
+            options["num_predict"] = max_tokens
+        if options:
+            payload["options"] = options
+        payload.update(kwargs)
+        payload["stream"] = True
+
+        try:
+            with self.session.post(
+                f"{self.base_url}/api/generate",
+                json=payload,
+                headers={"Content-Type": "application/json"},
+                timeout=self.timeout,
+                stream=True,
+            ) as r:
+                r.raise_for_status()
+                got = False
+                for raw in r.iter_lines(decode_unicode=False):
+                    if not raw:
+                        continue
+                    try:
+                        obj = json.loads(raw.decode("utf-8", errors="replace"))
+                    except Exception:
+                        continue
+                    if not isinstance(obj, dict):
+                        continue
+                    if obj.get("error"):
+                        raise RuntimeError(f"Ollama 错误: {obj['error']}")
+                    piece = obj.get("response")
+                    if isinstance(piece, str) and piece:
+                        got = True
+                        yield piece
+                    if obj.get("done"):
+                        break
+                if not got:
+                    raise RuntimeError("Ollama 空响应")
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+
+
 def get_ollama_client() -> OllamaClient:
     global _ollama_client
-    if _ollama_client is None:
+    version = _ai_config.current_version()
+    # 配置文件改动后重建客户端
+    if _ollama_client is None or _ollama_client.config_version != version:
         _ollama_client = OllamaClient()
+        _ollama_client.config_version = version
     return _ollama_client
 
 
@@ -599,14 +955,7 @@ class PreferAIClient:
 
     @property
     def provider_hint(self) -> str:
-        prefer = "deepseek_first"
-        try:
-            project_root = Path(__file__).parent.parent
-            with open(project_root / "config" / "config.yaml", "r", encoding="utf-8") as f:
-                cfg = yaml.safe_load(f) or {}
-            prefer = str((cfg.get("ai") or {}).get("prefer") or prefer).strip().lower()
-        except Exception:
-            pass
+        prefer = ai_prefer()
         d = get_deepseek_client()
         o = get_ollama_client()
         q = get_qwen_client()
@@ -639,6 +988,23 @@ class PreferAIClient:
         )
 
 
+_router: Optional["ProviderRouter"] = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> "ProviderRouter":
+    """全局通道路由（配置文件改动后重建）。"""
+    from utils.llm_router import ProviderRouter
+
+    global _router
+    version = _ai_config.current_version()
+    with _router_lock:
+        if _router is None or _router.config_version != version:
+            _router = ProviderRouter(ai_config())
+            _router.config_version = version
+        return _router
+
+
 _prefer_client: Optional[PreferAIClient] = None
 
 
@@ -650,6 +1016,177 @@ def get_ai_client() -> PreferAIClient:
     return _prefer_client
 
 
+def _provider_order(prefer: str) -> List[str]:
+    if prefer in ("deepseek", "ollama", "qwen"):
+        return [prefer]
+    if prefer == "ollama_first":
+        return ["ollama", "deepseek", "qwen"]
+    # deepseek_first（默认）
+    return ["deepseek", "ollama", "qwen"]
+
+
+def _provider_clients() -> Dict[str, Any]:
+    return {
+        "deepseek": get_deepseek_client(),
+        "ollama": get_ollama_client(),
+        "qwen": get_qwen_client(),
+    }
+
+
+def _cache_key(
+    provider: str,
+    client: Any,
+    prompt: str,
+    system_prompt: Optional[str],
+    kwargs: Dict[str, Any],
+) -> str:
+    from utils.llm_cache import make_key
+
+    temperature = kwargs.get("temperature")
+    max_tokens = kwargs.get("max_tokens")
+    extra = {k: v for k, v in kwargs.items() if k not in ("temperature", "max_tokens")}
+    return make_key(
+        provider,
+        client.model,
+        system_prompt,
+        prompt,
+        temperature if temperature is not None else getattr(client, "temperature", None),
+        max_tokens if max_tokens is not None else getattr(client, "max_tokens", None),
+        extra,
+    )
+
+
+def _cache_wanted(cache: Optional[bool], client: Any, kwargs: Dict[str, Any]) -> bool:
+    """按显式 cache 参数或实际温度（未传时取通道默认温度）决定是否走响应缓存。"""
+    from utils.llm_cache import get_llm_cache
+
+    temperature = kwargs.get("temperature")
+    if temperature is None:
+        temperature = getattr(client, "temperature", None)
+    return get_llm_cache().wants(temperature, cache)
+
+
+class TextStream:
+    """
+    流式生成结果：迭代得到文本块，结束后 result() 返回与 generate_text 相同结构的字典。
+
+    按 prefer 顺序选择通道；通道在产出首个文本块前失败会回退下一个通道，
+    已经开始输出后失败则结束迭代并在 result() 中带上 error。
+    缓存命中时整段内容作为一个文本块产出。
+    """
+
+    def __init__(self, prompt: str, system_prompt: Optional[str], kwargs: Dict[str, Any], cache: Optional[bool] = None):
+        self.prompt = prompt
+        self.system_prompt = system_prompt
+        self.kwargs = kwargs
+        self.cache = cache
+        self.provider = ""
+        self.model = ""
+        self.error = ""
+        self.success = False
+        self.cached = False
+        self._parts: List[str] = []
+
+    @property
+    def content(self) -> str:
+        return "".join(self._parts)
+
+    def __iter__(self) -> Iterator[str]:
+        clients = _provider_clients()
+        router = get_router()
+        errors: List[str] = []
+        for name in _provider_order(ai_prefer()):
+            client = clients[name]
+            if not client.enable:
+                errors.append(f"{name}: 未启用")
+                continue
+            self.provider, self.model = name, str(getattr(client, "model", "") or "")
+
+            key = ""
+            if _cache_wanted(self.cache, client, self.kwargs):
+                from utils.llm_cache import get_llm_cache
+
+                key = _cache_key(name, client, self.prompt, self.system_prompt, self.kwargs)
+                hit = get_llm_cache().get(key)
+                if hit is not None and hit.get("content"):
+                    self.cached = self.success = True
+                    self._parts.append(str(hit["content"]))
+                    yield str(hit["content"])
+                    return
+
+            state = router.state(name)
+            if not state.allow():
+                errors.append(f"{name}: 熔断中")
+                continue
+            t0 = time.perf_counter()
+            started = False
+            try:
+                with state.slots:
+                    for piece in client.stream(self.prompt, system_prompt=self.system_prompt, **self.kwargs):
+                        started = True
+                        self._parts.append(piece)
+                        yield piece
+            except GeneratorExit:
+                # 调用方提前停止迭代：不计成败，但要释放半开试探名额
+                state.release_trial()
+                raise
+            except Exception as e:
+                state.record(False, time.perf_counter() - t0)
+                err = f"{name} 流式请求失败: {e}"
+                logger.warning(err)
+                if started:
+                    self.error = err
+                    return
+                errors.append(err)
+                continue
+
+            state.record(True, time.perf_counter() - t0)
+            self.success = True
+            if key:
+                from utils.llm_cache import get_llm_cache
+
+                get_llm_cache().put(key, self.result(), name, self.model)
+            return
+
+        self.error = "；".join(errors) or "没有可用的 AI 通道"
+        self.provider = self.provider or "none"
+
+    def result(self) -> Dict[str, Any]:
+        content = self.content.strip()
+        out: Dict[str, Any] = {
+            "success": self.success and bool(content),
+            "content": content,
+            "error": self.error if not self.success else "",
+            "usage": {},
+            "provider": self.provider,
+            "model": self.model,
+            "streamed": True,
+        }
+        if self.success and not content:
+            out["error"] = f"{self.provider} 空响应"
+        if self.cached:
+            out["cached"] = True
+        return out
+
+
+def stream_text(
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    **kwargs,
+) -> TextStream:
+    """
+    流式生成：DeepSeek / 千问走 SSE，Ollama 走 NDJSON。
+
+    用法：
+        stream = stream_text(prompt, system_prompt=...)
+        for chunk in stream:
+            ...
+        result = stream.result()
+    """
+    cache = kwargs.pop("cache", None)
+    return TextStream(prompt, system_prompt, kwargs, cache=cache)
+
+
 def generate_text(
     prompt: str,
     system_prompt: Optional[str] = None,
@@ -660,54 +1197,52 @@ def generate_text(
     - deepseek_first：DeepSeek → Ollama → 千问
     - ollama_first：Ollama → DeepSeek → 千问
     - deepseek / ollama / qwen：仅该通道
+
+    低温度调用在每个通道前先查响应缓存（见 utils.llm_cache），传 cache=False 跳过、cache=True 强制；
+    熔断、并发上限与对冲见 utils.llm_router。
+    传 on_chunk 回调时改走流式接口（见 stream_text），每收到一块文本回调一次，返回值结构不变。
     """
-    prefer = "deepseek_first"
-    try:
-        project_root = Path(__file__).parent.parent
-        with open(project_root / "config" / "config.yaml", "r", encoding="utf-8") as f:
-            cfg = yaml.safe_load(f) or {}
-        prefer = str((cfg.get("ai") or {}).get("prefer") or "deepseek_first").strip().lower()
-    except Exception:
-        pass
-
-    def _ollama():
-        return get_ollama_client().generate(prompt, system_prompt=system_prompt, **kwargs)
-
-    def _deepseek():
-        return get_deepseek_client().generate(prompt, system_prompt=system_prompt, **kwargs)
-
-    def _qwen():
-        r = get_qwen_client().generate(prompt, system_prompt=system_prompt, **kwargs)
-        if isinstance(r, dict):
-            r.setdefault("provider", "qwen")
-        return r
+    on_chunk: Optional[Callable[[str], None]] = kwargs.pop("on_chunk", None)
+    cache: Optional[bool] = kwargs.pop("cache", None)
+    if on_chunk is not None:
+        stream = TextStream(prompt, system_prompt, kwargs, cache=cache)
+        for piece in stream:
+            try:
+                on_chunk(piece)
+            except Exception as e:
+                logger.debug(f"on_chunk 回调异常: {e}")
+        return stream.result()
 
-    if prefer == "deepseek":
-        return _deepseek()
-    if prefer == "qwen":
-        return _qwen()
-    if prefer == "ollama":
-        return _ollama()
+    def _key(provider: str) -> str:
+        return _cache_key(provider, clients[provider], prompt, system_prompt, kwargs)
 
-    if prefer == "ollama_first":
-        r = _ollama()
-        if r.get("success"):
-            return r
-        logger.warning(f"Ollama 不可用，回退 DeepSeek: {r.get('error')}")
-        r2 = _deepseek()
-        if r2.get("success"):
-            return r2
-        logger.warning(f"DeepSeek 不可用，回退千问: {r2.get('error')}")
-        return _qwen()
+    def _lookup(provider: str) -> Optional[Dict[str, Any]]:
+        from utils.llm_cache import get_llm_cache
 
-    # deepseek_first（默认）
-    r = _deepseek()
-    if r.get("success"):
+        return get_llm_cache().get(_key(provider))
+
+    def _call(provider: str) -> Dict[str, Any]:
+        client = clients[provider]
+        r = client.generate(prompt, system_prompt=system_prompt, **kwargs)
+        if isinstance(r, dict):
+            r.setdefault("provider", provider)
+            if client.enable and _cache_wanted(cache, client, kwargs):
+                from utils.llm_cache import get_llm_cache
+
+                get_llm_cache().put(_key(provider), r, provider, client.model)
         return r
-    logger.warning(f"DeepSeek 不可用，回退 Ollama: {r.get('error')}")
-    r2 = _ollama()
-    if r2.get("success"):
-        return r2
-    logger.warning(f"Ollama 不可用，回退千问: {r2.get('error')}")
-    return _qwen()
 
+    clients = _provider_clients()
+    # 缓存查询在熔断判断之前（命中不占试探名额与并发槽）；
+    # 熔断中的通道直接跳过，开启对冲时主通道超过 p95 未返回会并行请求下一个通道
+    return get_router().run(
+        [
+            (
+                name,
+                (lambda n=name: _call(n)),
+                bool(clients[name].enable),
+                (lambda n=name: _lookup(n)) if _cache_wanted(cache, clients[name], kwargs) else None,
+            )
+            for name in _provider_order(ai_prefer())
+        ]
+    )
@@ -0,0 +1,262 @@
+# coding=utf-8
+"""
+本地假 LLM 服务：同时模拟 DeepSeek（OpenAI 兼容）、千问 DashScope 与 Ollama 接口，
+用于联调路由、熔断、对冲与并发上限，不消耗真实额度。
+
+    python -m utils.fake_llm_server --port 18080 --latency-ms 200 --fail-rate 0.1
+
+把 config.yaml 中的地址指向它即可：
+    deepseek.api_endpoint: http://127.0.0.1:18080/chat/completions
+    qwen.api_endpoint:     http://127.0.0.1:18080/api/v1/services/aigc/text-generation/generation
+    ollama.base_url:       http://127.0.0.1:18080
+
+请求体带 stream=true（千问为 X-DashScope-SSE: enable 头）时按各家格式流式返回：
+OpenAI / DashScope 为 SSE，Ollama 为 NDJSON，每个分块间隔 chunk_ms。
+
+运行中可 POST /__control 调整行为：{"latency_ms": 500, "fail_rate": 0.5, "down": true, "chunk_ms": 20}
+（down 时所有生成请求返回 503）；GET /__stats 查看请求计数与最大并发。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+
+
+class FakeLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        addr: Tuple[str, int],
+        *,
+        latency_ms: int = 0,
+        fail_rate: float = 0.0,
+        model: str = "fake-model",
+        seed: int = 0,
+        chunk_ms: int = 0,
+    ):
+        super().__init__(addr, _Handler)
+        self.latency_ms = latency_ms
+        self.chunk_ms = chunk_ms
+        self.fail_rate = fail_rate
+        self.down = False
+        self.model = model
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts: Dict[str, int] = {"requests": 0, "failures": 0}
+        self.inflight = 0
+        self.max_inflight = 0
+
+    def control(self, body: Dict[str, Any]) -> None:
+        with self.lock:
+            if "latency_ms" in body:
+                self.latency_ms = int(body["latency_ms"])
+            if "fail_rate" in body:
+                self.fail_rate = float(body["fail_rate"])
+            if "down" in body:
+                self.down = bool(body["down"])
+            if "chunk_ms" in body:
+                self.chunk_ms = int(body["chunk_ms"])
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                **self.counts,
+                "inflight": self.inflight,
+                "max_inflight": self.max_inflight,
+                "latency_ms": self.latency_ms,
+                "fail_rate": self.fail_rate,
+                "chunk_ms": self.chunk_ms,
+                "down": self.down,
+            }
+
+    def begin(self, kind: str) -> bool:
+        """登记一次生成请求，返回本次是否应失败。"""
+        with self.lock:
+            self.counts["requests"] += 1
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+            self.inflight += 1
+            self.max_inflight = max(self.max_inflight, self.inflight)
+            fail = self.down or self.rng.random() < self.fail_rate
+            if fail:
+                self.counts["failures"] += 1
+            delay = self.latency_ms / 1000.0
+        if delay:
+            time.sleep(delay)
+        return fail
+
+    def end(self) -> None:
+        with self.lock:
+            self.inflight -= 1
+
+
+def fake_reply(prompt: str, model: str) -> str:
+    text = " ".join(str(prompt or "").split())
+    return f"[{model}] {text[:80]}"
+
+
+def fake_chunks(content: str, size: int = 8) -> List[str]:
+    return [content[i:i + size] for i in range(0, len(content), size)] or [""]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: FakeLLMServer
+
+    def log_message(self, fmt: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, content_type: str, lines: List[bytes]) -> None:
+        """逐块写出（无 Content-Length，写完关闭连接）。"""
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        for line in lines:
+            if self.server.chunk_ms:
+                time.sleep(self.server.chunk_ms / 1000.0)
+            self.wfile.write(line)
+            self.wfile.flush()
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw.decode("utf-8")) if raw else {}
+        except Exception:
+            body = {}
+        return body if isinstance(body, dict) else {}
+
+    def do_GET(self) -> None:
+        path = self.path.split("?")[0]
+        if path == "/__stats":
+            self._send(200, self.server.stats())
+        elif path == "/api/tags":
+            self._send(200, {"models": [{"name": f"{self.server.model}:latest"}]})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        path = self.path.split("?")[0]
+        body = self._read_json()
+        if path == "/__control":
+            self.server.control(body)
+            self._send(200, self.server.stats())
+            return
+
+        if path.endswith("/chat/completions"):
+            kind = "openai"
+        elif path.endswith("/text-generation/generation"):
+            kind = "dashscope"
+        elif path == "/api/generate":
+            kind = "ollama"
+        else:
+            self._send(404, {"error": "not found"})
+            return
+
+        fail = self.server.begin(kind)
+        try:
+            if fail:
+                self._send(503, {"error": {"message": "fake upstream unavailable"}})
+                return
+            model = str(body.get("model") or self.server.model)
+            stream = bool(body.get("stream")) or self.headers.get("X-DashScope-SSE") == "enable"
+            if kind == "openai":
+                messages = body.get("messages") or []
+                prompt = messages[-1].get("content") if messages and isinstance(messages[-1], dict) else ""
+                content = fake_reply(prompt, model)
+                if stream:
+                    events = [
+                        {"id": "fake", "model": model, "choices": [{"index": 0, "delta": {"content": c}}]}
+                        for c in fake_chunks(content)
+                    ]
+                    self._stream("text/event-stream", [
+                        *(f"data: {json.dumps(e, ensure_ascii=False)}\n\n".encode("utf-8") for e in events),
+                        b"data: [DONE]\n\n",
+                    ])
+                    return
+                self._send(200, {
+                    "id": "fake",
+                    "model": model,
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+                    "usage": {"prompt_tokens": len(str(prompt)), "completion_tokens": len(content)},
+                })
+            elif kind == "dashscope":
+                messages = (body.get("input") or {}).get("messages") or []
+                prompt = messages[-1].get("content") if messages and isinstance(messages[-1], dict) else ""
+                content = fake_reply(prompt, model)
+                if stream:
+                    events = [
+                        {"output": {"choices": [{"message": {"role": "assistant", "content": c}}]}}
+                        for c in fake_chunks(content)
+                    ]
+                    self._stream("text/event-stream", [
+                        f"id:{i}\nevent:result\ndata:{json.dumps(e, ensure_ascii=False)}\n\n".encode("utf-8")
+                        for i, e in enumerate(events, 1)
+                    ])
+                    return
+                self._send(200, {
+                    "output": {"choices": [{"message": {"role": "assistant", "content": content}}]},
+                    "usage": {"input_tokens": len(str(prompt)), "output_tokens": len(content)},
+                })
+            elif stream:
+                chunks = fake_chunks(fake_reply(body.get("prompt"), model))
+                self._stream("application/x-ndjson", [
+                    (json.dumps({"model": model, "response": c, "done": i == len(chunks)}, ensure_ascii=False) + "\n").encode("utf-8")
+                    for i, c in enumerate(chunks, 1)
+                ])
+            else:
+                self._send(200, {"model": model, "response": fake_reply(body.get("prompt"), model), "done": True})
+        finally:
+            self.server.end()
+
+
+def start_fake_llm(host: str = "127.0.0.1", port: int = 0, **kwargs: Any) -> FakeLLMServer:
+    """后台线程启动（port=0 时自动分配端口，见 server.server_address）。"""
+    srv = FakeLLMServer((host, port), **kwargs)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="本地假 LLM 服务（DeepSeek / 千问 / Ollama 接口）")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=18080)
+    ap.add_argument("--latency-ms", type=int, default=0, help="每个生成请求的模拟延迟")
+    ap.add_argument("--fail-rate", type=float, default=0.0, help="随机返回 503 的比例（0-1）")
+    ap.add_argument("--model", default="fake-model")
+    ap.add_argument("--chunk-ms", type=int, default=0, help="流式响应每个分块的间隔")
+    args = ap.parse_args()
+    srv = FakeLLMServer(
+        (args.host, args.port),
+        latency_ms=args.latency_ms,
+        fail_rate=args.fail_rate,
+        model=args.model,
+        chunk_ms=args.chunk_ms,
+    )
+    print(f"Fake LLM: http://{args.host}:{srv.server_address[1]}")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
+
+
+if __name__ == "__main__":
+    main()
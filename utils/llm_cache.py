@@ -0,0 +1,236 @@
+# coding=utf-8
+"""
+LLM 响应缓存（SQLite）
+
+键为 (provider, model, system_prompt, prompt, temperature, max_tokens, 其他参数) 的 sha256，
+只缓存成功的响应。重解析、崩溃重启后重复提交同一提示词时直接命中，不再请求模型。
+
+默认只缓存低温度（<= max_temperature）的确定性调用，如信号/推文卡片分析、拆解、关键词衍生、摘要；
+创作类调用温度较高，每次都应重新采样，不走缓存。
+
+配置（config.yaml → ai.cache，首次使用时读取一次）：
+    enable: true
+    ttl_hours: 72        # 条目有效期，<=0 表示不过期
+    max_entries: 20000   # 超出后按最近使用时间淘汰
+    max_temperature: 0.4 # 温度高于此值的调用默认不缓存
+    path: output/llm_cache.db
+
+单次调用可传 cache=False 跳过缓存（既不读也不写），cache=True 则不论温度都走缓存。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PATH = PROJECT_ROOT / "output" / "llm_cache.db"
+DEFAULT_TTL_HOURS = 72
+DEFAULT_MAX_ENTRIES = 20000
+DEFAULT_MAX_TEMPERATURE = 0.4
+
+
+def make_key(
+    provider: str,
+    model: str,
+    system_prompt: Optional[str],
+    prompt: str,
+    temperature: Any = None,
+    max_tokens: Any = None,
+    extra: Optional[Dict[str, Any]] = None,
+) -> str:
+    """提示词指纹：各字段按固定顺序序列化后取 sha256。"""
+    raw = json.dumps(
+        [provider, model, system_prompt or "", prompt or "", temperature, max_tokens, extra or {}],
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """线程安全的持久化响应缓存，带命中/未命中计数。"""
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_PATH,
+        ttl_seconds: float = DEFAULT_TTL_HOURS * 3600,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        enable: bool = True,
+        max_temperature: float = DEFAULT_MAX_TEMPERATURE,
+    ):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enable = enable
+        self.max_temperature = max_temperature
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "expired": 0, "stores": 0, "evictions": 0, "errors": 0}
+        self._entries: Optional[int] = None
+
+    @contextmanager
+    def _connect(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, provider TEXT NOT NULL, model TEXT NOT NULL, "
+                "result_json TEXT NOT NULL, created_at REAL NOT NULL, used_at REAL NOT NULL, "
+                "hits INTEGER NOT NULL DEFAULT 0)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_used ON responses(used_at)")
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += n
+
+    def wants(self, temperature: Any, explicit: Optional[bool] = None) -> bool:
+        """
+        本次调用是否走缓存：显式传了 cache 以其为准，否则只缓存温度不高于 max_temperature 的调用
+        （温度未知时不缓存）。
+        """
+        if not self.enable:
+            return False
+        if explicit is not None:
+            return bool(explicit)
+        try:
+            return float(temperature) <= self.max_temperature
+        except (TypeError, ValueError):
+            return False
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """命中返回缓存的结果（带 cached=True），未命中/过期返回 None。"""
+        if not self.enable:
+            return None
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT result_json, created_at FROM responses WHERE key=?", (key,)
+                ).fetchone()
+                if row is None:
+                    self._count("misses")
+                    return None
+                if self.ttl_seconds > 0 and now - row[1] > self.ttl_seconds:
+                    conn.execute("DELETE FROM responses WHERE key=?", (key,))
+                    self._entries = None
+                    self._count("expired")
+                    self._count("misses")
+                    return None
+                conn.execute("UPDATE responses SET used_at=?, hits=hits+1 WHERE key=?", (now, key))
+            result = json.loads(row[0])
+        except Exception:
+            self._count("errors")
+            return None
+        self._count("hits")
+        result["cached"] = True
+        return result
+
+    def put(self, key: str, result: Dict[str, Any], provider: str, model: str) -> None:
+        """只写入成功的响应。"""
+        if not self.enable or not result.get("success"):
+            return
+        now = time.time()
+        stored = {k: v for k, v in result.items() if k != "cached"}
+        try:
+            with self._connect() as conn:
+                existed = conn.execute("SELECT 1 FROM responses WHERE key=?", (key,)).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses(key, provider, model, result_json, created_at, used_at, hits) "
+                    "VALUES (?,?,?,?,?,?,0)",
+                    (key, provider, model or "", json.dumps(stored, ensure_ascii=False, default=str), now, now),
+                )
+                if self._entries is None:
+                    self._entries = int(conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0])
+                elif not existed:
+                    self._entries += 1
+                if self.max_entries > 0 and self._entries > self.max_entries:
+                    # 一次淘汰到上限的 90%，避免每次写入都触发
+                    drop = self._entries - int(self.max_entries * 0.9)
+                    conn.execute(
+                        "DELETE FROM responses WHERE key IN "
+                        "(SELECT key FROM responses ORDER BY used_at ASC LIMIT ?)",
+                        (drop,),
+                    )
+                    self._entries -= drop
+                    self._count("evictions", drop)
+            self._count("stores")
+        except Exception:
+            self._count("errors")
+
+    def clear(self) -> int:
+        with self._connect() as conn:
+            n = conn.execute("DELETE FROM responses").rowcount
+        self._entries = 0
+        return int(n or 0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._counters)
+        lookups = out["hits"] + out["misses"]
+        out["hit_rate"] = round(out["hits"] / lookups, 4) if lookups else 0.0
+        out["enable"] = self.enable
+        out["max_temperature"] = self.max_temperature
+        out["path"] = str(self.path)
+        try:
+            with self._connect() as conn:
+                out["entries"] = int(conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0])
+        except Exception:
+            out["entries"] = None
+        return out
+
+
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def _load_cache_config() -> Dict[str, Any]:
+    try:
+        import yaml
+
+        with open(PROJECT_ROOT / "config" / "config.yaml", "r", encoding="utf-8") as f:
+            cfg = yaml.safe_load(f) or {}
+        c = (cfg.get("ai") or {}).get("cache") or {}
+        return c if isinstance(c, dict) else {}
+    except Exception:
+        return {}
+
+
+def get_llm_cache() -> LLMCache:
+    """全局缓存实例（首次调用时读取 ai.cache 配置）。"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            c = _load_cache_config()
+            path = Path(c.get("path") or DEFAULT_PATH)
+            if not path.is_absolute():
+                path = PROJECT_ROOT / path
+            _cache = LLMCache(
+                path=path,
+                ttl_seconds=float(c.get("ttl_hours", DEFAULT_TTL_HOURS)) * 3600,
+                max_entries=int(c.get("max_entries", DEFAULT_MAX_ENTRIES)),
+                enable=bool(c.get("enable", True)),
+                max_temperature=float(c.get("max_temperature", DEFAULT_MAX_TEMPERATURE)),
+            )
+        return _cache
+
+
+def cache_stats() -> Dict[str, Any]:
+    return get_llm_cache().stats()
@@ -0,0 +1,285 @@
+# coding=utf-8
+"""
+LLM 通道路由：熔断、并发上限与对冲请求
+
+- 熔断：某通道连续失败 breaker_threshold 次后 breaker_cooldown 秒内直接跳过，
+  冷却结束放行一次试探（半开），成功即恢复；
+- 并发上限：每个通道一个信号量（ai.<provider>.max_concurrency）；
+- 对冲：开启后主通道超过其近期 p95 延迟（或固定 hedge_delay_ms）仍未返回时，
+  并行发起下一个通道，先成功者胜出。
+
+配置（config.yaml → ai.router）：
+    breaker_threshold: 3
+    breaker_cooldown: 30
+    hedge: false
+    hedge_delay_ms: 0        # 0 表示按主通道 p95 自动计算
+    hedge_min_samples: 20    # p95 需要的最少样本数
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = {"deepseek": 8, "qwen": 8, "ollama": 2}
+DISPLAY_NAMES = {"deepseek": "DeepSeek", "ollama": "Ollama", "qwen": "千问"}
+
+# (通道名, 调用函数, 是否启用[, 缓存查询函数])
+Attempt = Tuple[Any, ...]
+
+
+class ProviderState:
+    """单个通道的熔断状态、并发信号量与延迟样本。"""
+
+    def __init__(self, name: str, max_concurrency: int, threshold: int, cooldown: float):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.slots = threading.BoundedSemaphore(self.max_concurrency)
+        self.latencies: Deque[float] = deque(maxlen=200)
+        self.failures = 0
+        self.open_until = 0.0
+        self.trial_inflight = False
+        self.counters = {"calls": 0, "successes": 0, "failures": 0, "skipped_open": 0, "cached": 0}
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """是否可以调用：熔断中返回 False；冷却结束后只放行一个试探请求。"""
+        with self._lock:
+            if self.open_until == 0.0:
+                return True
+            if time.monotonic() < self.open_until or self.trial_inflight:
+                self.counters["skipped_open"] += 1
+                return False
+            self.trial_inflight = True
+            return True
+
+    def release_trial(self) -> None:
+        """放行的试探请求没有真正调用上游（如命中缓存、调用方中途放弃）：交还试探名额。"""
+        with self._lock:
+            self.trial_inflight = False
+
+    def record(self, ok: bool, seconds: float) -> None:
+        with self._lock:
+            self.counters["calls"] += 1
+            self.trial_inflight = False
+            if ok:
+                self.counters["successes"] += 1
+                self.latencies.append(seconds)
+                self.failures = 0
+                self.open_until = 0.0
+                return
+            self.counters["failures"] += 1
+            self.failures += 1
+            if self.failures >= self.threshold:
+                if self.open_until == 0.0 or time.monotonic() >= self.open_until:
+                    logger.warning(f"{DISPLAY_NAMES.get(self.name, self.name)} 连续失败 {self.failures} 次，熔断 {self.cooldown:.0f}s")
+                self.open_until = time.monotonic() + self.cooldown
+
+    def p95(self, min_samples: int) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self.latencies)
+        if len(samples) < max(1, min_samples):
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        p95 = self.p95(1)
+        with self._lock:
+            return {
+                **self.counters,
+                "consecutive_failures": self.failures,
+                "circuit_open": self.open_until > now,
+                "open_seconds_left": round(max(0.0, self.open_until - now), 1),
+                "max_concurrency": self.max_concurrency,
+                "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            }
+
+
+class ProviderRouter:
+    def __init__(self, ai_cfg: Optional[Dict[str, Any]] = None):
+        ai_cfg = ai_cfg or {}
+        router = ai_cfg.get("router") if isinstance(ai_cfg.get("router"), dict) else {}
+        self.ai_cfg = ai_cfg
+        self.threshold = int(router.get("breaker_threshold", 3))
+        self.cooldown = float(router.get("breaker_cooldown", 30))
+        self.hedge = bool(router.get("hedge", False))
+        self.hedge_delay = float(router.get("hedge_delay_ms") or 0) / 1000.0
+        self.hedge_min_samples = int(router.get("hedge_min_samples", 20))
+        self.hedge_stats = {"hedged": 0, "primary_won": 0, "backup_won": 0}
+        self._states: Dict[str, ProviderState] = {}
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def state(self, name: str) -> ProviderState:
+        with self._lock:
+            st = self._states.get(name)
+            if st is None:
+                p = self.ai_cfg.get(name) if isinstance(self.ai_cfg.get(name), dict) else {}
+                limit = int(p.get("max_concurrency") or DEFAULT_CONCURRENCY.get(name, 4))
+                st = self._states[name] = ProviderState(name, limit, self.threshold, self.cooldown)
+            return st
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm-hedge")
+            return self._pool
+
+    def call(self, name: str, fn: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """在通道并发上限内执行一次调用并记录结果（缓存命中不计入熔断与延迟）。"""
+        st = self.state(name)
+        with st.slots:
+            t0 = time.perf_counter()
+            try:
+                r = fn()
+            except Exception as e:
+                r = {"success": False, "content": "", "error": f"{name} 调用异常: {e}", "usage": {}, "provider": name}
+            elapsed = time.perf_counter() - t0
+        if not isinstance(r, dict):
+            r = {"success": False, "content": "", "error": f"{name} 返回格式异常", "usage": {}, "provider": name}
+        if r.get("cached"):
+            with st._lock:
+                st.counters["cached"] += 1
+                st.trial_inflight = False
+        else:
+            st.record(bool(r.get("success")), elapsed)
+        return r
+
+    def _hedge_delay_for(self, name: str) -> Optional[float]:
+        if not self.hedge:
+            return None
+        if self.hedge_delay > 0:
+            return self.hedge_delay
+        return self.state(name).p95(self.hedge_min_samples)
+
+    def _lookup(self, name: str, lookup: Optional[Callable[[], Optional[Dict[str, Any]]]]) -> Optional[Dict[str, Any]]:
+        """缓存查询：在熔断判断与信号量之前执行，命中不占用试探名额和并发槽。"""
+        if lookup is None:
+            return None
+        try:
+            hit = lookup()
+        except Exception as e:
+            logger.debug(f"{name} 缓存查询失败: {e}")
+            return None
+        if not hit:
+            return None
+        st = self.state(name)
+        with st._lock:
+            st.counters["cached"] += 1
+        return hit
+
+    def _next_available(self, attempts: List[Attempt], start: int) -> int:
+        for j in range(start, len(attempts)):
+            name, _, enabled = attempts[j][:3]
+            if enabled and self.state(name).allow():
+                return j
+        return -1
+
+    def _race(self, primary: Tuple[str, Future], backup: Tuple[str, Future]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """两个请求赛跑：返回 (胜者结果或 None, 失败结果列表)。"""
+        self.hedge_stats["hedged"] += 1
+        pending = {primary[1]: primary[0], backup[1]: backup[0]}
+        failed: List[Dict[str, Any]] = []
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = pending.pop(fut)
+                r = fut.result()
+                if r.get("success"):
+                    key = "primary_won" if name == primary[0] else "backup_won"
+                    self.hedge_stats[key] += 1
+                    r["hedged"] = True
+                    return r, failed
+                failed.append(r)
+        return {}, failed
+
+    def run(self, attempts: List[Attempt]) -> Dict[str, Any]:
+        """
+        按顺序尝试各通道，返回第一个成功结果；全部失败时返回最后一个失败结果。
+
+        Args:
+            attempts: [(通道名, 调用函数, 是否启用[, 缓存查询函数])]；
+                未启用的通道直接调用以取得错误信息，不计入熔断；
+                缓存查询在熔断判断之前执行，命中直接返回
+        """
+        last: Optional[Dict[str, Any]] = None
+        skipped: List[str] = []
+        i = 0
+        while i < len(attempts):
+            name, fn, enabled = attempts[i][:3]
+            lookup = attempts[i][3] if len(attempts[i]) > 3 else None
+            if enabled:
+                hit = self._lookup(name, lookup)
+                if hit is not None:
+                    return hit
+            if not enabled:
+                if len(attempts) == 1 or i == len(attempts) - 1 and last is None:
+                    last = fn()
+                i += 1
+                continue
+            if not self.state(name).allow():
+                skipped.append(name)
+                i += 1
+                continue
+
+            delay = self._hedge_delay_for(name) if i < len(attempts) - 1 else None
+            if delay is None:
+                r = self.call(name, fn)
+                i += 1
+            else:
+                pool = self._executor()
+                fut = pool.submit(self.call, name, fn)
+                done, _ = wait([fut], timeout=delay)
+                if done:
+                    r = fut.result()
+                    i += 1
+                else:
+                    j = self._next_available(attempts, i + 1)
+                    if j < 0:
+                        r = fut.result()
+                        i += 1
+                    else:
+                        bname, bfn = attempts[j][:2]
+                        logger.info(f"{DISPLAY_NAMES.get(name, name)} 超过 {delay * 1000:.0f}ms 未返回，对冲请求 {DISPLAY_NAMES.get(bname, bname)}")
+                        winner, failed = self._race((name, fut), (bname, pool.submit(self.call, bname, bfn)))
+                        if winner:
+                            return winner
+                        r = failed[-1] if failed else {}
+                        i = j + 1
+
+            if r.get("success"):
+                return r
+            last = r
+            if i < len(attempts):
+                nxt = attempts[i][0]
+                logger.warning(
+                    f"{DISPLAY_NAMES.get(name, name)} 不可用，回退 {DISPLAY_NAMES.get(nxt, nxt)}: {r.get('error')}"
+                )
+
+        if last is not None:
+            return last
+        names = "、".join(DISPLAY_NAMES.get(n, n) for n in skipped) or "无"
+        return {
+            "success": False,
+            "content": "",
+            "error": f"没有可用的 AI 通道（熔断中: {names}）",
+            "usage": {},
+            "provider": "none",
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            states = dict(self._states)
+        return {
+            "providers": {name: st.snapshot() for name, st in states.items()},
+            "hedge": {"enable": self.hedge, **self.hedge_stats},
+        }
@@ -0,0 +1,200 @@
+# coding=utf-8
+"""
+轻量级耗时追踪：记录一轮爬取各阶段耗时。
+
+用法：
+    tracer = start_round(round_id)
+    with span("fetch", platform="weibo"):
+        ...
+    finish_round(jsonl_path, prometheus_path)
+
+没有活动的轮次时 span / traced 不做任何记录，开销只有一次全局变量读取。
+计时使用 time.perf_counter（单调时钟）。
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class RoundTracer:
+    """单轮爬取的阶段耗时记录器"""
+
+    def __init__(self, round_id: str, attrs: Optional[Dict[str, Any]] = None):
+        self.round_id = round_id
+        self.attrs: Dict[str, Any] = dict(attrs or {})
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.total_seconds: Optional[float] = None
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        record: Dict[str, Any] = {"name": name, "parent": stack[-1] if stack else None}
+        if attrs:
+            record["attrs"] = attrs
+        stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record["offset_ms"] = round((start - self._t0) * 1000, 2)
+            record["ms"] = round((time.perf_counter() - start) * 1000, 2)
+            stack.pop()
+            with self._lock:
+                self.spans.append(record)
+
+    def finish(self) -> None:
+        if self.total_seconds is None:
+            self.total_seconds = time.perf_counter() - self._t0
+
+    def to_record(self) -> Dict[str, Any]:
+        self.finish()
+        with self._lock:
+            spans = sorted(self.spans, key=lambda item: item["offset_ms"])
+        return {
+            "round": self.round_id,
+            "started_at": self.started_at,
+            "total_ms": round(self.total_seconds * 1000, 2),
+            **self.attrs,
+            "spans": spans,
+        }
+
+    def stage_totals(self) -> Dict[tuple, Dict[str, float]]:
+        """按 (阶段名, 平台/渠道标签) 汇总耗时与次数"""
+        totals: Dict[tuple, Dict[str, float]] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for record in spans:
+            labels = tuple(sorted((record.get("attrs") or {}).items()))
+            item = totals.setdefault((record["name"], labels), {"seconds": 0.0, "count": 0, "errors": 0})
+            item["seconds"] += record["ms"] / 1000
+            item["count"] += 1
+            if "error" in record:
+                item["errors"] += 1
+        return totals
+
+
+_current: Optional[RoundTracer] = None
+
+
+def start_round(round_id: str, **attrs: Any) -> RoundTracer:
+    """开始记录一轮（替换当前活动轮次）"""
+    global _current
+    _current = RoundTracer(round_id, attrs)
+    return _current
+
+
+def current_round() -> Optional[RoundTracer]:
+    return _current
+
+
+@contextmanager
+def span(name: str, **attrs: Any):
+    """在当前轮次中记录一个阶段；没有活动轮次时不记录"""
+    tracer = _current
+    if tracer is None:
+        yield None
+        return
+    with tracer.span(name, **attrs) as record:
+        yield record
+
+
+def traced(name: str, **attrs: Any):
+    """函数装饰器：每次调用记录为一个阶段"""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current is None:
+                return func(*args, **kwargs)
+            with _current.span(name, **attrs):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_prometheus(tracer: RoundTracer, prefix: str = "trendradar") -> str:
+    """把一轮记录渲染为 Prometheus 文本格式（适用于 node_exporter textfile collector）"""
+    tracer.finish()
+    lines = [
+        f"# HELP {prefix}_round_duration_seconds Duration of the last crawl round.",
+        f"# TYPE {prefix}_round_duration_seconds gauge",
+        f"{prefix}_round_duration_seconds {tracer.total_seconds:.6f}",
+        f"# HELP {prefix}_round_timestamp_seconds Start time of the last crawl round.",
+        f"# TYPE {prefix}_round_timestamp_seconds gauge",
+        f"{prefix}_round_timestamp_seconds {tracer.started_at:.3f}",
+        f"# HELP {prefix}_stage_seconds Time spent per stage in the last crawl round.",
+        f"# TYPE {prefix}_stage_seconds gauge",
+    ]
+    totals = tracer.stage_totals()
+    for (name, labels), item in sorted(totals.items()):
+        label_text = ",".join([f'stage="{_escape_label(name)}"'] + [
+            f'{key}="{_escape_label(value)}"' for key, value in labels
+        ])
+        lines.append(f"{prefix}_stage_seconds{{{label_text}}} {item['seconds']:.6f}")
+
+    lines.append(f"# HELP {prefix}_stage_errors Failed stage calls in the last crawl round.")
+    lines.append(f"# TYPE {prefix}_stage_errors gauge")
+    for (name, labels), item in sorted(totals.items()):
+        label_text = ",".join([f'stage="{_escape_label(name)}"'] + [
+            f'{key}="{_escape_label(value)}"' for key, value in labels
+        ])
+        lines.append(f"{prefix}_stage_errors{{{label_text}}} {int(item['errors'])}")
+    return "\n".join(lines) + "\n"
+
+
+def finish_round(jsonl_path: Optional[str] = None, prometheus_path: Optional[str] = None) -> Optional[Dict]:
+    """
+    结束当前轮次并写出记录
+
+    Args:
+        jsonl_path: 追加一行 JSON 记录的文件路径，为空则不写
+        prometheus_path: Prometheus 文本文件路径（原子覆盖），为空则不写
+
+    Returns:
+        本轮记录；没有活动轮次时返回 None
+    """
+    global _current
+    tracer = _current
+    _current = None
+    if tracer is None:
+        return None
+
+    record = tracer.to_record()
+    try:
+        if jsonl_path:
+            Path(jsonl_path).parent.mkdir(parents=True, exist_ok=True)
+            with open(jsonl_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        if prometheus_path:
+            path = Path(prometheus_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(render_prometheus(tracer))
+            os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"写入耗时记录失败: {e}")
+    return record